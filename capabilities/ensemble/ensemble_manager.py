@@ -15,21 +15,71 @@ from pathlib import Path
 import json
 import pickle
 import warnings
+import importlib.util
+import threading
+from collections import deque
 
-# ML model imports with fallback
+from minhos.core.feature_store import ENSEMBLE_FEATURES, get_feature_store
+from minhos.core.startup import get_startup_report
+from .tree_kernel import TreeEnsembleKernel, compile_ensemble
+
+# The model libraries are only needed to train or to load pickled models;
+# live inference runs on the compiled tree kernel, so imports are deferred
+ENSEMBLE_LIBS = ('xgboost', 'lightgbm', 'sklearn', 'catboost')
 try:
-    import xgboost as xgb
-    import lightgbm as lgb
-    from sklearn.ensemble import RandomForestRegressor
-    from sklearn.linear_model import LinearRegression
-    from sklearn.model_selection import train_test_split
-    from sklearn.preprocessing import StandardScaler
-    from sklearn.isotonic import IsotonicRegression
-    import catboost as cb
-    HAS_ENSEMBLE_LIBS = True
-except ImportError as e:
-    HAS_ENSEMBLE_LIBS = False
-    logging.warning(f"Ensemble libraries not available: {e}")
+    _missing_libs = [name for name in ENSEMBLE_LIBS if importlib.util.find_spec(name) is None]
+except (ImportError, ValueError):
+    _missing_libs = list(ENSEMBLE_LIBS)
+HAS_ENSEMBLE_LIBS = not _missing_libs
+if not HAS_ENSEMBLE_LIBS:
+    logging.warning(f"Ensemble libraries not available: {', '.join(_missing_libs)}")
+
+xgb = lgb = cb = None
+RandomForestRegressor = LinearRegression = IsotonicRegression = StandardScaler = train_test_split = None
+
+
+def _load_ensemble_libs():
+    """Import the model libraries on first use"""
+    global xgb, lgb, cb, RandomForestRegressor, LinearRegression, IsotonicRegression, StandardScaler, train_test_split
+    if xgb is None:
+        with get_startup_report().timed('import', 'ensemble libraries'):
+            import xgboost
+            import lightgbm
+            import catboost
+            from sklearn.ensemble import RandomForestRegressor
+            from sklearn.linear_model import LinearRegression
+            from sklearn.model_selection import train_test_split
+            from sklearn.preprocessing import StandardScaler
+            from sklearn.isotonic import IsotonicRegression
+        xgb, lgb, cb = xgboost, lightgbm, catboost
+
+
+# Best per-model hyperparameters from a walk-forward search (see walk_forward.py)
+HYPERPARAMETERS_FILE = "ensemble_hyperparameters.json"
+
+
+def build_base_model(name: str, params: Dict[str, Any], threads: int = -1, seed: int = 42) -> Any:
+    """
+    One untrained base model from generic hyperparameters (n_estimators,
+    max_depth, learning_rate), with its own thread count
+    """
+    _load_ensemble_libs()
+    if name == 'xgboost':
+        return xgb.XGBRegressor(n_estimators=params['n_estimators'], max_depth=params['max_depth'],
+                                learning_rate=params['learning_rate'], random_state=seed, n_jobs=threads,
+                                verbosity=0)
+    if name == 'lightgbm':
+        return lgb.LGBMRegressor(n_estimators=params['n_estimators'], max_depth=params['max_depth'],
+                                 learning_rate=params['learning_rate'], random_state=seed, n_jobs=threads,
+                                 deterministic=True, force_row_wise=True, verbosity=-1)
+    if name == 'random_forest':
+        return RandomForestRegressor(n_estimators=params['n_estimators'], max_depth=params['max_depth'],
+                                     random_state=seed, n_jobs=threads)
+    if name == 'catboost':
+        return cb.CatBoostRegressor(iterations=params['n_estimators'], depth=params['max_depth'],
+                                    learning_rate=params['learning_rate'], random_state=seed,
+                                    thread_count=threads, verbose=False)
+    raise ValueError(f"Unknown base model: {name}")
 
 # Suppress warnings from ML libraries
 warnings.filterwarnings('ignore', category=UserWarning)
@@ -59,29 +109,36 @@ class EnsembleManager:
             'confidence_threshold': 0.6,
             'n_estimators': 100,
             'max_depth': 6,
-            'learning_rate': 0.1
+            'learning_rate': 0.1,
+            'hyperparameters': {}  # Per-model overrides, e.g. the best walk-forward config
         }
         
         # Model components
         self.base_models = {}
         self.meta_learner = None
-        self.scaler = StandardScaler()
+        self.scaler = None
+        self.kernel: Optional[TreeEnsembleKernel] = None  # Flat NumPy trees compiled from the models
+        self.kernel_path = Path(self.model_path) / "tree_kernel.npz"
+        self.model_version: Optional[str] = None  # Registry version being served, once deployed
         self.is_trained = False
-        self.is_enabled = HAS_ENSEMBLE_LIBS
+        self.is_enabled = HAS_ENSEMBLE_LIBS or self.kernel_path.exists()
         
         # Model weights and performance tracking
         self.model_weights = {}
         self.model_performance = {}
         self.prediction_history = []
+        self.recent_features = deque(maxlen=64)  # Latest served feature rows, for shadow inference
+        self.recent_features_lock = threading.Lock()  # Appended on the inference pool, read on the loop
         
-        # Feature engineering
+        # Optional executor for blocking inference (e.g. minhos.core.inference); None runs inline
+        self.inference_executor = None
+        
+        # Feature engineering (shared store, same definitions as the other models)
+        self.feature_store = get_feature_store()
         self.feature_names = []
         self.feature_importance = {}
         
-        # Initialize models
-        self._initialize_models()
-        
-        # Try to load existing trained models
+        # Try to load existing trained models (base models are created when needed)
         self._load_trained_models()
         
         # Performance tracking
@@ -92,45 +149,20 @@ class EnsembleManager:
     
     def _initialize_models(self):
         """Initialize base models and meta-learner"""
-        if not self.is_enabled:
+        if not HAS_ENSEMBLE_LIBS:
             self.logger.warning("Ensemble models disabled - required libraries not available")
             return
         
         try:
-            # XGBoost
-            self.base_models['xgboost'] = xgb.XGBRegressor(
-                n_estimators=self.config['n_estimators'],
-                max_depth=self.config['max_depth'],
-                learning_rate=self.config['learning_rate'],
-                random_state=42,
-                verbosity=0
-            )
+            _load_ensemble_libs()
             
-            # LightGBM
-            self.base_models['lightgbm'] = lgb.LGBMRegressor(
-                n_estimators=self.config['n_estimators'],
-                max_depth=self.config['max_depth'],
-                learning_rate=self.config['learning_rate'],
-                random_state=42,
-                verbosity=-1
-            )
-            
-            # Random Forest
-            self.base_models['random_forest'] = RandomForestRegressor(
-                n_estimators=self.config['n_estimators'],
-                max_depth=self.config['max_depth'],
-                random_state=42,
-                n_jobs=-1
-            )
-            
-            # CatBoost
-            self.base_models['catboost'] = cb.CatBoostRegressor(
-                iterations=self.config['n_estimators'],
-                depth=self.config['max_depth'],
-                learning_rate=self.config['learning_rate'],
-                random_state=42,
-                verbose=False
-            )
+            # XGBoost, LightGBM, Random Forest, CatBoost: shared defaults, per-model overrides
+            if not self.config['hyperparameters']:
+                self.config['hyperparameters'] = self._load_hyperparameters()
+            defaults = {key: self.config[key] for key in ('n_estimators', 'max_depth', 'learning_rate')}
+            for name in ('xgboost', 'lightgbm', 'random_forest', 'catboost'):
+                params = {**defaults, **self.config['hyperparameters'].get(name, {})}
+                self.base_models[name] = build_base_model(name, params)
             
             # Meta-learner for stacking
             if self.config['meta_learner'] == 'linear':
@@ -144,6 +176,24 @@ class EnsembleManager:
             self.logger.error(f"Model initialization error: {e}")
             self.is_enabled = False
     
+    def _load_hyperparameters(self) -> Dict[str, Dict[str, Any]]:
+        """Best per-model config saved by a walk-forward search, if any"""
+        path = Path(self.model_path) / HYPERPARAMETERS_FILE
+        if not path.exists():
+            return {}
+        try:
+            with open(path) as f:
+                return json.load(f)['best']
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable {path}: {e}")
+            return {}
+    
+    def apply_hyperparameters(self, hyperparameters: Dict[str, Dict[str, Any]]):
+        """Use per-model hyperparameters for the next training run"""
+        self.config['hyperparameters'] = dict(hyperparameters)
+        self.base_models = {}
+        self._initialize_models()
+    
     def _load_trained_models(self):
         """Load trained models from disk if they exist"""
         if not self.is_enabled:
@@ -154,6 +204,20 @@ class EnsembleManager:
             self.logger.info("No trained models found - models will need to be trained")
             return
         
+        # Compiled kernel: ready for inference without the model libraries
+        if self.kernel_path.exists():
+            try:
+                self.kernel = TreeEnsembleKernel.load(str(self.kernel_path))
+                self.is_trained = True
+                self.logger.info(f"🌲 Ensemble tree kernel loaded from {self.kernel_path}")
+                return
+            except Exception as e:
+                self.logger.warning(f"Could not load ensemble tree kernel: {e}")
+        
+        if not HAS_ENSEMBLE_LIBS:
+            return
+        self._initialize_models()
+        
         try:
             # Load metadata to check model compatibility
             metadata_file = model_dir / "ensemble_metadata.json"
@@ -200,12 +264,54 @@ class EnsembleManager:
             if models_loaded > 0:
                 self.is_trained = True
                 self.logger.info(f"Successfully loaded {models_loaded}/{len(self.config['base_models'])} trained models")
+                self.export_kernel()
             else:
                 self.logger.info("No trained models loaded - training will be required")
                 
         except Exception as e:
             self.logger.error(f"Error loading trained models: {e}")
     
+    def export_kernel(self) -> bool:
+        """Compile the trained models to the NumPy tree kernel and switch inference to it"""
+        try:
+            meta_learner = self.meta_learner if self.config['stacking_enabled'] else None
+            kernel = compile_ensemble(self.base_models, self.scaler, meta_learner)
+            kernel.save(str(self.kernel_path))
+            self.kernel = kernel
+            self.logger.info(f"🌲 Ensemble tree kernel exported to {self.kernel_path}")
+            return True
+        except Exception as e:
+            self.kernel = None
+            self.logger.warning(f"Ensemble tree kernel export failed, inference stays on model libraries: {e}")
+            return False
+    
+    def swap_kernel(self, kernel: TreeEnsembleKernel, version: Optional[str] = None):
+        """Serve from ``kernel`` from the next prediction on; in-flight predictions finish on the old one"""
+        self.kernel = kernel
+        self.model_version = version
+        self.is_trained = True
+        self.is_enabled = True
+        self.logger.info(f"🌲 Ensemble now serving model version {version}")
+    
+    def recent_inputs(self) -> Optional[np.ndarray]:
+        """Feature rows of the latest predictions, for shadow inference"""
+        with self.recent_features_lock:  # The inference pool keeps appending
+            rows = list(self.recent_features)
+        return np.array(rows) if rows else None
+    
+    def warm_up(self) -> bool:
+        """One dummy inference so the first live prediction pays no first-call cost"""
+        if not self.is_trained:
+            return False
+        dummy = np.zeros((1, len(ENSEMBLE_FEATURES)))
+        if self.kernel is not None:
+            self.kernel.predict_base(dummy)
+        else:
+            dummy = self.scaler.transform(dummy)
+            for model in self.base_models.values():
+                model.predict(dummy)
+        return True
+    
     def engineer_features(self, market_data: List[Dict[str, Any]]) -> Optional[pd.DataFrame]:
         """
         Engineer features for ensemble models from market data
@@ -220,83 +326,9 @@ class EnsembleManager:
             return None
         
         try:
-            # Convert to DataFrame
-            df = pd.DataFrame(market_data)
-            
-            # Ensure required columns
-            required_cols = ['price', 'volume', 'timestamp']
-            for col in required_cols:
-                if col not in df.columns:
-                    if col == 'price' and 'close' in df.columns:
-                        df['price'] = df['close']
-                    elif col == 'volume':
-                        df['volume'] = 1.0
-                    elif col == 'timestamp':
-                        df['timestamp'] = pd.to_datetime('now').timestamp()
-            
-            # Convert timestamp column to numeric if it's string format
-            if 'timestamp' in df.columns:
-                if df['timestamp'].dtype == 'object':
-                    try:
-                        # Handle ISO format timestamps properly
-                        df['timestamp'] = pd.to_datetime(df['timestamp'], utc=True).astype('int64') // 10**9
-                    except Exception as e:
-                        self.logger.warning(f"Timestamp conversion warning: {e}, using current time")
-                        df['timestamp'] = pd.Timestamp.now().timestamp()
-            
-            # Sort by timestamp
-            df = df.sort_values('timestamp').reset_index(drop=True)
-            
-            # Create feature DataFrame
-            features = pd.DataFrame()
-            
-            # Price-based features
-            features['price_change_1'] = df['price'].pct_change().fillna(0)
-            features['price_change_5'] = df['price'].pct_change(periods=5).fillna(0)
-            features['price_volatility'] = df['price'].rolling(window=10, min_periods=1).std().fillna(0)
-            features['price_ma_ratio'] = df['price'] / df['price'].rolling(window=10, min_periods=1).mean()
-            features['price_ma_ratio'] = features['price_ma_ratio'].fillna(1.0)
-            
-            # Technical indicators
-            features['rsi'] = self._calculate_rsi(df['price'])
-            features['macd'] = self._calculate_macd(df['price'])
-            features['bollinger_position'] = self._calculate_bollinger_position(df['price'])
-            
-            # Volume features
-            features['volume_ma'] = df['volume'].rolling(window=10, min_periods=1).mean()
-            features['volume_ratio'] = df['volume'] / features['volume_ma']
-            features['volume_ratio'] = features['volume_ratio'].fillna(1.0)
-            features['volume_change'] = df['volume'].pct_change().fillna(0)
-            
-            # Momentum features
-            features['momentum_5'] = (df['price'] - df['price'].shift(5)) / df['price'].shift(5)
-            features['momentum_10'] = (df['price'] - df['price'].shift(10)) / df['price'].shift(10)
-            features['momentum_5'] = features['momentum_5'].fillna(0)
-            features['momentum_10'] = features['momentum_10'].fillna(0)
-            
-            # Time-based features
-            timestamps = pd.to_datetime(df['timestamp'], unit='s')
-            features['hour'] = timestamps.dt.hour / 24.0
-            features['day_of_week'] = timestamps.dt.dayofweek / 6.0
-            features['is_market_hours'] = ((timestamps.dt.hour >= 9) & (timestamps.dt.hour <= 16)).astype(float)
-            
-            # High-low features (if available)
-            if 'high' in df.columns and 'low' in df.columns:
-                features['hl_ratio'] = (df['high'] - df['low']) / df['price']
-                features['close_position'] = (df['price'] - df['low']) / (df['high'] - df['low'])
-                features['hl_ratio'] = features['hl_ratio'].fillna(0)
-                features['close_position'] = features['close_position'].fillna(0.5)
-            else:
-                features['hl_ratio'] = 0.0
-                features['close_position'] = 0.5
-            
-            # Lag features
-            for lag in [1, 2, 3]:
-                features[f'price_lag_{lag}'] = df['price'].shift(lag) / df['price']
-                features[f'price_lag_{lag}'] = features[f'price_lag_{lag}'].fillna(1.0)
-            
-            # Fill any remaining NaN values
-            features = features.fillna(0)
+            # Sorted by timestamp; bars already seen on the symbol's stream come from the cache
+            frame = self.feature_store.features(market_data, symbol=market_data[-1].get('symbol'))
+            features = pd.DataFrame(frame.select(ENSEMBLE_FEATURES.values()), columns=list(ENSEMBLE_FEATURES))
             
             # Store feature names
             self.feature_names = list(features.columns)
@@ -307,54 +339,23 @@ class EnsembleManager:
             self.logger.error(f"Feature engineering error: {e}")
             return None
     
-    def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> pd.Series:
-        """Calculate RSI indicator"""
-        try:
-            delta = prices.diff()
-            gain = delta.where(delta > 0, 0).rolling(window=period, min_periods=1).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=period, min_periods=1).mean()
-            rs = gain / loss.replace(0, 1)  # Avoid division by zero
-            rsi = 100 - (100 / (1 + rs))
-            return rsi.fillna(50) / 100.0  # Normalize to 0-1
-        except:
-            return pd.Series([0.5] * len(prices), index=prices.index)
-    
-    def _calculate_macd(self, prices: pd.Series, fast: int = 12, slow: int = 26) -> pd.Series:
-        """Calculate MACD indicator"""
-        try:
-            ema_fast = prices.ewm(span=fast).mean()
-            ema_slow = prices.ewm(span=slow).mean()
-            macd = ema_fast - ema_slow
-            return (macd / prices).fillna(0)  # Normalize by price
-        except:
-            return pd.Series([0.0] * len(prices), index=prices.index)
-    
-    def _calculate_bollinger_position(self, prices: pd.Series, period: int = 20) -> pd.Series:
-        """Calculate position within Bollinger Bands"""
-        try:
-            ma = prices.rolling(window=period, min_periods=1).mean()
-            std = prices.rolling(window=period, min_periods=1).std()
-            upper = ma + (std * 2)
-            lower = ma - (std * 2)
-            position = (prices - lower) / (upper - lower)
-            return position.fillna(0.5).clip(0, 1)
-        except:
-            return pd.Series([0.5] * len(prices), index=prices.index)
-    
     async def train_ensemble(self, 
                             training_data: List[Dict[str, Any]], 
-                            validation_split: float = 0.2) -> Dict[str, Any]:
+                            validation_split: float = 0.2,
+                            context: Any = None) -> Dict[str, Any]:
         """
         Train ensemble models on historical data
         
         Args:
             training_data: Historical market data
             validation_split: Fraction of data for validation
+            context: Optional minhos.core.training.TrainingContext; reports progress per base model,
+                checkpoints fitted models, resumes from its checkpoint and stops when the budget is spent
             
         Returns:
             Training results and metrics
         """
-        if not self.is_enabled:
+        if not HAS_ENSEMBLE_LIBS:
             return {
                 'success': False,
                 'message': 'Ensemble libraries not available'
@@ -402,7 +403,12 @@ class EnsembleManager:
                     'message': f'Feature-target mismatch: {len(X)} features, {len(y)} targets'
                 }
             
+            # Fresh models when serving from the kernel only
+            if not self.base_models:
+                self._initialize_models()
+            
             # Scale features
+            self.scaler = StandardScaler()
             X_scaled = self.scaler.fit_transform(X)
             
             # Split data
@@ -416,11 +422,28 @@ class EnsembleManager:
             base_predictions_train = {}
             base_predictions_val = {}
             
-            for name, model in self.base_models.items():
-                self.logger.info(f"Training {name}...")
-                
-                # Train model
-                model.fit(X_train, y_train)
+            # Base models fitted by an interrupted run of this training job
+            fitted = (context.load_checkpoint() or {}).get('fitted', {}) if context is not None else {}
+            
+            for step, (name, model) in enumerate(list(self.base_models.items()), 1):
+                if name in fitted:
+                    self.logger.info(f"Resuming with checkpointed {name}")
+                    model = self.base_models[name] = fitted[name]
+                elif context is not None and context.should_stop():
+                    self.logger.warning(f"🌲 Ensemble training budget spent before {name}; checkpoint saved")
+                    return {
+                        'success': False,
+                        'resumable': True,
+                        'message': f'Training time budget reached after {len(fitted)} of {len(self.base_models)} models'
+                    }
+                else:
+                    self.logger.info(f"Training {name}...")
+                    
+                    # Train model
+                    model.fit(X_train, y_train)
+                    if context is not None:
+                        fitted[name] = model
+                        context.save_checkpoint({'fitted': fitted})
                 
                 # Get predictions
                 train_pred = model.predict(X_train)
@@ -438,6 +461,8 @@ class EnsembleManager:
                 }
                 
                 self.logger.info(f"{name} validation accuracy: {val_accuracy:.1%}")
+                if context is not None:
+                    context.progress(step, len(self.base_models), model=name, direction_accuracy=val_accuracy)
             
             # Train meta-learner for stacking
             if self.config['stacking_enabled'] and self.meta_learner is not None:
@@ -582,83 +607,9 @@ class EnsembleManager:
             }
         
         try:
-            # Engineer features
-            features_df = self.engineer_features(market_data)
-            if features_df is None or len(features_df) == 0:
-                return {
-                    'direction': 0,
-                    'confidence': 0.0,
-                    'ensemble_prediction': 0.0,
-                    'model_agreement': 0.0,
-                    'base_predictions': {},
-                    'source': 'ensemble_insufficient_data',
-                    'message': 'Insufficient data for feature engineering'
-                }
-            
-            # Use latest features
-            latest_features = features_df.iloc[-1].values.reshape(1, -1)
-            features_scaled = self.scaler.transform(latest_features)
-            
-            # Get predictions from base models
-            base_predictions = {}
-            for name, model in self.base_models.items():
-                pred = model.predict(features_scaled)[0]
-                base_predictions[name] = float(pred)
-            
-            # Calculate ensemble prediction
-            if self.config['stacking_enabled'] and self.meta_learner is not None:
-                # Use meta-learner
-                meta_features = np.array(list(base_predictions.values())).reshape(1, -1)
-                ensemble_pred = self.meta_learner.predict(meta_features)[0]
-                ensemble_method = 'stacking'
-            else:
-                # Weighted average
-                ensemble_pred = sum(
-                    pred * self.model_weights.get(name, 1.0 / len(base_predictions))
-                    for name, pred in base_predictions.items()
-                )
-                ensemble_method = 'weighted_average'
-            
-            # Calculate model agreement
-            agreement = self._calculate_model_agreement(list(base_predictions.values()))
-            
-            # Calculate confidence
-            confidence = min(abs(ensemble_pred) * agreement, 1.0)
-            
-            # Determine direction
-            if ensemble_pred > 0.05:
-                direction = 1  # UP
-            elif ensemble_pred < -0.05:
-                direction = -1  # DOWN
-            else:
-                direction = 0  # NEUTRAL
-            
-            # Apply confidence threshold
-            if confidence < self.config['confidence_threshold']:
-                direction = 0
-            
-            # Track predictions
-            self.predictions_made += 1
-            
-            result = {
-                'direction': direction,
-                'confidence': float(confidence),
-                'ensemble_prediction': float(ensemble_pred),
-                'model_agreement': float(agreement),
-                'base_predictions': base_predictions,
-                'ensemble_method': ensemble_method,
-                'predictions_made': self.predictions_made,
-                'source': 'ensemble_ml_models',
-                'message': 'Ensemble prediction successful'
-            }
-            
-            # Store prediction history
-            self.prediction_history.append({
-                'timestamp': datetime.now().isoformat(),
-                'prediction': result
-            })
-            
-            return result
+            if self.inference_executor is None:
+                return self._predict_sync(market_data)
+            return await self.inference_executor.run('ensemble', self._predict_sync, market_data)
             
         except Exception as e:
             self.logger.error(f"Ensemble prediction error: {e}")
@@ -672,6 +623,102 @@ class EnsembleManager:
                 'message': f'Prediction error: {str(e)}'
             }
     
+    def _predict_sync(self, market_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Feature engineering and model inference; blocking, safe to run off the event loop"""
+        # Engineer features
+        features_df = self.engineer_features(market_data)
+        if features_df is None or len(features_df) == 0:
+            return {
+                'direction': 0,
+                'confidence': 0.0,
+                'ensemble_prediction': 0.0,
+                'model_agreement': 0.0,
+                'base_predictions': {},
+                'source': 'ensemble_insufficient_data',
+                'message': 'Insufficient data for feature engineering'
+            }
+        
+        # Use latest features
+        latest_features = features_df.iloc[-1].values.reshape(1, -1)
+        with self.recent_features_lock:
+            self.recent_features.append(latest_features[0])
+        meta_pred = None
+        kernel = self.kernel  # One reference per call: a hot swap never splits a prediction
+        
+        if kernel is not None:
+            # All trees of all base models in one vectorized pass
+            base = kernel.predict_base(latest_features)
+            base_predictions = {name: float(pred) for name, pred in zip(kernel.model_names, base[0])}
+            if self.config['stacking_enabled']:
+                meta = kernel.predict_meta(base)
+                meta_pred = None if meta is None else meta[0]
+        else:
+            features_scaled = self.scaler.transform(latest_features)
+            
+            # Get predictions from base models
+            base_predictions = {}
+            for name, model in self.base_models.items():
+                pred = model.predict(features_scaled)[0]
+                base_predictions[name] = float(pred)
+            
+            if self.config['stacking_enabled'] and self.meta_learner is not None:
+                meta_features = np.array(list(base_predictions.values())).reshape(1, -1)
+                meta_pred = self.meta_learner.predict(meta_features)[0]
+        
+        # Calculate ensemble prediction
+        if meta_pred is not None:
+            # Use meta-learner
+            ensemble_pred = meta_pred
+            ensemble_method = 'stacking'
+        else:
+            # Weighted average
+            ensemble_pred = sum(
+                pred * self.model_weights.get(name, 1.0 / len(base_predictions))
+                for name, pred in base_predictions.items()
+            )
+            ensemble_method = 'weighted_average'
+        
+        # Calculate model agreement
+        agreement = self._calculate_model_agreement(list(base_predictions.values()))
+        
+        # Calculate confidence
+        confidence = min(abs(ensemble_pred) * agreement, 1.0)
+        
+        # Determine direction
+        if ensemble_pred > 0.05:
+            direction = 1  # UP
+        elif ensemble_pred < -0.05:
+            direction = -1  # DOWN
+        else:
+            direction = 0  # NEUTRAL
+        
+        # Apply confidence threshold
+        if confidence < self.config['confidence_threshold']:
+            direction = 0
+        
+        # Track predictions
+        self.predictions_made += 1
+        
+        result = {
+            'direction': direction,
+            'confidence': float(confidence),
+            'ensemble_prediction': float(ensemble_pred),
+            'model_agreement': float(agreement),
+            'base_predictions': base_predictions,
+            'ensemble_method': ensemble_method,
+            'predictions_made': self.predictions_made,
+            'source': 'ensemble_ml_models',
+            'message': 'Ensemble prediction successful'
+        }
+        
+        # Store prediction history
+        self.prediction_history.append({
+            'timestamp': datetime.now().isoformat(),
+            'prediction': result
+        })
+        
+        return result
+    
     def _calculate_model_agreement(self, predictions: List[float]) -> float:
         """Calculate agreement between model predictions"""
         if len(predictions) < 2:
@@ -727,6 +774,9 @@ class EnsembleManager:
             with open(metadata_file, 'w') as f:
                 json.dump(metadata, f, indent=2)
             
+            # Compiled trees used for live inference
+            self.export_kernel()
+            
             self.logger.info(f"Ensemble models saved to {model_dir}")
             
         except Exception as e:
@@ -738,7 +788,9 @@ class EnsembleManager:
             'is_enabled': self.is_enabled,
             'is_trained': self.is_trained,
             'predictions_made': self.predictions_made,
-            'base_models': list(self.base_models.keys()),
+            'base_models': list(self.base_models.keys()) or list(self.kernel.model_names if self.kernel else []),
+            'inference_backend': 'numpy' if self.kernel is not None else 'libraries',
+            'model_version': self.model_version,
             'model_weights': self.model_weights,
             'model_performance': self.model_performance,
             'feature_count': len(self.feature_names),
@@ -755,4 +807,38 @@ class EnsembleManager:
         for key, value in kwargs.items():
             if key in self.config:
                 self.config[key] = value
-                self.logger.info(f"Updated ensemble config: {key} = {value}")
\ No newline at end of file
+                self.logger.info(f"Updated ensemble config: {key} = {value}")
+
+
+def run_training_job(context: Any) -> Dict[str, Any]:
+    """
+    Training-process entry point (minhos.core.training): retrain on
+    ``data`` from the job config, or on the symbol's history, and write the
+    tree kernel arrays to context.output_dir for the model registry.
+    """
+    from minhos.core.model_registry import save_arrays
+    
+    config = context.config
+    manager = EnsembleManager(model_path=str(context.work_dir / "ensemble"))
+    data = config.get('data')
+    if data is None:
+        from capabilities.prediction.lstm.trainer import LSTMTrainer
+        data = asyncio.run(LSTMTrainer().load_training_data(config.get('symbol', 'NQ'), config.get('days_back', 30)))
+    
+    result = asyncio.run(manager.train_ensemble(data, validation_split=config.get('validation_split', 0.2),
+                                                context=context))
+    if not result.get('success'):
+        return result
+    if manager.kernel is None:
+        return {'success': False, 'message': 'Trained models could not be compiled to the tree kernel'}
+    
+    save_arrays(context.output_dir, *manager.kernel.to_arrays())
+    performance = manager.model_performance
+    best = performance.get('meta_learner') or max(performance.values(), key=lambda p: p['direction_accuracy'])
+    result['model_path'] = str(context.output_dir)
+    result['validation_metrics'] = {
+        'accuracy': float(best['direction_accuracy']),
+        'validation_loss': float(best['mse']),
+        'training_samples': result['training_samples']
+    }
+    return result
@@ -0,0 +1,383 @@
+"""
+NumPy Tree Ensemble Kernel
+
+Flat-array evaluator for the ensemble's trained tree models, so serving
+needs neither XGBoost, LightGBM, scikit-learn nor CatBoost and pays no
+per-library call overhead.
+
+compile_ensemble() converts each trained base model into node arrays
+(feature index, threshold, left/right child, leaf value, missing-value
+direction), folds in the StandardScaler and a linear meta-learner, and
+returns a TreeEnsembleKernel. The kernel scores every tree of every model
+for one or many rows in one vectorized traversal: all rows and trees step
+down one level per iteration, so the Python loop runs max-depth times.
+
+Every split is normalized to "go left if x <= threshold". XGBoost's
+strict "<" becomes "<=" on the next float32 below the split, and the
+models that compare float32 inputs (XGBoost, scikit-learn, CatBoost) are
+fed float32-rounded features, so routing matches the libraries exactly;
+leaf sums differ only by float rounding.
+"""
+
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+FORMAT_VERSION = 2
+
+NODE_ARRAYS = ('feature', 'threshold', 'left', 'right', 'value', 'default_left')
+
+# Combined arrays of a TreeEnsembleKernel, as stored
+KERNEL_ARRAYS = NODE_ARRAYS + ('roots', 'tree_input', 'tree_weights', 'bias')
+
+
+@dataclass
+class TreeArrays:
+    """All trees of one model as flat node arrays; leaves point to themselves"""
+    feature: np.ndarray       # int32, split feature (0 for leaves)
+    threshold: np.ndarray     # float64, go left if x <= threshold
+    left: np.ndarray          # int32
+    right: np.ndarray         # int32
+    value: np.ndarray         # float64, leaf value (0 for splits)
+    default_left: np.ndarray  # bool, direction for NaN inputs
+    roots: np.ndarray         # int32, root node of each tree
+    depth: int
+    scale: float = 1.0        # prediction = scale * sum(leaves) + bias
+    bias: float = 0.0
+    float32_inputs: bool = False
+
+    @classmethod
+    def from_trees(cls, trees: Sequence[Dict[str, np.ndarray]], **params) -> "TreeArrays":
+        """Concatenate per-tree arrays with local child indices (-1 marks a leaf)"""
+        offsets = np.cumsum([0] + [len(tree['feature']) for tree in trees])
+        merged = {}
+        for name in NODE_ARRAYS:
+            merged[name] = np.concatenate([np.asarray(tree[name]) for tree in trees])
+        for name in ('left', 'right'):
+            children = []
+            for offset, tree in zip(offsets, trees):
+                local = np.asarray(tree[name], dtype=np.int64)
+                own = np.arange(len(local))
+                children.append(np.where(local < 0, own, local) + offset)
+            merged[name] = np.concatenate(children)
+
+        leaf = merged['left'] == np.arange(len(merged['left']))
+        return cls(
+            feature=np.where(leaf, 0, merged['feature']).astype(np.int32),
+            threshold=np.where(leaf, 0.0, merged['threshold']).astype(np.float64),
+            left=merged['left'].astype(np.int32),
+            right=merged['right'].astype(np.int32),
+            value=np.where(leaf, merged['value'], 0.0).astype(np.float64),
+            default_left=merged['default_left'].astype(bool),
+            roots=offsets[:-1].astype(np.int32),
+            depth=max(_depth(tree) for tree in trees),
+            **params
+        )
+
+
+def _depth(tree: Dict[str, np.ndarray]) -> int:
+    left, right = np.asarray(tree['left'], dtype=np.int64), np.asarray(tree['right'], dtype=np.int64)
+    depth, level = 0, [0]
+    while True:
+        level = [child for node in level for child in (left[node], right[node]) if left[node] >= 0]
+        if not level:
+            return depth
+        depth += 1
+
+
+def _float32_below(values: np.ndarray) -> np.ndarray:
+    """Largest float32 below each value: x < t  <=>  x <= _float32_below(t) for float32 x"""
+    values = np.asarray(values, dtype=np.float32)
+    return np.nextafter(values, np.float32(-np.inf)).astype(np.float64)
+
+
+# Library formats
+
+def _from_xgboost(model: Any) -> TreeArrays:
+    """XGBRegressor/Booster via its JSON model: array-based trees, leaf values in split_conditions"""
+    booster = model.get_booster() if hasattr(model, 'get_booster') else model
+    learner = json.loads(bytes(booster.save_raw('json')))['learner']
+    objective = learner['objective']['name']
+    if not objective.startswith('reg:') or objective in ('reg:logistic', 'reg:gamma', 'reg:tweedie'):
+        raise ValueError(f"Unsupported XGBoost objective for tree kernel: {objective}")
+    booster_model = learner['gradient_booster']
+    if booster_model.get('name', 'gbtree') != 'gbtree':
+        raise ValueError(f"Unsupported XGBoost booster for tree kernel: {booster_model.get('name')}")
+
+    trees = []
+    for tree in booster_model['model']['trees']:
+        left = np.asarray(tree['left_children'])
+        conditions = np.asarray(tree['split_conditions'], dtype=np.float64)
+        trees.append({
+            'feature': np.asarray(tree['split_indices']),
+            'threshold': _float32_below(conditions),
+            'left': left,
+            'right': np.asarray(tree['right_children']),
+            'value': conditions,  # Leaves keep their value in split_conditions
+            'default_left': np.asarray(tree['default_left'], dtype=bool)
+        })
+    base_score = float(str(learner['learner_model_param']['base_score']).strip('[]'))
+    return TreeArrays.from_trees(trees, bias=base_score, float32_inputs=True)
+
+
+def _from_lightgbm(model: Any) -> TreeArrays:
+    """LGBMRegressor/Booster via dump_model(): nested nodes with '<=' splits"""
+    booster = model.booster_ if hasattr(model, 'booster_') else model
+    dump = booster.dump_model()
+    objective = str(dump.get('objective', 'regression')).split()[0]
+    if not objective.startswith(('regression', 'huber', 'fair', 'quantile', 'mape')):
+        raise ValueError(f"Unsupported LightGBM objective for tree kernel: {objective}")
+
+    trees = []
+    for info in dump['tree_info']:
+        nodes: Dict[str, List] = {name: [] for name in NODE_ARRAYS}
+
+        def add(node: Dict[str, Any]) -> int:
+            index = len(nodes['feature'])
+            for name in NODE_ARRAYS:
+                nodes[name].append(0)
+            if 'split_index' not in node:
+                nodes['left'][index] = nodes['right'][index] = -1
+                nodes['value'][index] = node['leaf_value']
+                return index
+            if node.get('decision_type', '<=') != '<=':
+                raise ValueError(f"Unsupported LightGBM split for tree kernel: {node['decision_type']}")
+            threshold = float(node['threshold'])
+            missing = node.get('missing_type', 'None')
+            if missing == 'Zero':
+                raise ValueError("Unsupported LightGBM missing_type for tree kernel: Zero")
+            nodes['feature'][index] = node['split_feature']
+            nodes['threshold'][index] = threshold
+            # missing_type None: NaN is treated as 0.0
+            nodes['default_left'][index] = bool(node.get('default_left', True)) if missing == 'NaN' else 0.0 <= threshold
+            nodes['left'][index] = add(node['left_child'])
+            nodes['right'][index] = add(node['right_child'])
+            return index
+
+        add(info['tree_structure'])
+        trees.append({name: np.asarray(values) for name, values in nodes.items()})
+
+    scale = 1.0 / len(trees) if dump.get('average_output') else 1.0
+    return TreeArrays.from_trees(trees, scale=scale)
+
+
+def _from_random_forest(model: Any) -> TreeArrays:
+    """scikit-learn forest: each estimator's tree_ already is flat arrays"""
+    trees = []
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        if tree.value.shape[1] != 1:
+            raise ValueError("Unsupported multi-output forest for tree kernel")
+        missing_left = getattr(tree, 'missing_go_to_left', None)
+        trees.append({
+            'feature': tree.feature,
+            'threshold': tree.threshold,
+            'left': tree.children_left,
+            'right': tree.children_right,
+            'value': tree.value[:, 0, 0],
+            'default_left': np.zeros(tree.node_count, dtype=bool) if missing_left is None else missing_left
+        })
+    return TreeArrays.from_trees(trees, scale=1.0 / len(trees), float32_inputs=True)
+
+
+def _from_catboost(model: Any) -> TreeArrays:
+    """CatBoostRegressor via its JSON export: oblivious trees expanded to full binary trees"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'model.json')
+        model.save_model(path, format='json')
+        with open(path) as f:
+            data = json.load(f)
+
+    float_features = data['features_info'].get('float_features', [])
+    trees = []
+    for tree in data['oblivious_trees']:
+        splits = tree.get('splits') or []
+        depth = len(splits)
+        leaf_values = np.asarray(tree['leaf_values'], dtype=np.float64)
+        if len(leaf_values) != 2 ** depth:
+            raise ValueError("Unsupported multi-dimensional CatBoost leaves for tree kernel")
+
+        # Level d holds 2**d nodes in breadth-first order; split d sets bit d of the leaf index
+        splits_count = 2 ** depth - 1
+        nodes = {name: np.zeros(splits_count + 2 ** depth) for name in NODE_ARRAYS}
+        for d, split in enumerate(splits):
+            if split.get('split_type', 'FloatFeature') != 'FloatFeature':
+                raise ValueError(f"Unsupported CatBoost split for tree kernel: {split['split_type']}")
+            info = float_features[split['float_feature_index']]
+            for k in range(2 ** d):
+                index = 2 ** d - 1 + k
+                nodes['feature'][index] = info.get('flat_feature_index', info.get('feature_index'))
+                nodes['threshold'][index] = np.float32(split['border'])  # Right when x > border
+                nodes['default_left'][index] = info.get('nan_value_treatment', 'AsIs') != 'AsTrue'
+                nodes['left'][index] = 2 ** (d + 1) - 1 + k
+                nodes['right'][index] = 2 ** (d + 1) - 1 + k + 2 ** d
+        nodes['left'][splits_count:] = nodes['right'][splits_count:] = -1
+        nodes['value'][splits_count:] = leaf_values
+        trees.append(nodes)
+
+    scale, bias = data.get('scale_and_bias', [1.0, [0.0]])
+    bias = bias[0] if isinstance(bias, (list, tuple)) else bias
+    return TreeArrays.from_trees(trees, scale=float(scale), bias=float(bias), float32_inputs=True)
+
+
+COMPILERS = {
+    'XGBRegressor': _from_xgboost,
+    'Booster': _from_xgboost,
+    'LGBMRegressor': _from_lightgbm,
+    'RandomForestRegressor': _from_random_forest,
+    'ExtraTreesRegressor': _from_random_forest,
+    'CatBoostRegressor': _from_catboost,
+}
+
+
+def compile_tree_model(model: Any) -> TreeArrays:
+    """Flat arrays for one trained model; raises ValueError for models the kernel cannot reproduce"""
+    kind = model.__class__.__name__
+    if kind == 'Booster' and hasattr(model, 'dump_model'):
+        return _from_lightgbm(model)
+    if kind not in COMPILERS:
+        raise ValueError(f"Unsupported model for tree kernel: {kind}")
+    return COMPILERS[kind](model)
+
+
+class TreeEnsembleKernel:
+    """
+    All base models of the ensemble in one set of node arrays:
+    - predict_base(): per-model predictions for (F,) or (rows, F) raw features
+    - predict_meta(): the linear meta-learner over base predictions
+
+    Build with from_models(); the constructor takes the combined arrays as
+    they are stored, so memory-mapped arrays are served without copying.
+    """
+
+    def __init__(self, model_names: Sequence[str], arrays: Dict[str, np.ndarray], depth: int,
+                 meta_intercept: Optional[float] = None):
+        self.model_names = tuple(model_names)
+        self.depth = int(depth)
+        for name in KERNEL_ARRAYS:
+            setattr(self, name, arrays[name])
+        self.mean = arrays.get('mean')
+        self.scale = arrays.get('scale')
+        self.meta = None if meta_intercept is None else (arrays['meta_coef'], float(meta_intercept))
+
+    @classmethod
+    def from_models(cls, models: Dict[str, TreeArrays], mean: Optional[np.ndarray] = None,
+                    scale: Optional[np.ndarray] = None,
+                    meta: Optional[Tuple[np.ndarray, float]] = None) -> "TreeEnsembleKernel":
+        # One node space across models, children and roots offset per model
+        models = list(models.items())
+        parts = [a for _, a in models]
+        offsets = np.cumsum([0] + [len(a.feature) for a in parts])
+        arrays = {
+            'feature': np.concatenate([a.feature for a in parts]).astype(np.intp),
+            'threshold': np.concatenate([a.threshold for a in parts]),
+            'left': np.concatenate([a.left + offset for a, offset in zip(parts, offsets)]).astype(np.intp),
+            'right': np.concatenate([a.right + offset for a, offset in zip(parts, offsets)]).astype(np.intp),
+            'value': np.concatenate([a.value for a in parts]),
+            'default_left': np.concatenate([a.default_left for a in parts]),
+            'roots': np.concatenate([a.roots + offset for a, offset in zip(parts, offsets)]).astype(np.intp),
+            # Which input (float64 or float32-rounded) each tree compares, and its weight per model
+            'tree_input': np.concatenate([np.full(len(a.roots), int(a.float32_inputs)) for a in parts]),
+            'tree_weights': np.zeros((sum(len(a.roots) for a in parts), len(parts))),
+            'bias': np.array([a.bias for a in parts], dtype=np.float64)
+        }
+        start = 0
+        for m, a in enumerate(parts):
+            arrays['tree_weights'][start:start + len(a.roots), m] = a.scale
+            start += len(a.roots)
+        for name, value in (('mean', mean), ('scale', scale), ('meta_coef', None if meta is None else meta[0])):
+            if value is not None:
+                arrays[name] = np.asarray(value, dtype=np.float64)
+
+        return cls([name for name, _ in models], arrays,
+                   depth=max((a.depth for a in parts), default=0),
+                   meta_intercept=None if meta is None else float(meta[1]))
+
+    def transform(self, features: np.ndarray) -> np.ndarray:
+        """StandardScaler.transform equivalent"""
+        x = np.array(features, dtype=np.float64, ndmin=2)
+        if self.mean is not None:
+            x = x - self.mean
+        if self.scale is not None:
+            x = x / self.scale
+        return x
+
+    def predict_base(self, features: np.ndarray, scaled: bool = False) -> np.ndarray:
+        """Predictions of shape (rows, models) in model_names order"""
+        x = np.array(features, dtype=np.float64, ndmin=2) if scaled else self.transform(features)
+        inputs = np.stack((x, x.astype(np.float32).astype(np.float64)))
+        rows = np.arange(len(x))[:, None]
+        kind = self.tree_input[None, :]
+
+        node = np.broadcast_to(self.roots, (len(x), len(self.roots)))
+        for _ in range(self.depth):
+            value = inputs[kind, rows, self.feature[node]]
+            go_left = (value <= self.threshold[node]) | (np.isnan(value) & self.default_left[node])
+            node = np.where(go_left, self.left[node], self.right[node])
+
+        return self.value[node] @ self.tree_weights + self.bias
+
+    def predict_meta(self, base: np.ndarray) -> Optional[np.ndarray]:
+        """Stacked prediction per row, or None without a meta-learner"""
+        if self.meta is None:
+            return None
+        coef, intercept = self.meta
+        return np.asarray(base, dtype=np.float64) @ coef + intercept
+
+    def to_arrays(self) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        """JSON spec and the combined arrays"""
+        spec = {
+            'format_version': FORMAT_VERSION,
+            'model_names': list(self.model_names),
+            'depth': self.depth,
+            'meta_intercept': None if self.meta is None else self.meta[1]
+        }
+        arrays = {name: getattr(self, name) for name in KERNEL_ARRAYS}
+        for name, value in (('mean', self.mean), ('scale', self.scale),
+                            ('meta_coef', None if self.meta is None else self.meta[0])):
+            if value is not None:
+                arrays[name] = value
+        return spec, arrays
+
+    @classmethod
+    def from_arrays(cls, spec: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> "TreeEnsembleKernel":
+        if spec.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported tree kernel format: {spec.get('format_version')}")
+        return cls(spec['model_names'], arrays, depth=spec['depth'], meta_intercept=spec['meta_intercept'])
+
+    def save(self, path: str) -> str:
+        spec, arrays = self.to_arrays()
+        with open(path, 'wb') as f:
+            np.savez(f, spec=np.array(json.dumps(spec)), **arrays)
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> "TreeEnsembleKernel":
+        with np.load(path, allow_pickle=False) as archive:
+            spec = json.loads(str(archive['spec']))
+            arrays = {name: archive[name] for name in archive.files if name != 'spec'}
+        return cls.from_arrays(spec, arrays)
+
+
+def compile_ensemble(base_models: Dict[str, Any], scaler: Any = None,
+                     meta_learner: Any = None) -> TreeEnsembleKernel:
+    """
+    Compile trained base models, a fitted StandardScaler and a linear
+    meta-learner. Raises ValueError if any part cannot be reproduced.
+    """
+    models = {name: compile_tree_model(model) for name, model in base_models.items()}
+
+    meta = None
+    if meta_learner is not None:
+        if not hasattr(meta_learner, 'coef_'):
+            raise ValueError(f"Unsupported meta-learner for tree kernel: {meta_learner.__class__.__name__}")
+        meta = (np.ravel(meta_learner.coef_), float(np.ravel(meta_learner.intercept_)[0]))
+
+    mean = getattr(scaler, 'mean_', None) if scaler is not None else None
+    scale = getattr(scaler, 'scale_', None) if scaler is not None else None
+    return TreeEnsembleKernel.from_models(models, mean=mean, scale=scale, meta=meta)
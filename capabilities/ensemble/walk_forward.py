@@ -0,0 +1,274 @@
+"""
+Walk-Forward Hyperparameter Search
+
+Out-of-sample model selection for the ensemble's base models.
+
+The history is split into walk-forward windows: train on one span, test on
+the span right after it, then roll forward. Every (window x model x params)
+job is fanned out over a process pool and scored on its test span; metrics
+are averaged across windows and the best parameters per model are emitted.
+
+Features are engineered once for the whole history (the definitions only
+look back) and scaled once per window, with the scaler fitted on that
+window's training rows. Each window's arrays are written to a cache
+directory once and memory-mapped by the workers, so a job only ships its
+coordinates.
+
+Workers are spawned with BLAS/OpenMP pools capped at ``threads_per_job``
+in their start-up environment (a spawned worker imports numpy before any
+initializer runs), the models' own thread counts match, and the pool size
+defaults to cores // threads_per_job, so the jobs never oversubscribe the
+CPU. Parameter sampling and model seeds derive from one seed and results
+are aggregated in job order, so a run is reproducible.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from minhos.core.feature_store import ENSEMBLE_FEATURES, FeatureStore
+from minhos.core.training import thread_limit_env
+from .ensemble_manager import HYPERPARAMETERS_FILE, build_base_model
+
+logger = logging.getLogger(__name__)
+
+BASE_MODELS = ('xgboost', 'lightgbm', 'random_forest', 'catboost')
+
+# Tree depth, learning rate and estimator count, shared by all base models
+DEFAULT_SEARCH_SPACE = {
+    'max_depth': [3, 4, 6, 8],
+    'learning_rate': [0.03, 0.05, 0.1, 0.2],
+    'n_estimators': [100, 200, 400]
+}
+
+# Parameters a model does not use; dropping them removes duplicate jobs
+UNUSED_PARAMS = {'random_forest': ('learning_rate',)}
+
+Window = Tuple[int, int, int, int]  # train_start, train_end (= test_start), test_start, test_end
+
+
+def walk_forward_windows(rows: int, train_size: int, test_size: int, step: Optional[int] = None,
+                         expanding: bool = False) -> List[Window]:
+    """Rolling (or expanding) train spans, each followed by its test span"""
+    step = step or test_size
+    windows = []
+    train_end = train_size
+    while train_end + test_size <= rows:
+        train_start = 0 if expanding else train_end - train_size
+        windows.append((train_start, train_end, train_end, train_end + test_size))
+        train_end += step
+    return windows
+
+
+def parameter_candidates(space: Dict[str, Sequence[Any]], n_samples: Optional[int] = None,
+                         seed: int = 42) -> List[Dict[str, Any]]:
+    """The full grid, or ``n_samples`` of it drawn without replacement, in grid order"""
+    keys = sorted(space)
+    grid = [dict(zip(keys, values)) for values in itertools.product(*(space[key] for key in keys))]
+    if n_samples is None or n_samples >= len(grid):
+        return grid
+    chosen = np.random.default_rng(seed).choice(len(grid), size=n_samples, replace=False)
+    return [grid[i] for i in sorted(chosen)]
+
+
+def params_key(params: Dict[str, Any]) -> str:
+    return json.dumps(params, sort_keys=True)
+
+
+def direction_accuracy(predictions: np.ndarray, targets: np.ndarray) -> float:
+    return float(np.mean(np.sign(predictions) == np.sign(targets)))
+
+
+# Window arrays already mapped in this worker process
+_window_cache: Dict[Tuple[str, int], Dict[str, np.ndarray]] = {}
+
+
+def _load_window(cache_dir: str, window: int) -> Dict[str, np.ndarray]:
+    key = (cache_dir, window)
+    if key not in _window_cache:
+        directory = Path(cache_dir) / f"window_{window:03d}"
+        _window_cache[key] = {name: np.load(directory / f"{name}.npy", mmap_mode='r')
+                              for name in ('X_train', 'y_train', 'X_test', 'y_test')}
+    return _window_cache[key]
+
+
+def _fit_and_score(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Train one model on one window and score it out of sample"""
+    data = _load_window(job['cache_dir'], job['window'])
+    started = time.perf_counter()
+    model = job['builder'](job['model'], job['params'], job['threads'], job['seed'])
+    model.fit(data['X_train'], data['y_train'])
+    predictions = np.asarray(model.predict(data['X_test']), dtype=np.float64)
+    errors = predictions - data['y_test']
+    return {
+        'window': job['window'],
+        'model': job['model'],
+        'params': job['params'],
+        'direction_accuracy': direction_accuracy(predictions, data['y_test']),
+        'mse': float(np.mean(errors ** 2)),
+        'mae': float(np.mean(np.abs(errors))),
+        'fit_seconds': time.perf_counter() - started
+    }
+
+
+class WalkForwardSearch:
+    """
+    Walk-forward search over the base models' hyperparameters:
+    - prepare(): features once, scaled arrays cached once per window
+    - run(): all (window x model x params) jobs on a process pool
+    - save(): best config where EnsembleManager picks it up
+    """
+
+    def __init__(self, model_names: Sequence[str] = BASE_MODELS,
+                 search_space: Optional[Dict[str, Sequence[Any]]] = None, n_samples: Optional[int] = None,
+                 train_size: int = 3000, test_size: int = 500, step: Optional[int] = None,
+                 expanding: bool = False, workers: Optional[int] = None, threads_per_job: int = 1,
+                 seed: int = 42, builder: Callable[..., Any] = build_base_model,
+                 cache_dir: Optional[str] = None):
+        self.model_names = tuple(model_names)
+        self.search_space = dict(search_space or DEFAULT_SEARCH_SPACE)
+        self.n_samples = n_samples
+        self.train_size = train_size
+        self.test_size = test_size
+        self.step = step
+        self.expanding = expanding
+        self.threads_per_job = max(1, threads_per_job)
+        # workers=0 runs the jobs inline, in this process
+        self.workers = max(1, (os.cpu_count() or 1) // self.threads_per_job) if workers is None else workers
+        self.seed = seed
+        self.builder = builder  # Module-level, so pool workers can import it
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.windows: List[Window] = []
+
+    def candidates(self, model: str) -> List[Dict[str, Any]]:
+        """Parameter sets for one model; sampling is seeded per model"""
+        unused = UNUSED_PARAMS.get(model, ())
+        space = {key: values for key, values in self.search_space.items() if key not in unused}
+        return parameter_candidates(space, self.n_samples, seed=self.seed + BASE_MODELS.index(model)
+                                    if model in BASE_MODELS else self.seed)
+
+    def prepare(self, market_data: List[Dict[str, Any]]) -> List[Window]:
+        """Engineer features for the whole history, then cache scaled arrays per window"""
+        frame = FeatureStore().compute(market_data)
+        features = frame.select(ENSEMBLE_FEATURES.values())
+
+        # Target: next bar's return, squashed as in EnsembleManager.train_ensemble
+        prices = frame.prices
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change = np.where(prices[:-1] > 0, (prices[1:] - prices[:-1]) / prices[:-1], 0.0)
+        X, y = features[:-1], np.tanh(change * 100)
+
+        self.windows = walk_forward_windows(len(X), self.train_size, self.test_size, self.step, self.expanding)
+        if not self.windows:
+            raise ValueError(f"{len(X)} rows are too few for a {self.train_size}+{self.test_size} window")
+
+        if self.cache_dir is None:
+            self.cache_dir = Path(tempfile.mkdtemp(prefix="walk_forward_"))
+        for i, (train_start, train_end, test_start, test_end) in enumerate(self.windows):
+            train = X[train_start:train_end]
+            mean, scale = train.mean(axis=0), train.std(axis=0)
+            scale[scale == 0] = 1.0  # StandardScaler's handling of constant features
+            arrays = {
+                'X_train': (train - mean) / scale,
+                'y_train': y[train_start:train_end],
+                'X_test': (X[test_start:test_end] - mean) / scale,
+                'y_test': y[test_start:test_end]
+            }
+            directory = self.cache_dir / f"window_{i:03d}"
+            directory.mkdir(parents=True, exist_ok=True)
+            for name, array in arrays.items():
+                np.save(directory / f"{name}.npy", np.ascontiguousarray(array, dtype=np.float64))
+
+        logger.info(f"🪟 {len(self.windows)} walk-forward windows cached in {self.cache_dir}")
+        return self.windows
+
+    def jobs(self) -> List[Dict[str, Any]]:
+        return [
+            {'cache_dir': str(self.cache_dir), 'window': window, 'model': model, 'params': params,
+             'threads': self.threads_per_job, 'seed': self.seed, 'builder': self.builder}
+            for model in self.model_names
+            for params in self.candidates(model)
+            for window in range(len(self.windows))
+        ]
+
+    async def run(self, market_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Search and return the best parameters per model with their out-of-sample metrics"""
+        started = time.perf_counter()
+        self.prepare(market_data)
+        jobs = self.jobs()
+        logger.info(f"🔍 Walk-forward search: {len(jobs)} jobs on {self.workers or 'no'} workers "
+                    f"x {self.threads_per_job} threads")
+
+        if self.workers == 0:
+            results = [_fit_and_score(job) for job in jobs]
+        else:
+            pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+            try:
+                loop = asyncio.get_running_loop()
+                # Workers are spawned as jobs are submitted
+                with thread_limit_env(self.threads_per_job):
+                    futures = [loop.run_in_executor(pool, _fit_and_score, job) for job in jobs]
+                results = await asyncio.gather(*futures)
+            finally:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+        summary = self.aggregate(results)
+        summary.update(jobs=len(jobs), seed=self.seed, elapsed_s=round(time.perf_counter() - started, 2))
+        logger.info(f"✅ Walk-forward search done in {summary['elapsed_s']}s: {summary['best']}")
+        return summary
+
+    def aggregate(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Mean out-of-sample metrics per (model, params); best by accuracy, then lower MSE"""
+        grouped: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        for result in results:
+            grouped.setdefault(result['model'], {}).setdefault(params_key(result['params']), []).append(result)
+
+        leaderboard, best, best_metrics = {}, {}, {}
+        for model, by_params in grouped.items():
+            rows = []
+            for key, runs in by_params.items():
+                accuracy = np.array([run['direction_accuracy'] for run in runs])
+                rows.append({
+                    'params': runs[0]['params'],
+                    'windows': len(runs),
+                    'direction_accuracy': float(accuracy.mean()),
+                    'accuracy_std': float(accuracy.std()),
+                    'mse': float(np.mean([run['mse'] for run in runs])),
+                    'mae': float(np.mean([run['mae'] for run in runs]))
+                })
+            # Stable sort: ties keep candidate order
+            rows.sort(key=lambda row: (-row['direction_accuracy'], row['mse']))
+            leaderboard[model] = rows
+            best[model] = rows[0]['params']
+            best_metrics[model] = {key: value for key, value in rows[0].items() if key != 'params'}
+
+        return {
+            'best': best,
+            'best_metrics': best_metrics,
+            'leaderboard': leaderboard,
+            'windows': [list(window) for window in self.windows]
+        }
+
+    def save(self, summary: Dict[str, Any], model_path: str) -> Path:
+        """Write the summary where EnsembleManager loads its per-model hyperparameters"""
+        path = Path(model_path) / HYPERPARAMETERS_FILE
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({key: value for key, value in summary.items() if key != 'leaderboard'}, f, indent=2)
+        return path
+
+    def cleanup(self):
+        """Remove the window cache"""
+        if self.cache_dir is not None:
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
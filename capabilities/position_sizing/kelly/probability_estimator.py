@@ -6,7 +6,6 @@ Includes isotonic regression calibration for better probability estimates.
 """
 
 import numpy as np
-import pandas as pd
 import logging
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
@@ -14,6 +13,8 @@ import json
 import pickle
 from pathlib import Path
 
+from minhos.core.feature_store import KELLY_MARKET_FEATURES, get_feature_store
+
 # ML imports with fallback
 try:
     import xgboost as xgb
@@ -58,7 +59,8 @@ class ProbabilityEstimator:
             'confidence_threshold': 0.55
         }
         
-        # Feature tracking
+        # Feature tracking (market features come from the shared feature store)
+        self.feature_store = get_feature_store()
         self.feature_names = []
         self.feature_importance = {}
         
@@ -111,34 +113,21 @@ class ProbabilityEstimator:
             return None
         
         try:
-            # Convert to DataFrame
-            df = pd.DataFrame(market_data)
-            
-            # Ensure required columns
-            if 'price' not in df.columns and 'close' in df.columns:
-                df['price'] = df['close']
-            if 'volume' not in df.columns:
-                df['volume'] = 1.0
-            
-            # Sort by timestamp
-            df = df.sort_values('timestamp').reset_index(drop=True)
+            # Latest bar's market features; earlier bars of the window come from the cache
+            frame = self.feature_store.features(market_data, symbol=market_data[-1].get('symbol'))
+            market = dict(zip(KELLY_MARKET_FEATURES, frame.select(KELLY_MARKET_FEATURES.values())[-1].tolist()))
+            returns = frame.column('return_1')[1:]  # The first bar has no return in this window
             
             features = []
             
-            # Market state features
-            current_price = df['price'].iloc[-1]
-            price_ma_5 = df['price'].rolling(5, min_periods=1).mean().iloc[-1]
-            price_ma_20 = df['price'].rolling(20, min_periods=1).mean().iloc[-1]
-            
             # Price position relative to moving averages
-            features.append((current_price - price_ma_5) / price_ma_5 if price_ma_5 > 0 else 0)
-            features.append((current_price - price_ma_20) / price_ma_20 if price_ma_20 > 0 else 0)
+            features.append(market['price_ma5_ratio'])
+            features.append(market['price_ma20_ratio'])
             
             # Volatility features
-            returns = df['price'].pct_change().dropna()
+            volatility_5d = market['volatility_5d']
             if len(returns) >= 5:
-                volatility_5d = returns.rolling(5, min_periods=1).std().iloc[-1]
-                volatility_20d = returns.rolling(20, min_periods=1).std().iloc[-1]
+                volatility_20d = market['volatility_20d']
                 features.append(volatility_5d)
                 features.append(volatility_20d if volatility_20d > 0 else volatility_5d)
                 features.append(volatility_5d / volatility_20d if volatility_20d > 0 else 1.0)
@@ -146,22 +135,11 @@ class ProbabilityEstimator:
                 features.extend([0.01, 0.01, 1.0])
             
             # Momentum features
-            if len(df) >= 5:
-                momentum_5 = (current_price - df['price'].iloc[-5]) / df['price'].iloc[-5]
-                features.append(momentum_5)
-            else:
-                features.append(0.0)
-            
-            if len(df) >= 10:
-                momentum_10 = (current_price - df['price'].iloc[-10]) / df['price'].iloc[-10]
-                features.append(momentum_10)
-            else:
-                features.append(0.0)
+            features.append(market['momentum_5'])
+            features.append(market['momentum_10'])
             
             # Volume features
-            volume_ma = df['volume'].rolling(10, min_periods=1).mean().iloc[-1]
-            current_volume = df['volume'].iloc[-1]
-            features.append(current_volume / volume_ma if volume_ma > 0 else 1.0)
+            features.append(market['volume_ratio'])
             
             # Signal strength features
             signal_confidence = trade_signal.get('confidence', 0.5)
@@ -170,20 +148,15 @@ class ProbabilityEstimator:
             features.append(float(signal_direction))
             
             # Technical indicator agreement
-            rsi = self._calculate_rsi(df['price'])
-            macd = self._calculate_macd(df['price'])
-            bb_position = self._calculate_bollinger_position(df['price'])
-            
-            features.extend([rsi, macd, bb_position])
+            features.extend([market['rsi'], market['macd'], market['bb_position']])
             
-            # Market timing features
-            current_hour = datetime.now().hour
-            features.append(current_hour / 24.0)
-            features.append(1.0 if 9 <= current_hour <= 16 else 0.0)  # Market hours
+            # Market timing features (bar time, as in training)
+            features.append(market['hour_normalized'])
+            features.append(market['is_market_hours'])
             
             # Trend consistency
             if len(returns) >= 5:
-                trend_consistency = np.mean(np.sign(returns.iloc[-5:]) == np.sign(signal_direction))
+                trend_consistency = np.mean(np.sign(returns[-5:]) == np.sign(signal_direction))
                 features.append(trend_consistency)
             else:
                 features.append(0.5)
@@ -210,41 +183,6 @@ class ProbabilityEstimator:
             self.logger.error(f"Feature engineering error: {e}")
             return None
     
-    def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> float:
-        """Calculate RSI indicator"""
-        try:
-            delta = prices.diff()
-            gain = delta.where(delta > 0, 0).rolling(window=period, min_periods=1).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=period, min_periods=1).mean()
-            rs = gain.iloc[-1] / (loss.iloc[-1] + 1e-6)
-            rsi = 100 - (100 / (1 + rs))
-            return rsi / 100.0  # Normalize to 0-1
-        except:
-            return 0.5
-    
-    def _calculate_macd(self, prices: pd.Series, fast: int = 12, slow: int = 26) -> float:
-        """Calculate MACD indicator"""
-        try:
-            ema_fast = prices.ewm(span=fast).mean()
-            ema_slow = prices.ewm(span=slow).mean()
-            macd = (ema_fast - ema_slow).iloc[-1]
-            return (macd / prices.iloc[-1]) if prices.iloc[-1] > 0 else 0.0
-        except:
-            return 0.0
-    
-    def _calculate_bollinger_position(self, prices: pd.Series, period: int = 20) -> float:
-        """Calculate position within Bollinger Bands"""
-        try:
-            ma = prices.rolling(window=period, min_periods=1).mean()
-            std = prices.rolling(window=period, min_periods=1).std()
-            upper = ma + (std * 2)
-            lower = ma - (std * 2)
-            current_price = prices.iloc[-1]
-            position = (current_price - lower.iloc[-1]) / (upper.iloc[-1] - lower.iloc[-1])
-            return max(0.0, min(1.0, position))
-        except:
-            return 0.5
-    
     async def train_probability_estimator(self, training_data: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Train probability estimator on historical trades
@@ -11,6 +11,8 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 import logging
 
+from minhos.core.feature_store import LSTM_FEATURES, get_feature_store
+
 class LSTMDataPipeline:
     """
     Data pipeline for LSTM neural network training and inference.
@@ -27,17 +29,11 @@ class LSTMDataPipeline:
         self.features = features
         self.logger = logging.getLogger(__name__)
         
+        # Shared feature store, so training sees the same features the predictor serves
+        self.feature_store = get_feature_store()
+        
         # Feature names for tracking
-        self.feature_names = [
-            'price_change',
-            'price_position',
-            'volume_ratio',
-            'volatility',
-            'gap',
-            'time_of_day',
-            'market_session',
-            'momentum'
-        ]
+        self.feature_names = list(LSTM_FEATURES)
     
     def create_features_from_market_data(self, market_data: List[Dict[str, Any]]) -> pd.DataFrame:
         """
@@ -53,71 +49,9 @@ class LSTMDataPipeline:
             return pd.DataFrame()
         
         try:
-            # Convert to DataFrame for easier processing
-            df = pd.DataFrame(market_data)
-            
-            # Ensure required columns exist
-            required_columns = ['price', 'volume', 'timestamp']
-            for col in required_columns:
-                if col not in df.columns:
-                    # Try alternative column names
-                    if col == 'price' and 'close' in df.columns:
-                        df['price'] = df['close']
-                    elif col == 'volume' and 'volume' not in df.columns:
-                        df['volume'] = 1.0  # Default volume
-                    elif col == 'timestamp' and 'timestamp' not in df.columns:
-                        df['timestamp'] = pd.to_datetime('now').timestamp()
-            
-            # Sort by timestamp
-            df = df.sort_values('timestamp').reset_index(drop=True)
-            
-            # Create features
-            features_df = pd.DataFrame()
-            
-            # 1. Price change (returns)
-            features_df['price_change'] = df['price'].pct_change().fillna(0)
-            
-            # 2. Price position within high-low range
-            if 'high' in df.columns and 'low' in df.columns:
-                price_range = df['high'] - df['low']
-                price_range = price_range.replace(0, 1)  # Avoid division by zero
-                features_df['price_position'] = (df['price'] - df['low']) / price_range
-            else:
-                features_df['price_position'] = 0.5  # Default to middle
-            
-            # 3. Volume ratio (current vs moving average)
-            volume_ma = df['volume'].rolling(window=5, min_periods=1).mean()
-            features_df['volume_ratio'] = df['volume'] / volume_ma.replace(0, 1)
-            
-            # 4. Volatility (high-low range as percentage of price)
-            if 'high' in df.columns and 'low' in df.columns:
-                features_df['volatility'] = (df['high'] - df['low']) / df['price'].replace(0, 1)
-            else:
-                features_df['volatility'] = 0.0
-            
-            # 5. Gap (open vs previous close)
-            if 'open' in df.columns:
-                prev_close = df['price'].shift(1)
-                features_df['gap'] = (df['open'] - prev_close) / prev_close.replace(0, 1)
-            else:
-                features_df['gap'] = 0.0
-            
-            # 6. Time of day (normalized 0-1)
-            timestamps = pd.to_datetime(df['timestamp'], unit='s')
-            features_df['time_of_day'] = timestamps.dt.hour / 24.0
-            
-            # 7. Market session indicator
-            hour = timestamps.dt.hour
-            features_df['market_session'] = np.where(
-                (hour >= 9) & (hour <= 16), 1.0,  # Regular session
-                np.where((hour >= 17) & (hour <= 20), 0.5, 0.0)  # Extended/Overnight
-            )
-            
-            # 8. Price momentum (3-period momentum)
-            features_df['momentum'] = (df['price'] - df['price'].shift(3)) / df['price'].shift(3).replace(0, 1)
-            
-            # Fill NaN values
-            features_df = features_df.fillna(0)
+            # Sorted by timestamp; cached per bar when the data is from the symbol's live stream
+            frame = self.feature_store.features(market_data, symbol=market_data[-1].get('symbol'))
+            features_df = pd.DataFrame(frame.select(LSTM_FEATURES.values()), columns=list(LSTM_FEATURES))
             
             # Ensure we have exactly the expected number of features
             if len(features_df.columns) < self.features:
@@ -129,8 +63,8 @@ class LSTMDataPipeline:
                 features_df = features_df.iloc[:, :self.features]
             
             # Add metadata
-            features_df['timestamp'] = df['timestamp']
-            features_df['price'] = df['price']
+            features_df['timestamp'] = frame.timestamps
+            features_df['price'] = frame.prices
             
             return features_df
             
@@ -12,18 +12,34 @@ from collections import deque
 from typing import Dict, Any, Optional, List
 import json
 import os
+import importlib.util
 from datetime import datetime
 
-# TensorFlow imports with fallback
+from .numpy_kernel import LSTMKernel, export_keras_model
+from minhos.core.feature_store import LSTM_FEATURES, FeatureFrame, get_feature_store
+from minhos.core.startup import get_startup_report
+
+# TensorFlow is only needed to train or to load .h5 models; live inference
+# runs on the exported NumPy kernel, so the import is deferred until used
 try:
-    import tensorflow as tf
-    from tensorflow import keras
-    from sklearn.preprocessing import MinMaxScaler
-    HAS_TENSORFLOW = True
-except ImportError:
+    HAS_TENSORFLOW = importlib.util.find_spec('tensorflow') is not None
+except (ImportError, ValueError):
     HAS_TENSORFLOW = False
+if not HAS_TENSORFLOW:
     logging.warning("TensorFlow not available. LSTM predictor will run in simulation mode.")
 
+tf = None
+keras = None
+
+
+def _load_tensorflow():
+    """Import TensorFlow on first use"""
+    global tf, keras
+    if keras is None:
+        tensorflow = get_startup_report().import_module('tensorflow')
+        tf, keras = tensorflow, tensorflow.keras
+    return keras
+
 class LSTMPredictor:
     """
     Self-contained LSTM neural network for price direction prediction.
@@ -42,13 +58,21 @@ class LSTMPredictor:
         
         # Model components
         self.model = None
-        self.scaler = MinMaxScaler()
+        self.kernel: Optional[LSTMKernel] = None  # NumPy inference kernel exported from the model
+        self.kernel_path = f"{self.model_path}.npz"
+        self.model_version: Optional[str] = None  # Registry version being served, once deployed
         self.is_trained = False
-        self.is_enabled = HAS_TENSORFLOW
+        self.is_enabled = HAS_TENSORFLOW or os.path.exists(self.kernel_path)
         
         # Data buffer for sequence creation
         self.data_buffer = deque(maxlen=sequence_length * 2)
         
+        # Shared feature store: the same feature definitions as training and the other models
+        self.feature_store = get_feature_store()
+        
+        # Optional executor for model.predict (e.g. minhos.core.inference); None runs inline
+        self.inference_executor = None
+        
         # Performance tracking
         self.predictions_made = 0
         self.accuracy_window = deque(maxlen=100)
@@ -75,8 +99,18 @@ class LSTMPredictor:
         # Ensure model directory exists
         os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
         
-        # Try to load existing model
-        if os.path.exists(f"{self.model_path}.h5"):
+        # Exported kernel: ready for inference without TensorFlow
+        if os.path.exists(self.kernel_path):
+            try:
+                self.kernel = LSTMKernel.load(self.kernel_path)
+                self.is_trained = True
+                self.logger.info(f"LSTM NumPy kernel loaded from {self.kernel_path}")
+            except Exception as e:
+                self.logger.warning(f"Could not load LSTM kernel: {e}")
+        
+        # Otherwise load the Keras model and export a kernel from it once
+        if self.kernel is None and HAS_TENSORFLOW and os.path.exists(f"{self.model_path}.h5"):
+            keras = _load_tensorflow()
             try:
                 # Load with custom objects for TensorFlow compatibility
                 custom_objects = {
@@ -103,13 +137,56 @@ class LSTMPredictor:
                 except Exception as e2:
                     self.logger.error(f"Failed to load model with fallback: {e2}")
                     # Model exists but can't load - rebuild and retrain will be needed
+            
+            if self.model is not None:
+                self.export_kernel()
         
         self.logger.info(f"LSTM Predictor initialized (enabled: {self.is_enabled}, trained: {self.is_trained})")
     
-    def build_model(self) -> keras.Model:
+    def export_kernel(self) -> bool:
+        """Export the Keras model to the NumPy kernel archive and switch inference to it"""
+        try:
+            export_keras_model(self.model, self.kernel_path)
+            self.kernel = LSTMKernel.load(self.kernel_path)
+            self.logger.info(f"LSTM NumPy kernel exported to {self.kernel_path}")
+            return True
+        except Exception as e:
+            self.logger.warning(f"LSTM kernel export failed, inference stays on Keras: {e}")
+            return False
+    
+    def swap_kernel(self, kernel: LSTMKernel, version: Optional[str] = None):
+        """Serve from ``kernel`` from the next prediction on; in-flight predictions finish on the old one"""
+        self.kernel = kernel
+        self.model_version = version
+        self.is_trained = True
+        self.is_enabled = True
+        self.logger.info(f"LSTM now serving model version {version}")
+    
+    def recent_sequences(self, limit: int = 16) -> Optional[np.ndarray]:
+        """Sliding windows over the buffered features, newest last, for shadow inference"""
+        buffer = list(self.data_buffer)  # Snapshot: predictions keep appending
+        if len(buffer) < self.sequence_length:
+            return None
+        rows = np.array([data_point[3:] for data_point in buffer], dtype=np.float32)
+        starts = range(max(0, len(rows) - self.sequence_length - limit + 1), len(rows) - self.sequence_length + 1)
+        return np.stack([rows[start:start + self.sequence_length] for start in starts])
+    
+    def warm_up(self) -> bool:
+        """One dummy inference so the first live prediction pays no first-call cost"""
+        if not self.is_trained:
+            return False
+        dummy = np.zeros((1, self.sequence_length, self.features), dtype=np.float32)
+        if self.kernel is not None:
+            self.kernel.predict(dummy)
+        elif self.model is not None:
+            self.model.predict(dummy, verbose=0)
+        return True
+    
+    def build_model(self) -> "keras.Model":
         """Build optimized LSTM architecture for trading"""
-        if not self.is_enabled:
+        if not HAS_TENSORFLOW:
             return None
+        keras = _load_tensorflow()
             
         model = keras.Sequential([
             # First LSTM layer with return sequences
@@ -155,88 +232,24 @@ class LSTMPredictor:
             Feature array or None if insufficient data
         """
         try:
-            # Extract basic price data
-            price = market_data.get('price', market_data.get('close', 0))
-            volume = market_data.get('volume', 1)
-            high = market_data.get('high', price)
-            low = market_data.get('low', price)
-            open_price = market_data.get('open', price)
-            
-            # Calculate basic features
-            features = []
-            
-            # Price-based features
-            if len(self.data_buffer) > 0:
-                prev_price = self.data_buffer[-1][0] if self.data_buffer else price
-                price_change = (price - prev_price) / prev_price if prev_price > 0 else 0
-                features.append(price_change)
-            else:
-                features.append(0.0)
-            
-            # Normalized price position within high-low range
-            if high != low:
-                price_position = (price - low) / (high - low)
-            else:
-                price_position = 0.5
-            features.append(price_position)
-            
-            # Volume features
-            if len(self.data_buffer) >= 5:
-                recent_volumes = [data[2] for data in list(self.data_buffer)[-5:]]
-                avg_volume = np.mean(recent_volumes)
-                volume_ratio = volume / avg_volume if avg_volume > 0 else 1.0
-            else:
-                volume_ratio = 1.0
-            features.append(volume_ratio)
-            
-            # Volatility proxy (high-low range)
-            volatility = (high - low) / price if price > 0 else 0
-            features.append(volatility)
-            
-            # Gap feature (open vs previous close)
-            if len(self.data_buffer) > 0:
-                prev_close = self.data_buffer[-1][0]
-                gap = (open_price - prev_close) / prev_close if prev_close > 0 else 0
-            else:
-                gap = 0.0
-            features.append(gap)
-            
-            # Time-based features (simplified)
-            current_hour = datetime.now().hour
-            features.append(current_hour / 24.0)  # Normalized hour
-            
-            # Market session feature (basic)
-            if 9 <= current_hour <= 16:
-                session = 1.0  # Regular session
-            elif 17 <= current_hour <= 20:
-                session = 0.5  # Extended session
-            else:
-                session = 0.0  # Overnight
-            features.append(session)
-            
-            # Price momentum (simplified)
-            if len(self.data_buffer) >= 3:
-                recent_prices = [data[0] for data in list(self.data_buffer)[-3:]]
-                if len(recent_prices) >= 2:
-                    momentum = (recent_prices[-1] - recent_prices[0]) / recent_prices[0] if recent_prices[0] > 0 else 0
-                else:
-                    momentum = 0.0
-            else:
-                momentum = 0.0
-            features.append(momentum)
-            
-            # Ensure we have exactly the expected number of features
-            while len(features) < self.features:
-                features.append(0.0)
-            
-            features = features[:self.features]  # Truncate if too many
-            
-            return np.array(features, dtype=np.float32)
+            # One bar on the symbol's feature stream; a repeated bar is served from the cache
+            bar = dict(market_data)
+            if bar.get('timestamp') is None:
+                bar['timestamp'] = datetime.now().timestamp()
+            frame = self.feature_store.features([bar], symbol=market_data.get('symbol') or 'default')
+            return self._feature_rows(frame)[-1]
             
         except Exception as e:
             self.logger.error(f"Feature engineering error: {e}")
             return None
     
+    def _feature_rows(self, frame: FeatureFrame) -> np.ndarray:
+        """Model inputs from a feature frame, padded or truncated to self.features columns"""
+        rows = frame.select(LSTM_FEATURES.values()).astype(np.float32)
+        if rows.shape[1] < self.features:
+            rows = np.pad(rows, ((0, 0), (0, self.features - rows.shape[1])))
+        return rows[:, :self.features]
+    
     def update_data_buffer(self, market_data: Dict[str, Any]):
         """Update the data buffer with new market data"""
         features = self.engineer_features(market_data)
@@ -274,6 +287,7 @@ class LSTMPredictor:
             Dictionary with prediction results
         """
         # Use ML inference cache if available and enabled
+        cache_input = None
         if use_cache:
             try:
                 # Import cache here to avoid circular imports
@@ -286,42 +300,112 @@ class LSTMPredictor:
                 
                 cache = get_ml_inference_cache()
                 
+                # Buffer the tick now, so the lookup sees the sequence the model would be fed
+                self.update_data_buffer(market_data)
+                sequence = self.create_sequence()
+                
                 # Prepare cache input
                 cache_input = {
                     'market_data': market_data,
+                    'sequence': None if sequence is None else sequence.tolist(),
+                    'features': None if sequence is None else self._similarity_vector(sequence).tolist(),
                     'sequence_length': self.sequence_length,
-                    'features': self.features,
                     'is_trained': self.is_trained,
-                    'is_enabled': self.is_enabled
+                    'is_enabled': self.is_enabled,
+                    'model_version': self.model_version
                 }
                 
                 # Try to get cached result
                 return await cache.get_prediction(
                     'lstm', 
                     cache_input, 
-                    self._predict_without_cache
+                    self._predict_without_cache,
+                    self._predict_batch_without_cache
                 )
                 
             except Exception as e:
                 self.logger.warning(f"Cache error, falling back to direct prediction: {e}")
         
-        # Fall back to direct prediction
-        return await self._predict_without_cache(market_data)
+        # Fall back to direct prediction (without buffering the tick twice)
+        return await self._predict_without_cache(cache_input or market_data)
+    
+    def _similarity_vector(self, sequence: np.ndarray) -> np.ndarray:
+        """
+        The model input standardized per feature and flattened, for cache
+        similarity lookups: raw scales would let the calendar columns match
+        every sequence in the same hour.
+        """
+        rows = sequence.reshape(self.sequence_length, self.features).astype(np.float64)
+        scale = rows.std(axis=0)
+        scale[scale == 0] = 1.0  # Constant columns (hour, session) drop out
+        return ((rows - rows.mean(axis=0)) / scale).ravel()
     
     async def _predict_without_cache(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Internal prediction method without caching"""
+        sequence, result = self._prepare_sequence(input_data)
+        if result is not None:
+            return result
+        
+        try:
+            # Run prediction
+            prediction = (await self._run_model(sequence))[0][0]
+            return self._format_prediction(prediction)
+            
+        except Exception as e:
+            self.logger.error(f"LSTM prediction error: {e}")
+            return self._error_result(e)
+    
+    async def _predict_batch_without_cache(self, inputs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Predict several inputs with one stacked model.predict call"""
+        results: List[Optional[Dict[str, Any]]] = []
+        sequences, positions = [], []
+        
+        # Inputs carry their submitted sequence or are buffered here in request order,
+        # so each sequence matches a one-by-one call
+        for input_data in inputs:
+            sequence, result = self._prepare_sequence(input_data)
+            results.append(result)
+            if result is None:
+                sequences.append(sequence)
+                positions.append(len(results) - 1)
+        
+        if sequences:
+            try:
+                predictions = (await self._run_model(np.concatenate(sequences)))[:, 0]
+                for position, prediction in zip(positions, predictions):
+                    results[position] = self._format_prediction(prediction)
+            except Exception as e:
+                self.logger.error(f"LSTM batch prediction error: {e}")
+                for position in positions:
+                    results[position] = self._error_result(e)
+        
+        return results
+    
+    async def _run_model(self, sequences: np.ndarray) -> np.ndarray:
+        """NumPy kernel when exported, else model.predict on the inference executor when attached"""
+        kernel = self.kernel  # One reference per call: a hot swap never splits a prediction
+        if kernel is not None:
+            return kernel.predict(sequences)  # Sub-millisecond; no need to leave the loop
+        if self.inference_executor is None:
+            return self.model.predict(sequences, verbose=0)
+        return await self.inference_executor.run('lstm', self.model.predict, sequences, verbose=0)
+    
+    def _prepare_sequence(self, input_data: Dict[str, Any]) -> tuple:
+        """Update the buffer and build a sequence; returns (sequence, None) or (None, result)"""
         # Extract market data from input (for cache compatibility)
         if 'market_data' in input_data:
             market_data = input_data['market_data']
         else:
             market_data = input_data
         
-        # Update data buffer
-        self.update_data_buffer(market_data)
+        # Cached requests were buffered, and their sequence built, when they were submitted
+        submitted = 'sequence' in input_data
+        if not submitted:
+            self.update_data_buffer(market_data)
         
         # Check if enabled and trained
         if not self.is_enabled:
-            return {
+            return None, {
                 'direction': 0,
                 'confidence': 0.0,
                 'raw_prediction': 0.0,
@@ -330,7 +414,7 @@ class LSTMPredictor:
             }
         
         if not self.is_trained:
-            return {
+            return None, {
                 'direction': 0,
                 'confidence': 0.0,
                 'raw_prediction': 0.0,
@@ -339,9 +423,13 @@ class LSTMPredictor:
             }
         
         # Create sequence for prediction
-        sequence = self.create_sequence()
+        if submitted:
+            sequence = input_data['sequence']
+            sequence = None if sequence is None else np.asarray(sequence, dtype=np.float32)
+        else:
+            sequence = self.create_sequence()
         if sequence is None:
-            return {
+            return None, {
                 'direction': 0,
                 'confidence': 0.0,
                 'raw_prediction': 0.0,
@@ -349,59 +437,61 @@ class LSTMPredictor:
                 'message': f'Need {self.sequence_length} data points, have {len(self.data_buffer)}'
             }
         
-        try:
-            # Run prediction
-            prediction = self.model.predict(sequence, verbose=0)[0][0]
-            
-            # Calculate confidence and direction
-            confidence = min(abs(prediction), 1.0)
-            
-            # Direction based on prediction strength
-            if prediction > 0.05:
-                direction = 1  # UP
-            elif prediction < -0.05:
-                direction = -1  # DOWN
-            else:
-                direction = 0  # NEUTRAL
-            
-            # Only provide signal if confidence is above threshold
-            if confidence < self.config['confidence_threshold']:
-                direction = 0
-            
-            # Track predictions
-            self.predictions_made += 1
-            
-            return {
-                'direction': direction,
-                'confidence': confidence,
-                'raw_prediction': float(prediction),
-                'source': 'lstm_neural_network',
-                'predictions_made': self.predictions_made,
-                'message': 'LSTM prediction successful'
-            }
-            
-        except Exception as e:
-            self.logger.error(f"LSTM prediction error: {e}")
-            return {
-                'direction': 0,
-                'confidence': 0.0,
-                'raw_prediction': 0.0,
-                'source': 'lstm_error',
-                'message': f'Prediction error: {str(e)}'
-            }
+        return sequence, None
+    
+    def _format_prediction(self, prediction: float) -> Dict[str, Any]:
+        """Turn a raw model output into a direction signal"""
+        # Calculate confidence and direction
+        confidence = min(abs(prediction), 1.0)
+        
+        # Direction based on prediction strength
+        if prediction > 0.05:
+            direction = 1  # UP
+        elif prediction < -0.05:
+            direction = -1  # DOWN
+        else:
+            direction = 0  # NEUTRAL
+        
+        # Only provide signal if confidence is above threshold
+        if confidence < self.config['confidence_threshold']:
+            direction = 0
+        
+        # Track predictions
+        self.predictions_made += 1
+        
+        return {
+            'direction': direction,
+            'confidence': confidence,
+            'raw_prediction': float(prediction),
+            'source': 'lstm_neural_network',
+            'predictions_made': self.predictions_made,
+            'message': 'LSTM prediction successful'
+        }
+    
+    def _error_result(self, error: Exception) -> Dict[str, Any]:
+        return {
+            'direction': 0,
+            'confidence': 0.0,
+            'raw_prediction': 0.0,
+            'source': 'lstm_error',
+            'message': f'Prediction error: {str(error)}'
+        }
     
-    async def train_on_historical_data(self, historical_data: List[Dict[str, Any]], epochs: int = 50) -> Dict[str, Any]:
+    async def train_on_historical_data(self, historical_data: List[Dict[str, Any]], epochs: int = 50,
+                                       context: Any = None) -> Dict[str, Any]:
         """
         Train LSTM model on historical data
         
         Args:
             historical_data: List of historical market data points
             epochs: Number of training epochs
+            context: Optional minhos.core.training.TrainingContext; reports progress per epoch,
+                checkpoints the weights, resumes from its checkpoint and stops when the budget is spent
             
         Returns:
             Training results
         """
-        if not self.is_enabled:
+        if not HAS_TENSORFLOW:
             return {
                 'success': False,
                 'message': 'TensorFlow not available'
@@ -431,6 +521,7 @@ class LSTMPredictor:
             y_train, y_val = y[:split_idx], y[split_idx:]
             
             # Build model
+            keras = _load_tensorflow()
             self.model = self.build_model()
             
             # Training callbacks
@@ -448,23 +539,37 @@ class LSTMPredictor:
                 )
             ]
             
+            initial_epoch = 0
+            if context is not None:
+                initial_epoch = self._resume_from_checkpoint(context)
+                callbacks.append(self._training_job_callback(keras, context, epochs))
+            
             # Train model
             history = self.model.fit(
                 X_train, y_train,
                 validation_data=(X_val, y_val),
                 epochs=epochs,
+                initial_epoch=initial_epoch,
                 batch_size=32,
-                verbose=1,
+                verbose=1 if context is None else 0,
                 callbacks=callbacks
             )
+            if not history.history.get('loss'):
+                return {
+                    'success': False,
+                    'message': f'No epochs left to train (resumed at epoch {initial_epoch})'
+                }
             
-            # Save model
+            # Save model and the kernel used for live inference
             self.model.save(f"{self.model_path}.h5")
+            self.export_kernel()
             self.is_trained = True
             
             # Calculate final metrics
             final_loss = history.history['loss'][-1]
             final_val_loss = history.history['val_loss'][-1]
+            val_predictions = self._run_kernel_or_model(X_val)
+            direction_accuracy = float(np.mean(np.sign(val_predictions) == np.sign(y_val)))
             
             self.logger.info(f"LSTM training completed. Final loss: {final_loss:.4f}, Val loss: {final_val_loss:.4f}")
             
@@ -474,7 +579,9 @@ class LSTMPredictor:
                 'validation_samples': len(X_val),
                 'final_loss': final_loss,
                 'final_val_loss': final_val_loss,
-                'epochs_completed': len(history.history['loss']),
+                'direction_accuracy': direction_accuracy,
+                'epochs_completed': initial_epoch + len(history.history['loss']),
+                'resumed_from_epoch': initial_epoch,
                 'message': 'LSTM training completed successfully'
             }
             
@@ -485,38 +592,61 @@ class LSTMPredictor:
                 'message': f'Training error: {str(e)}'
             }
     
+    def _run_kernel_or_model(self, sequences: np.ndarray) -> np.ndarray:
+        """Blocking batch inference, for validation"""
+        if self.kernel is not None:
+            return self.kernel.predict(sequences).reshape(-1)
+        return self.model.predict(sequences, verbose=0).reshape(-1)
+    
+    def _resume_from_checkpoint(self, context: Any) -> int:
+        """Restore the weights of an interrupted training job; returns the epoch to continue from"""
+        state = context.load_checkpoint()
+        weights_path = context.work_dir / "lstm.weights.h5"
+        if not state or not weights_path.exists():
+            return 0
+        self.model.load_weights(str(weights_path))
+        self.logger.info(f"Resuming LSTM training at epoch {state['epoch']}")
+        return state['epoch']
+    
+    def _training_job_callback(self, keras: Any, context: Any, epochs: int) -> Any:
+        """Per epoch: checkpoint the weights, report progress, stop once the time budget is spent"""
+        def on_epoch_end(epoch, logs=None):
+            logs = logs or {}
+            self.model.save_weights(str(context.work_dir / "lstm.weights.h5"))
+            context.save_checkpoint({'epoch': epoch + 1})
+            context.progress(epoch + 1, epochs, loss=float(logs.get('loss', np.nan)),
+                             val_loss=float(logs.get('val_loss', np.nan)))
+            if context.should_stop():
+                self.logger.warning(f"LSTM training budget spent after epoch {epoch + 1}; checkpoint saved")
+                self.model.stop_training = True
+        
+        return keras.callbacks.LambdaCallback(on_epoch_end=on_epoch_end)
+    
     def _prepare_training_data(self, historical_data: List[Dict[str, Any]]) -> tuple:
         """Prepare training sequences and targets from historical data"""
         sequences = []
         targets = []
         
-        # Create feature buffer
-        feature_buffer = []
+        # Features for the whole history in one batch
+        feature_rows = self._feature_rows(self.feature_store.compute(historical_data))
         
-        for i, data_point in enumerate(historical_data):
-            features = self.engineer_features(data_point)
-            if features is not None:
-                feature_buffer.append(features)
-                
-                # Create sequence and target when we have enough data
-                if len(feature_buffer) >= self.sequence_length + 1:
-                    # Sequence is the last sequence_length features
-                    sequence = feature_buffer[-self.sequence_length-1:-1]
-                    
-                    # Target is the price direction for next step
-                    if i < len(historical_data) - 1:
-                        current_price = data_point.get('price', data_point.get('close', 0))
-                        next_price = historical_data[i + 1].get('price', historical_data[i + 1].get('close', 0))
-                        
-                        if current_price > 0:
-                            price_change = (next_price - current_price) / current_price
-                            # Normalize price change to [-1, 1] range
-                            target = np.tanh(price_change * 100)  # Scale factor for sensitivity
-                        else:
-                            target = 0.0
-                        
-                        sequences.append(sequence)
-                        targets.append(target)
+        for i in range(self.sequence_length, len(historical_data) - 1):
+            # Sequence is the sequence_length feature rows before this point
+            sequence = feature_rows[i - self.sequence_length:i]
+            
+            # Target is the price direction for next step
+            current_price = historical_data[i].get('price', historical_data[i].get('close', 0))
+            next_price = historical_data[i + 1].get('price', historical_data[i + 1].get('close', 0))
+            
+            if current_price > 0:
+                price_change = (next_price - current_price) / current_price
+                # Normalize price change to [-1, 1] range
+                target = np.tanh(price_change * 100)  # Scale factor for sensitivity
+            else:
+                target = 0.0
+            
+            sequences.append(sequence)
+            targets.append(target)
         
         if len(sequences) == 0:
             return np.array([]), np.array([])
@@ -535,7 +665,9 @@ class LSTMPredictor:
             'data_buffer_size': len(self.data_buffer),
             'required_sequence_length': self.sequence_length,
             'confidence_threshold': self.config['confidence_threshold'],
-            'has_tensorflow': HAS_TENSORFLOW
+            'has_tensorflow': HAS_TENSORFLOW,
+            'model_version': self.model_version,
+            'inference_backend': 'numpy' if self.kernel is not None else 'keras'
         }
     
     def set_config(self, **kwargs):
@@ -543,4 +675,35 @@ class LSTMPredictor:
         for key, value in kwargs.items():
             if key in self.config:
                 self.config[key] = value
-                self.logger.info(f"Updated LSTM config: {key} = {value}")
\ No newline at end of file
+                self.logger.info(f"Updated LSTM config: {key} = {value}")
+
+
+def run_training_job(context: Any) -> Dict[str, Any]:
+    """
+    Training-process entry point (minhos.core.training): retrain on
+    ``data`` from the job config, or on the symbol's history, and write the
+    kernel arrays to context.output_dir for the model registry.
+    """
+    from minhos.core.model_registry import save_arrays
+    
+    config = context.config
+    predictor = LSTMPredictor(model_path=str(context.work_dir / "lstm_model"))
+    data = config.get('data')
+    if data is None:
+        from .trainer import LSTMTrainer
+        data = asyncio.run(LSTMTrainer().load_training_data(config.get('symbol', 'NQ'), config.get('days_back', 30)))
+    
+    result = asyncio.run(predictor.train_on_historical_data(data, epochs=config.get('epochs', 50), context=context))
+    if not result.get('success'):
+        return result
+    if predictor.kernel is None:
+        return {'success': False, 'message': 'Trained model could not be exported to the NumPy kernel'}
+    
+    save_arrays(context.output_dir, *predictor.kernel.to_arrays())
+    result['model_path'] = str(context.output_dir)
+    result['validation_metrics'] = {
+        'accuracy': result['direction_accuracy'],
+        'validation_loss': result['final_val_loss'],
+        'training_samples': result['training_samples']
+    }
+    return result
@@ -0,0 +1,209 @@
+"""
+NumPy LSTM Inference Kernel
+
+Pure-NumPy forward pass for the trained LSTM predictor, so live inference
+needs no TensorFlow import and no per-call framework overhead.
+
+export_keras_model() dumps the weights of a Sequential stack of LSTM and
+Dense layers (Dropout is an identity at inference) to an .npz archive with
+a small JSON spec. LSTMKernel loads that archive and reproduces
+model.predict in float32 for one sequence or a batch, and can also advance
+a carried hidden state one tick at a time (stateful streaming).
+"""
+
+import json
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+
+FORMAT_VERSION = 1
+
+
+def _hard_sigmoid(x: np.ndarray) -> np.ndarray:
+    return np.clip(0.2 * x + 0.5, 0.0, 1.0)  # Keras 2 definition
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 0.5 * (1.0 + np.tanh(0.5 * x))  # Same value as 1 / (1 + exp(-x)), no overflow
+
+
+ACTIVATIONS = {
+    'tanh': np.tanh,
+    'sigmoid': _sigmoid,
+    'hard_sigmoid': _hard_sigmoid,
+    'relu': lambda x: np.maximum(x, 0.0),
+    'linear': lambda x: x
+}
+
+
+def _activation_name(activation: Any) -> str:
+    name = activation if isinstance(activation, str) else getattr(activation, '__name__', str(activation))
+    if name not in ACTIVATIONS:
+        raise ValueError(f"Unsupported activation for NumPy kernel: {name}")
+    return name
+
+
+def export_keras_model(model: Any, path: str) -> str:
+    """
+    Write the weights of a trained Sequential LSTM/Dense model to ``path``.
+
+    Returns the path written. Raises ValueError for layers the kernel
+    cannot reproduce.
+    """
+    spec: List[Dict[str, Any]] = []
+    arrays: Dict[str, np.ndarray] = {}
+
+    for layer in model.layers:
+        kind = layer.__class__.__name__
+        if kind in ('Dropout', 'InputLayer'):
+            continue
+        config = layer.get_config()
+        weights = layer.get_weights()
+
+        if kind == 'LSTM':
+            if config.get('stateful') or config.get('go_backwards'):
+                raise ValueError(f"Unsupported LSTM options in layer {layer.name}")
+            kernel, recurrent = weights[0], weights[1]
+            bias = weights[2] if len(weights) > 2 else np.zeros(kernel.shape[1], dtype=np.float32)
+            spec.append({
+                'type': 'lstm',
+                'units': int(config['units']),
+                'activation': _activation_name(config.get('activation', 'tanh')),
+                'recurrent_activation': _activation_name(config.get('recurrent_activation', 'sigmoid')),
+                'return_sequences': bool(config.get('return_sequences', False))
+            })
+            arrays.update({f'{len(spec) - 1}_kernel': kernel, f'{len(spec) - 1}_recurrent_kernel': recurrent,
+                           f'{len(spec) - 1}_bias': bias})
+        elif kind == 'Dense':
+            kernel = weights[0]
+            bias = weights[1] if len(weights) > 1 else np.zeros(kernel.shape[1], dtype=np.float32)
+            spec.append({
+                'type': 'dense',
+                'units': int(config['units']),
+                'activation': _activation_name(config.get('activation', 'linear'))
+            })
+            arrays.update({f'{len(spec) - 1}_kernel': kernel, f'{len(spec) - 1}_bias': bias})
+        else:
+            raise ValueError(f"Unsupported layer for NumPy kernel: {kind}")
+
+    lstm_layers = [layer for layer in spec if layer['type'] == 'lstm']
+    if not lstm_layers or lstm_layers[-1]['return_sequences']:
+        raise ValueError("Expected LSTM layers ending in a non-sequence output")
+
+    header = {'format_version': FORMAT_VERSION, 'layers': spec}
+    with open(path, 'wb') as f:
+        np.savez(f, spec=np.array(json.dumps(header)),
+                 **{name: np.asarray(array, dtype=np.float32) for name, array in arrays.items()})
+    return path
+
+
+class LSTMKernel:
+    """
+    NumPy LSTM + Dense forward pass:
+    - predict(): model.predict equivalent for (T, F) or (B, T, F) inputs
+    - initial_state() / step(): one cell update per tick on a carried state
+    """
+
+    def __init__(self, layers: Sequence[Dict[str, Any]], arrays: Dict[str, np.ndarray]):
+        self.spec = [dict(layer) for layer in layers]
+        self.layers = []
+        for i, layer in enumerate(layers):
+            layer = dict(layer)
+            layer['kernel'] = np.ascontiguousarray(arrays[f'{i}_kernel'], dtype=np.float32)
+            layer['bias'] = np.ascontiguousarray(arrays[f'{i}_bias'], dtype=np.float32)
+            if layer['type'] == 'lstm':
+                layer['recurrent_kernel'] = np.ascontiguousarray(arrays[f'{i}_recurrent_kernel'], dtype=np.float32)
+                layer['recurrent_fn'] = ACTIVATIONS[layer['recurrent_activation']]
+            layer['fn'] = ACTIVATIONS[layer['activation']]
+            self.layers.append(layer)
+        self.lstm_layers = [layer for layer in self.layers if layer['type'] == 'lstm']
+        self.dense_layers = [layer for layer in self.layers if layer['type'] == 'dense']
+        self.input_features = self.layers[0]['kernel'].shape[0]
+
+    @classmethod
+    def load(cls, path: str) -> "LSTMKernel":
+        with np.load(path, allow_pickle=False) as archive:
+            header = json.loads(str(archive['spec']))
+            arrays = {name: archive[name] for name in archive.files if name != 'spec'}
+        return cls.from_arrays(header, arrays)
+
+    @classmethod
+    def from_arrays(cls, header: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> "LSTMKernel":
+        """Build from to_arrays() output; float32 arrays (e.g. memory-mapped) are used without copying"""
+        if header.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported kernel format: {header.get('format_version')}")
+        return cls(header['layers'], arrays)
+
+    def to_arrays(self) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        """JSON header and weight arrays, as written by export_keras_model"""
+        arrays = {}
+        for i, layer in enumerate(self.layers):
+            for name in ('kernel', 'recurrent_kernel', 'bias'):
+                if name in layer:
+                    arrays[f'{i}_{name}'] = layer[name]
+        return {'format_version': FORMAT_VERSION, 'layers': self.spec}, arrays
+
+    @staticmethod
+    def _cell(layer: Dict[str, Any], projected: np.ndarray, h: np.ndarray,
+              c: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """One LSTM step; ``projected`` is x @ kernel + bias. Gate order i, f, c, o."""
+        units = layer['units']
+        z = projected + h @ layer['recurrent_kernel']
+        gate = layer['recurrent_fn']
+        i = gate(z[:, :units])
+        f = gate(z[:, units:2 * units])
+        candidate = layer['fn'](z[:, 2 * units:3 * units])
+        o = gate(z[:, 3 * units:])
+        c = f * c + i * candidate
+        return o * layer['fn'](c), c
+
+    def _head(self, h: np.ndarray) -> np.ndarray:
+        for layer in self.dense_layers:
+            h = layer['fn'](h @ layer['kernel'] + layer['bias'])
+        return h
+
+    def predict(self, sequences: np.ndarray) -> np.ndarray:
+        """Outputs of shape (batch, units) for sequences of shape (T, F) or (batch, T, F)"""
+        x = np.asarray(sequences, dtype=np.float32)
+        if x.ndim == 2:
+            x = x[None]
+        batch, steps, _ = x.shape
+
+        for layer in self.lstm_layers:
+            units = layer['units']
+            projected = x @ layer['kernel'] + layer['bias']  # All timesteps in one matmul
+            h = np.zeros((batch, units), dtype=np.float32)
+            c = np.zeros((batch, units), dtype=np.float32)
+            outputs = np.empty((batch, steps, units), dtype=np.float32) if layer['return_sequences'] else None
+            for t in range(steps):
+                h, c = self._cell(layer, projected[:, t], h, c)
+                if outputs is not None:
+                    outputs[:, t] = h
+            x = outputs if outputs is not None else h
+
+        return self._head(x)
+
+    def initial_state(self, batch: int = 1) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Zero (h, c) per LSTM layer, as at the start of a sequence"""
+        return [(np.zeros((batch, layer['units']), dtype=np.float32),
+                 np.zeros((batch, layer['units']), dtype=np.float32)) for layer in self.lstm_layers]
+
+    def step(self, features: np.ndarray,
+             state: List[Tuple[np.ndarray, np.ndarray]]) -> Tuple[np.ndarray, List[Tuple[np.ndarray, np.ndarray]]]:
+        """
+        Advance every LSTM layer by one tick of shape (F,) or (batch, F).
+
+        Returns the head output as if the sequence ended at this tick, and the
+        new state. Stepping a fresh state through a sequence gives the same
+        output as predict() on that sequence.
+        """
+        x = np.asarray(features, dtype=np.float32)
+        if x.ndim == 1:
+            x = x[None]
+        new_state = []
+        for layer, (h, c) in zip(self.lstm_layers, state):
+            h, c = self._cell(layer, x @ layer['kernel'] + layer['bias'], h, c)
+            new_state.append((h, c))
+            x = h
+        return self._head(x), new_state
@@ -409,11 +409,15 @@ class LSTMTrainer:
             model_path = f"{self.predictor.model_path}.h5"
             self.predictor.model.save(model_path)
             
+            # Export the NumPy kernel used for live inference
+            kernel_exported = self.predictor.export_kernel()
+            
             # Save metadata
             metadata = {
                 'timestamp': datetime.now().isoformat(),
                 'symbol': symbol,
                 'model_path': model_path,
+                'kernel_path': self.predictor.kernel_path if kernel_exported else None,
                 'config': self.config,
                 'evaluation_results': evaluation_results,
                 'feature_info': self.data_pipeline.get_feature_info()
@@ -429,6 +433,7 @@ class LSTMTrainer:
             return {
                 'model_saved': True,
                 'model_path': model_path,
+                'kernel_path': self.predictor.kernel_path if kernel_exported else None,
                 'metadata_path': metadata_path
             }
             
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Correlation Engine
+==================
+
+Online cross-asset correlation for MinhOS v3.
+
+Ticks are bucketed into fixed-length bars. Every bar close updates an
+exponentially weighted mean and covariance of log returns in O(k²) for k
+symbols, so the matrix is always current without rescanning history.
+Readers get an immutable correlation snapshot that is rebuilt at most once
+per bar.
+"""
+
+import math
+import threading
+import time
+import logging
+from collections import deque
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Any
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CorrelationSnapshot:
+    """Immutable correlation matrix as of a bar close"""
+    version: int
+    symbols: Tuple[str, ...]
+    index: Mapping[str, int]
+    correlation: np.ndarray  # k x k, read-only
+    covariance: np.ndarray  # k x k per-bar log return covariance, read-only
+    volatility: np.ndarray  # per-bar log return standard deviation, read-only
+    observations: Tuple[int, ...]
+    ready: bool
+    default_correlation: float
+    updated_at: float
+
+    def get(self, symbol_a: str, symbol_b: str) -> float:
+        """Correlation between two symbols, or the default if either is unknown"""
+        if symbol_a == symbol_b:
+            return 1.0
+        i = self.index.get(symbol_a)
+        j = self.index.get(symbol_b)
+        if i is None or j is None:
+            return self.default_correlation
+        return float(self.correlation[i, j])
+
+
+class CorrelationEngine:
+    """
+    Exponentially weighted correlation engine with:
+    - Tick-to-bar bucketing on a fixed bar length
+    - O(k²) covariance update per bar close
+    - Cached read-only snapshots versioned per bar
+    - Bounded per-bar return history for scenario bootstrapping
+    """
+
+    def __init__(self, halflife_bars: float = 60.0, bar_seconds: int = 60,
+                 min_observations: int = 20, default_correlation: float = 1.0,
+                 history_bars: int = 2000):
+        self.alpha = 1.0 - 0.5 ** (1.0 / halflife_bars)
+        self.halflife_bars = halflife_bars
+        self.bar_seconds = bar_seconds
+        self.min_observations = min_observations
+        # Used for pairs without enough history; 1.0 treats them as fully correlated
+        self.default_correlation = default_correlation
+
+        self._lock = threading.RLock()
+        self._symbols: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._mean = np.zeros(0)
+        self._cov = np.zeros((0, 0))
+        self._last_close = np.zeros(0)
+        self._observations = np.zeros(0, dtype=np.int64)
+        self._history: deque = deque(maxlen=history_bars)
+
+        # Current bar being built from ticks
+        self._current_bar: Optional[int] = None
+        self._pending: Dict[str, float] = {}
+
+        self._version = 0
+        self._snapshot: Optional[CorrelationSnapshot] = None
+        self.stats = {
+            "ticks": 0,
+            "late_ticks": 0,
+            "bars": 0
+        }
+
+    def _ensure_symbol(self, symbol: str) -> int:
+        """Grow the state arrays for a newly seen symbol"""
+        index = self._index.get(symbol)
+        if index is not None:
+            return index
+
+        index = len(self._symbols)
+        self._symbols.append(symbol)
+        self._index[symbol] = index
+
+        cov = np.zeros((index + 1, index + 1))
+        cov[:index, :index] = self._cov
+        self._cov = cov
+        self._mean = np.append(self._mean, 0.0)
+        self._last_close = np.append(self._last_close, np.nan)
+        self._observations = np.append(self._observations, 0)
+        return index
+
+    def on_price(self, symbol: str, price: float, timestamp: Optional[float] = None) -> bool:
+        """Feed a tick; returns True if it closed the previous bar"""
+        if price is None or not price > 0:
+            return False
+
+        timestamp = timestamp if timestamp is not None else time.time()
+        bar = int(timestamp // self.bar_seconds)
+        closed = False
+
+        with self._lock:
+            self.stats["ticks"] += 1
+
+            if self._current_bar is None:
+                self._current_bar = bar
+            elif bar > self._current_bar:
+                if self._pending:
+                    self._apply_bar_close(self._pending)
+                    closed = True
+                self._pending = {}
+                self._current_bar = bar
+            elif bar < self._current_bar:
+                self.stats["late_ticks"] += 1
+                return False
+
+            self._pending[symbol] = price
+
+        return closed
+
+    def on_bar_close(self, closes: Mapping[str, float]):
+        """Apply one bar of closing prices across symbols"""
+        with self._lock:
+            self._apply_bar_close(closes)
+
+    def _apply_bar_close(self, closes: Mapping[str, float]):
+        """EW mean/covariance update; symbols without a close carry their price forward"""
+        for symbol in closes:
+            self._ensure_symbol(symbol)
+
+        k = len(self._symbols)
+        returns = np.zeros(k)
+        new_close = self._last_close.copy()
+
+        for symbol, price in closes.items():
+            if not price > 0:
+                continue
+            i = self._index[symbol]
+            previous = self._last_close[i]
+            if previous > 0:
+                returns[i] = math.log(price / previous)
+                self._observations[i] += 1
+            new_close[i] = price
+
+        self._last_close = new_close
+        self._history.append(returns)
+
+        # West (1979) exponentially weighted update, O(k²)
+        diff = returns - self._mean
+        increment = self.alpha * diff
+        self._mean += increment
+        self._cov = (1.0 - self.alpha) * (self._cov + np.outer(diff, increment))
+
+        self._version += 1
+        self.stats["bars"] += 1
+
+    def get_return_history(self, symbols: Optional[List[str]] = None) -> np.ndarray:
+        """
+        Get per-bar log returns, oldest first, as an (n, k) array.
+        Symbols added after a bar show a zero return for it.
+        """
+        with self._lock:
+            rows = list(self._history)
+            index = dict(self._index)
+
+        k = len(index)
+        history = np.zeros((len(rows), k))
+        for i, row in enumerate(rows):
+            history[i, :len(row)] = row
+
+        if symbols is not None:
+            columns = [index.get(symbol) for symbol in symbols]
+            history = np.column_stack([
+                history[:, column] if column is not None else np.zeros(len(rows))
+                for column in columns
+            ]) if columns else np.zeros((len(rows), 0))
+
+        return history
+
+    def warm_start(self, ticks: Iterable[Tuple[str, float, float]]):
+        """Seed from historical (symbol, price, timestamp) ticks in any order"""
+        count = 0
+        for symbol, price, timestamp in sorted(ticks, key=lambda tick: tick[2]):
+            self.on_price(symbol, price, timestamp)
+            count += 1
+
+        logger.info(f"📈 Correlation engine warmed up from {count} ticks "
+                    f"({self.stats['bars']} bars, {len(self._symbols)} symbols)")
+
+    def get_snapshot(self) -> CorrelationSnapshot:
+        """Get the correlation matrix as of the last bar close (cached per bar)"""
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == self._version:
+            return snapshot
+
+        with self._lock:
+            snapshot = self._build_snapshot()
+            self._snapshot = snapshot
+            return snapshot
+
+    def _build_snapshot(self) -> CorrelationSnapshot:
+        """Normalize covariance into correlation, defaulting pairs without history"""
+        k = len(self._symbols)
+        cov = self._cov.copy()
+        volatility = np.sqrt(np.clip(np.diag(cov), 0.0, None))
+
+        known = (self._observations >= self.min_observations) & (volatility > 0)
+        correlation = np.full((k, k), self.default_correlation)
+        if known.any():
+            block = np.ix_(known, known)
+            correlation[block] = cov[block] / np.outer(volatility[known], volatility[known])
+        np.clip(correlation, -1.0, 1.0, out=correlation)
+        np.fill_diagonal(correlation, 1.0)
+
+        for array in (correlation, cov, volatility):
+            array.flags.writeable = False
+
+        return CorrelationSnapshot(
+            version=self._version,
+            symbols=tuple(self._symbols),
+            index=MappingProxyType(dict(self._index)),
+            correlation=correlation,
+            covariance=cov,
+            volatility=volatility,
+            observations=tuple(int(n) for n in self._observations),
+            ready=bool(k) and bool(known.all()),
+            default_correlation=self.default_correlation,
+            updated_at=time.time()
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get engine statistics"""
+        snapshot = self.get_snapshot()
+        return {
+            **self.stats,
+            "symbols": list(snapshot.symbols),
+            "observations": dict(zip(snapshot.symbols, snapshot.observations)),
+            "ready": snapshot.ready,
+            "version": snapshot.version,
+            "halflife_bars": self.halflife_bars,
+            "bar_seconds": self.bar_seconds
+        }
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Debounced Scheduler
+===================
+
+Per-key rate limiting of expensive async work for MinhOS v3.
+
+Each key (typically a symbol) runs at most once per minimum interval and
+never has more than one run in flight. Requests inside the interval or
+during a run are folded into a single trailing-edge run, so the latest
+state is always processed without doing redundant work. Priority requests
+skip the interval, but still wait for an in-flight run to finish.
+"""
+
+import asyncio
+import time
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _KeyState:
+    """Scheduling state for one key"""
+    task: Optional[asyncio.Task] = None
+    timer: Optional[asyncio.TimerHandle] = None
+    pending: bool = False
+    pending_priority: bool = False
+    last_started: float = float("-inf")
+    runs: int = 0
+
+
+class DebouncedScheduler:
+    """
+    Trailing-edge debounce with:
+    - Minimum interval between runs per key
+    - At most one in-flight run per key
+    - Priority requests that bypass the interval
+    """
+
+    def __init__(self, run: Callable[[str], Awaitable[Any]], min_interval: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self._run = run
+        self.min_interval = min_interval
+        self._clock = clock
+        self._keys: Dict[str, _KeyState] = {}
+        self.stats = {
+            "requests": 0,
+            "priority_requests": 0,
+            "runs": 0,
+            "trailing_runs": 0,
+            "skipped": 0,  # Requests that did not start a run themselves
+            "coalesced": 0,  # Skipped requests folded into an already pending run
+            "errors": 0
+        }
+
+    def request(self, key: str, priority: bool = False) -> bool:
+        """Ask for a run of ``key``; returns True if it started immediately"""
+        state = self._keys.get(key)
+        if state is None:
+            state = self._keys[key] = _KeyState()
+
+        self.stats["requests"] += 1
+        if priority:
+            self.stats["priority_requests"] += 1
+
+        if state.task is None:
+            wait = 0.0 if priority else state.last_started + self.min_interval - self._clock()
+            if wait <= 0:
+                self._start(key, state)
+                return True
+        else:
+            wait = None  # Rescheduled when the in-flight run finishes
+
+        self.stats["skipped"] += 1
+        if state.pending:
+            self.stats["coalesced"] += 1
+        state.pending = True
+        state.pending_priority = state.pending_priority or priority
+
+        if wait is not None and state.timer is None:
+            state.timer = asyncio.get_running_loop().call_later(wait, self._fire, key)
+        return False
+
+    def _start(self, key: str, state: _KeyState, trailing: bool = False):
+        """Launch a run now"""
+        if state.timer is not None:
+            state.timer.cancel()
+            state.timer = None
+
+        state.pending = False
+        state.pending_priority = False
+        state.last_started = self._clock()
+        state.runs += 1
+        self.stats["runs"] += 1
+        if trailing:
+            self.stats["trailing_runs"] += 1
+
+        state.task = asyncio.get_running_loop().create_task(self._execute(key, state))
+
+    async def _execute(self, key: str, state: _KeyState):
+        """Run the work, then schedule the trailing run if one is pending"""
+        try:
+            await self._run(key)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"❌ Scheduled run failed for {key}: {e}")
+        finally:
+            state.task = None
+
+        if state.pending and state.timer is None:
+            wait = 0.0 if state.pending_priority else state.last_started + self.min_interval - self._clock()
+            if wait <= 0:
+                self._start(key, state, trailing=True)
+            else:
+                state.timer = asyncio.get_running_loop().call_later(wait, self._fire, key)
+
+    def _fire(self, key: str):
+        """Trailing edge of the interval"""
+        state = self._keys[key]
+        state.timer = None
+        if state.pending and state.task is None:
+            self._start(key, state, trailing=True)
+
+    def in_flight(self, key: str) -> bool:
+        state = self._keys.get(key)
+        return bool(state and state.task)
+
+    async def drain(self):
+        """Wait for in-flight and pending runs to finish"""
+        while True:
+            tasks = [state.task for state in self._keys.values() if state.task]
+            pending = any(state.pending for state in self._keys.values())
+            if not tasks and not pending:
+                return
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            else:
+                await asyncio.sleep(self.min_interval / 10 or 0.001)
+
+    def cancel(self):
+        """Drop pending runs and cancel in-flight ones"""
+        for state in self._keys.values():
+            if state.timer is not None:
+                state.timer.cancel()
+                state.timer = None
+            if state.task is not None:
+                state.task.cancel()
+            state.pending = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get scheduling counters"""
+        return {
+            **self.stats,
+            "in_flight": sum(1 for state in self._keys.values() if state.task),
+            "pending": sum(1 for state in self._keys.values() if state.pending),
+            "min_interval": self.min_interval,
+            "runs_by_key": {key: state.runs for key, state in self._keys.items()}
+        }
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Streaming Indicators
+====================
+
+Constant-time technical indicators for MinhOS v3.
+
+Each tick updates running state instead of rescanning a window: rolling
+sums for simple moving averages and volume ratios, exponential smoothing
+for EMAs and Wilder's RSI, and Welford's add/remove recurrence for the
+rolling variance of returns. State is kept per symbol and readers take an
+immutable snapshot, so the analysis step never touches a price list.
+
+Ticks without a positive close do not update the price indicators.
+Running sums are re-added from their windows periodically to keep
+floating point drift bounded.
+"""
+
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, Mapping, Optional, Any
+
+
+class RollingMean:
+    """Mean of the last ``window`` values from a running sum"""
+
+    __slots__ = ('window', '_values', '_sum', '_updates')
+
+    RESYNC_EVERY = 10_000
+
+    def __init__(self, window: int):
+        self.window = window
+        self._values: deque = deque(maxlen=window)
+        self._sum = 0.0
+        self._updates = 0
+
+    def add(self, value: float):
+        """Push a value, dropping the oldest once the window is full"""
+        if len(self._values) == self.window:
+            self._sum -= self._values[0]
+        self._values.append(value)
+        self._sum += value
+
+        self._updates += 1
+        if self._updates % self.RESYNC_EVERY == 0:
+            self._sum = math.fsum(self._values)
+
+    def drop_oldest(self):
+        """Remove the oldest value before the window would evict it"""
+        self._sum -= self._values.popleft()
+        if not self._values:
+            self._sum = 0.0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self._sum / len(self._values) if self._values else None
+
+    @property
+    def oldest(self) -> Optional[float]:
+        return self._values[0] if self._values else None
+
+
+class RollingVariance:
+    """Sample variance of the last ``window`` values using Welford's add/remove updates"""
+
+    __slots__ = ('window', '_values', '_mean', '_m2')
+
+    def __init__(self, window: int):
+        self.window = window
+        self._values: deque = deque(maxlen=window)
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float):
+        """Push a value, removing the oldest once the window is full"""
+        if len(self._values) == self.window:
+            old = self._values[0]
+            n = len(self._values) - 1
+            if n:
+                delta = old - self._mean
+                self._mean -= delta / n
+                self._m2 -= delta * (old - self._mean)
+            else:
+                self._mean = self._m2 = 0.0
+
+        self._values.append(value)
+        n = len(self._values)
+        delta = value - self._mean
+        self._mean += delta / n
+        self._m2 += delta * (value - self._mean)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self._mean if self._values else None
+
+    @property
+    def variance(self) -> float:
+        n = len(self._values)
+        return max(self._m2, 0.0) / (n - 1) if n > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class EMA:
+    """Exponential moving average seeded with the first value"""
+
+    __slots__ = ('alpha', 'value')
+
+    def __init__(self, period: int):
+        self.alpha = 2.0 / (period + 1)
+        self.value: Optional[float] = None
+
+    def add(self, value: float):
+        self.value = value if self.value is None else self.value + self.alpha * (value - self.value)
+
+
+class WilderRSI:
+    """Wilder's RSI: simple average over the first period, then smoothed by 1/period"""
+
+    __slots__ = ('period', '_count', '_avg_gain', '_avg_loss')
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._count = 0
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+
+    def add(self, change: float):
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        self._count += 1
+
+        if self._count <= self.period:
+            # Seed with the running simple average
+            self._avg_gain += (gain - self._avg_gain) / self._count
+            self._avg_loss += (loss - self._avg_loss) / self._count
+        else:
+            self._avg_gain += (gain - self._avg_gain) / self.period
+            self._avg_loss += (loss - self._avg_loss) / self.period
+
+    @property
+    def value(self) -> Optional[float]:
+        if self._count < self.period:
+            return None
+        if self._avg_loss == 0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + self._avg_gain / self._avg_loss)
+
+
+@dataclass(frozen=True)
+class IndicatorSnapshot:
+    """Indicator values for one symbol as of its latest tick"""
+    symbol: str
+    ticks: int  # Ticks seen, capped at the analysis window
+    last_price: Optional[float]
+    window_open: Optional[float]  # Oldest price in the trend window
+    sma_short: Optional[float]
+    sma_long: Optional[float]
+    ema_short: Optional[float]
+    ema_long: Optional[float]
+    rsi_changes: int  # Price changes in the RSI window
+    avg_gain: float
+    avg_loss: float
+    rsi: Optional[float]  # Simple-average RSI over the window
+    rsi_wilder: Optional[float]
+    returns: int
+    return_mean: Optional[float]
+    return_std: float
+    volumes: int  # Ticks in the volume window that reported volume
+    positive_volumes: int
+    avg_volume: Optional[float]
+    recent_volume: Optional[float]
+    updated_at: float
+
+
+class SymbolIndicators:
+    """Streaming indicator state for a single symbol"""
+
+    def __init__(self, symbol: str, short_period: int = 10, long_period: int = 20,
+                 rsi_period: int = 14, volatility_period: int = 20,
+                 volume_period: int = 20, recent_volume_period: int = 5):
+        self.symbol = symbol
+        self.long_period = long_period
+        self.volume_period = volume_period
+
+        self.ticks = 0
+        self.last_price: Optional[float] = None
+        self.sma_short = RollingMean(short_period)
+        self.sma_long = RollingMean(long_period)
+        self.ema_short = EMA(short_period)
+        self.ema_long = EMA(long_period)
+        self.gains = RollingMean(rsi_period)
+        self.losses = RollingMean(rsi_period)
+        self.rsi_wilder = WilderRSI(rsi_period)
+        self.returns = RollingVariance(volatility_period - 1)
+
+        # Volume window: reported flags plus positive volumes tagged with their tick
+        self._volume_seen: deque = deque(maxlen=volume_period)
+        self._volume_reported = 0
+        self.positive_volume = RollingMean(volume_period)
+        self._positive_ticks: deque = deque()
+        self._recent_volume: deque = deque(maxlen=recent_volume_period)
+        self._volume_tick = 0
+        self.updated_at = 0.0
+
+    def update(self, close: Optional[float], volume: Optional[float] = None,
+               timestamp: Optional[float] = None):
+        """Apply one tick in O(1)"""
+        self.ticks += 1
+        self.updated_at = timestamp if timestamp is not None else time.time()
+        self._update_volume(volume)
+
+        if close is None or not close > 0:
+            return
+
+        previous = self.last_price
+        self.last_price = close
+        self.sma_short.add(close)
+        self.sma_long.add(close)
+        self.ema_short.add(close)
+        self.ema_long.add(close)
+
+        if previous is not None:
+            change = close - previous
+            self.gains.add(change if change > 0 else 0.0)
+            self.losses.add(-change if change < 0 else 0.0)
+            self.rsi_wilder.add(change)
+            self.returns.add(change / previous)
+
+    def _update_volume(self, volume: Optional[float]):
+        """Track reported and positive volumes over the last volume_period ticks"""
+        self._volume_tick += 1
+        tick = self._volume_tick
+
+        if len(self._volume_seen) == self.volume_period:
+            self._volume_reported -= self._volume_seen[0]
+        reported = volume is not None
+        self._volume_seen.append(reported)
+        self._volume_reported += reported
+
+        # Expire positive volumes that left the window
+        while self._positive_ticks and self._positive_ticks[0] <= tick - self.volume_period:
+            self._positive_ticks.popleft()
+            self.positive_volume.drop_oldest()
+
+        if reported and volume > 0:
+            self.positive_volume.add(volume)
+            self._positive_ticks.append(tick)
+            self._recent_volume.append(volume)
+
+    def snapshot(self) -> IndicatorSnapshot:
+        """Get current indicator values"""
+        avg_gain = self.gains.mean or 0.0
+        avg_loss = self.losses.mean or 0.0
+        if len(self.gains) < self.gains.window:
+            rsi = None
+        elif avg_loss == 0:
+            rsi = 100.0
+        else:
+            rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+        positives = len(self.positive_volume)
+        if positives >= self._recent_volume.maxlen:
+            recent_volume = sum(self._recent_volume) / len(self._recent_volume)
+        else:
+            recent_volume = self._recent_volume[-1] if positives else None
+
+        return IndicatorSnapshot(
+            symbol=self.symbol,
+            ticks=min(self.ticks, self.long_period),
+            last_price=self.last_price,
+            window_open=self.sma_long.oldest,
+            sma_short=self.sma_short.mean,
+            sma_long=self.sma_long.mean,
+            ema_short=self.ema_short.value,
+            ema_long=self.ema_long.value,
+            rsi_changes=len(self.gains),
+            avg_gain=avg_gain,
+            avg_loss=avg_loss,
+            rsi=rsi,
+            rsi_wilder=self.rsi_wilder.value,
+            returns=len(self.returns),
+            return_mean=self.returns.mean,
+            return_std=self.returns.std,
+            volumes=self._volume_reported,
+            positive_volumes=positives,
+            avg_volume=self.positive_volume.mean,
+            recent_volume=recent_volume,
+            updated_at=self.updated_at
+        )
+
+
+class IndicatorEngine:
+    """Per-symbol streaming indicators with snapshot reads"""
+
+    def __init__(self, **periods: int):
+        self.periods = periods
+        self._symbols: Dict[str, SymbolIndicators] = {}
+        self.stats = {"updates": 0}
+
+    def update(self, symbol: str, close: Optional[float], volume: Optional[float] = None,
+               timestamp: Optional[float] = None):
+        """Apply a tick for a symbol"""
+        state = self._symbols.get(symbol)
+        if state is None:
+            state = self._symbols[symbol] = SymbolIndicators(symbol, **self.periods)
+        state.update(close, volume, timestamp)
+        self.stats["updates"] += 1
+
+    def snapshot(self, symbol: str) -> Optional[IndicatorSnapshot]:
+        """Get a symbol's indicators, or None if it has not ticked"""
+        state = self._symbols.get(symbol)
+        return state.snapshot() if state else None
+
+    def symbols(self) -> Iterable[str]:
+        return list(self._symbols)
+
+    def compute(self, points: Iterable[Mapping[str, Any]], symbol: str = "") -> IndicatorSnapshot:
+        """One-off snapshot for a batch of points (e.g. a historical window)"""
+        state = SymbolIndicators(symbol, **self.periods)
+        for point in points:
+            state.update(point.get('close'), point.get('volume'))
+        return state.snapshot()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "symbols": {symbol: state.ticks for symbol, state in self._symbols.items()}
+        }
+
+
+def compute_indicators(points: Iterable[Mapping[str, Any]], symbol: str = "",
+                       periods: Optional[Mapping[str, int]] = None) -> IndicatorSnapshot:
+    """Replay a window into a snapshot; module-level so it can run in a worker process"""
+    return IndicatorEngine(**(periods or {})).compute(points, symbol)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Inference Executor
+==================
+
+Off-loop model inference for MinhOS v3.
+
+Keras ``model.predict`` and tree-ensemble ``predict`` calls block for
+milliseconds. Running them on the asyncio loop freezes every other task
+for that long. InferenceExecutor runs them on a small dedicated thread
+pool instead. Threads, not processes, because the models live in this
+process and their native predict paths release the GIL; shipping a model
+to another process per call would cost more than the inference itself.
+
+The pool is size-limited, so a slow model queues work rather than
+spawning threads. A caller that gives up on a result (a deadline)
+cancels it if it has not started yet.
+"""
+
+import asyncio
+import functools
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class InferenceExecutor:
+    """
+    Dedicated thread pool for blocking model calls with:
+    - A fixed worker count shared by all components
+    - Per-component call, error and busy-time counters
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self.max_workers = max_workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.stats: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: {"calls": 0, "errors": 0, "busy_seconds": 0.0}
+        )
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inference")
+            return self._pool
+
+    def _call(self, component: str, fn: Callable, args: tuple, kwargs: dict) -> Any:
+        started = time.perf_counter()
+        with self._lock:
+            self._in_flight += 1
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            with self._lock:
+                self.stats[component]["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self.stats[component]["calls"] += 1
+                self.stats[component]["busy_seconds"] += time.perf_counter() - started
+
+    async def run(self, component: str, fn: Callable, *args, **kwargs) -> Any:
+        """Run ``fn(*args, **kwargs)`` on the inference pool and await its result"""
+        call = functools.partial(self._call, component, fn, args, kwargs)
+        return await asyncio.get_running_loop().run_in_executor(self._get_pool(), call)
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "in_flight": self._in_flight,
+                "components": {name: dict(values) for name, values in self.stats.items()}
+            }
+
+
+# Global inference executor
+_inference_executor: Optional[InferenceExecutor] = None
+
+
+def get_inference_executor() -> InferenceExecutor:
+    """Get global inference executor instance"""
+    global _inference_executor
+    if _inference_executor is None:
+        _inference_executor = InferenceExecutor()
+    return _inference_executor
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Kelly Calibration Engine
+========================
+
+Vectorized fractional-Kelly calibration and risk-of-ruin simulation for
+MinhOS v3.
+
+Trade P&L is normalized into outcomes per unit staked (the average loss)
+and resampled with replacement into bootstrap paths. Every Kelly multiplier
+is replayed on the same paths at once: log wealth is a cumulative sum of
+log(1 + f·x) over a (multipliers, paths, trades) array, so a whole grid
+costs a handful of array passes. Paths are simulated in chunks to bound
+memory, and chunks can be handed to a process pool.
+"""
+
+import math
+import time
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple, Any
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class KellyCalibrationConfig:
+    """Calibration grid and simulation settings"""
+    multipliers: Tuple[float, ...] = field(
+        default_factory=lambda: tuple(np.round(np.arange(1, 51) * 0.02, 2).tolist())
+    )
+    paths: int = 10_000
+    trades_per_path: Optional[int] = None  # Defaults to the length of the trade history
+    trades_per_year: float = 252.0
+    ruin_level: float = 0.5  # Wealth, as a fraction of the start, that counts as ruin
+    drawdown_limit: float = 0.2  # Drawdown threshold for the exceedance probability
+    max_ruin_probability: float = 0.01  # Constraints used to pick the optimal multiplier
+    max_drawdown_probability: float = 0.05
+    chunk_elements: int = 2_000_000  # multipliers x paths x trades per chunk
+    seed: Optional[int] = None
+
+
+def normalize_outcomes(pnls: Sequence[float]) -> np.ndarray:
+    """Express trade P&L in units of the average loss (one unit staked per trade)"""
+    pnls = np.asarray(pnls, dtype=np.float64)
+    pnls = pnls[np.isfinite(pnls)]
+    losses = -pnls[pnls < 0]
+    unit = losses.mean() if len(losses) else np.abs(pnls).mean()
+    if not unit > 0:
+        raise ValueError("Trade history has no non-zero P&L")
+    return pnls / unit
+
+
+def full_kelly_fraction(outcomes: np.ndarray, iterations: int = 60) -> float:
+    """
+    Growth-optimal fraction of capital staked per trade.
+
+    Maximizes mean(log(1 + f·x)) by bisection on its derivative, which is
+    decreasing in f. For win/loss outcomes of +b/-1 this is p - q/b.
+    """
+    if outcomes.mean() <= 0:
+        return 0.0
+
+    worst = outcomes.min()
+    high = -1.0 / worst if worst < 0 else 1.0
+    low = 0.0
+    for _ in range(iterations):
+        mid = (low + high) / 2
+        if np.mean(outcomes / (1.0 + mid * outcomes)) > 0:
+            low = mid
+        else:
+            high = mid
+    return float(low)
+
+
+def simulate_paths(outcomes: np.ndarray, fractions: np.ndarray, paths: int, trades: int,
+                   seed: Any, ruin_level: float, trades_per_year: float) -> Dict[str, np.ndarray]:
+    """
+    Simulate one chunk of bootstrap paths for every fraction.
+
+    Module-level so it can run in a worker process. Returns per-path
+    (multipliers, paths) arrays of terminal log wealth, max drawdown, ruin
+    flags and annualized Sharpe of per-trade log returns (the Sharpe of
+    simple returns does not depend on the bet fraction).
+    """
+    rng = np.random.default_rng(seed)
+    draws = outcomes[rng.integers(0, len(outcomes), size=(paths, trades))]
+
+    # A trade losing more than the whole account leaves nothing
+    growth = 1.0 + fractions[:, None, None] * draws[None, :, :]
+    steps = np.log(np.maximum(growth, 1e-12))
+    del growth
+    log_wealth = np.cumsum(steps, axis=2)
+
+    # Peaks include the starting capital (log wealth 0)
+    peaks = np.maximum.accumulate(np.maximum(log_wealth, 0.0), axis=2)
+    max_drawdown = -np.expm1((log_wealth - peaks).min(axis=2))
+    del peaks
+
+    std = steps.std(axis=2)
+    sharpe = np.divide(steps.mean(axis=2), std, out=np.zeros_like(std), where=std > 0)
+
+    return {
+        "terminal": log_wealth[:, :, -1],
+        "max_drawdown": max_drawdown,
+        "ruined": log_wealth.min(axis=2) <= math.log(ruin_level),
+        "sharpe": sharpe * math.sqrt(trades_per_year)
+    }
+
+
+class KellyCalibrationEngine:
+    """
+    Fractional Kelly calibration with:
+    - Growth-optimal fraction from the empirical outcome distribution
+    - Bootstrap paths replayed at every multiplier via broadcasting
+    - Terminal wealth, drawdown, ruin and Sharpe distributions per multiplier
+    - Optional process pool for path chunks
+    """
+
+    def __init__(self, config: Optional[KellyCalibrationConfig] = None):
+        self.config = config or KellyCalibrationConfig()
+
+    def _chunks(self, multipliers: int, trades: int) -> List[int]:
+        """Split the paths so each chunk stays under the element budget"""
+        per_chunk = max(1, self.config.chunk_elements // max(1, multipliers * trades))
+        full, remainder = divmod(self.config.paths, per_chunk)
+        return [per_chunk] * full + ([remainder] if remainder else [])
+
+    def calibrate(self, pnls: Sequence[float], executor=None) -> Dict[str, Any]:
+        """
+        Calibrate the multiplier grid on a history of per-trade P&L.
+
+        ``executor`` may be any concurrent.futures executor; chunks are
+        seeded independently so results do not depend on where they ran.
+        """
+        started = time.perf_counter()
+        config = self.config
+
+        outcomes = normalize_outcomes(pnls)
+        kelly = full_kelly_fraction(outcomes)
+        multipliers = np.asarray(config.multipliers, dtype=np.float64)
+        fractions = multipliers * kelly
+        trades = config.trades_per_path or len(outcomes)
+
+        chunks = self._chunks(len(multipliers), trades)
+        seeds = np.random.SeedSequence(config.seed).spawn(len(chunks))
+        args = [(outcomes, fractions, paths, trades, seed, config.ruin_level, config.trades_per_year)
+                for paths, seed in zip(chunks, seeds)]
+
+        if executor is not None:
+            futures = [executor.submit(simulate_paths, *chunk_args) for chunk_args in args]
+            parts = [future.result() for future in futures]
+        else:
+            parts = [simulate_paths(*chunk_args) for chunk_args in args]
+
+        combined = {key: np.concatenate([part[key] for part in parts], axis=1) for key in parts[0]}
+        results = [self._summarize(multiplier, fraction, i, combined, trades)
+                   for i, (multiplier, fraction) in enumerate(zip(multipliers, fractions))]
+
+        wins = outcomes[outcomes > 0]
+        losses = outcomes[outcomes < 0]
+        return {
+            "full_kelly_fraction": round(kelly, 6),
+            "trades": len(outcomes),
+            "win_rate": round(float(len(wins) / len(outcomes)), 4),
+            "win_loss_ratio": round(float(wins.mean() / -losses.mean()), 4) if len(wins) and len(losses) else 1.0,
+            "paths": config.paths,
+            "trades_per_path": trades,
+            "ruin_level": config.ruin_level,
+            "drawdown_limit": config.drawdown_limit,
+            "results": results,
+            "optimal_multiplier": self._select_optimal(results),
+            "chunks": len(chunks),
+            "compute_ms": round((time.perf_counter() - started) * 1000, 1)
+        }
+
+    def _summarize(self, multiplier: float, fraction: float, i: int,
+                   combined: Dict[str, np.ndarray], trades: int) -> Dict[str, Any]:
+        """Distribution statistics for one multiplier"""
+        wealth = np.exp(combined["terminal"][i])
+        drawdown = combined["max_drawdown"][i]
+        sharpe = combined["sharpe"][i]
+        percentiles = np.percentile(wealth, [5, 25, 50, 75, 95])
+        median_log = float(np.median(combined["terminal"][i]))
+
+        return {
+            "multiplier": float(multiplier),
+            "fraction": round(float(fraction), 6),
+            "terminal_wealth": {
+                "mean": round(float(wealth.mean()), 4),
+                **{f"p{p}": round(float(v), 4) for p, v in zip((5, 25, 50, 75, 95), percentiles)}
+            },
+            "median_growth_per_trade": median_log / trades,
+            "annual_return": round(math.expm1(median_log / trades * self.config.trades_per_year), 4),
+            "max_drawdown": {
+                "mean": round(float(drawdown.mean()), 4),
+                "p50": round(float(np.median(drawdown)), 4),
+                "p95": round(float(np.percentile(drawdown, 95)), 4)
+            },
+            "probability_of_ruin": round(float(combined["ruined"][i].mean()), 4),
+            "probability_drawdown_exceeds": round(float((drawdown > self.config.drawdown_limit).mean()), 4),
+            "sharpe": {
+                "mean": round(float(sharpe.mean()), 4),
+                "p50": round(float(np.median(sharpe)), 4)
+            }
+        }
+
+    def _select_optimal(self, results: List[Dict[str, Any]]) -> float:
+        """Highest median growth within the ruin and drawdown constraints"""
+        if not results:
+            return 0.0
+
+        admissible = [
+            r for r in results
+            if r["probability_of_ruin"] <= self.config.max_ruin_probability
+            and r["probability_drawdown_exceeds"] <= self.config.max_drawdown_probability
+        ]
+        if not admissible:
+            return min(r["multiplier"] for r in results)
+        return max(admissible, key=lambda r: r["median_growth_per_trade"])["multiplier"]
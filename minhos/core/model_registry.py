@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Model Registry and Hot Swap
+===========================
+
+Versioned model artifacts and zero-downtime model deployment for MinhOS v3.
+
+ModelRegistry publishes each model version into its own directory, which
+is never rewritten: files are copied into a staging directory, hashed,
+made read-only and renamed into place in one step. A manifest records the
+metadata and SHA-256 checksum of every file. The active version of each
+model is a small pointer file replaced atomically, with the versions it
+replaced kept as a rollback history.
+
+Array artifacts are stored as a JSON spec plus one .npy file per array, so
+load_arrays() can memory-map them: processes serving the same version
+share the OS page cache instead of each holding a private copy.
+
+ModelDeployer swaps a served model without a restart. It verifies the
+checksums, loads the new version on a worker thread, runs it next to the
+current model on recent inputs (shadow inference), and only then replaces
+the reference the predictor serves from. Predictions already running keep
+the object they started with. The replaced object stays loaded, so a
+rollback is another reference swap.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import shutil
+import stat
+import tempfile
+import threading
+import uuid
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROOT = Path(__file__).parent.parent.parent / "ml_models" / "registry"
+
+MANIFEST = "manifest.json"
+ACTIVE = "ACTIVE"
+SPEC = "spec.json"
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def save_arrays(directory: Union[str, Path], spec: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> Path:
+    """Write a JSON spec and one .npy file per array into ``directory``"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    with open(directory / SPEC, "w") as f:
+        json.dump(spec, f)
+    for name, array in arrays.items():
+        np.save(directory / f"{name}.npy", np.ascontiguousarray(array), allow_pickle=False)
+    return directory
+
+
+def load_arrays(directory: Union[str, Path], mmap: bool = True) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """Read save_arrays() output; arrays are read-only memory maps unless ``mmap`` is False"""
+    directory = Path(directory)
+    with open(directory / SPEC) as f:
+        spec = json.load(f)
+    arrays = {path.stem: np.load(path, mmap_mode="r" if mmap else None, allow_pickle=False)
+              for path in sorted(directory.glob("*.npy"))}
+    return spec, arrays
+
+
+class ModelRegistry:
+    """
+    Immutable model versions under ``root/<model>/<version>/``:
+    - publish() / publish_arrays(): add a version with checksummed files
+    - verify(): re-hash a version against its manifest
+    - activate() / rollback(): move the ACTIVE pointer
+    """
+
+    def __init__(self, root: Optional[Union[str, Path]] = None):
+        self.root = Path(root) if root is not None else DEFAULT_ROOT
+        self._lock = threading.Lock()
+
+    def publish(self, model: str, source: Union[str, Path], metadata: Optional[Dict[str, Any]] = None) -> str:
+        """Copy a file or directory of artifacts into a new version; returns the version id"""
+        source = Path(source)
+        model_dir = self.root / model
+        model_dir.mkdir(parents=True, exist_ok=True)
+        staging = model_dir / f".staging-{uuid.uuid4().hex}"
+
+        try:
+            if source.is_dir():
+                shutil.copytree(source, staging)
+            else:
+                staging.mkdir()
+                shutil.copy2(source, staging / source.name)
+
+            files = {}
+            for path in sorted(p for p in staging.rglob("*") if p.is_file()):
+                files[path.relative_to(staging).as_posix()] = {"sha256": _sha256(path), "bytes": path.stat().st_size}
+            if not files:
+                raise ValueError(f"No model artifacts in {source}")
+
+            content = hashlib.sha256(json.dumps(files, sort_keys=True).encode()).hexdigest()
+            version = f"{datetime.now().strftime('%Y%m%dT%H%M%S%f')}-{content[:8]}"
+            manifest = {
+                "model": model,
+                "version": version,
+                "created": datetime.now().isoformat(),
+                "metadata": metadata or {},
+                "files": files
+            }
+            with open(staging / MANIFEST, "w") as f:
+                json.dump(manifest, f, indent=2, default=str)
+
+            for path in staging.rglob("*"):
+                if path.is_file():
+                    path.chmod(stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+            os.rename(staging, model_dir / version)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        logger.info(f"📦 Published {model} version {version} ({len(files)} files)")
+        return version
+
+    def publish_arrays(self, model: str, spec: Dict[str, Any], arrays: Dict[str, np.ndarray],
+                       metadata: Optional[Dict[str, Any]] = None) -> str:
+        """Publish a spec and arrays (e.g. a kernel's to_arrays()) in the memory-mappable layout"""
+        (self.root / model).mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=self.root / model, prefix=".export-") as directory:
+            save_arrays(directory, spec, arrays)
+            return self.publish(model, directory, metadata)
+
+    def versions(self, model: str) -> List[str]:
+        """Published versions, oldest first"""
+        model_dir = self.root / model
+        if not model_dir.exists():
+            return []
+        return sorted(p.name for p in model_dir.iterdir() if p.is_dir() and not p.name.startswith("."))
+
+    def path(self, model: str, version: str) -> Path:
+        return self.root / model / version
+
+    def manifest(self, model: str, version: str) -> Dict[str, Any]:
+        with open(self.path(model, version) / MANIFEST) as f:
+            return json.load(f)
+
+    def verify(self, model: str, version: str) -> bool:
+        """True if every file in the manifest is present with its recorded checksum"""
+        try:
+            directory = self.path(model, version)
+            for name, entry in self.manifest(model, version)["files"].items():
+                if _sha256(directory / name) != entry["sha256"]:
+                    logger.error(f"❌ Checksum mismatch: {model} {version} {name}")
+                    return False
+            return True
+        except Exception as e:
+            logger.error(f"❌ Cannot verify {model} {version}: {e}")
+            return False
+
+    def _read_pointer(self, model: str) -> Dict[str, Any]:
+        try:
+            with open(self.root / model / ACTIVE) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"version": None, "history": []}
+
+    def _write_pointer(self, model: str, pointer: Dict[str, Any]):
+        """Write-then-rename, so readers see either the old or the new pointer"""
+        model_dir = self.root / model
+        fd, tmp = tempfile.mkstemp(dir=model_dir, prefix=f".{ACTIVE}-")
+        with os.fdopen(fd, "w") as f:
+            json.dump(dict(pointer, updated=datetime.now().isoformat()), f)
+        os.replace(tmp, model_dir / ACTIVE)
+
+    def active_version(self, model: str) -> Optional[str]:
+        return self._read_pointer(model)["version"]
+
+    def activate(self, model: str, version: str):
+        if not self.path(model, version).is_dir():
+            raise ValueError(f"Unknown {model} version: {version}")
+        with self._lock:
+            pointer = self._read_pointer(model)
+            if pointer["version"] == version:
+                return
+            history = pointer["history"] + ([pointer["version"]] if pointer["version"] else [])
+            self._write_pointer(model, {"version": version, "history": history})
+        logger.info(f"✅ {model} active version: {version}")
+
+    def rollback(self, model: str) -> Optional[str]:
+        """Re-activate the previously active version; returns it, or None if there is none"""
+        with self._lock:
+            pointer = self._read_pointer(model)
+            if not pointer["history"]:
+                return None
+            version = pointer["history"][-1]
+            self._write_pointer(model, {"version": version, "history": pointer["history"][:-1]})
+        logger.info(f"⏪ {model} rolled back to version {version}")
+        return version
+
+
+class ModelDeployer:
+    """
+    Hot swap of served models:
+    - register(): how to load, serve and shadow-test one model
+    - deploy(): verify, load in the background, shadow-test, swap, activate
+    - rollback(): swap back to the previous version
+    """
+
+    def __init__(self, registry: Optional[ModelRegistry] = None, keep_previous: int = 2):
+        self.registry = registry or get_model_registry()
+        self.keep_previous = keep_previous
+        self._models: Dict[str, Dict[str, Any]] = {}
+
+    def register(self, name: str, load: Callable[[Path], Any], apply: Callable[[Any, Optional[str]], None],
+                 infer: Callable[[Any, np.ndarray], np.ndarray],
+                 recent_inputs: Optional[Callable[[], Optional[np.ndarray]]] = None,
+                 current: Any = None, max_divergence: Optional[float] = None, load_active: bool = True):
+        """
+        Register a served model.
+
+        ``load`` builds a model from a version directory, ``apply(model, version)``
+        makes the predictor serve it and ``infer(model, inputs)`` runs a batch.
+        ``current`` is the model served now, if any. With ``load_active``, the
+        registry's active version (if any) is loaded and applied right away.
+        """
+        self._models[name] = {
+            "load": load, "apply": apply, "infer": infer, "recent_inputs": recent_inputs,
+            "max_divergence": max_divergence, "version": None, "model": current,
+            "previous": deque(maxlen=self.keep_previous), "lock": asyncio.Lock(), "last_deploy": None
+        }
+        version = self.registry.active_version(name) if load_active else None
+        if version is not None:
+            try:
+                self._apply(name, load(self.registry.path(name, version)), version, keep=False)
+            except Exception as e:
+                logger.error(f"❌ Cannot load active {name} version {version}: {e}")
+
+    def _apply(self, name: str, model: Any, version: Optional[str], keep: bool = True):
+        served = self._models[name]
+        if keep and served["model"] is not None:
+            served["previous"].append((served["version"], served["model"]))
+        served["apply"](model, version)
+        served["model"], served["version"] = model, version
+
+    def _shadow(self, served: Dict[str, Any], candidate: Any, inputs: Optional[np.ndarray]) -> Dict[str, Any]:
+        """Candidate and current model on the same recent inputs"""
+        if inputs is None or len(inputs) == 0:
+            return {"rows": 0}
+        new = np.asarray(served["infer"](candidate, inputs), dtype=np.float64)
+        if len(new) != len(inputs) or not np.isfinite(new).all():
+            raise ValueError("candidate produced missing or non-finite outputs")
+        shadow = {"rows": len(inputs)}
+        if served["model"] is not None:
+            old = np.asarray(served["infer"](served["model"], inputs), dtype=np.float64)
+            if old.shape == new.shape:
+                shadow["mean_abs_diff"] = float(np.mean(np.abs(new - old)))
+                shadow["max_abs_diff"] = float(np.max(np.abs(new - old)))
+        limit = served["max_divergence"]
+        if limit is not None and shadow.get("mean_abs_diff", 0.0) > limit:
+            raise ValueError(f"candidate diverges from current model ({shadow['mean_abs_diff']:.4f} > {limit})")
+        return shadow
+
+    async def deploy(self, name: str, version: str) -> Dict[str, Any]:
+        """Swap ``name`` to ``version``; the current model keeps serving unless every check passes"""
+        served = self._models.get(name)
+        result = {"model": name, "version": version, "deployed": False}
+
+        if served is None:
+            # Not served in this process: activate for the next process that loads it
+            if self.registry.verify(name, version):
+                self.registry.activate(name, version)
+                result.update(deployed=True, swapped=False)
+            else:
+                result["reason"] = "checksum mismatch"
+            return result
+
+        async with served["lock"]:
+            try:
+                if not await asyncio.to_thread(self.registry.verify, name, version):
+                    raise ValueError("checksum mismatch")
+                candidate = await asyncio.to_thread(served["load"], self.registry.path(name, version))
+                # Snapshot before shadowing: the LSTM appends to its buffer on this loop thread,
+                # the ensemble on the inference pool under its own lock
+                inputs = served["recent_inputs"]() if served["recent_inputs"] is not None else None
+                result["shadow"] = await asyncio.to_thread(self._shadow, served, candidate, inputs)
+
+                previous = served["version"]
+                self._apply(name, candidate, version)
+                self.registry.activate(name, version)
+                result.update(deployed=True, swapped=True, previous=previous)
+                logger.info(f"🔄 {name} swapped to version {version} (shadow: {result['shadow']})")
+            except Exception as e:
+                result["reason"] = str(e)
+                logger.error(f"❌ {name} version {version} not deployed: {e}")
+            served["last_deploy"] = result
+        return result
+
+    def rollback(self, name: str) -> Optional[str]:
+        """Serve the previously active version again; returns it, or None if there is none"""
+        version = self.registry.rollback(name)
+        served = self._models.get(name)
+        if version is None or served is None:
+            return version
+
+        previous: Deque[Tuple[Optional[str], Any]] = served["previous"]
+        while previous:
+            kept_version, model = previous.pop()
+            if kept_version == version:
+                self._apply(name, model, version, keep=False)
+                return version
+        # Not kept in memory: memory-mapped load of the immutable version
+        self._apply(name, served["load"](self.registry.path(name, version)), version, keep=False)
+        return version
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            name: {
+                "version": served["version"],
+                "active_version": self.registry.active_version(name),
+                "previous": [version for version, _ in served["previous"]],
+                "last_deploy": served["last_deploy"]
+            }
+            for name, served in self._models.items()
+        }
+
+
+# Global model registry and deployer
+_model_registry: Optional[ModelRegistry] = None
+_model_deployer: Optional[ModelDeployer] = None
+
+
+def get_model_registry() -> ModelRegistry:
+    """Get global model registry instance"""
+    global _model_registry
+    if _model_registry is None:
+        _model_registry = ModelRegistry()
+    return _model_registry
+
+
+def get_model_deployer() -> ModelDeployer:
+    """Get global model deployer instance"""
+    global _model_deployer
+    if _model_deployer is None:
+        _model_deployer = ModelDeployer(get_model_registry())
+    return _model_deployer
@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+Pattern Engine
+==============
+
+Vectorized market pattern detection across symbols for MinhOS v3.
+
+Each symbol's recent bars are packed into right-aligned (symbols, bars)
+arrays, padded with NaN on the left when a history is short, so the latest
+bar of every symbol sits in the last column. Every pattern kind is then a
+handful of array operations over all symbols at once: breakouts and
+breakdowns, volume spikes, volatility expansion, trend reversals and
+tested support/resistance levels. Market conditions are computed per
+symbol in the same pass, once per detection cycle.
+
+Thresholds and lookbacks match the original list-based detectors. Only
+bars with a positive close are packed, so divisions by price are safe.
+When a PriceLevelBook is passed, support/resistance comes from its
+long-lived level index instead of the window's own closes.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from .price_levels import PriceLevelBook
+
+
+@dataclass
+class PatternEngineConfig:
+    """Detection thresholds and lookbacks"""
+    breakout_lookback: int = 20
+    breakout_threshold: float = 0.005
+    volume_min_bars: int = 20
+    volume_spike_ratio: float = 2.0
+    volatility_bars: int = 30
+    volatility_recent: int = 10
+    volatility_expansion_ratio: float = 1.5
+    reversal_bars: int = 30
+    reversal_move: float = 0.02
+    level_bars: int = 50
+    level_exclude_recent: int = 5
+    level_band: float = 0.05
+    level_min_tests: int = 3
+    level_max_hits: int = 5  # Strongest indexed levels reported per symbol
+    realtime_min_bars: int = 10
+    realtime_breakout_threshold: float = 0.003
+    realtime_volume_spike_ratio: float = 1.8
+    conditions_bars: int = 20
+    conditions_min_bars: int = 10
+
+
+@dataclass
+class PatternHit:
+    """A pattern detected for one symbol"""
+    symbol: str
+    kind: str  # PatternType value
+    confidence: float
+    description: str
+    context: Dict[str, Any]
+    suggestions: List[str] = field(default_factory=list)
+
+
+def _field(record: Any, name: str, default: Any = None) -> Any:
+    if isinstance(record, Mapping):
+        value = record.get(name, default)
+    else:
+        value = getattr(record, name, default)
+    return default if value is None else value
+
+
+class PriceWindows:
+    """Right-aligned per-symbol bar arrays; short histories are NaN-padded on the left"""
+
+    def __init__(self, symbols: Sequence[str], close: np.ndarray, high: np.ndarray,
+                 low: np.ndarray, volume: np.ndarray, lengths: np.ndarray):
+        self.symbols = list(symbols)
+        self.close = close
+        self.high = high
+        self.low = low
+        self.volume = volume
+        self.lengths = lengths
+
+    @property
+    def bars(self) -> int:
+        return self.close.shape[1]
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    @classmethod
+    def from_records(cls, records: Mapping[str, Sequence[Any]], bars: int) -> "PriceWindows":
+        """
+        Pack chronological records (dicts or MarketData) per symbol.
+
+        Records without a positive close are skipped; only the latest
+        ``bars`` records of each symbol are kept.
+        """
+        symbols = list(records)
+        shape = (len(symbols), bars)
+        close = np.full(shape, np.nan)
+        high = np.full(shape, np.nan)
+        low = np.full(shape, np.nan)
+        volume = np.full(shape, np.nan)
+        lengths = np.zeros(len(symbols), dtype=np.int64)
+
+        for i, symbol in enumerate(symbols):
+            rows = [r for r in records[symbol] if (_field(r, 'close') or 0) > 0][-bars:]
+            n = len(rows)
+            if not n:
+                continue
+            closes = [float(_field(r, 'close')) for r in rows]
+            close[i, bars - n:] = closes
+            high[i, bars - n:] = [float(_field(r, 'high', c)) for r, c in zip(rows, closes)]
+            low[i, bars - n:] = [float(_field(r, 'low', c)) for r, c in zip(rows, closes)]
+            volume[i, bars - n:] = [float(_field(r, 'volume', 0)) for r in rows]
+            lengths[i] = n
+
+        return cls(symbols, close, high, low, volume, lengths)
+
+    def rows_with(self, bars: int) -> np.ndarray:
+        """Indices of symbols with at least ``bars`` bars"""
+        return np.flatnonzero(self.lengths >= bars)
+
+
+class PatternEngine:
+    """
+    Multi-symbol pattern detection with:
+    - One array pass per pattern kind over every symbol
+    - Per-symbol market conditions computed once per cycle
+    - Full and real-time (quick) detector sets
+    """
+
+    def __init__(self, config: Optional[PatternEngineConfig] = None):
+        self.config = config or PatternEngineConfig()
+
+    def detect(self, windows: PriceWindows, levels: Optional[PriceLevelBook] = None) -> List[PatternHit]:
+        """Run every market pattern kind; levels come from ``levels`` when given"""
+        hits: List[PatternHit] = []
+        if not len(windows):
+            return hits
+        hits.extend(self._breakouts(windows))
+        hits.extend(self._volume_spikes(windows, self.config.volume_min_bars, self.config.volume_spike_ratio))
+        hits.extend(self._volatility_expansion(windows))
+        hits.extend(self._trend_reversals(windows))
+        if levels is None:
+            hits.extend(self._support_resistance(windows))
+        else:
+            hits.extend(self._indexed_levels(windows, levels))
+        return hits
+
+    def detect_realtime(self, windows: PriceWindows) -> List[PatternHit]:
+        """Quick breakout and volume spike checks on short windows"""
+        hits: List[PatternHit] = []
+        if not len(windows):
+            return hits
+        hits.extend(self._realtime_breakouts(windows))
+        hits.extend(self._volume_spikes(windows, self.config.realtime_min_bars,
+                                        self.config.realtime_volume_spike_ratio, realtime=True))
+        return hits
+
+    def market_conditions(self, windows: PriceWindows, timestamp: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Volatility, trend and range over each symbol's latest bars"""
+        config = self.config
+        rows = windows.rows_with(config.conditions_min_bars)
+        if not len(rows):
+            return {}
+
+        span = min(config.conditions_bars, windows.bars)
+        prices = windows.close[rows, -span:]
+        n = np.minimum(windows.lengths[rows], span)
+        first = prices[np.arange(len(rows)), span - n]
+        last = prices[:, -1]
+
+        returns = np.diff(prices, axis=1) / prices[:, :-1]
+        valid = ~np.isnan(returns)
+        count = valid.sum(axis=1)
+        mean = np.where(valid, returns, 0.0).sum(axis=1) / count
+        squares = np.where(valid, (returns - mean[:, None]) ** 2, 0.0).sum(axis=1)
+        volatility = np.sqrt(squares / np.maximum(count - 1, 1))
+
+        high = np.where(np.isnan(prices), -np.inf, prices).max(axis=1)
+        low = np.where(np.isnan(prices), np.inf, prices).min(axis=1)
+        trend = (last - first) / first
+
+        return {
+            windows.symbols[r]: {
+                'volatility': float(volatility[i]),
+                'trend': float(trend[i]),
+                'current_price': float(last[i]),
+                'price_range': float(high[i] - low[i]),
+                'timestamp': timestamp
+            }
+            for i, r in enumerate(rows)
+        }
+
+    def _breakouts(self, windows: PriceWindows) -> List[PatternHit]:
+        """Close beyond the high/low of the prior lookback bars"""
+        config = self.config
+        rows = windows.rows_with(config.breakout_lookback)
+        if not len(rows):
+            return []
+
+        prior = windows.close[rows, -config.breakout_lookback:-1]
+        current = windows.close[rows, -1]
+        recent_high = prior.max(axis=1)
+        recent_low = prior.min(axis=1)
+
+        hits = []
+        for i in np.flatnonzero(current > recent_high * (1 + config.breakout_threshold)):
+            level, price = float(recent_high[i]), float(current[i])
+            hits.append(PatternHit(
+                symbol=windows.symbols[rows[i]],
+                kind="price_breakout",
+                confidence=0.8,
+                description=f"Price breakout above {level:.2f}",
+                context={'breakout_level': level, 'current_price': price, 'strength': (price - level) / level},
+                suggestions=["Consider long entry", "Monitor for continuation", "Set tight stops"]
+            ))
+        for i in np.flatnonzero(current < recent_low * (1 - config.breakout_threshold)):
+            level, price = float(recent_low[i]), float(current[i])
+            hits.append(PatternHit(
+                symbol=windows.symbols[rows[i]],
+                kind="price_breakdown",
+                confidence=0.8,
+                description=f"Price breakdown below {level:.2f}",
+                context={'breakdown_level': level, 'current_price': price, 'strength': (level - price) / level},
+                suggestions=["Consider short entry", "Monitor for continuation", "Set tight stops"]
+            ))
+        return hits
+
+    def _realtime_breakouts(self, windows: PriceWindows) -> List[PatternHit]:
+        """Close above the high of every earlier bar in the window"""
+        config = self.config
+        rows = windows.rows_with(config.realtime_min_bars)
+        if not len(rows):
+            return []
+
+        prior = windows.close[rows, :-1]
+        recent_high = np.where(np.isnan(prior), -np.inf, prior).max(axis=1)
+        current = windows.close[rows, -1]
+
+        return [
+            PatternHit(
+                symbol=windows.symbols[rows[i]],
+                kind="price_breakout",
+                confidence=0.7,
+                description=f"Real-time breakout above {recent_high[i]:.2f}",
+                context={'breakout_level': float(recent_high[i]), 'current_price': float(current[i])}
+            )
+            for i in np.flatnonzero(current > recent_high * (1 + config.realtime_breakout_threshold))
+        ]
+
+    def _volume_spikes(self, windows: PriceWindows, min_bars: int, ratio: float,
+                       realtime: bool = False) -> List[PatternHit]:
+        """Latest positive volume against the mean of the earlier positive volumes"""
+        volume = windows.volume
+        positive = volume > 0
+        count = positive.sum(axis=1)
+        rows = np.flatnonzero(count >= min_bars)
+        if not len(rows):
+            return []
+
+        positive = positive[rows]
+        last = windows.bars - 1 - np.argmax(positive[:, ::-1], axis=1)
+        current = volume[rows, last]
+        total = np.where(positive, volume[rows], 0.0).sum(axis=1)
+        average = (total - current) / (count[rows] - 1)
+
+        hits = []
+        for i in np.flatnonzero(current > average * ratio):
+            current_volume, average_volume = float(current[i]), float(average[i])
+            if realtime:
+                hits.append(PatternHit(
+                    symbol=windows.symbols[rows[i]],
+                    kind="volume_spike",
+                    confidence=0.6,
+                    description=f"Real-time volume spike: {current_volume:.0f}",
+                    context={'current_volume': current_volume, 'average_volume': average_volume}
+                ))
+            else:
+                hits.append(PatternHit(
+                    symbol=windows.symbols[rows[i]],
+                    kind="volume_spike",
+                    confidence=0.7,
+                    description=f"Volume spike: {current_volume:.0f} vs {average_volume:.0f} average",
+                    context={
+                        'current_volume': current_volume,
+                        'average_volume': average_volume,
+                        'spike_ratio': current_volume / average_volume
+                    },
+                    suggestions=["Expect increased volatility", "Monitor price action", "Potential trend change"]
+                ))
+        return hits
+
+    def _volatility_expansion(self, windows: PriceWindows) -> List[PatternHit]:
+        """Recent return volatility well above the window's"""
+        config = self.config
+        rows = windows.rows_with(config.volatility_bars)
+        if not len(rows):
+            return []
+
+        prices = windows.close[rows, -config.volatility_bars:]
+        returns = np.diff(prices, axis=1) / prices[:, :-1]
+        current = returns[:, -config.volatility_recent:].std(axis=1, ddof=1)
+        historical = returns.std(axis=1, ddof=1)
+
+        return [
+            PatternHit(
+                symbol=windows.symbols[rows[i]],
+                kind="volatility_expansion",
+                confidence=0.75,
+                description=f"Volatility expansion: {current[i]:.4f} vs {historical[i]:.4f}",
+                context={
+                    'current_volatility': float(current[i]),
+                    'historical_volatility': float(historical[i]),
+                    'expansion_ratio': float(current[i] / historical[i]) if historical[i] > 0 else 0
+                },
+                suggestions=["Reduce position sizes", "Widen stops", "Expect larger moves"]
+            )
+            for i in np.flatnonzero(current > historical * config.volatility_expansion_ratio)
+        ]
+
+    def _trend_reversals(self, windows: PriceWindows) -> List[PatternHit]:
+        """A sharp recent move against the preceding move"""
+        config = self.config
+        rows = windows.rows_with(config.reversal_bars)
+        if not len(rows):
+            return []
+
+        prices = windows.close[rows, -config.reversal_bars:]
+        p_now, p_10, p_20 = prices[:, -1], prices[:, -10], prices[:, -20]
+        recent = (p_now - p_10) / p_10
+        longer = (p_10 - p_20) / p_20
+        sma_short = prices[:, -10:].mean(axis=1)
+        sma_long = prices[:, -20:].mean(axis=1)
+
+        return [
+            PatternHit(
+                symbol=windows.symbols[rows[i]],
+                kind="trend_reversal",
+                confidence=0.65,
+                description="Potential trend reversal detected",
+                context={
+                    'recent_trend': float(recent[i]),
+                    'longer_trend': float(longer[i]),
+                    'sma_short': float(sma_short[i]),
+                    'sma_long': float(sma_long[i])
+                },
+                suggestions=["Wait for confirmation", "Consider counter-trend", "Monitor closely"]
+            )
+            for i in np.flatnonzero((np.abs(recent) > config.reversal_move) & (recent * longer < 0))
+        ]
+
+    def _support_resistance(self, windows: PriceWindows) -> List[PatternHit]:
+        """Whole-number price levels near the current price touched repeatedly"""
+        config = self.config
+        rows = windows.rows_with(config.level_bars)
+        if not len(rows):
+            return []
+
+        prices = windows.close[rows, -config.level_bars:]
+        current = prices[:, -1]
+        levels = np.round(prices[:, :-config.level_exclude_recent])
+        near = np.abs(levels - current[:, None]) / current[:, None] < config.level_band
+
+        # Count touches per (symbol, level) with one sort over every symbol
+        row_idx, col_idx = np.nonzero(near)
+        values = levels[row_idx, col_idx]
+        order = np.lexsort((values, row_idx))
+        row_idx, values = row_idx[order], values[order]
+        starts = np.flatnonzero(np.r_[True, (row_idx[1:] != row_idx[:-1]) | (values[1:] != values[:-1])])
+        counts = np.diff(np.r_[starts, len(values)])
+
+        hits = []
+        for start, tests in zip(starts[counts >= config.level_min_tests], counts[counts >= config.level_min_tests]):
+            i = row_idx[start]
+            level, price, tests = float(values[start]), float(current[i]), int(tests)
+            level_type = "resistance" if level > price else "support"
+            hits.append(PatternHit(
+                symbol=windows.symbols[rows[i]],
+                kind="support_resistance",
+                confidence=min(0.9, 0.5 + tests * 0.1),
+                description=f"{level_type.title()} level at {level:.0f} (tested {tests} times)",
+                context={
+                    'level': level,
+                    'type': level_type,
+                    'tests': tests,
+                    'current_price': price,
+                    'distance_pct': abs(level - price) / price
+                },
+                suggestions=[f"Watch for {level_type} at {level:.0f}", "Plan entry/exit around level"]
+            ))
+        return hits
+
+    def _indexed_levels(self, windows: PriceWindows, levels: PriceLevelBook) -> List[PatternHit]:
+        """Strongest persistent levels near the current price from the level index"""
+        config = self.config
+        hits = []
+        for i in windows.rows_with(1):
+            symbol = windows.symbols[i]
+            price = float(windows.close[i, -1])
+            found = levels.levels(symbol, price=price, band=config.level_band,
+                                  min_touches=config.level_min_tests, limit=config.level_max_hits)
+            for level in found:
+                tests = int(round(level.touches))
+                level_type = "resistance" if level.price > price else "support"
+                hits.append(PatternHit(
+                    symbol=symbol,
+                    kind="support_resistance",
+                    confidence=min(0.9, 0.5 + level.strength * 0.1),
+                    description=f"{level_type.title()} level at {level.price:g} (tested {tests} times)",
+                    context={
+                        'level': level.price,
+                        'type': level_type,
+                        'tests': tests,
+                        'pivot_highs': level.pivot_highs,
+                        'pivot_lows': level.pivot_lows,
+                        'current_price': price,
+                        'distance_pct': abs(level.price - price) / price
+                    },
+                    suggestions=[f"Watch for {level_type} at {level.price:g}", "Plan entry/exit around level"]
+                ))
+        return hits
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Shared SQLite Persistence Layer
+===============================
+
+One writer thread per database file for MinhOS v3 services.
+
+Each writer owns a long-lived WAL connection with tuned ``mmap_size`` and
+cache size, drains its queue into batched transactions and resolves the
+caller's future once the batch commits. Reads use long-lived per-thread
+connections, so services never open a fresh connection or commit on the
+asyncio event loop.
+
+Writers are flushed and stopped by close_all_writers(), which the
+orchestrator calls on shutdown and which also runs at interpreter exit.
+"""
+
+import asyncio
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+import logging
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+
+logger = logging.getLogger(__name__)
+
+Statement = Tuple[str, Sequence[Any]]
+
+
+@dataclass
+class PersistenceConfig:
+    """Connection tuning for a database file"""
+    mmap_size: int = 256 * 1024 * 1024  # 256 MB
+    cache_size_kb: int = 64 * 1024  # 64 MB page cache
+    cached_statements: int = 256
+    batch_size: int = 500
+    busy_timeout_ms: int = 5000
+    latency_window: int = 1000
+
+
+class _WriteJob:
+    """Queued write: one or more statements committed atomically"""
+    __slots__ = ('statements', 'future', 'enqueued_at')
+
+    def __init__(self, statements: List[Statement]):
+        self.statements = statements
+        self.future: Future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+_STOP = object()
+
+
+class SQLiteWriter:
+    """
+    Single-writer persistence for one SQLite file with:
+    - Dedicated writer thread and long-lived WAL connection
+    - Batched transactions drained from a queue
+    - Per-thread read connections
+    - Write latency and queue depth statistics
+    """
+
+    def __init__(self, db_path: Union[str, Path], config: Optional[PersistenceConfig] = None):
+        self.db_path = Path(db_path)
+        self.config = config or PersistenceConfig()
+
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._local = threading.local()
+        self._read_conns: List[sqlite3.Connection] = []  # Every thread's, so close() can reach them
+        self._read_conns_lock = threading.Lock()
+        self._reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"sqlite-read-{self.db_path.stem}")
+
+        self._stats_lock = threading.Lock()
+        self._latencies_ms: deque = deque(maxlen=self.config.latency_window)
+        self._stats = {
+            "writes": 0,
+            "batches": 0,
+            "errors": 0,
+            "max_queue_depth": 0,
+            "last_batch_size": 0
+        }
+
+        # Opened here so a bad path fails the caller instead of the thread
+        self._write_conn = self._connect()
+
+        self._thread = threading.Thread(
+            target=self._writer_loop,
+            name=f"sqlite-writer-{self.db_path.stem}",
+            daemon=True
+        )
+        self._thread.start()
+
+        logger.info(f"SQLite writer started for {self.db_path}")
+
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """Open a tuned long-lived connection"""
+        conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=self.config.busy_timeout_ms / 1000,
+            cached_statements=self.config.cached_statements,
+            check_same_thread=False,
+            isolation_level=None  # Explicit BEGIN/COMMIT for batching
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA mmap_size={int(self.config.mmap_size)}")
+        conn.execute(f"PRAGMA cache_size=-{int(self.config.cache_size_kb)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        if read_only:
+            conn.execute("PRAGMA query_only=ON")
+        return conn
+
+    # Writer side
+    def _writer_loop(self):
+        """Drain the queue into batched transactions"""
+        conn = self._write_conn
+
+        while True:
+            job = self._queue.get()
+            if job is _STOP:
+                break
+
+            batch = [job]
+            stop_after = False
+            while len(batch) < self.config.batch_size:
+                try:
+                    job = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if job is _STOP:
+                    stop_after = True
+                    break
+                batch.append(job)
+
+            self._write_batch(conn, batch)
+
+            if stop_after:
+                break
+
+        conn.close()
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: List[_WriteJob]):
+        """Commit a batch, falling back to per-job transactions on error"""
+        try:
+            conn.execute("BEGIN")
+            results = [self._execute_job(conn, job) for job in batch]
+            conn.execute("COMMIT")
+        except Exception as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            logger.debug(f"Batch write failed, retrying jobs individually: {e}")
+            for job in batch:
+                self._write_single(conn, job)
+            return
+
+        self._complete(batch, results)
+
+    def _write_single(self, conn: sqlite3.Connection, job: _WriteJob):
+        """Commit one job on its own so a bad statement only fails its caller"""
+        try:
+            conn.execute("BEGIN")
+            result = self._execute_job(conn, job)
+            conn.execute("COMMIT")
+        except Exception as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            with self._stats_lock:
+                self._stats["errors"] += 1
+            logger.error(f"SQLite write error ({self.db_path.name}): {e}")
+            job.future.set_exception(e)
+            return
+
+        self._complete([job], [result])
+
+    @staticmethod
+    def _execute_job(conn: sqlite3.Connection, job: _WriteJob) -> Optional[int]:
+        """Execute a job's statements, returning the last row id"""
+        cursor = None
+        for sql, params in job.statements:
+            cursor = conn.execute(sql, params)
+        return cursor.lastrowid if cursor is not None else None
+
+    def _complete(self, batch: List[_WriteJob], results: List[Optional[int]]):
+        """Resolve futures and record latency"""
+        now = time.perf_counter()
+        with self._stats_lock:
+            self._stats["writes"] += len(batch)
+            self._stats["batches"] += 1
+            self._stats["last_batch_size"] = len(batch)
+            for job in batch:
+                self._latencies_ms.append((now - job.enqueued_at) * 1000)
+
+        for job, result in zip(batch, results):
+            job.future.set_result(result)
+
+    # Public write API
+    def enqueue(self, sql: str, params: Sequence[Any] = ()) -> Future:
+        """Queue a write from any thread; the future resolves after commit"""
+        return self.enqueue_many([(sql, params)])
+
+    def enqueue_many(self, statements: List[Statement]) -> Future:
+        """Queue statements to be committed atomically"""
+        if not self._thread.is_alive():
+            raise RuntimeError(f"SQLite writer for {self.db_path} is closed")
+
+        job = _WriteJob(list(statements))
+        self._queue.put(job)
+
+        depth = self._queue.qsize()
+        if depth > self._stats["max_queue_depth"]:
+            with self._stats_lock:
+                self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], depth)
+
+        return job.future
+
+    async def submit(self, sql: str, params: Sequence[Any] = ()) -> Optional[int]:
+        """Write without blocking the event loop; returns the last row id"""
+        return await asyncio.wrap_future(self.enqueue(sql, params))
+
+    async def submit_many(self, statements: List[Statement]) -> Optional[int]:
+        """Write several statements in one transaction"""
+        return await asyncio.wrap_future(self.enqueue_many(statements))
+
+    def flush(self, timeout: Optional[float] = None):
+        """Block until everything queued so far has been committed"""
+        self.enqueue_many([]).result(timeout=timeout)
+
+    # Public read API
+    def _read_connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect(read_only=True)
+            self._local.conn = conn
+            with self._read_conns_lock:
+                self._read_conns.append(conn)
+        return conn
+
+    def query_sync(self, sql: str, params: Sequence[Any] = ()) -> List[Tuple]:
+        """Run a read query on this thread's long-lived connection"""
+        return self._read_connection().execute(sql, params).fetchall()
+
+    async def query(self, sql: str, params: Sequence[Any] = ()) -> List[Tuple]:
+        """Run a read query off the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._reader, self.query_sync, sql, params)
+
+    # Lifecycle and stats
+    def close(self, timeout: float = 5.0):
+        """Commit pending writes, stop the writer thread and close the read connections"""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout=timeout)
+        self._reader.shutdown(wait=True)
+
+        with self._read_conns_lock:
+            conns, self._read_conns = self._read_conns, []
+        for conn in conns:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.debug(f"Closing read connection failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get write latency and queue depth statistics"""
+        with self._stats_lock:
+            latencies = sorted(self._latencies_ms)
+            stats = dict(self._stats)
+
+        if latencies:
+            stats["avg_write_latency_ms"] = round(sum(latencies) / len(latencies), 3)
+            stats["p99_write_latency_ms"] = round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))], 3)
+        else:
+            stats["avg_write_latency_ms"] = 0.0
+            stats["p99_write_latency_ms"] = 0.0
+
+        stats["queue_depth"] = self._queue.qsize()
+        stats["avg_batch_size"] = round(stats["writes"] / stats["batches"], 2) if stats["batches"] else 0.0
+        stats["db_path"] = str(self.db_path)
+        return stats
+
+
+# Writer registry: one writer per database file
+_writers: Dict[str, SQLiteWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_sqlite_writer(db_path: Union[str, Path], config: Optional[PersistenceConfig] = None) -> SQLiteWriter:
+    """Get or create the writer for a database file"""
+    key = str(Path(db_path).resolve())
+
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = SQLiteWriter(key, config)
+            _writers[key] = writer
+        return writer
+
+
+def get_persistence_stats() -> Dict[str, Dict[str, Any]]:
+    """Get per-database write latency and queue depth"""
+    with _writers_lock:
+        writers = dict(_writers)
+    return {path: writer.get_stats() for path, writer in writers.items()}
+
+
+def close_all_writers(timeout: float = 5.0):
+    """Flush and stop every writer"""
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close(timeout=timeout)
+
+
+def _close_at_exit():
+    """Writer threads are daemons: commit what is still queued before they are killed"""
+    try:
+        close_all_writers()
+    except Exception as e:
+        logger.error(f"❌ Flushing SQLite writers at exit failed: {e}")
+
+
+atexit.register(_close_at_exit)
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Price Level Index
+=================
+
+Persistent support/resistance levels per symbol for MinhOS v3.
+
+Prices are bucketed on the symbol's tick grid (``bucket_ticks`` ticks per
+bucket) into a dense array that grows to cover the traded range. Each
+update adds a touch when price enters a bucket it was not already in, and
+confirmed swing highs and lows (bar highs and lows that are the extreme over
+``pivot_span`` bars on each side) add to separate pivot counts. Updates
+sharing the last timestamp revise that bar in place rather than being
+dropped, so a pivot is confirmed once the bar after its window starts.
+All counts decay exponentially with a time half-life, applied lazily:
+increments are scaled up by the current decay weight instead of rescaling
+every bucket, so an update is O(1) and a query ("levels within X% with at
+least N touches") is one slice of the array no matter how many months of
+history have been indexed.
+"""
+
+import math
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+
+
+# Minimum price increments by contract root
+TICK_SIZES = {
+    'NQ': 0.25, 'MNQ': 0.25, 'ES': 0.25, 'MES': 0.25,
+    'YM': 1.0, 'MYM': 1.0, 'RTY': 0.1, 'M2K': 0.1,
+    'CL': 0.01, 'GC': 0.1, 'SI': 0.005, 'ZN': 0.015625
+}
+DEFAULT_TICK_SIZE = 0.01
+
+_FUTURES_ROOT = re.compile(r'^([A-Z0-9]+?)[FGHJKMNQUVXZ]\d{1,2}(?:-|$)')
+
+
+def tick_size_for(symbol: str) -> float:
+    """Tick size from the contract root (NQU25-CME -> NQ -> 0.25)"""
+    match = _FUTURES_ROOT.match(symbol)
+    root = match.group(1) if match else symbol.split('-')[0]
+    return TICK_SIZES.get(root, DEFAULT_TICK_SIZE)
+
+
+def _to_epoch(timestamp: Any) -> float:
+    if isinstance(timestamp, datetime):
+        return timestamp.timestamp()
+    if isinstance(timestamp, str):
+        return datetime.fromisoformat(timestamp).timestamp()
+    return float(timestamp)
+
+
+@dataclass
+class PriceLevelConfig:
+    """Bucketing, decay and pivot settings"""
+    bucket_ticks: int = 4  # 4 ticks = 1 point on NQ/ES, the old whole-dollar grid
+    half_life_seconds: float = 5 * 86400
+    pivot_span: int = 5
+    max_buckets: int = 2_000_000  # Guards against bad prints far from the range
+
+
+@dataclass
+class PriceLevel:
+    """A price level with decayed touch and pivot counts"""
+    price: float
+    touches: float
+    pivot_highs: float
+    pivot_lows: float
+
+    @property
+    def strength(self) -> float:
+        return self.touches + self.pivot_highs + self.pivot_lows
+
+
+class PriceLevelIndex:
+    """
+    Incrementally updated level histogram for one symbol with:
+    - Tick-grid buckets in a dense, growable array
+    - Lazily decayed touch and pivot counts
+    - Microsecond range queries around a price
+    """
+
+    # Renormalize once the lazy decay weight reaches 2**_MAX_EXPONENT
+    _MAX_EXPONENT = 512
+
+    def __init__(self, tick_size: float, config: Optional[PriceLevelConfig] = None):
+        self.config = config or PriceLevelConfig()
+        self.tick_size = tick_size
+        self.bucket_size = tick_size * self.config.bucket_ticks
+        self._origin = 0  # Bucket number of array index 0
+        self._touches = np.zeros(0)
+        self._pivot_highs = np.zeros(0)
+        self._pivot_lows = np.zeros(0)
+        self._epoch: Optional[float] = None  # Time at which the decay weight is 1
+        self._last_bucket: Optional[int] = None
+        self._recent = deque(maxlen=2 * self.config.pivot_span + 1)  # [timestamp, high, low] per bar
+        self.last_timestamp: Optional[float] = None
+        self.last_price: Optional[float] = None
+        self.updates = 0
+
+    def _bucket(self, price: float) -> int:
+        return int(round(price / self.bucket_size))
+
+    def _weight(self, timestamp: float) -> float:
+        return 2.0 ** ((timestamp - self._epoch) / self.config.half_life_seconds)
+
+    def _ensure(self, bucket: int) -> bool:
+        """Grow the arrays to cover ``bucket``; False if that exceeds max_buckets"""
+        size = len(self._touches)
+        if size and self._origin <= bucket < self._origin + size:
+            return True
+        if not size:
+            low, high = max(0, bucket - 64), bucket + 64
+        else:
+            low, high = min(self._origin, bucket), max(self._origin + size - 1, bucket)
+            margin = max(64, (high - low) // 2)
+            if high - low + 1 + margin <= self.config.max_buckets:
+                low = max(0, low - margin) if bucket < self._origin else low
+                high = high + margin if bucket >= self._origin + size else high
+        if high - low + 1 > self.config.max_buckets:
+            return False
+
+        offset = self._origin - low
+        for name in ('_touches', '_pivot_highs', '_pivot_lows'):
+            grown = np.zeros(high - low + 1)
+            grown[offset:offset + size] = getattr(self, name)
+            setattr(self, name, grown)
+        self._origin = low
+        return True
+
+    def _renormalize(self, timestamp: float):
+        scale = 1.0 / self._weight(timestamp)
+        self._touches *= scale
+        self._pivot_highs *= scale
+        self._pivot_lows *= scale
+        self._epoch = timestamp
+
+    def update(self, timestamp: Any, price: float, high: Optional[float] = None,
+               low: Optional[float] = None) -> bool:
+        """
+        Apply one bar (or tick) closing at ``price``; high/low default to it.
+
+        An update at the last timestamp is folded into that bar. Older or
+        unusable updates are ignored.
+        """
+        timestamp = _to_epoch(timestamp)
+        if not price or price <= 0 or not math.isfinite(price):
+            return False
+        if self.last_timestamp is not None and timestamp < self.last_timestamp:
+            return False
+        high = price if high is None or not math.isfinite(high) else max(high, price)
+        low = price if low is None or not math.isfinite(low) or low <= 0 else min(low, price)
+
+        bucket = self._bucket(price)
+        if not (self._ensure(self._bucket(low)) and self._ensure(self._bucket(high))):
+            return False
+        if self._epoch is None:
+            self._epoch = timestamp
+        elif (timestamp - self._epoch) / self.config.half_life_seconds > self._MAX_EXPONENT:
+            self._renormalize(timestamp)
+
+        weight = self._weight(timestamp)
+        if bucket != self._last_bucket:
+            self._touches[bucket - self._origin] += weight
+            self._last_bucket = bucket
+
+        if timestamp == self.last_timestamp:
+            bar = self._recent[-1]
+            bar[1], bar[2] = max(bar[1], high), min(bar[2], low)
+        else:
+            # Every bar in a full window has closed once a newer one arrives
+            if len(self._recent) == self._recent.maxlen:
+                self._confirm_pivot()
+            self._recent.append([timestamp, high, low])
+
+        self.last_timestamp = timestamp
+        self.last_price = price
+        self.updates += 1
+        return True
+
+    def _confirm_pivot(self):
+        """The middle bar of the window is a pivot high/low if its high/low is the strict extreme"""
+        span = self.config.pivot_span
+        timestamp, high, low = self._recent[span]
+        highs = [bar[1] for bar in self._recent]
+        lows = [bar[2] for bar in self._recent]
+        weight = self._weight(timestamp)
+        if high >= max(highs[:span]) and high > max(highs[span + 1:]):
+            self._pivot_highs[self._bucket(high) - self._origin] += weight
+        if low <= min(lows[:span]) and low < min(lows[span + 1:]):
+            self._pivot_lows[self._bucket(low) - self._origin] += weight
+
+    def warm_start(self, records: Iterable[Any]) -> int:
+        """Feed chronological records (dicts or MarketData); returns updates applied"""
+        applied = 0
+        for record in records:
+            get = record.get if isinstance(record, Mapping) else lambda name: getattr(record, name, None)
+            timestamp, price, high, low = get('timestamp'), get('close'), get('high'), get('low')
+            if timestamp is not None and price is not None:
+                applied += self.update(timestamp, float(price), None if high is None else float(high),
+                                       None if low is None else float(low))
+        return applied
+
+    def levels(self, price: Optional[float] = None, band: float = 0.05, min_touches: float = 3,
+               now: Optional[Any] = None, limit: Optional[int] = None) -> List[PriceLevel]:
+        """
+        Levels within ``band`` (fraction of price) of ``price`` with at least
+        ``min_touches`` decayed touches, strongest first.
+
+        Defaults to the last price and last update time.
+        """
+        price = self.last_price if price is None else price
+        if price is None or not len(self._touches):
+            return []
+        now = self.last_timestamp if now is None else _to_epoch(now)
+
+        low = max(self._bucket(price * (1 - band)) - self._origin, 0)
+        high = min(self._bucket(price * (1 + band)) - self._origin + 1, len(self._touches))
+        if low >= high:
+            return []
+
+        scale = 1.0 / self._weight(now)
+        touches = self._touches[low:high] * scale
+        found = np.flatnonzero(touches >= min_touches)
+        if not len(found):
+            return []
+        highs = self._pivot_highs[low:high][found] * scale
+        lows = self._pivot_lows[low:high][found] * scale
+        strength = touches[found] + highs + lows
+        order = np.argsort(-strength, kind='stable')
+        if limit is not None:
+            order = order[:limit]
+
+        return [
+            PriceLevel(
+                price=(self._origin + low + int(found[i])) * self.bucket_size,
+                touches=float(touches[found[i]]),
+                pivot_highs=float(highs[i]),
+                pivot_lows=float(lows[i])
+            )
+            for i in order
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "tick_size": self.tick_size,
+            "bucket_size": self.bucket_size,
+            "buckets": len(self._touches),
+            "updates": self.updates,
+            "last_timestamp": self.last_timestamp,
+            "nbytes": self._touches.nbytes + self._pivot_highs.nbytes + self._pivot_lows.nbytes
+        }
+
+
+class PriceLevelBook:
+    """Per-symbol PriceLevelIndex collection, safe to update from several threads"""
+
+    def __init__(self, config: Optional[PriceLevelConfig] = None,
+                 tick_sizes: Optional[Mapping[str, float]] = None):
+        self.config = config or PriceLevelConfig()
+        self.tick_sizes = dict(tick_sizes or {})
+        self._indexes: Dict[str, PriceLevelIndex] = {}
+        self._lock = threading.Lock()
+
+    def index(self, symbol: str) -> PriceLevelIndex:
+        with self._lock:
+            if symbol not in self._indexes:
+                tick_size = self.tick_sizes.get(symbol) or tick_size_for(symbol)
+                self._indexes[symbol] = PriceLevelIndex(tick_size, self.config)
+            return self._indexes[symbol]
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._indexes
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._indexes)
+
+    def update(self, symbol: str, timestamp: Any, price: float, high: Optional[float] = None,
+               low: Optional[float] = None) -> bool:
+        index = self.index(symbol)
+        with self._lock:
+            return index.update(timestamp, price, high, low)
+
+    def warm_start(self, symbol: str, records: Iterable[Any]) -> int:
+        """Seed a symbol from chronological history"""
+        index = self.index(symbol)
+        with self._lock:
+            return index.warm_start(records)
+
+    def levels(self, symbol: str, **kwargs) -> List[PriceLevel]:
+        if symbol not in self._indexes:
+            return []
+        with self._lock:
+            return self._indexes[symbol].levels(**kwargs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {symbol: index.get_stats() for symbol, index in self._indexes.items()}
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Ordered Shards
+==============
+
+Per-symbol ordering and state isolation for MinhOS v3.
+
+Keys are mapped to a fixed number of shards with a stable hash (CRC32,
+unlike the salted built-in ``hash``), so a symbol always lands on the same
+shard in every process and run. Each shard is one asyncio task draining its
+own queue: work for a key runs in submission order, so a symbol's state is
+only ever touched by one analysis at a time, and one symbol's backlog does
+not queue behind another's.
+
+The shard tasks share one event loop. They overlap only while a job awaits
+(data, model services, a worker process); pure-Python CPU work still runs
+one job at a time. For CPU parallelism enable ``processes``: each shard then
+owns a single-process pool for CPU-bound steps, so a symbol's heavy work
+always runs in the same worker process and different shards use different
+cores.
+"""
+
+import asyncio
+import zlib
+import time
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+def shard_for(key: str, shards: int) -> int:
+    """Stable shard index for a key"""
+    return zlib.crc32(key.encode("utf-8")) % shards
+
+
+class OrderedShards:
+    """
+    Fixed set of shard queues on the event loop with:
+    - Stable key-to-shard assignment
+    - In-order execution per key; shards interleave at await points
+    - Optional per-shard worker process for CPU-bound functions
+    - Inline execution when the shards are not started
+    """
+
+    def __init__(self, shards: int = 4, processes: bool = False, queue_size: int = 1000):
+        self.shards = max(1, shards)
+        self.processes = processes
+        self.queue_size = queue_size
+        self._queues: List[asyncio.Queue] = []
+        self._workers: List[asyncio.Task] = []
+        self._pools: List[Optional[ProcessPoolExecutor]] = [None] * self.shards
+        self._keys: List[set] = [set() for _ in range(self.shards)]
+        self._processed = [0] * self.shards
+        self._busy_seconds = [0.0] * self.shards
+        self.stats = {"submitted": 0, "inline": 0, "process_calls": 0, "errors": 0}
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def shard_for(self, key: str) -> int:
+        return shard_for(key, self.shards)
+
+    async def start(self):
+        """Start one worker task per shard"""
+        if self.running:
+            return
+        self._queues = [asyncio.Queue(maxsize=self.queue_size) for _ in range(self.shards)]
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(self.shards)]
+        logger.info(f"🧩 Started {self.shards} ordered shards (processes: {self.processes})")
+
+    async def stop(self):
+        """Stop the workers and shut down any shard processes"""
+        for worker in self._workers:
+            worker.cancel()
+        if self._workers:
+            await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        # Fail any work left in the queues
+        for queue in self._queues:
+            while not queue.empty():
+                _, _, future = queue.get_nowait()
+                if not future.done():
+                    future.cancel()
+        self._queues = []
+
+        for i, pool in enumerate(self._pools):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+                self._pools[i] = None
+
+    async def run(self, key: str, fn: Callable[..., Awaitable[Any]], *args) -> Any:
+        """Run a coroutine function on the key's shard and wait for its result"""
+        shard = self.shard_for(key)
+        self._keys[shard].add(key)
+        self.stats["submitted"] += 1
+
+        if not self.running:
+            self.stats["inline"] += 1
+            return await fn(*args)
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queues[shard].put((fn, args, future))
+        return await future
+
+    async def run_cpu(self, key: str, fn: Callable[..., Any], *args) -> Any:
+        """Run a picklable function in the key's shard process, or inline without processes"""
+        if not self.processes:
+            return fn(*args)
+
+        shard = self.shard_for(key)
+        pool = self._pools[shard]
+        if pool is None:
+            pool = self._pools[shard] = ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn")
+            )
+        self.stats["process_calls"] += 1
+        return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+
+    async def _worker(self, shard: int):
+        """Drain one shard's queue in order"""
+        queue = self._queues[shard]
+        while True:
+            fn, args, future = await queue.get()
+            if future.cancelled():
+                continue
+
+            started = time.perf_counter()
+            try:
+                result = await fn(*args)
+                if not future.done():
+                    future.set_result(result)
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.cancel()
+                raise
+            except Exception as e:
+                self.stats["errors"] += 1
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self._processed[shard] += 1
+                self._busy_seconds[shard] += time.perf_counter() - started
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-shard load"""
+        return {
+            **self.stats,
+            "shards": self.shards,
+            "running": self.running,
+            "processes": self.processes,
+            "by_shard": [
+                {
+                    "keys": sorted(self._keys[i]),
+                    "queued": self._queues[i].qsize() if self._queues else 0,
+                    "processed": self._processed[i],
+                    "busy_seconds": round(self._busy_seconds[i], 3)
+                }
+                for i in range(self.shards)
+            ]
+        }
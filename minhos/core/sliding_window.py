@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Sliding Window Counters
+=======================
+
+Constant-time event counting over trailing time windows for MinhOS v3.
+
+Events are aggregated into fixed-width buckets held in a deque together
+with a running total. Recording an event touches only the newest bucket
+and expiry pops whole buckets off the old end, so both are amortized O(1)
+regardless of event volume. Counts are bucket-granular: an event stays in
+the window until its whole bucket has aged out, which errs on the side of
+over-counting for rate limits.
+"""
+
+import time
+from collections import deque
+from typing import Callable, Dict, Optional, Any
+
+
+class SlidingWindowCounter:
+    """Event count over a trailing window using fixed-width buckets"""
+
+    __slots__ = ('window_seconds', 'bucket_seconds', '_buckets', '_count', '_total', '_clock')
+
+    def __init__(self, window_seconds: float, bucket_seconds: float = 1.0,
+                 clock: Callable[[], float] = time.time):
+        if bucket_seconds <= 0 or window_seconds < bucket_seconds:
+            raise ValueError(f"Invalid window {window_seconds}s with {bucket_seconds}s buckets")
+
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        self._buckets: deque = deque()  # [bucket_id, count], oldest first
+        self._count = 0
+        self._total = 0
+        self._clock = clock
+
+    def _expire(self, bucket: int):
+        """Drop buckets that have fully left the window"""
+        # A bucket ends one width after it starts: keep it until its end is a window old
+        oldest = bucket - int(self.window_seconds // self.bucket_seconds)
+        buckets = self._buckets
+        while buckets and buckets[0][0] < oldest:
+            self._count -= buckets.popleft()[1]
+
+    def add(self, count: int = 1, now: Optional[float] = None):
+        """Record events at ``now`` (defaults to the clock)"""
+        bucket = int((now if now is not None else self._clock()) // self.bucket_seconds)
+        self._expire(bucket)
+
+        buckets = self._buckets
+        if buckets and buckets[-1][0] >= bucket:
+            buckets[-1][1] += count  # Same bucket (or a slightly late event)
+        else:
+            buckets.append([bucket, count])
+
+        self._count += count
+        self._total += count
+
+    def count(self, now: Optional[float] = None) -> int:
+        """Events in the trailing window"""
+        self._expire(int((now if now is not None else self._clock()) // self.bucket_seconds))
+        return self._count
+
+    @property
+    def total(self) -> int:
+        """Events recorded since creation"""
+        return self._total
+
+    def rate(self, per_seconds: float = 60.0, now: Optional[float] = None) -> float:
+        """Average rate over the window, scaled to ``per_seconds``"""
+        return self.count(now) * per_seconds / self.window_seconds
+
+    def clear(self):
+        """Forget all events"""
+        self._buckets.clear()
+        self._count = 0
+
+
+class EventRateTracker:
+    """
+    Per-second buckets over the last minute and per-minute buckets over the
+    last hour and day for a single event stream.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self.last_minute = SlidingWindowCounter(60, 1, clock)
+        self.last_hour = SlidingWindowCounter(3600, 60, clock)
+        self.last_day = SlidingWindowCounter(86400, 60, clock)
+
+    def record(self, count: int = 1, now: Optional[float] = None):
+        """Record events in every window"""
+        self.last_minute.add(count, now)
+        self.last_hour.add(count, now)
+        self.last_day.add(count, now)
+
+    def get_stats(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Get windowed counts"""
+        return {
+            "last_minute": self.last_minute.count(now),
+            "last_hour": self.last_hour.count(now),
+            "last_24h": self.last_day.count(now),
+            "total": self.last_minute.total
+        }
+
+    def clear(self):
+        """Forget all events"""
+        self.last_minute.clear()
+        self.last_hour.clear()
+        self.last_day.clear()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Startup Timing and Model Warm-up
+================================
+
+Fast service startup for MinhOS v3.
+
+Heavy ML and web libraries are imported behind lazy boundaries (the
+services package, the model libraries in the predictors, the dashboard),
+so a command only pays for what it uses. StartupReport records how long
+each deferred import, service start and model warm-up took.
+
+ModelWarmup loads model artifacts and runs one dummy inference per model
+on a background thread, so services come up while models are still
+loading. Each model has a readiness flag; consumers wait only for the
+models they actually need.
+"""
+
+import asyncio
+import importlib
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StartupReport:
+    """
+    Startup timings by category:
+    - import: deferred module imports
+    - service: service construction and start
+    - warmup: model artifact loading and dummy inference
+    """
+
+    CATEGORIES = ("import", "service", "warmup")
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._timings: Dict[str, "OrderedDict[str, float]"] = {
+            category: OrderedDict() for category in self.CATEGORIES
+        }
+
+    def record(self, category: str, name: str, seconds: float):
+        with self._lock:
+            self._timings[category][name] = seconds
+
+    @contextmanager
+    def timed(self, category: str, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(category, name, time.perf_counter() - started)
+
+    def import_module(self, module: str) -> Any:
+        """importlib.import_module, timed on first import"""
+        if module in sys.modules:
+            return sys.modules[module]
+        with self.timed("import", module):
+            return importlib.import_module(module)
+
+    def get_report(self) -> Dict[str, Any]:
+        with self._lock:
+            report = {
+                category: {name: round(seconds * 1000, 1) for name, seconds in timings.items()}
+                for category, timings in self._timings.items()
+            }
+        report["since_start_s"] = round(time.time() - self.started_at, 2)
+        return report
+
+    def format_report(self, limit: int = 10) -> str:
+        """Slowest entries per category, one per line"""
+        report = self.get_report()
+        lines = [f"⏱️ Startup timing ({report['since_start_s']}s since process start)"]
+        for category in self.CATEGORIES:
+            entries = sorted(report[category].items(), key=lambda item: item[1], reverse=True)
+            for name, ms in entries[:limit]:
+                lines.append(f"  {category:<8} {name:<50} {ms:>9.1f}ms")
+        return "\n".join(lines)
+
+
+class ModelWarmup:
+    """
+    Background model loading with per-model readiness:
+    - register(): a loader that builds the model and an optional dummy inference
+    - start(): runs pending warm-ups in order on a daemon thread
+    - is_ready() / wait_for(): readiness flags for consumers
+    """
+
+    PENDING, LOADING, READY, FAILED = "pending", "loading", "ready", "failed"
+
+    def __init__(self, report: Optional[StartupReport] = None):
+        self.report = report or get_startup_report()
+        self._lock = threading.Lock()
+        self._models: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, name: str, loader: Callable[[], Any],
+                 warm: Optional[Callable[[Any], Any]] = None,
+                 on_ready: Optional[Callable[[Any], None]] = None,
+                 on_failed: Optional[Callable[[Exception], None]] = None):
+        """
+        Register (or replace) a model; it loads on the next start().
+
+        ``on_failed`` runs on the warm-up thread if loading fails; models it
+        registers are warmed up by the same run.
+        """
+        with self._lock:
+            self._models[name] = {
+                "loader": loader, "warm": warm, "on_ready": on_ready, "on_failed": on_failed,
+                "state": self.PENDING, "instance": None, "error": None,
+                "load_ms": None, "warm_ms": None, "done": threading.Event()
+            }
+
+    def start(self) -> threading.Thread:
+        """Warm up pending models in the background; returns the worker thread"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="model-warmup", daemon=True)
+                self._thread.start()
+            return self._thread
+
+    def _next_pending(self) -> Optional[str]:
+        with self._lock:
+            for name, model in self._models.items():
+                if model["state"] == self.PENDING:
+                    model["state"] = self.LOADING
+                    return name
+            self._thread = None
+            return None
+
+    def _run(self):
+        while True:
+            name = self._next_pending()
+            if name is None:
+                return
+            self._warm(name, self._models[name])
+
+    def _warm(self, name: str, model: Dict[str, Any]):
+        started = time.perf_counter()
+        try:
+            instance = model["loader"]()
+            loaded = time.perf_counter()
+            if model["warm"] is not None:
+                model["warm"](instance)
+            warmed = time.perf_counter()
+
+            model["instance"] = instance
+            model["load_ms"] = round((loaded - started) * 1000, 1)
+            model["warm_ms"] = round((warmed - loaded) * 1000, 1)
+            if model["on_ready"] is not None:
+                model["on_ready"](instance)
+            model["state"] = self.READY
+            logger.info(f"🔥 {name} ready (load {model['load_ms']}ms, warm-up {model['warm_ms']}ms)")
+        except Exception as e:
+            model["state"] = self.FAILED
+            model["error"] = str(e)
+            logger.error(f"❌ {name} warm-up failed: {e}")
+            if model["on_failed"] is not None:
+                try:
+                    model["on_failed"](e)
+                except Exception as hook_error:
+                    logger.error(f"❌ {name} failure hook failed: {hook_error}")
+        finally:
+            self.report.record("warmup", name, time.perf_counter() - started)
+            model["done"].set()
+
+    def is_ready(self, name: str) -> bool:
+        model = self._models.get(name)
+        return model is not None and model["state"] == self.READY
+
+    def get(self, name: str) -> Any:
+        """The loaded model instance, or None until ready"""
+        model = self._models.get(name)
+        return model["instance"] if model is not None else None
+
+    async def wait_for(self, names: Iterable[str], timeout: Optional[float] = None) -> bool:
+        """
+        Wait until each registered model in ``names`` has finished warming up.
+
+        Names that were never registered are not waited for. Returns True
+        if all of the registered ones are ready (not failed) in time.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        models = [self._models[name] for name in names if name in self._models]
+        for model in models:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not await asyncio.to_thread(model["done"].wait, remaining):
+                return False
+        return all(model["state"] == self.READY for model in models)
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                name: {key: model[key] for key in ("state", "load_ms", "warm_ms", "error")}
+                for name, model in self._models.items()
+            }
+
+    def pending(self) -> List[str]:
+        with self._lock:
+            return [name for name, model in self._models.items()
+                    if model["state"] in (self.PENDING, self.LOADING)]
+
+
+# Global startup report and model warm-up
+_startup_report: Optional[StartupReport] = None
+_model_warmup: Optional[ModelWarmup] = None
+
+
+def get_startup_report() -> StartupReport:
+    """Get global startup report instance"""
+    global _startup_report
+    if _startup_report is None:
+        _startup_report = StartupReport()
+    return _startup_report
+
+
+def get_model_warmup() -> ModelWarmup:
+    """Get global model warm-up instance"""
+    global _model_warmup
+    if _model_warmup is None:
+        _model_warmup = ModelWarmup(get_startup_report())
+    return _model_warmup
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Telemetry Buffers
+=================
+
+Fixed-capacity, NumPy-backed history for AI and ML telemetry in MinhOS v3.
+
+A TelemetryBuffer preallocates one typed array per column and overwrites
+the oldest row once full, so a week-long session uses the same memory as
+the first hour. Aggregates (mean, percentiles, counts) run over views of
+the column arrays: the whole history, or the most recent ``last`` rows,
+is a slice without copying unless that window wraps the end of the ring.
+
+Missing values are stored as NaN in float columns, empty strings in
+string columns and zero elsewhere; aggregates ignore NaN.
+
+A Histogram counts values into fixed upper-bound buckets, for
+distributions (batch sizes, queueing delays) that should cover the whole
+session rather than a recent window.
+"""
+
+from bisect import bisect_left
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+
+class TelemetryBuffer:
+    """
+    Ring buffer of typed columns with:
+    - Constant memory after allocation
+    - Windowed views and NaN-aware aggregates
+    - Row records for APIs and dashboards
+    """
+
+    def __init__(self, capacity: int, columns: Mapping[str, Any]):
+        if capacity < 1:
+            raise ValueError("Telemetry buffer capacity must be positive")
+        self.capacity = capacity
+        self._columns = {name: np.zeros(capacity, dtype=dtype) for name, dtype in columns.items()}
+        self._fill = {name: self._missing(array.dtype) for name, array in self._columns.items()}
+        self._head = 0  # Next row to write
+        self._size = 0
+        self.total = 0  # Rows ever appended
+
+    @staticmethod
+    def _missing(dtype: np.dtype) -> Any:
+        if dtype.kind == "f":
+            return np.nan
+        if dtype.kind in "US":
+            return ""
+        return 0
+
+    def append(self, **values: Any):
+        """Write a row, overwriting the oldest once full; missing columns are filled"""
+        row = self._head
+        for name, array in self._columns.items():
+            value = values.get(name)
+            array[row] = self._fill[name] if value is None else value
+        self._head = (row + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        self.total += 1
+
+    def clear(self):
+        self._head = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.records())
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in self._columns.values())
+
+    def _span(self, last: Optional[int]) -> int:
+        return self._size if last is None else max(0, min(last, self._size))
+
+    def column(self, name: str, last: Optional[int] = None, ordered: bool = True) -> np.ndarray:
+        """
+        Values of a column, oldest first.
+
+        Returns a view when the window is contiguous in the ring. With
+        ``ordered=False`` the full history is always a view, in storage
+        order, which is all that order-free aggregates need.
+        """
+        array = self._columns[name]
+        n = self._span(last)
+        if self._size < self.capacity:
+            return array[self._size - n:self._size]
+        if not ordered and n == self.capacity:
+            return array
+        start = (self._head - n) % self.capacity
+        if start + n <= self.capacity:
+            return array[start:start + n]
+        return np.concatenate((array[start:], array[:self._head]))
+
+    def mean(self, name: str, last: Optional[int] = None) -> Optional[float]:
+        """Mean of the window ignoring missing values, or None if empty"""
+        values = self.column(name, last, ordered=False)
+        valid = values[~np.isnan(values)] if values.dtype.kind == "f" else values
+        return float(valid.mean()) if len(valid) else None
+
+    def percentile(self, name: str, q: Union[float, Sequence[float]],
+                   last: Optional[int] = None) -> Optional[Union[float, np.ndarray]]:
+        """Percentile(s) of the window ignoring missing values, or None if empty"""
+        values = self.column(name, last, ordered=False)
+        if not len(values) or (values.dtype.kind == "f" and np.isnan(values).all()):
+            return None
+        result = np.nanpercentile(values, q) if values.dtype.kind == "f" else np.percentile(values, q)
+        return float(result) if np.ndim(result) == 0 else result
+
+    def percentiles(self, name: str, qs: Sequence[float] = (50, 95, 99),
+                    last: Optional[int] = None) -> Dict[str, Optional[float]]:
+        """Named percentiles, e.g. {'p50': ..., 'p95': ..., 'p99': ...}"""
+        result = self.percentile(name, qs, last)
+        if result is None:
+            return {f"p{q:g}": None for q in qs}
+        return {f"p{q:g}": float(v) for q, v in zip(qs, result)}
+
+    def summary(self, name: str, last: Optional[int] = None,
+                qs: Sequence[float] = (50, 95, 99)) -> Dict[str, Any]:
+        """Count, mean, min, max and percentiles for a numeric column"""
+        values = self.column(name, last, ordered=False)
+        valid = values[~np.isnan(values)] if values.dtype.kind == "f" else values
+        if not len(valid):
+            return {"count": 0, "mean": None, "min": None, "max": None, **{f"p{q:g}": None for q in qs}}
+        return {
+            "count": int(len(valid)),
+            "mean": float(valid.mean()),
+            "min": float(valid.min()),
+            "max": float(valid.max()),
+            **{f"p{q:g}": float(v) for q, v in zip(qs, np.percentile(valid, qs))}
+        }
+
+    def since(self, cutoff: float, time_column: str = "timestamp") -> np.ndarray:
+        """Boolean mask over the storage-order history for rows at or after ``cutoff``"""
+        return self.column(time_column, ordered=False) >= cutoff
+
+    def records(self, last: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Rows as dicts of Python scalars, oldest first; missing floats are None"""
+        columns = {}
+        for name, array in self._columns.items():
+            values = self.column(name, last).tolist()
+            if array.dtype.kind == "f":
+                values = [None if v != v else v for v in values]
+            columns[name] = values
+        n = self._span(last)
+        return [{name: values[i] for name, values in columns.items()} for i in range(n)]
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        records = self.records(1)
+        return records[0] if records else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "rows": self._size,
+            "capacity": self.capacity,
+            "total": self.total,
+            "nbytes": self.nbytes
+        }
+
+
+class Histogram:
+    """Counts of values per bucket; bucket i holds values <= edges[i], the last one the rest"""
+
+    def __init__(self, edges: Sequence[float]):
+        self.edges = sorted(edges)
+        self.counts = [0] * (len(self.edges) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def record(self, value: float):
+        self.counts[bisect_left(self.edges, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def clear(self):
+        self.counts = [0] * (len(self.edges) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        buckets = {f"<={edge:g}": n for edge, n in zip(self.edges, self.counts)}
+        buckets[f">{self.edges[-1]:g}"] = self.counts[-1]
+        return {
+            "buckets": buckets,
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None
+        }
+
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Trade Ledger
+============
+
+Normalized fills and closed-trade ledger for MinhOS v3.
+
+Fills are written at execution time and matched against the open position
+(average-price accounting) so every closing fill produces a trade row with
+precomputed realized P&L. Both tables are indexed on (symbol, timestamp), so
+lookback queries used by Kelly sizing and risk checks are an index range scan
+instead of a full scan of ``state_history``.
+"""
+
+import sqlite3
+import threading
+import time
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Any
+
+import numpy as np
+
+from .persistence import get_sqlite_writer
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Fill:
+    """Single execution as reported by the broker"""
+    symbol: str
+    side: str  # BUY, SELL
+    quantity: int
+    price: float
+    timestamp: float
+    order_id: Optional[str] = None
+    realized_pnl: float = 0.0
+    position_after: int = 0  # Signed net position after this fill
+    avg_price_after: float = 0.0
+
+
+@dataclass
+class LedgerTrade:
+    """Closed (or partially closed) round trip with realized P&L"""
+    symbol: str
+    side: str  # LONG, SHORT
+    quantity: int
+    entry_price: float
+    exit_price: float
+    entry_time: float
+    exit_time: float
+    realized_pnl: float
+
+
+class TradeLedger:
+    """
+    Fill-time trade ledger with:
+    - Average-price position matching per symbol
+    - Indexed fills and trades tables
+    - Cached columnar P&L arrays for lookback windows
+    """
+
+    def __init__(self, db_path: Path, cache_ttl: float = 60.0):
+        self.db_path = Path(db_path)
+        self.cache_ttl = cache_ttl
+        self._lock = threading.RLock()
+
+        # symbol -> (signed net quantity, average entry price, entry time)
+        self._open: Dict[str, Tuple[int, float, float]] = {}
+
+        # Bumped on every write so cached arrays can be invalidated cheaply
+        self._version = 0
+        self._pnl_cache: Dict[Tuple[Optional[str], int], Tuple[int, float, Dict[str, np.ndarray]]] = {}
+
+        self._init_database()
+        self.db = get_sqlite_writer(self.db_path)
+        self._last_write = None
+        self._load_open_positions()
+
+    def _init_database(self):
+        """Create ledger tables and indexes"""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with sqlite3.connect(str(self.db_path)) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS fills (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    symbol TEXT NOT NULL,
+                    side TEXT NOT NULL,
+                    quantity INTEGER NOT NULL,
+                    price REAL NOT NULL,
+                    timestamp REAL NOT NULL,
+                    order_id TEXT,
+                    realized_pnl REAL NOT NULL DEFAULT 0,
+                    position_after INTEGER NOT NULL,
+                    avg_price_after REAL NOT NULL
+                )
+            """)
+
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS trades (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    symbol TEXT NOT NULL,
+                    side TEXT NOT NULL,
+                    quantity INTEGER NOT NULL,
+                    entry_price REAL NOT NULL,
+                    exit_price REAL NOT NULL,
+                    entry_time REAL NOT NULL,
+                    exit_time REAL NOT NULL,
+                    realized_pnl REAL NOT NULL
+                )
+            """)
+
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_fills_symbol_timestamp
+                ON fills(symbol, timestamp)
+            """)
+
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_trades_symbol_exit_time
+                ON trades(symbol, exit_time)
+            """)
+
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_trades_exit_time
+                ON trades(exit_time)
+            """)
+
+            conn.commit()
+
+    def _load_open_positions(self):
+        """Restore open positions from the latest fill of each symbol"""
+        try:
+            self.db.flush()
+            rows = self.db.query_sync("""
+                SELECT f.symbol, f.position_after, f.avg_price_after, f.timestamp
+                FROM fills f
+                JOIN (SELECT symbol, MAX(id) AS max_id FROM fills GROUP BY symbol) latest
+                ON f.id = latest.max_id
+            """)
+            for symbol, position_after, avg_price, timestamp in rows:
+                if position_after:
+                    self._open[symbol] = (position_after, avg_price, timestamp)
+        except Exception as e:
+            logger.error(f"Error loading open ledger positions: {e}")
+
+    def record_fill(self, symbol: str, side: str, quantity: int, price: float,
+                    timestamp: Optional[float] = None, order_id: Optional[str] = None) -> Fill:
+        """Record an execution and realize P&L for any quantity it closes"""
+        side = side.upper()
+        if side not in ("BUY", "SELL"):
+            raise ValueError(f"Invalid fill side: {side}")
+        if quantity <= 0:
+            raise ValueError(f"Fill quantity must be positive, got {quantity}")
+
+        timestamp = timestamp if timestamp is not None else time.time()
+        signed_qty = quantity if side == "BUY" else -quantity
+
+        with self._lock:
+            net_qty, avg_price, entry_time = self._open.get(symbol, (0, 0.0, timestamp))
+            closed_trade = None
+            realized_pnl = 0.0
+
+            if net_qty == 0 or (net_qty > 0) == (signed_qty > 0):
+                # Opening or adding: roll the average entry price forward
+                new_qty = net_qty + signed_qty
+                avg_price = (abs(net_qty) * avg_price + quantity * price) / abs(new_qty)
+                if net_qty == 0:
+                    entry_time = timestamp
+            else:
+                # Reducing, closing or reversing
+                closed_qty = min(abs(net_qty), quantity)
+                direction = 1 if net_qty > 0 else -1
+                realized_pnl = (price - avg_price) * closed_qty * direction
+                closed_trade = LedgerTrade(
+                    symbol=symbol,
+                    side="LONG" if direction > 0 else "SHORT",
+                    quantity=closed_qty,
+                    entry_price=avg_price,
+                    exit_price=price,
+                    entry_time=entry_time,
+                    exit_time=timestamp,
+                    realized_pnl=realized_pnl
+                )
+                new_qty = net_qty + signed_qty
+                if new_qty == 0:
+                    avg_price = 0.0
+                elif (new_qty > 0) != (net_qty > 0):
+                    # Reversal: remainder opens a fresh position at the fill price
+                    avg_price = price
+                    entry_time = timestamp
+
+            fill = Fill(
+                symbol=symbol,
+                side=side,
+                quantity=quantity,
+                price=price,
+                timestamp=timestamp,
+                order_id=order_id,
+                realized_pnl=realized_pnl,
+                position_after=new_qty,
+                avg_price_after=avg_price
+            )
+
+            self._persist(fill, closed_trade)
+
+            if new_qty == 0:
+                self._open.pop(symbol, None)
+            else:
+                self._open[symbol] = (new_qty, avg_price, entry_time)
+
+            self._version += 1
+            return fill
+
+    def _persist(self, fill: Fill, trade: Optional[LedgerTrade]):
+        """Queue a fill and its closed trade as one transaction"""
+        statements = [("""
+            INSERT INTO fills
+            (symbol, side, quantity, price, timestamp, order_id,
+             realized_pnl, position_after, avg_price_after)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            fill.symbol, fill.side, fill.quantity, fill.price, fill.timestamp,
+            fill.order_id, fill.realized_pnl, fill.position_after, fill.avg_price_after
+        ))]
+
+        if trade is not None:
+            statements.append(("""
+                INSERT INTO trades
+                (symbol, side, quantity, entry_price, exit_price,
+                 entry_time, exit_time, realized_pnl)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                trade.symbol, trade.side, trade.quantity, trade.entry_price,
+                trade.exit_price, trade.entry_time, trade.exit_time, trade.realized_pnl
+            )))
+
+        self._last_write = self.db.enqueue_many(statements)
+
+    def _query(self, sql: str, params: List[Any]) -> List[Tuple]:
+        """Read after any pending ledger write has committed"""
+        last_write = self._last_write
+        if last_write is not None and not last_write.done():
+            last_write.result()
+        return self.db.query_sync(sql, params)
+
+    def get_open_position(self, symbol: str) -> Tuple[int, float]:
+        """Get signed net quantity and average entry price for a symbol"""
+        with self._lock:
+            net_qty, avg_price, _ = self._open.get(symbol, (0, 0.0, 0.0))
+            return net_qty, avg_price
+
+    def get_trades(self, days: int = 30, symbol: Optional[str] = None,
+                   limit: Optional[int] = None) -> List[LedgerTrade]:
+        """Get closed trades in the lookback window, newest first"""
+        cutoff = time.time() - days * 86400
+        query = """
+            SELECT symbol, side, quantity, entry_price, exit_price,
+                   entry_time, exit_time, realized_pnl
+            FROM trades
+            WHERE exit_time >= ?
+        """
+        params: List[Any] = [cutoff]
+
+        if symbol:
+            query += " AND symbol = ?"
+            params.append(symbol)
+
+        query += " ORDER BY exit_time DESC"
+
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        return [LedgerTrade(*row) for row in self._query(query, params)]
+
+    def get_pnl_arrays(self, days: int = 30, symbol: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """
+        Get columnar realized P&L for the lookback window, oldest first.
+
+        Returns ``exit_time``, ``realized_pnl`` and ``quantity`` arrays. Results
+        are cached until the next fill or ``cache_ttl`` seconds, whichever
+        comes first.
+        """
+        key = (symbol, days)
+        now = time.time()
+
+        with self._lock:
+            cached = self._pnl_cache.get(key)
+            if cached and cached[0] == self._version and now - cached[1] < self.cache_ttl:
+                return cached[2]
+            version = self._version
+
+        query = "SELECT exit_time, realized_pnl, quantity FROM trades WHERE exit_time >= ?"
+        params: List[Any] = [now - days * 86400]
+        if symbol:
+            query += " AND symbol = ?"
+            params.append(symbol)
+        query += " ORDER BY exit_time ASC"
+
+        rows = self._query(query, params)
+
+        if rows:
+            exit_time, realized_pnl, quantity = zip(*rows)
+        else:
+            exit_time, realized_pnl, quantity = (), (), ()
+
+        arrays = {
+            'exit_time': np.asarray(exit_time, dtype=np.float64),
+            'realized_pnl': np.asarray(realized_pnl, dtype=np.float64),
+            'quantity': np.asarray(quantity, dtype=np.int64)
+        }
+        for array in arrays.values():
+            array.flags.writeable = False
+
+        with self._lock:
+            self._pnl_cache[key] = (version, now, arrays)
+
+        return arrays
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get ledger statistics"""
+        fills = self._query("SELECT COUNT(*) FROM fills", [])[0][0]
+        trades = self._query("SELECT COUNT(*) FROM trades", [])[0][0]
+
+        with self._lock:
+            return {
+                'fills': fills,
+                'trades': trades,
+                'open_symbols': len(self._open),
+                'cached_windows': len(self._pnl_cache),
+                'version': self._version
+            }
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Out-of-Process Training
+=======================
+
+Model retraining for MinhOS v3 without touching the trading event loop.
+
+TrainingExecutor runs each job in its own spawned process, limited so
+live inference keeps the machine:
+- pinned to a few CPU cores, with the BLAS/ML thread pools capped to match
+  from the environment it starts with
+- niced, so the scheduler always prefers the serving processes
+- an address-space limit, so a runaway job fails on its own
+- a time budget: the job is asked to stop (checkpoint and return) when it
+  runs out, and the process is terminated after a grace period
+
+A job is a module-level function ``fn(context) -> dict`` named as
+"package.module:function", so the child imports it itself. Its
+TrainingContext streams progress back to the parent and saves/loads a
+checkpoint in the job's directory; running the same job id again resumes
+from the checkpoint. The parent waits for messages on a worker thread, so
+the event loop only runs the progress callbacks.
+"""
+
+import asyncio
+import importlib
+import logging
+import multiprocessing
+import os
+import pickle
+import queue as queue_module
+import shutil
+import time
+import traceback
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Thread pools sized from these when the libraries are imported in the training process
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "NUMEXPR_NUM_THREADS",
+                   "VECLIB_MAXIMUM_THREADS", "TF_NUM_INTRAOP_THREADS", "TF_NUM_INTEROP_THREADS")
+
+
+@contextmanager
+def thread_limit_env(threads: int):
+    """
+    Cap thread pools in processes started inside the block.
+
+    A spawned child re-imports the parent's main module (and with it numpy)
+    before any initializer or target runs, so the limit has to be in the
+    environment it starts with.
+    """
+    saved = {name: os.environ.get(name) for name in THREAD_ENV_VARS}
+    os.environ.update({name: str(max(1, threads)) for name in THREAD_ENV_VARS})
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+class TrainingFailed(RuntimeError):
+    """The training job raised or its process died"""
+
+
+class TrainingBudgetExceeded(TimeoutError):
+    """The training process did not stop within its time budget and was terminated"""
+
+
+@dataclass
+class TrainingLimits:
+    """Resource limits for one training process"""
+    cpu_cores: int = 1
+    memory_mb: Optional[int] = 4096
+    niceness: int = 10
+    time_budget_s: float = 3600.0
+    grace_s: float = 30.0  # After the budget: time to checkpoint and return before termination
+
+
+def apply_limits(limits: TrainingLimits) -> Dict[str, Any]:
+    """Limit the current process; returns what was applied"""
+    applied: Dict[str, Any] = {}
+    cores = max(1, limits.cpu_cores)
+    for name in THREAD_ENV_VARS:
+        os.environ[name] = str(cores)
+    applied["threads"] = cores
+
+    if hasattr(os, "sched_setaffinity"):
+        # The highest-numbered cores; the serving processes start on the lowest
+        allowed = sorted(os.sched_getaffinity(0))
+        os.sched_setaffinity(0, allowed[-cores:])
+        applied["cpu_affinity"] = sorted(os.sched_getaffinity(0))
+
+    if limits.niceness and hasattr(os, "nice"):
+        applied["niceness"] = os.nice(limits.niceness)
+
+    if limits.memory_mb:
+        try:
+            import resource
+            limit = int(limits.memory_mb) * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+            applied["memory_mb"] = limits.memory_mb
+        except (ImportError, ValueError, OSError) as e:
+            applied["memory_mb"] = None
+            logger.warning(f"⚠️ Memory limit not applied: {e}")
+    return applied
+
+
+class TrainingContext:
+    """Passed to a training job in its process: config, progress, checkpoints and the time budget"""
+
+    def __init__(self, job_id: str, config: Dict[str, Any], work_dir: Path, deadline: float, messages: Any):
+        self.job_id = job_id
+        self.config = config
+        self.work_dir = Path(work_dir)
+        self.output_dir = self.work_dir / "output"
+        self.checkpoint_path = self.work_dir / "checkpoint.pkl"
+        self.deadline = deadline
+        self._messages = messages
+
+    def progress(self, step: int, total: int, **metrics):
+        """Report progress; metrics must be picklable"""
+        self._messages.put({"type": "progress", "step": step, "total": total,
+                            "metrics": metrics, "time": time.time()})
+
+    def save_checkpoint(self, state: Dict[str, Any]):
+        """Write-then-rename, so a terminated job leaves the previous checkpoint intact"""
+        tmp = self.checkpoint_path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(state, f)
+        os.replace(tmp, self.checkpoint_path)
+
+    def load_checkpoint(self) -> Optional[Dict[str, Any]]:
+        if not self.checkpoint_path.exists():
+            return None
+        with open(self.checkpoint_path, "rb") as f:
+            return pickle.load(f)
+
+    def time_left(self) -> float:
+        return self.deadline - time.time()
+
+    def should_stop(self) -> bool:
+        """True once the time budget is spent: checkpoint and return"""
+        return self.time_left() <= 0
+
+
+def _run_job(target: str, job_id: str, config: Dict[str, Any], work_dir: str,
+             limits: TrainingLimits, deadline: float, messages: Any):
+    """Training process entry point"""
+    try:
+        messages.put({"type": "started", "pid": os.getpid(), "limits": apply_limits(limits)})
+        module, _, name = target.partition(":")
+        fn = getattr(importlib.import_module(module), name)
+        context = TrainingContext(job_id, config, Path(work_dir), deadline, messages)
+        messages.put({"type": "result", "result": fn(context)})
+    except BaseException as e:
+        messages.put({"type": "error", "error": f"{type(e).__name__}: {e}", "traceback": traceback.format_exc()})
+
+
+class TrainingExecutor:
+    """
+    Runs training jobs in limited child processes:
+    - run(): start (or resume) a job and wait for its result
+    - cancel(): terminate a running job, keeping its checkpoint
+    - cleanup(): remove a finished job's directory
+    """
+
+    def __init__(self, work_root: Path, limits: Optional[TrainingLimits] = None, max_concurrent: int = 1):
+        self.work_root = Path(work_root)
+        self.limits = limits or TrainingLimits()
+        self._slots = asyncio.Semaphore(max(1, max_concurrent))
+        self._context = multiprocessing.get_context("spawn")
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+
+    def work_dir(self, job_id: str) -> Path:
+        return self.work_root / job_id
+
+    async def run(self, job_id: str, target: str, config: Optional[Dict[str, Any]] = None,
+                  on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+                  limits: Optional[TrainingLimits] = None) -> Dict[str, Any]:
+        """
+        Run ``target`` in a training process and return its result.
+
+        Raises TrainingFailed if the job raises or its process dies, and
+        TrainingBudgetExceeded if it overruns the budget plus grace period.
+        """
+        limits = limits or self.limits
+        work_dir = self.work_dir(job_id)
+        shutil.rmtree(work_dir / "output", ignore_errors=True)
+        (work_dir / "output").mkdir(parents=True, exist_ok=True)
+
+        async with self._slots:
+            messages = self._context.Queue()
+            deadline = time.time() + limits.time_budget_s
+            # Not a daemon: jobs may start their own worker processes (e.g. joblib)
+            process = self._context.Process(
+                target=_run_job, name=f"training-{job_id}",
+                args=(target, job_id, config or {}, str(work_dir), limits, deadline, messages)
+            )
+            job = self._jobs[job_id] = {
+                "target": target, "state": "running", "pid": None, "limits": None,
+                "progress": None, "started": time.time(), "process": process
+            }
+            with thread_limit_env(limits.cpu_cores):
+                process.start()
+            logger.info(f"🏋️ Training job {job_id} started ({target}, pid {process.pid})")
+
+            try:
+                while True:
+                    message = await asyncio.to_thread(self._next_message, messages, 0.5)
+                    if message is None:
+                        if not process.is_alive():
+                            message = self._next_message(messages, 0.5)  # Sent just before exit
+                            if message is None:
+                                raise TrainingFailed(f"training process exited with code {process.exitcode}")
+                        elif time.time() > deadline + limits.grace_s:
+                            raise TrainingBudgetExceeded(
+                                f"training job {job_id} exceeded its {limits.time_budget_s:.0f}s budget")
+                        else:
+                            continue
+
+                    kind = message["type"]
+                    if kind == "started":
+                        job["pid"], job["limits"] = message["pid"], message["limits"]
+                    elif kind == "progress":
+                        job["progress"] = message
+                        if on_progress is not None:
+                            try:
+                                on_progress(message)
+                            except Exception as e:
+                                logger.warning(f"⚠️ Training progress callback failed: {e}")
+                    elif kind == "error":
+                        raise TrainingFailed(message["error"])
+                    elif kind == "result":
+                        job["state"] = "completed"
+                        elapsed = time.time() - job["started"]
+                        logger.info(f"✅ Training job {job_id} finished in {elapsed:.1f}s")
+                        return {
+                            "job_id": job_id,
+                            "result": message["result"],
+                            "elapsed_s": round(elapsed, 2),
+                            "budget_exhausted": time.time() > deadline,
+                            "limits": job["limits"],
+                            "progress": job["progress"]
+                        }
+            except BaseException as e:
+                job["state"] = "cancelled" if isinstance(e, asyncio.CancelledError) else "failed"
+                job["error"] = str(e)
+                logger.error(f"❌ Training job {job_id} {job['state']}: {e}")
+                raise
+            finally:
+                self._stop_process(process)
+                messages.close()
+                job.pop("process", None)
+
+    @staticmethod
+    def _next_message(messages: Any, timeout: float) -> Optional[Dict[str, Any]]:
+        try:
+            return messages.get(timeout=timeout)
+        except queue_module.Empty:
+            return None
+
+    @staticmethod
+    def _stop_process(process: Any, timeout: float = 5.0):
+        if process.is_alive():
+            process.terminate()
+            process.join(timeout)
+            if process.is_alive():
+                process.kill()
+        process.join(timeout)
+
+    def cancel(self, job_id: str) -> bool:
+        """Terminate a running job; its checkpoint stays for a later run"""
+        job = self._jobs.get(job_id)
+        process = job.get("process") if job else None
+        if process is None or not process.is_alive():
+            return False
+        self._stop_process(process)
+        return True
+
+    def cancel_all(self):
+        for job_id in list(self._jobs):
+            self.cancel(job_id)
+
+    def cleanup(self, job_id: str):
+        """Remove a job's directory (checkpoint and output)"""
+        shutil.rmtree(self.work_dir(job_id), ignore_errors=True)
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            job_id: {key: value for key, value in job.items() if key != "process"}
+            for job_id, job in self._jobs.items()
+        }
+
+    def get_limits(self) -> Dict[str, Any]:
+        return asdict(self.limits)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Vector Index
+============
+
+Approximate nearest-neighbour lookup by cosine similarity for MinhOS v3.
+
+Unit-normalized vectors live in one preallocated float32 matrix. Each row is
+hashed into several random-projection LSH tables (sign of the projection on
+``bits`` random hyperplanes per table). A query probes its own bucket and
+every bucket one bit away in each table, then scores all candidates with a
+single matrix-vector product. Small indexes skip hashing and score every
+live row, which is exact and just as fast at that size.
+
+Rows carry an insertion timestamp so expired entries can be excluded in the
+same vectorized pass; removal frees the row for reuse, keeping the matrix
+consistent with the owner's eviction policy.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+
+class VectorIndex:
+    """
+    Cosine similarity index with:
+    - Fixed dimension, growable float32 storage with row reuse
+    - Multi-table, multi-probe random-projection LSH
+    - Vectorized scoring and expiry filtering over candidates
+    """
+
+    def __init__(self, dim: int, tables: int = 4, bits: int = 10, exact_below: int = 512,
+                 capacity: int = 1024, seed: int = 0):
+        if dim < 1:
+            raise ValueError("Vector dimension must be positive")
+        self.dim = dim
+        self.tables = tables
+        self.bits = bits
+        self.exact_below = exact_below
+        rng = np.random.default_rng(seed)
+        self._planes = rng.standard_normal((tables * bits, dim)).astype(np.float32)
+        self._powers = 1 << np.arange(bits, dtype=np.int64)
+        self._probes = np.r_[0, self._powers]  # XOR masks: own bucket, then one-bit neighbours
+
+        self._matrix = np.zeros((capacity, dim), dtype=np.float32)
+        self._timestamps = np.zeros(capacity)
+        self._signatures = np.zeros((capacity, tables), dtype=np.int64)
+        self._live = np.zeros(capacity, dtype=bool)
+        self._keys: List[Optional[str]] = [None] * capacity
+        self._rows: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._next = 0
+        self._buckets: List[Dict[int, Set[int]]] = [{} for _ in range(tables)]
+
+        self.stats = {"queries": 0, "hits": 0, "candidates": 0}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    def _normalize(self, vector: Sequence[float]) -> Optional[np.ndarray]:
+        vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+        if vector.shape[0] != self.dim:
+            return None
+        norm = float(np.linalg.norm(vector))
+        if norm == 0 or not np.isfinite(norm):
+            return None
+        return vector / norm
+
+    def _signature(self, unit: np.ndarray) -> np.ndarray:
+        bits = (self._planes @ unit > 0).reshape(self.tables, self.bits)
+        return bits @ self._powers
+
+    def _allocate(self) -> int:
+        if self._free:
+            return self._free.pop()
+        if self._next == len(self._keys):
+            capacity = 2 * len(self._keys)
+            for name in ('_matrix', '_timestamps', '_signatures', '_live'):
+                array = getattr(self, name)
+                grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+                grown[:len(array)] = array
+                setattr(self, name, grown)
+            self._keys.extend([None] * (capacity - len(self._keys)))
+        row = self._next
+        self._next += 1
+        return row
+
+    def add(self, key: str, vector: Sequence[float], timestamp: float) -> bool:
+        """Index ``vector`` under ``key``, replacing any previous vector; False if unusable"""
+        unit = self._normalize(vector)
+        if unit is None:
+            return False
+        self.remove(key)
+
+        row = self._allocate()
+        signature = self._signature(unit)
+        self._matrix[row] = unit
+        self._timestamps[row] = timestamp
+        self._signatures[row] = signature
+        self._live[row] = True
+        self._keys[row] = key
+        self._rows[key] = row
+        for table, code in enumerate(signature.tolist()):
+            self._buckets[table].setdefault(code, set()).add(row)
+        return True
+
+    def remove(self, key: str) -> bool:
+        row = self._rows.pop(key, None)
+        if row is None:
+            return False
+        for table, code in enumerate(self._signatures[row].tolist()):
+            bucket = self._buckets[table].get(code)
+            if bucket is not None:
+                bucket.discard(row)
+                if not bucket:
+                    del self._buckets[table][code]
+        self._live[row] = False
+        self._keys[row] = None
+        self._free.append(row)
+        return True
+
+    def clear(self):
+        self._live[:] = False
+        self._keys = [None] * len(self._keys)
+        self._rows.clear()
+        self._free.clear()
+        self._next = 0
+        self._buckets = [{} for _ in range(self.tables)]
+
+    def _candidates(self, unit: np.ndarray) -> np.ndarray:
+        if len(self._rows) < self.exact_below:
+            return np.flatnonzero(self._live[:self._next])
+        found: Set[int] = set()
+        for table, code in enumerate(self._signature(unit).tolist()):
+            buckets = self._buckets[table]
+            for probe in (code ^ self._probes).tolist():
+                bucket = buckets.get(probe)
+                if bucket:
+                    found.update(bucket)
+        return np.fromiter(found, dtype=np.int64, count=len(found))
+
+    def query(self, vector: Sequence[float], threshold: float,
+              min_timestamp: Optional[float] = None) -> Optional[Tuple[str, float]]:
+        """Most similar live key with cosine similarity >= ``threshold``, or None"""
+        self.stats["queries"] += 1
+        unit = self._normalize(vector)
+        if unit is None or not self._rows:
+            return None
+
+        rows = self._candidates(unit)
+        self.stats["candidates"] += len(rows)
+        if min_timestamp is not None and len(rows):
+            rows = rows[self._timestamps[rows] >= min_timestamp]
+        if not len(rows):
+            return None
+
+        similarity = self._matrix[rows] @ unit
+        best = int(np.argmax(similarity))
+        if similarity[best] < threshold:
+            return None
+        self.stats["hits"] += 1
+        return self._keys[rows[best]], float(similarity[best])
+
+    def get_stats(self) -> Dict[str, Any]:
+        queries = self.stats["queries"]
+        return {
+            "entries": len(self._rows),
+            "capacity": len(self._keys),
+            "dim": self.dim,
+            "queries": queries,
+            "hits": self.stats["hits"],
+            "avg_candidates": self.stats["candidates"] / queries if queries else 0.0,
+            "exact": len(self._rows) < self.exact_below
+        }
@@ -968,7 +968,7 @@ async def get_risk_status():
     """Get current risk status"""
     try:
         risk_manager = get_risk_manager()
-        status = await risk_manager.get_detailed_status()
+        status = risk_manager.get_risk_status()
         
         return {
             "risk_status": status,
@@ -978,6 +978,22 @@ async def get_risk_status():
         logger.error(f"Error getting risk status: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/risk/var")
+async def get_risk_var(refresh: bool = False):
+    """Get Monte Carlo VaR/ES for the current book"""
+    try:
+        risk_manager = get_risk_manager()
+        report = await risk_manager.calculate_var(force=refresh)
+        
+        return {
+            "var": report,
+            "correlation": risk_manager.get_correlation_matrix(),
+            "timestamp": datetime.now().isoformat()
+        }
+    except Exception as e:
+        logger.error(f"Error getting VaR: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/risk/parameters")
 async def update_risk_parameters(parameters: Dict[str, Any] = Body(...)):
     """Update risk parameters"""
@@ -1214,6 +1230,17 @@ async def get_rollover_status():
             "message": str(e)
         }
 
+# Persistence endpoint
+@router.get("/system/persistence")
+async def get_persistence_status():
+    """Get per-database write latency and queue depth"""
+    from minhos.core.persistence import get_persistence_stats
+    
+    return {
+        "databases": get_persistence_stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
 # Health check endpoint
 @router.get("/health")
 async def api_health_check():
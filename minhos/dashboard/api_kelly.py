@@ -120,8 +120,7 @@ async def get_current_kelly_recommendation(
         state_manager = get_state_manager()
         trade_history = []
         if state_manager:
-            recent_trades = await state_manager.get_recent_trades(days=30)
-            trade_history = [trade for trade in recent_trades if trade.get('symbol') == symbol]
+            trade_history = await state_manager.get_recent_trades(days=30, symbol=symbol)
         
         # Get Kelly recommendation
         kelly_svc = await get_kelly_service()
@@ -128,13 +128,9 @@ async def get_ml_system_status():
         # Calculate average confidence from recent signals
         avg_confidence = 0.5
         if hasattr(ai_brain, 'analysis_history') and ai_brain.analysis_history:
-            recent_signals = []
-            for analysis in list(ai_brain.analysis_history)[-20:]:
-                if analysis.get('signal') and analysis['signal'].get('confidence'):
-                    recent_signals.append(analysis['signal']['confidence'])
-            
-            if recent_signals:
-                avg_confidence = statistics.mean(recent_signals)
+            recent_confidence = ai_brain.analysis_history.mean('confidence', last=20)
+            if recent_confidence:
+                avg_confidence = recent_confidence
         
         return MLSystemStatus(
             lstm_enabled=lstm_enabled,
@@ -335,32 +331,21 @@ async def get_recent_predictions(limit: int = Query(20, ge=1, le=100)):
         recent_predictions = []
         
         # Get recent analysis with ML predictions
-        for analysis in list(ai_brain.analysis_history)[-limit:]:
-            if not analysis.get('signal'):
+        for analysis in ai_brain.get_analysis_history(limit):
+            if not analysis['signal']:
                 continue
                 
-            signal = analysis['signal']
             prediction_data = {
-                "timestamp": analysis.get('timestamp'),
-                "signal_type": signal.get('signal', {}).get('name', 'unknown'),
-                "confidence": signal.get('confidence', 0.0),
-                "reasoning": signal.get('reasoning', ''),
-                "ml_enhanced": "ML" in signal.get('reasoning', ''),
-                "kelly_position": signal.get('kelly_position_pct', 0.0),
-                "kelly_win_prob": signal.get('kelly_win_probability', 0.5)
+                "timestamp": analysis['timestamp'],
+                "symbol": analysis['symbol'],
+                "signal_type": analysis['signal'],
+                "confidence": analysis['confidence'] or 0.0,
+                "reasoning": analysis['reasoning'],
+                "ml_enhanced": "ML" in analysis['reasoning'],
+                "kelly_position": 0.0,
+                "kelly_win_prob": 0.5
             }
             
-            # Check if this was ML-enhanced
-            if hasattr(analysis.get('analysis'), 'ml_predictions'):
-                ml_preds = analysis['analysis']['ml_predictions']
-                prediction_data.update({
-                    "lstm_direction": ml_preds.get('lstm_prediction', {}).get('direction', 0),
-                    "lstm_confidence": ml_preds.get('lstm_prediction', {}).get('confidence', 0),
-                    "ensemble_direction": ml_preds.get('ensemble_prediction', {}).get('direction', 0),
-                    "ensemble_confidence": ml_preds.get('ensemble_prediction', {}).get('confidence', 0),
-                    "ml_agreement": ml_preds.get('ml_agreement', 0.0)
-                })
-            
             recent_predictions.append(prediction_data)
         
         return {
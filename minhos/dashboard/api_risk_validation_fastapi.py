@@ -8,6 +8,7 @@ FastAPI router for Risk Configuration & Validation dashboard:
 - Backtest performance comparisons  
 - Risk scenario testing results
 - Real-time risk monitoring
+- What-if simulation of hypothetical orders
 """
 
 import asyncio
@@ -17,12 +18,27 @@ from typing import Dict, Any, List, Optional
 
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
+
+from minhos.services.risk_manager import get_risk_manager, TradeRequest, OrderType
 
 logger = logging.getLogger(__name__)
 
 # Create FastAPI router
 router = APIRouter(prefix="/api/risk-validation", tags=["risk-validation"])
 
+class WhatIfOrder(BaseModel):
+    """Hypothetical order for what-if analysis"""
+    symbol: str
+    order_type: str = Field(..., description="BUY, SELL, CLOSE, STOP_LOSS or TAKE_PROFIT")
+    quantity: int = Field(..., ge=0)
+    price: float
+
+class WhatIfRequest(BaseModel):
+    """Batch of hypothetical orders"""
+    orders: List[WhatIfOrder] = Field(..., max_length=500)
+    cumulative: bool = Field(False, description="Apply orders in sequence, each seeing the previous fills")
+
 @router.get("/status")
 async def get_risk_validation_status():
     """Get overall risk validation status"""
@@ -327,4 +343,35 @@ async def get_performance_metrics():
         
     except Exception as e:
         logger.error(f"Performance metrics error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/what-if")
+async def simulate_orders(request: WhatIfRequest):
+    """Evaluate hypothetical orders against the live risk state without recording them"""
+    try:
+        now = datetime.now()
+        trade_requests = [
+            TradeRequest(
+                symbol=order.symbol,
+                order_type=OrderType(order.order_type.upper()),
+                quantity=order.quantity,
+                price=order.price,
+                timestamp=now,
+                reason="what-if"
+            )
+            for order in request.orders
+        ]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid order: {e}")
+    
+    try:
+        result = get_risk_manager().simulate_trade_requests(trade_requests, cumulative=request.cumulative)
+        return {
+            'success': True,
+            'simulation': result,
+            'timestamp': datetime.now().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error(f"What-if simulation error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
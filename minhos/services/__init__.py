@@ -18,68 +18,64 @@ All services are designed to work together seamlessly in a Linux environment
 with proper error handling, logging, and performance monitoring.
 """
 
-# Consolidated market data service
-from .market_data_service import (
-    MarketDataService, 
-    SierraChartRecord,
-    MultiChartData,
-    get_market_data_service,
-    get_sierra_client,  # Legacy compatibility
-    get_sierra_historical_service  # Legacy compatibility
-)
-from ..models.market import MarketData
-from .web_api import WebAPIService, get_web_api_service
-from .state_manager import (
-    StateManager, 
-    TradingState, 
-    SystemState, 
-    Position, 
-    RiskParameters, 
-    SystemConfig,
-    get_state_manager
-)
-from .ai_brain_service import (
-    AIBrainService, 
-    TradingSignal, 
-    SignalType, 
-    MarketAnalysis,
-    DetectedPattern,
-    PatternType,
-    get_ai_brain_service,
-    get_ai_status  # Legacy compatibility
-)
-from .trading_service import (
-    TradingEngine,
-    DecisionPriority,
-    MarketRegime,
-    TradingDecision,
-    get_trading_engine
-)
+import importlib.util
+
+from ..core.startup import get_startup_report
+
+# Services are imported on first use (PEP 562 module __getattr__), so a
+# command that needs one service does not pay for the ML and web stacks
+# of all the others. Import times land in the startup timing report.
+_LAZY_EXPORTS = {
+    # Consolidated market data service
+    '.market_data_service': (
+        'MarketDataService', 'SierraChartRecord', 'MultiChartData', 'get_market_data_service',
+        'get_sierra_client',  # Legacy compatibility
+        'get_sierra_historical_service'  # Legacy compatibility
+    ),
+    '..models.market': ('MarketData',),
+    '.web_api': ('WebAPIService', 'get_web_api_service'),
+    '.state_manager': (
+        'StateManager', 'TradingState', 'SystemState', 'Position', 'RiskParameters',
+        'SystemConfig', 'get_state_manager'
+    ),
+    '.ai_brain_service': (
+        'AIBrainService', 'TradingSignal', 'SignalType', 'MarketAnalysis', 'DetectedPattern',
+        'PatternType', 'get_ai_brain_service',
+        'get_ai_status'  # Legacy compatibility
+    ),
+    '.trading_service': (
+        'TradingEngine', 'DecisionPriority', 'MarketRegime', 'TradingDecision', 'get_trading_engine'
+    ),
+    '.risk_manager': ('RiskManager', 'RiskLevel', 'TradeRequest', 'RiskViolation', 'get_risk_manager'),
+}
 # Pattern analyzer functionality now integrated into ai_brain_service
-# from .pattern_analyzer import (
-#     PatternAnalyzer,
-#     PatternType,
-#     DetectedPattern,
-#     get_pattern_analyzer
-# )
+# Sierra historical data now part of market_data_service
+
+_EXPORT_MODULES = {name: module for module, names in _LAZY_EXPORTS.items() for name in names}
+
+
+def __getattr__(name: str):
+    module = _EXPORT_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    qualified = importlib.util.resolve_name(module, __name__)
+    value = getattr(get_startup_report().import_module(qualified), name)
+    globals()[name] = value
+    return value
+
+
+def _lazy_getter(name: str):
+    """Registry entry that imports its service module when first called"""
+    def getter():
+        return __getattr__(name)()
+    getter.__name__ = name
+    return getter
+
 
 # Legacy compatibility for pattern analyzer
 def get_pattern_analyzer():
     """Legacy compatibility - pattern analysis now part of AI brain service"""
-    return get_ai_brain_service()
-from .risk_manager import (
-    RiskManager,
-    RiskLevel,
-    TradeRequest,
-    RiskViolation,
-    get_risk_manager
-)
-# Sierra historical data now part of market_data_service
-# from .sierra_historical_data import (
-#     SierraHistoricalDataService,
-#     SierraChartRecord,
-#     get_sierra_historical_service
-# )
+    return __getattr__('get_ai_brain_service')()
 
 # Version information
 __version__ = "3.0.0"
@@ -88,14 +84,14 @@ __description__ = "Linux-native trading system services"
 
 # Service registry for easy access
 SERVICES = {
-    'market_data': get_market_data_service,  # Consolidated service
-    'sierra_client': get_sierra_client,  # Legacy compatibility -> market_data
-    'sierra_historical': get_sierra_historical_service,  # Legacy -> market_data
-    'web_api': get_web_api_service,
-    'state_manager': get_state_manager,
-    'ai_brain': get_ai_brain_service,
-    'trading_engine': get_trading_engine,
-    'risk_manager': get_risk_manager
+    'market_data': _lazy_getter('get_market_data_service'),  # Consolidated service
+    'sierra_client': _lazy_getter('get_sierra_client'),  # Legacy compatibility -> market_data
+    'sierra_historical': _lazy_getter('get_sierra_historical_service'),  # Legacy -> market_data
+    'web_api': _lazy_getter('get_web_api_service'),
+    'state_manager': _lazy_getter('get_state_manager'),
+    'ai_brain': _lazy_getter('get_ai_brain_service'),
+    'trading_engine': _lazy_getter('get_trading_engine'),
+    'risk_manager': _lazy_getter('get_risk_manager')
 }
 
 def get_service(service_name: str):
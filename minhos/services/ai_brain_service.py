@@ -7,23 +7,25 @@ import logging
 import asyncio
 import json
 import time
-import statistics
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
 from enum import Enum
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field
 from collections import deque, defaultdict
 from pathlib import Path
 import numpy as np
-import sqlite3
-import threading
-from contextlib import contextmanager
+import importlib.util
 
 # MinhOS imports
 from minhos.models.market import MarketData
 from .ab_testing_service import get_ab_testing_service
 from .ml_monitoring_service import get_ml_monitoring_service
 from ..core.market_data_adapter import get_market_data_adapter
+from ..core.indicators import IndicatorEngine, IndicatorSnapshot, compute_indicators
+from ..core.debounce import DebouncedScheduler
+from ..core.sharding import OrderedShards
+from ..core.telemetry import TelemetryBuffer
+from ..core.startup import get_model_warmup, get_startup_report
 
 # Import service getters (avoid circular imports by importing when needed)
 def get_sierra_client():
@@ -38,35 +40,33 @@ def get_sierra_historical_service():
     from . import get_sierra_historical_service as _get_sierra_historical_service
     return _get_sierra_historical_service()
 
-# Optional ML imports with availability flags
-HAS_ML_PIPELINE = False
-HAS_LSTM = False
-HAS_ENSEMBLE = False
-HAS_KELLY = False
+# Optional ML components with availability flags; the modules themselves
+# are imported by the background model warm-up, not at service import
+ML_COMPONENTS = {
+    'pipeline': ('minhos.services.ml_pipeline_service', 'MLPipelineService'),
+    'lstm': ('capabilities.prediction.lstm.lstm_predictor', 'LSTMPredictor'),
+    'ensemble': ('capabilities.prediction.ensemble.ensemble_manager', 'EnsembleManager'),
+    'kelly': ('minhos.services.position_sizing_service', 'PositionSizingService'),
+}
 
-try:
-    from capabilities.prediction.lstm.lstm_predictor import LSTMPredictor
-    HAS_LSTM = True
-except ImportError:
-    LSTMPredictor = None
 
-try:
-    from capabilities.prediction.ensemble.ensemble_manager import EnsembleManager
-    HAS_ENSEMBLE = True
-except ImportError:
-    EnsembleManager = None
+def _has_module(module: str) -> bool:
+    try:
+        return importlib.util.find_spec(module) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def _load_ml_component(name: str):
+    """Import an ML component class on first use (timed in the startup report)"""
+    module, attr = ML_COMPONENTS[name]
+    return getattr(get_startup_report().import_module(module), attr)
 
-try:
-    from .position_sizing_service import PositionSizingService
-    HAS_KELLY = True
-except ImportError:
-    PositionSizingService = None
 
-try:
-    from .ml_pipeline_service import MLPipelineService
-    HAS_ML_PIPELINE = True
-except ImportError:
-    MLPipelineService = None
+HAS_ML_PIPELINE = _has_module(ML_COMPONENTS['pipeline'][0])
+HAS_LSTM = _has_module(ML_COMPONENTS['lstm'][0])
+HAS_ENSEMBLE = _has_module(ML_COMPONENTS['ensemble'][0])
+HAS_KELLY = _has_module(ML_COMPONENTS['kelly'][0])
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -173,6 +173,44 @@ class MarketAnalysis:
         if self.key_levels is None:
             self.key_levels = []
 
+# Compact telemetry rows: one per analysis and one per ML pipeline prediction
+ANALYSIS_HISTORY_COLUMNS = {
+    'timestamp': 'f8',
+    'symbol': 'U24',
+    'data_source': 'U24',
+    'trend_direction': 'U10',
+    'trend_strength': 'f8',
+    'volatility_level': 'U8',
+    'volume_analysis': 'U12',
+    'support_level': 'f8',
+    'resistance_level': 'f8',
+    'signal': 'U12',
+    'confidence': 'f8',
+    'target_price': 'f8',
+    'stop_loss': 'f8',
+    # Fixed width: longer text is cut to 256 chars in the history (the signal keeps it
+    # whole). The longest reasoning _generate_signal composes is about 180 chars
+    'reasoning': 'U256'
+}
+
+ML_METRIC_COLUMNS = {
+    'timestamp': 'f8',
+    'direction': 'U8',
+    'confidence': 'f8',
+    'agreement': 'f8',
+    'kelly_fraction': 'f8'
+}
+
+@dataclass
+class SymbolState:
+    """Analysis state for one symbol"""
+    symbol: str
+    buffer: deque = field(default_factory=lambda: deque(maxlen=1000))  # Last 1000 data points
+    current_signal: Optional[TradingSignal] = None
+    current_analysis: Optional[MarketAnalysis] = None
+    last_analysis_time: Optional[datetime] = None
+    analyses: int = 0
+
 class AIBrainService:
     """
     Consolidated AI analysis service for MinhOS v3
@@ -182,9 +220,11 @@ class AIBrainService:
     def __init__(self, db_path: str = None):
         self.running = False
         
-        # Market data buffer for analysis
-        self.market_data_buffer = deque(maxlen=1000)  # Store last 1000 data points
-        self.analysis_history = deque(maxlen=100)     # Store last 100 analyses
+        # Per-symbol market data buffers and signals
+        self.symbol_states: Dict[str, SymbolState] = {}
+        self.primary_symbol: Optional[str] = None
+        self.analysis_history = TelemetryBuffer(100, ANALYSIS_HISTORY_COLUMNS)  # Last 100 analyses
+        self.ml_metrics = TelemetryBuffer(1000, ML_METRIC_COLUMNS)  # Last 1000 ML pipeline predictions
         
         # Pattern recognition components (from pattern_analyzer)
         if db_path is None:
@@ -194,8 +234,9 @@ class AIBrainService:
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(exist_ok=True)
         
-        # Initialize ML capabilities
+        # Initialize ML capabilities (loaded and warmed up in the background)
         self.ml_capabilities = {}
+        self.model_warmup = get_model_warmup()
         self._initialize_ml_capabilities()
         
         # Initialize A/B testing service
@@ -229,15 +270,34 @@ class AIBrainService:
             "confidence_threshold": 0.6,
             "strong_signal_threshold": 0.8,
             "min_volume_threshold": 100,  # Minimum volume for real-time analysis
-            "historical_fallback_days": 7  # Days of historical data to use as fallback
+            "historical_fallback_days": 7,  # Days of historical data to use as fallback
+            "min_analysis_interval": 1.0,  # Seconds between analyses of a symbol
+            "analysis_shards": 4,  # Ordered queues that symbols are hashed onto
+            "shard_processes": False  # Replay indicator windows in one process per shard (CPU parallelism)
         }
         
+        # Streaming per-symbol indicators, updated in O(1) per tick
+        self.indicators = IndicatorEngine(
+            long_period=self.analysis_params["trend_period"],
+            rsi_period=self.analysis_params["momentum_period"],
+            volatility_period=self.analysis_params["volatility_period"],
+            volume_period=self.analysis_params["volume_period"]
+        )
+        
+        # Symbols are hashed onto ordered shards: a symbol's analyses run one at a time, in order
+        self.shards = OrderedShards(
+            self.analysis_params["analysis_shards"], self.analysis_params["shard_processes"]
+        )
+        
+        # Per-symbol debounce: one analysis in flight, trailing run for the latest tick
+        self.analysis_scheduler = DebouncedScheduler(
+            self._run_sharded_analysis, self.analysis_params["min_analysis_interval"]
+        )
+        
         # Historical data service
         self.historical_service = None
         
-        # Current state
-        self.current_signal: Optional[TradingSignal] = None
-        self.current_analysis: Optional[MarketAnalysis] = None
+        # Latest analysis across all symbols
         self.last_analysis_time = None
         
         # Service references
@@ -261,81 +321,102 @@ class AIBrainService:
         
         logger.info("🧠 AI Brain Service initialized")
     
+    @property
+    def market_data_buffer(self) -> deque:
+        """Primary symbol's data buffer"""
+        return self._get_symbol_state(self._get_primary_symbol()).buffer
+    
+    @property
+    def current_signal(self) -> Optional[TradingSignal]:
+        return self.get_current_signal()
+    
+    @property
+    def current_analysis(self) -> Optional[MarketAnalysis]:
+        return self.get_current_analysis()
+    
+    def _get_primary_symbol(self) -> str:
+        """Primary trading symbol (centralized symbol management)"""
+        if self.primary_symbol is None:
+            from ..core.symbol_integration import get_ai_brain_primary_symbol
+            self.primary_symbol = get_ai_brain_primary_symbol()
+        return self.primary_symbol
+    
+    def _get_symbol_state(self, symbol: str) -> SymbolState:
+        """Get or create a symbol's analysis state"""
+        state = self.symbol_states.get(symbol)
+        if state is None:
+            state = self.symbol_states[symbol] = SymbolState(symbol)
+        return state
+    
     def _initialize_ml_capabilities(self):
-        """Initialize ML capabilities (LSTM, Ensemble, etc.)"""
+        """Register ML capabilities (LSTM, Ensemble, etc.) for background warm-up"""
         logger.info(f"🔄 Initializing ML capabilities - HAS_ML_PIPELINE:{HAS_ML_PIPELINE}, HAS_LSTM:{HAS_LSTM}, HAS_ENSEMBLE:{HAS_ENSEMBLE}, HAS_KELLY:{HAS_KELLY}")
         
-        try:
-            project_root = Path(__file__).parent.parent.parent
-            
-            # Initialize unified ML Pipeline Service
-            if HAS_ML_PIPELINE:
-                logger.info("🔄 Attempting to initialize ML Pipeline Service...")
-                from .ml_pipeline_service import MLPipelineService
-                self.ml_capabilities['pipeline'] = MLPipelineService()
-                logger.info("✅ ML Pipeline Service initialized (LSTM + Ensemble + Kelly)")
-            else:
-                logger.warning(f"⚠️ ML Pipeline Service not available - HAS_ML_PIPELINE:{HAS_ML_PIPELINE}, MLPipelineService:{MLPipelineService is not None}")
-                
-                # Fallback to individual components
-                # Initialize LSTM predictor
-                if HAS_LSTM and LSTMPredictor:
-                    logger.info("🔄 Attempting to initialize LSTM predictor...")
-                    model_path = project_root / "ml_models" / "lstm_model"
-                    
-                    self.ml_capabilities['lstm'] = LSTMPredictor(
-                        sequence_length=20,
-                        features=8,
-                        model_path=str(model_path)
-                    )
-                    logger.info("✅ LSTM predictor initialized")
-                else:
-                    logger.warning(f"⚠️ LSTM predictor disabled - HAS_LSTM:{HAS_LSTM}, LSTMPredictor:{LSTMPredictor is not None}")
-                
-                # Initialize Ensemble Manager
-                if HAS_ENSEMBLE and EnsembleManager:
-                    logger.info("🔄 Attempting to initialize Ensemble Manager...")
-                    ensemble_path = project_root / "ml_models" / "ensemble"
-                    
-                    self.ml_capabilities['ensemble'] = EnsembleManager(
-                        model_path=str(ensemble_path)
-                    )
-                    logger.info("✅ Ensemble manager initialized")
-                else:
-                    logger.warning(f"⚠️ Ensemble models disabled - HAS_ENSEMBLE:{HAS_ENSEMBLE}, EnsembleManager:{EnsembleManager is not None}")
-                
-                # Initialize Kelly Criterion Position Sizing
-                if HAS_KELLY and PositionSizingService:
-                    logger.info("🔄 Attempting to initialize Kelly Criterion...")
-                    self.ml_capabilities['kelly'] = PositionSizingService()
-                    logger.info("✅ Kelly Criterion position sizing initialized")
-                else:
-                    logger.warning(f"⚠️ Kelly Criterion disabled - HAS_KELLY:{HAS_KELLY}, PositionSizingService:{PositionSizingService is not None}")
-                
-        except Exception as e:
-            logger.error(f"❌ ML capabilities initialization error: {e}")
-            import traceback
-            logger.error(f"❌ Traceback: {traceback.format_exc()}")
-            
-        logger.info(f"🤖 ML Capabilities: {list(self.ml_capabilities.keys())}")
+        # Unified ML Pipeline Service; the individual components stand in if it fails to load
+        if HAS_ML_PIPELINE:
+            registered = [self._register_ml_capability(
+                'pipeline', lambda: _load_ml_component('pipeline')(),
+                warm=lambda pipeline: pipeline.warm_up(),
+                on_failed=self._fall_back_to_ml_components
+            )]
+        else:
+            logger.warning(f"⚠️ ML Pipeline Service not available - HAS_ML_PIPELINE:{HAS_ML_PIPELINE}")
+            registered = self._register_ml_components()
         
-        # Force enable at least one capability for testing
-        if not self.ml_capabilities:
-            logger.warning("⚠️ No ML capabilities loaded, attempting force initialization...")
-            try:
-                from .ml_pipeline_service import MLPipelineService
-                self.ml_capabilities['pipeline'] = MLPipelineService()
-                logger.info("✅ Force-initialized ML Pipeline Service")
-            except Exception as e:
-                logger.error(f"❌ Force initialization failed: {e}")
-                
-                # Try individual services as fallback
-                try:
-                    if HAS_KELLY and PositionSizingService:
-                        self.ml_capabilities['kelly'] = PositionSizingService()
-                        logger.info("✅ Force-initialized Kelly Criterion")
-                except Exception as kelly_e:
-                    logger.error(f"❌ Kelly force initialization failed: {kelly_e}")
+        # Artifacts load and dummy inferences run off the startup path;
+        # ml_capabilities fills in as each model becomes ready
+        self.model_warmup.start()
+        logger.info(f"🤖 ML Capabilities warming up: {registered}")
+    
+    def _fall_back_to_ml_components(self, error: Exception):
+        """Pipeline warm-up failed: load LSTM, Ensemble and Kelly individually"""
+        logger.warning(f"⚠️ ML Pipeline Service failed ({error}), falling back to individual components")
+        registered = self._register_ml_components()
+        self.model_warmup.start()
+        logger.info(f"🤖 Fallback ML Capabilities warming up: {registered}")
+    
+    def _register_ml_components(self) -> List[str]:
+        """Register the individual ML components that are available"""
+        project_root = Path(__file__).parent.parent.parent
+        registered = []
+        
+        # LSTM predictor
+        if HAS_LSTM:
+            model_path = project_root / "ml_models" / "lstm_model"
+            registered.append(self._register_ml_capability(
+                'lstm', lambda: _load_ml_component('lstm')(
+                    sequence_length=20,
+                    features=8,
+                    model_path=str(model_path)
+                ),
+                warm=lambda predictor: predictor.warm_up()
+            ))
+        else:
+            logger.warning(f"⚠️ LSTM predictor disabled - HAS_LSTM:{HAS_LSTM}")
+        
+        # Ensemble Manager
+        if HAS_ENSEMBLE:
+            ensemble_path = project_root / "ml_models" / "ensemble"
+            registered.append(self._register_ml_capability(
+                'ensemble', lambda: _load_ml_component('ensemble')(model_path=str(ensemble_path)),
+                warm=lambda manager: manager.warm_up()
+            ))
+        else:
+            logger.warning(f"⚠️ Ensemble models disabled - HAS_ENSEMBLE:{HAS_ENSEMBLE}")
+        
+        # Kelly Criterion Position Sizing
+        if HAS_KELLY:
+            registered.append(self._register_ml_capability('kelly', lambda: _load_ml_component('kelly')()))
+        else:
+            logger.warning(f"⚠️ Kelly Criterion disabled - HAS_KELLY:{HAS_KELLY}")
+        
+        return registered
+    
+    def _register_ml_capability(self, name: str, loader, warm=None, on_failed=None) -> str:
+        def on_ready(instance):
+            self.ml_capabilities[name] = instance
+        self.model_warmup.register(name, loader, warm=warm, on_ready=on_ready, on_failed=on_failed)
+        return name
     
     async def _load_historical_context(self):
         """Load historical market data for AI context"""
@@ -343,6 +424,7 @@ class AIBrainService:
             # Get primary trading symbol (centralized symbol management)
             from ..core.symbol_integration import get_ai_brain_primary_symbol, get_symbol_integration
             primary_symbol = get_ai_brain_primary_symbol()
+            self.primary_symbol = primary_symbol
             
             # Mark service as migrated to centralized symbol management
             get_symbol_integration().mark_service_migrated('ai_brain_service')
@@ -367,7 +449,8 @@ class AIBrainService:
                             'low': getattr(data, 'low', data.close),
                             'source': data.source
                         }
-                        self.market_data_buffer.append(data_point)
+                        self._get_symbol_state(data.symbol or primary_symbol).buffer.append(data_point)
+                        self.indicators.update(data.symbol or primary_symbol, data_point['close'], data_point['volume'])
                     except Exception as e:
                         logger.debug(f"Skipping invalid historical record: {e}")
                         continue
@@ -414,6 +497,9 @@ class AIBrainService:
         # Start ML monitoring service
         await self.ml_monitoring.start()
         
+        # Start the per-symbol ordered shards
+        await self.shards.start()
+        
         # Start analysis loops
         asyncio.create_task(self._analysis_loop())
         asyncio.create_task(self._signal_validation_loop())
@@ -425,6 +511,8 @@ class AIBrainService:
         """Stop the AI Brain Service"""
         logger.info("🛑 Stopping AI Brain Service...")
         self.running = False
+        self.analysis_scheduler.cancel()
+        await self.shards.stop()
         
         # Stop ML monitoring service
         await self.ml_monitoring.stop()
@@ -460,23 +548,41 @@ class AIBrainService:
                     'source': market_data.source
                 }
             
-            self.market_data_buffer.append(data_point)
+            symbol = data_point['symbol'] or self._get_primary_symbol()
+            state = self._get_symbol_state(symbol)
+            previous = self.indicators.snapshot(symbol)
+            state.buffer.append(data_point)
+            self.indicators.update(symbol, data_point['close'], data_point['volume'])
             
-            # Feed data to ML Pipeline if available
-            if 'pipeline' in self.ml_capabilities:
+            # Feed the primary symbol to the ML Pipeline if available (its feature buffer is single-instrument)
+            if 'pipeline' in self.ml_capabilities and symbol == self._get_primary_symbol():
                 try:
                     ml_prediction = await self.ml_capabilities['pipeline'].get_ml_prediction(data_point)
                     self._integrate_ml_prediction(ml_prediction)
                 except Exception as e:
                     logger.warning(f"ML Pipeline prediction failed: {e}")
             
-            # Trigger analysis if we have enough data
-            if len(self.market_data_buffer) >= 20:
-                await self._perform_analysis()
+            # Schedule analysis if we have enough data; level crosses skip the debounce interval
+            if len(state.buffer) >= 20:
+                priority = self._crossed_signal_level(state, previous, data_point['close'])
+                self.analysis_scheduler.request(symbol, priority=priority)
                 
         except Exception as e:
             logger.error(f"❌ Market data processing error: {e}")
     
+    def _crossed_signal_level(self, state: SymbolState, previous: Optional[IndicatorSnapshot],
+                              price: Optional[float]) -> bool:
+        """Check whether a tick crossed the long SMA or the symbol's signal target/stop"""
+        if previous is None or previous.last_price is None or price is None:
+            return False
+        
+        levels = [previous.sma_long]
+        if state.current_signal:
+            levels.extend([state.current_signal.target_price, state.current_signal.stop_loss])
+        
+        last_price = previous.last_price
+        return any(level is not None and (last_price - level) * (price - level) < 0 for level in levels)
+    
     def _integrate_ml_prediction(self, ml_prediction):
         """Integrate ML pipeline prediction into AI Brain analysis"""
         try:
@@ -488,16 +594,14 @@ class AIBrainService:
                 logger.info(f"🤖 High ML agreement: {ml_prediction.models_agreement:.2f} for {ml_prediction.direction}")
             
             # Store ML metrics for dashboard
-            if hasattr(self, 'ml_metrics'):
-                self.ml_metrics.append({
-                    'timestamp': ml_prediction.timestamp,
-                    'direction': ml_prediction.direction,
-                    'confidence': ml_prediction.confidence,
-                    'agreement': ml_prediction.models_agreement,
-                    'kelly_fraction': ml_prediction.kelly_fraction
-                })
-            else:
-                self.ml_metrics = []
+            timestamp = ml_prediction.timestamp
+            self.ml_metrics.append(
+                timestamp=timestamp.timestamp() if isinstance(timestamp, datetime) else time.time(),
+                direction=ml_prediction.direction,
+                confidence=ml_prediction.confidence,
+                agreement=ml_prediction.models_agreement,
+                kelly_fraction=ml_prediction.kelly_fraction
+            )
                 
         except Exception as e:
             logger.error(f"Failed to integrate ML prediction: {e}")
@@ -506,9 +610,10 @@ class AIBrainService:
         """Main analysis loop"""
         while self.running:
             try:
-                # Perform analysis every 30 seconds if we have data
-                if len(self.market_data_buffer) >= self.analysis_params["trend_period"]:
-                    await self._perform_analysis()
+                # Request analysis every 30 seconds for symbols with data (no-op while one is in flight)
+                for symbol, state in list(self.symbol_states.items()):
+                    if len(state.buffer) >= self.analysis_params["trend_period"]:
+                        self.analysis_scheduler.request(symbol)
                 
                 await asyncio.sleep(30)
                 
@@ -516,11 +621,18 @@ class AIBrainService:
                 logger.error(f"❌ Analysis loop error: {e}")
                 await asyncio.sleep(30)
     
-    async def _perform_analysis(self):
+    async def _run_sharded_analysis(self, symbol: str):
+        """Run a symbol's analysis in order on its shard"""
+        await self.shards.run(symbol, self._perform_analysis, symbol)
+    
+    async def _perform_analysis(self, symbol: Optional[str] = None):
         """Perform comprehensive market analysis with historical data fallback"""
         try:
+            symbol = symbol or self._get_primary_symbol()
+            state = self._get_symbol_state(symbol)
+            
             # Check if we have sufficient real-time data
-            analysis_result = await self._get_analysis_data()
+            analysis_result = await self._get_analysis_data(symbol)
             if not analysis_result:
                 return
             
@@ -534,10 +646,11 @@ class AIBrainService:
                 data_source = 'realtime'
             
             # Perform different types of analysis
-            trend_analysis = await self._analyze_trend(analysis_data)
-            momentum_analysis = await self._analyze_momentum(analysis_data)
-            volatility_analysis = await self._analyze_volatility(analysis_data)
-            volume_analysis = await self._analyze_volume(analysis_data)
+            indicators = await self._get_indicator_snapshot(analysis_data, data_source, symbol)
+            trend_analysis = await self._analyze_trend(indicators)
+            momentum_analysis = await self._analyze_momentum(indicators)
+            volatility_analysis = await self._analyze_volatility(indicators)
+            volume_analysis = await self._analyze_volume(indicators)
             pattern_analysis = await self._analyze_patterns(analysis_data)
             
             # Perform ML analysis
@@ -552,10 +665,11 @@ class AIBrainService:
             # Generate trading signal with data source context and A/B testing
             signal = await self._generate_signal(combined_analysis, analysis_data, data_source)
             
-            # Update current state
-            self.current_analysis = combined_analysis
-            self.current_signal = signal
-            self.last_analysis_time = datetime.now()
+            # Update the symbol's state
+            state.current_analysis = combined_analysis
+            state.current_signal = signal
+            state.last_analysis_time = self.last_analysis_time = datetime.now()
+            state.analyses += 1
             
             # Update statistics
             self.stats["analyses_performed"] += 1
@@ -569,24 +683,45 @@ class AIBrainService:
                     self.stats["hold_signals"] += 1
             
             # Store analysis history
-            self.analysis_history.append({
-                'timestamp': datetime.now().isoformat(),
-                'analysis': asdict(combined_analysis) if combined_analysis else None,
-                'signal': asdict(signal) if signal else None
-            })
+            self._record_analysis(symbol, data_source, combined_analysis, signal)
             
             if signal and signal.confidence > self.analysis_params["confidence_threshold"]:
-                logger.info(f"🎯 Signal: {signal.signal.value} ({signal.confidence:.1%} confidence) - {signal.reasoning}")
+                logger.info(f"🎯 {symbol} Signal: {signal.signal.value} ({signal.confidence:.1%} confidence) - {signal.reasoning}")
             
         except Exception as e:
-            logger.error(f"❌ Analysis error: {e}")
+            logger.error(f"❌ Analysis error for {symbol}: {e}")
     
-    async def _get_analysis_data(self) -> Dict[str, Any]:
-        """Get data for analysis - real-time or historical fallback"""
+    def _record_analysis(self, symbol: str, data_source: str, analysis: Optional[MarketAnalysis],
+                         signal: Optional[TradingSignal]):
+        """Append a compact analysis row to the telemetry history"""
+        row = {'timestamp': time.time(), 'symbol': symbol, 'data_source': data_source}
+        if analysis:
+            row.update(
+                trend_direction=analysis.trend_direction,
+                trend_strength=analysis.trend_strength,
+                volatility_level=analysis.volatility_level,
+                volume_analysis=analysis.volume_analysis,
+                support_level=analysis.support_level,
+                resistance_level=analysis.resistance_level
+            )
+        if signal:
+            row.update(
+                signal=signal.signal.value,
+                confidence=signal.confidence,
+                target_price=signal.target_price,
+                stop_loss=signal.stop_loss,
+                reasoning=signal.reasoning
+            )
+        self.analysis_history.append(**row)
+    
+    async def _get_analysis_data(self, symbol: Optional[str] = None) -> Dict[str, Any]:
+        """Get a symbol's data for analysis - real-time or historical fallback"""
+        symbol = symbol or self._get_primary_symbol()
+        buffer = self._get_symbol_state(symbol).buffer
         try:
             # First, check if we have sufficient and fresh real-time data with volume
-            if self.market_data_buffer:
-                recent_data = list(self.market_data_buffer)[-self.analysis_params["trend_period"]:]
+            if buffer:
+                recent_data = list(buffer)[-self.analysis_params["trend_period"]:]
                 
                 # Check if recent data has sufficient volume
                 recent_volumes = [d.get('volume', 0) for d in recent_data if d.get('volume', 0) > 0]
@@ -598,7 +733,6 @@ class AIBrainService:
                     try:
                         last_timestamp = recent_data[-1].get('timestamp')
                         if last_timestamp:
-                            from datetime import datetime, timedelta
                             if isinstance(last_timestamp, str):
                                 # Handle both ISO format and timestamp strings
                                 if 'T' in last_timestamp:
@@ -648,9 +782,9 @@ class AIBrainService:
                     end_date = datetime.utcnow()
                     start_date = end_date - timedelta(days=self.analysis_params["historical_fallback_days"])
                     
-                    # Get historical data for NQU25-CME (primary symbol)
+                    # Get historical data for the symbol being analysed
                     historical_records = await self.historical_service.get_historical_data(
-                        'NQU25-CME', start_date, end_date
+                        symbol, start_date, end_date
                     )
                     
                     if historical_records:
@@ -674,32 +808,39 @@ class AIBrainService:
                     logger.error(f"❌ Error fetching historical data: {e}")
             
             # If no historical service or error, return what we have
-            if self.market_data_buffer:
+            if buffer:
                 logger.warning("⚠️ Using limited real-time data despite low volume")
-                return {'data': list(self.market_data_buffer)[-self.analysis_params["trend_period"]:], 'source': 'realtime_limited'}
+                return {'data': list(buffer)[-self.analysis_params["trend_period"]:], 'source': 'realtime_limited'}
             
             logger.warning("❌ No data available for analysis")
             return {'data': [], 'source': 'none'}
             
         except Exception as e:
             logger.error(f"❌ Error getting analysis data: {e}")
-            fallback_data = list(self.market_data_buffer)[-self.analysis_params["trend_period"]:] if self.market_data_buffer else []
+            fallback_data = list(buffer)[-self.analysis_params["trend_period"]:] if buffer else []
             return {'data': fallback_data, 'source': 'error_fallback'}
     
-    async def _analyze_trend(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def _get_indicator_snapshot(self, data: List[Dict[str, Any]], data_source: str,
+                                      symbol: Optional[str] = None) -> IndicatorSnapshot:
+        """Get streaming indicators for live data; other windows are replayed once"""
+        symbol = symbol or (data[-1].get('symbol') if data else None) or ""
+        if symbol and data_source.startswith('realtime'):
+            snapshot = self.indicators.snapshot(symbol)
+            if snapshot is not None:
+                return snapshot
+        
+        # Replayed in the symbol's shard process when shard processes are enabled
+        return await self.shards.run_cpu(symbol, compute_indicators, data, symbol, self.indicators.periods)
+    
+    async def _analyze_trend(self, indicators: IndicatorSnapshot) -> Dict[str, Any]:
         """Analyze market trend"""
         try:
-            if len(data) < 10:
-                return {"direction": "unknown", "strength": 0.0}
-            
-            prices = [d['close'] for d in data if d['close'] is not None]
-            
-            if not prices:
+            if indicators.ticks < 10 or indicators.last_price is None:
                 return {"direction": "unknown", "strength": 0.0}
             
             # Simple moving averages
-            sma_short = statistics.mean(prices[-10:])
-            sma_long = statistics.mean(prices[-20:]) if len(prices) >= 20 else statistics.mean(prices)
+            sma_short = indicators.sma_short
+            sma_long = indicators.sma_long
             
             # Trend direction
             if sma_short > sma_long * 1.002:  # 0.2% threshold
@@ -709,8 +850,9 @@ class AIBrainService:
             else:
                 direction = "sideways"
             
-            # Trend strength (based on price momentum)
-            price_change = (prices[-1] - prices[0]) / prices[0] if prices[0] != 0 else 0
+            # Trend strength (based on price momentum over the window)
+            window_open = indicators.window_open
+            price_change = (indicators.last_price - window_open) / window_open if window_open else 0
             strength = min(1.0, abs(price_change) * 100)  # Scale to 0-1
             
             return {
@@ -718,6 +860,8 @@ class AIBrainService:
                 "strength": strength,
                 "sma_short": sma_short,
                 "sma_long": sma_long,
+                "ema_short": indicators.ema_short,
+                "ema_long": indicators.ema_long,
                 "price_change_pct": price_change * 100
             }
             
@@ -725,33 +869,17 @@ class AIBrainService:
             logger.error(f"❌ Trend analysis error: {e}")
             return {"direction": "unknown", "strength": 0.0}
     
-    async def _analyze_momentum(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def _analyze_momentum(self, indicators: IndicatorSnapshot) -> Dict[str, Any]:
         """Analyze momentum indicators"""
         try:
-            if len(data) < self.analysis_params["momentum_period"]:
+            if indicators.ticks < self.analysis_params["momentum_period"]:
                 return {"rsi": 50.0, "momentum": "neutral"}
             
-            prices = [d['close'] for d in data if d['close'] is not None]
-            
-            if not prices or len(prices) < 2:
+            if indicators.rsi_changes < 1:
                 return {"rsi": 50.0, "momentum": "neutral"}
             
-            # Simple RSI calculation
-            price_changes = [prices[i] - prices[i-1] for i in range(1, len(prices))]
-            gains = [change if change > 0 else 0 for change in price_changes]
-            losses = [-change if change < 0 else 0 for change in price_changes]
-            
-            if len(gains) >= 14:
-                avg_gain = statistics.mean(gains[-14:])
-                avg_loss = statistics.mean(losses[-14:])
-                
-                if avg_loss == 0:
-                    rsi = 100.0
-                else:
-                    rs = avg_gain / avg_loss
-                    rsi = 100 - (100 / (1 + rs))
-            else:
-                rsi = 50.0  # Neutral
+            # Simple-average RSI over the window (Wilder's RSI reported alongside)
+            rsi = indicators.rsi if indicators.rsi is not None else 50.0
             
             # Momentum classification
             if rsi > 70:
@@ -767,32 +895,26 @@ class AIBrainService:
             
             return {
                 "rsi": rsi,
+                "rsi_wilder": indicators.rsi_wilder,
                 "momentum": momentum,
-                "avg_gain": avg_gain if 'avg_gain' in locals() else 0,
-                "avg_loss": avg_loss if 'avg_loss' in locals() else 0
+                "avg_gain": indicators.avg_gain if indicators.rsi is not None else 0,
+                "avg_loss": indicators.avg_loss if indicators.rsi is not None else 0
             }
             
         except Exception as e:
             logger.error(f"❌ Momentum analysis error: {e}")
             return {"rsi": 50.0, "momentum": "neutral"}
     
-    async def _analyze_volatility(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def _analyze_volatility(self, indicators: IndicatorSnapshot) -> Dict[str, Any]:
         """Analyze market volatility"""
         try:
-            if len(data) < self.analysis_params["volatility_period"]:
+            if indicators.ticks < self.analysis_params["volatility_period"]:
                 return {"level": "unknown", "value": 0.0}
             
-            prices = [d['close'] for d in data if d['close'] is not None]
-            
-            if not prices or len(prices) < 2:
-                return {"level": "unknown", "value": 0.0}
-            
-            returns = [(prices[i] - prices[i-1]) / prices[i-1] for i in range(1, len(prices)) if prices[i-1] != 0]
-            
-            if not returns:
+            if not indicators.returns:
                 return {"level": "unknown", "value": 0.0}
             
-            volatility = statistics.stdev(returns) if len(returns) > 1 else 0.0
+            volatility = indicators.return_std
             
             # Classify volatility level
             if volatility > 0.02:  # 2%
@@ -806,27 +928,24 @@ class AIBrainService:
                 "level": level,
                 "value": volatility,
                 "returns_std": volatility,
-                "avg_return": statistics.mean(returns)
+                "avg_return": indicators.return_mean
             }
             
         except Exception as e:
             logger.error(f"❌ Volatility analysis error: {e}")
             return {"level": "unknown", "value": 0.0}
     
-    async def _analyze_volume(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def _analyze_volume(self, indicators: IndicatorSnapshot) -> Dict[str, Any]:
         try:
-            volumes = [d.get('volume', 0) for d in data if d.get('volume') is not None]
-            
-            if len(volumes) < 10:
+            if indicators.volumes < 10:
                 return {"trend": "unknown", "relative_volume": 1.0}
             
-            # Remove zeros for analysis
-            volumes = [v for v in volumes if v > 0]
-            if not volumes:
+            # Only positive volumes count
+            if not indicators.positive_volumes:
                 return {"trend": "unknown", "relative_volume": 1.0}
             
-            avg_volume = statistics.mean(volumes)
-            recent_volume = statistics.mean(volumes[-5:]) if len(volumes) >= 5 else volumes[-1]
+            avg_volume = indicators.avg_volume
+            recent_volume = indicators.recent_volume
             
             relative_volume = recent_volume / avg_volume if avg_volume > 0 else 1.0
             
@@ -1412,13 +1531,29 @@ class AIBrainService:
         """Process market data for analysis"""
         await self._on_market_data(market_data)
     
-    def get_current_signal(self) -> Optional[TradingSignal]:
-        """Get current trading signal"""
-        return self.current_signal
+    def get_current_signal(self, symbol: Optional[str] = None) -> Optional[TradingSignal]:
+        """Get current trading signal for a symbol (primary symbol by default)"""
+        state = self.symbol_states.get(symbol or self._get_primary_symbol())
+        return state.current_signal if state else None
     
-    def get_current_analysis(self) -> Optional[MarketAnalysis]:
-        """Get current market analysis"""
-        return self.current_analysis
+    def get_current_analysis(self, symbol: Optional[str] = None) -> Optional[MarketAnalysis]:
+        """Get current market analysis for a symbol (primary symbol by default)"""
+        state = self.symbol_states.get(symbol or self._get_primary_symbol())
+        return state.current_analysis if state else None
+    
+    def get_symbol_status(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-symbol signal and data summary"""
+        return {
+            symbol: {
+                "shard": self.shards.shard_for(symbol),
+                "data_points": len(state.buffer),
+                "signal": state.current_signal.signal.value if state.current_signal else None,
+                "confidence": state.current_signal.confidence if state.current_signal else None,
+                "analyses": state.analyses,
+                "last_analysis": state.last_analysis_time.isoformat() if state.last_analysis_time else None
+            }
+            for symbol, state in self.symbol_states.items()
+        }
     
     def get_ai_status(self) -> Dict[str, Any]:
         """Get comprehensive AI status"""
@@ -1464,8 +1599,19 @@ class AIBrainService:
                 "connected": is_connected,
                 "signal": signal_data,
                 "analysis": analysis_data,
-                "data_points": len(self.market_data_buffer),
+                "data_points": sum(len(state.buffer) for state in self.symbol_states.values()),
                 "historical_context": historical_info,
+                "primary_symbol": self.primary_symbol,
+                "symbols": self.get_symbol_status(),
+                "shards": self.shards.get_stats(),
+                "telemetry": {
+                    "analysis_history": self.analysis_history.get_stats(),
+                    "ml_metrics": self.ml_metrics.get_stats(),
+                    "signal_confidence": self.analysis_history.percentiles('confidence'),
+                    "ml_confidence": self.ml_metrics.percentiles('confidence')
+                },
+                "indicators": self.indicators.get_stats(),
+                "scheduler": self.analysis_scheduler.get_stats(),
                 "last_analysis": self.last_analysis_time.isoformat() if self.last_analysis_time else None,
                 "stats": self.stats.copy(),
                 "timestamp": datetime.now().isoformat()
@@ -1483,7 +1629,10 @@ class AIBrainService:
     
     def get_analysis_history(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent analysis history"""
-        return list(self.analysis_history)[-limit:]
+        records = self.analysis_history.records(limit)
+        for record in records:
+            record['timestamp'] = datetime.fromtimestamp(record['timestamp']).isoformat()
+        return records
 
 class PatternDetector:
     
@@ -164,11 +164,10 @@ class ConversationContext:
                 if self.ai_brain_service and hasattr(self.ai_brain_service, 'ml_capabilities'):
                     # Check recent analysis for ML confidence
                     if hasattr(self.ai_brain_service, 'analysis_history') and self.ai_brain_service.analysis_history:
-                        recent_analysis = list(self.ai_brain_service.analysis_history)[-1]
-                        if recent_analysis.get('signal') and recent_analysis['signal'].get('confidence'):
-                            ml_confidence = recent_analysis['signal']['confidence']
-                            if recent_analysis['signal'].get('signal', {}).get('name'):
-                                ml_signal = recent_analysis['signal']['signal']['name']
+                        recent_analysis = self.ai_brain_service.analysis_history.latest()
+                        if recent_analysis['signal'] and recent_analysis['confidence']:
+                            ml_confidence = recent_analysis['confidence']
+                            ml_signal = recent_analysis['signal']
                                 
             except Exception as e:
                 self.logger.debug(f"Could not get ML data: {e}")
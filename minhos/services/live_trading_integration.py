@@ -329,12 +329,14 @@ class LiveTradingIntegration(BaseService):
                     f"Filled @ ${result.fill_price}"
                 )
                 
-                # Update state manager with live position
+                # Record the fill in the trades ledger and update the live position
                 if self.state_manager:
-                    await self.state_manager.update_position(
+                    await self.state_manager.record_fill(
                         symbol=trade_command.symbol,
-                        quantity=decision.quantity if decision.action == "BUY" else -decision.quantity,
-                        price=result.fill_price
+                        side=decision.action,
+                        quantity=decision.quantity,
+                        price=result.fill_price,
+                        order_id=trade_command.command_id
                     )
             
             else:
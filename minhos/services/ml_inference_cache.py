@@ -10,14 +10,17 @@ import asyncio
 import logging
 import hashlib
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional, Tuple, Union
-from collections import defaultdict, deque
+from typing import Dict, Any, Callable, List, Optional, Tuple, Union
+from collections import deque
 import json
 import numpy as np
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 import threading
 import time
 
+from ..core.telemetry import Histogram, TelemetryBuffer
+from ..core.vector_index import VectorIndex
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -32,11 +35,13 @@ class CacheEntry:
 
 @dataclass
 class BatchRequest:
-    """Batch inference request"""
+    """Requests coalesced for one stacked inference call"""
     model_type: str
     requests: List[Dict[str, Any]]
     timestamp: datetime
-    callback: Optional[callable] = None
+    callback: Optional[callable] = None  # Batch predictor: list of inputs -> list of results
+    futures: List[asyncio.Future] = field(default_factory=list)
+    enqueued_at: List[float] = field(default_factory=list)
 
 class MLInferenceCache:
     """
@@ -64,11 +69,19 @@ class MLInferenceCache:
         self.cache: Dict[str, CacheEntry] = {}
         self.cache_lock = threading.RLock()
         
-        # Batch processing
-        self.batch_queue: Dict[str, List[BatchRequest]] = defaultdict(list)
+        # Feature vectors of cached inputs per (model type, dimension), for similarity hits
+        self.vector_indexes: Dict[Tuple[str, int], VectorIndex] = {}
+        
+        # Batch processing: one open batch per (model type, batch predictor). A request
+        # with nothing in flight runs at once; requests arriving while a batch runs
+        # coalesce until it finishes, for at most batch_timeout
+        self.batch_queue: Dict[Tuple[str, Callable], BatchRequest] = {}
+        self.batches_in_flight: Dict[Tuple[str, Callable], int] = {}
         self.batch_size = 32
-        self.batch_timeout = 0.1  # 100ms batch timeout
         self.batch_lock = threading.RLock()
+        self.batch_tasks = set()
+        self.batch_size_histogram = Histogram([1, 2, 4, 8, 16, 32, 64])
+        self.queue_delay_histogram = Histogram([0.5, 1, 2, 5, 10, 20, 50, 100])  # ms
         
         # Performance tracking
         self.stats = {
@@ -76,11 +89,12 @@ class MLInferenceCache:
             'cache_misses': 0,
             'total_requests': 0,
             'batch_processed': 0,
+            'batched_requests': 0,
             'avg_latency': 0.0,
             'cache_hit_rate': 0.0
         }
         
-        self.latency_history = deque(maxlen=1000)
+        self.latency_history = TelemetryBuffer(1000, {'timestamp': 'f8', 'latency_ms': 'f8', 'cache_hit': 'b1'})
         self.request_times = deque(maxlen=100)
         
         # Cache configuration
@@ -88,7 +102,8 @@ class MLInferenceCache:
             'enable_cache': True,
             'enable_batching': True,
             'similarity_threshold': 0.95,  # For feature similarity matching
-            'max_batch_wait_ms': 100,
+            'min_feature_dims': 4,  # Shorter vectors are too coarse for cosine similarity hits
+            'max_batch_wait_ms': 2,  # Longest a request waits behind a running batch
             'cache_ttl_seconds': 300,
             'performance_target_ms': 100
         }
@@ -146,76 +161,62 @@ class MLInferenceCache:
             logger.warning(f"Error generating cache key: {e}")
             return f"{model_type}:{hash(str(input_data))}"
     
-    def _calculate_feature_similarity(self, features1: np.ndarray, features2: np.ndarray) -> float:
-        """Calculate similarity between two feature vectors"""
+    def _extract_features(self, input_data: Dict[str, Any]) -> Optional[np.ndarray]:
+        """Numeric feature vector from input data, or None if there is none"""
+        features = input_data.get('features')
+        if features is None or np.ndim(features) == 0:
+            return None  # A scalar is metadata (e.g. a feature count), not a vector
         try:
-            if features1.shape != features2.shape:
-                return 0.0
-            
-            # Cosine similarity
-            dot_product = np.dot(features1, features2)
-            norm1 = np.linalg.norm(features1)
-            norm2 = np.linalg.norm(features2)
-            
-            if norm1 == 0 or norm2 == 0:
-                return 0.0
-            
-            return dot_product / (norm1 * norm2)
-        except Exception:
-            return 0.0
+            vector = np.asarray(features, dtype=np.float32).reshape(-1)
+        except (TypeError, ValueError):
+            return None  # e.g. a list of feature names
+        return vector if vector.size >= max(1, self.config['min_feature_dims']) else None
     
-    def _find_similar_cache_entry(self, model_type: str, input_data: Dict[str, Any]) -> Optional[CacheEntry]:
+    def _find_similar_cache_entry(self, model_type: str, features: Optional[np.ndarray]) -> Optional[CacheEntry]:
         """Find similar cache entry based on feature similarity"""
-        if not self.config['enable_cache']:
+        if not self.config['enable_cache'] or features is None:
             return None
         
         try:
-            # Extract features for similarity comparison
-            if 'features' not in input_data:
-                return None
-            
-            input_features = np.array(input_data['features'])
-            
-            # Search for similar entries
-            best_entry = None
-            best_similarity = 0.0
-            
             with self.cache_lock:
-                for entry in self.cache.values():
-                    if entry.model_type != model_type:
-                        continue
-                    
-                    # Check if entry is still valid
-                    if self._is_cache_entry_valid(entry):
-                        try:
-                            # Parse cached input to get features
-                            cached_data = json.loads(entry.key.split(':', 1)[1])
-                            if 'features' in cached_data:
-                                cached_features = np.array(cached_data['features'])
-                                similarity = self._calculate_feature_similarity(input_features, cached_features)
-                                
-                                if similarity > best_similarity and similarity >= self.config['similarity_threshold']:
-                                    best_similarity = similarity
-                                    best_entry = entry
-                        except Exception:
-                            continue
-            
-            if best_entry and best_similarity >= self.config['similarity_threshold']:
-                logger.debug(f"Found similar cache entry with {best_similarity:.3f} similarity")
-                return best_entry
+                index = self.vector_indexes.get((model_type, features.size))
+                if index is None:
+                    return None
+                
+                # One vectorized cosine pass over LSH candidates, skipping expired rows
+                min_timestamp = time.time() - self.config['cache_ttl_seconds']
+                match = index.query(features, self.config['similarity_threshold'], min_timestamp)
+                if match is None:
+                    return None
+                
+                key, similarity = match
+                entry = self.cache.get(key)
+                if entry and self._is_cache_entry_valid(entry):
+                    logger.debug(f"Found similar cache entry with {similarity:.3f} similarity")
+                    return entry
             
         except Exception as e:
             logger.warning(f"Error finding similar cache entry: {e}")
         
         return None
     
+    def _remove_cache_entry(self, key: str):
+        """Remove an entry and its feature vector (caller holds cache_lock)"""
+        entry = self.cache.pop(key, None)
+        if entry is None:
+            return
+        for (model_type, _), index in self.vector_indexes.items():
+            if model_type == entry.model_type:
+                index.remove(key)
+    
     def _is_cache_entry_valid(self, entry: CacheEntry) -> bool:
         """Check if cache entry is still valid"""
         age_seconds = (datetime.now() - entry.timestamp).total_seconds()
         return age_seconds < self.config['cache_ttl_seconds']
     
     async def get_prediction(self, model_type: str, input_data: Dict[str, Any], 
-                           predictor_func: callable) -> Dict[str, Any]:
+                           predictor_func: callable,
+                           batch_predictor_func: Optional[callable] = None) -> Dict[str, Any]:
         """
         Get ML prediction with caching and optimization
         
@@ -223,6 +224,8 @@ class MLInferenceCache:
             model_type: Type of ML model ('lstm', 'ensemble', 'kelly')
             input_data: Input data for prediction
             predictor_func: Function to call for actual prediction
+            batch_predictor_func: Optional function predicting a list of inputs in one call;
+                concurrent misses are coalesced into it when batching is enabled
             
         Returns:
             Prediction result with cache metadata
@@ -234,6 +237,7 @@ class MLInferenceCache:
             
             # Generate cache key
             cache_key = self._generate_cache_key(model_type, input_data)
+            features = self._extract_features(input_data)
             
             # Check direct cache hit
             cache_entry = None
@@ -247,7 +251,7 @@ class MLInferenceCache:
             
             # Check similarity-based cache hit if no direct hit
             if cache_entry is None and self.config['enable_cache']:
-                cache_entry = self._find_similar_cache_entry(model_type, input_data)
+                cache_entry = self._find_similar_cache_entry(model_type, features)
                 if cache_entry:
                     cache_entry.hit_count += 1
             
@@ -256,7 +260,7 @@ class MLInferenceCache:
                 self.stats['cache_hits'] += 1
                 end_time = time.time()
                 latency_ms = (end_time - start_time) * 1000
-                self.latency_history.append(latency_ms)
+                self.latency_history.append(timestamp=end_time, latency_ms=latency_ms, cache_hit=True)
                 
                 result = cache_entry.data.copy()
                 result['cache_hit'] = True
@@ -271,17 +275,17 @@ class MLInferenceCache:
             
             # Use batch processing if enabled
             if self.config['enable_batching']:
-                result = await self._batch_predict(model_type, input_data, predictor_func)
+                result = await self._batch_predict(model_type, input_data, predictor_func, batch_predictor_func)
             else:
                 result = await self._single_predict(model_type, input_data, predictor_func)
             
             # Cache the result
             if self.config['enable_cache'] and result:
-                await self._cache_result(cache_key, model_type, result)
+                await self._cache_result(cache_key, model_type, result, features)
             
             end_time = time.time()
             latency_ms = (end_time - start_time) * 1000
-            self.latency_history.append(latency_ms)
+            self.latency_history.append(timestamp=end_time, latency_ms=latency_ms, cache_hit=False)
             
             result['cache_hit'] = False
             result['inference_latency_ms'] = latency_ms
@@ -301,21 +305,96 @@ class MLInferenceCache:
             # Update performance stats
             self._update_performance_stats()
     
+    @property
+    def batch_timeout(self) -> float:
+        """Coalescing window in seconds, from max_batch_wait_ms"""
+        return self.config['max_batch_wait_ms'] / 1000
+    
     async def _single_predict(self, model_type: str, input_data: Dict[str, Any], 
                             predictor_func: callable) -> Dict[str, Any]:
         """Perform single prediction"""
         return await predictor_func(input_data)
     
     async def _batch_predict(self, model_type: str, input_data: Dict[str, Any], 
-                           predictor_func: callable) -> Dict[str, Any]:
-        """Add request to batch queue or process immediately if batch is full"""
+                           predictor_func: callable,
+                           batch_predictor_func: Optional[callable] = None) -> Dict[str, Any]:
+        """Run the request now if its model is idle, else join the open batch"""
+        if batch_predictor_func is None:
+            return await self._single_predict(model_type, input_data, predictor_func)
+        
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        key = (model_type, batch_predictor_func)
         
-        # For now, fall back to single prediction
-        # Batch processing would require model-specific implementation
-        return await self._single_predict(model_type, input_data, predictor_func)
+        with self.batch_lock:
+            batch = self.batch_queue.get(key)
+            idle = batch is None and not self.batches_in_flight.get(key)
+            if batch is None:
+                batch = BatchRequest(model_type=model_type, requests=[], timestamp=datetime.now(),
+                                     callback=batch_predictor_func)
+                self.batch_queue[key] = batch
+                if not idle:
+                    loop.call_later(self.batch_timeout, self._dispatch_batch, key, batch)
+            
+            batch.requests.append(input_data)
+            batch.futures.append(future)
+            batch.enqueued_at.append(time.perf_counter())
+            full = len(batch.requests) >= self.batch_size
+        
+        if idle or full:
+            self._dispatch_batch(key, batch)
+        
+        return await future
+    
+    def _dispatch_batch(self, key: Tuple[str, Callable], batch: BatchRequest):
+        """Close a batch and run it, unless it was already dispatched"""
+        with self.batch_lock:
+            if self.batch_queue.get(key) is not batch:
+                return
+            del self.batch_queue[key]
+            self.batches_in_flight[key] = self.batches_in_flight.get(key, 0) + 1
+        
+        task = asyncio.get_running_loop().create_task(self._run_batch(key, batch))
+        self.batch_tasks.add(task)
+        task.add_done_callback(self.batch_tasks.discard)
     
-    async def _cache_result(self, cache_key: str, model_type: str, result: Dict[str, Any]):
-        """Cache a prediction result"""
+    async def _run_batch(self, key: Tuple[str, Callable], batch: BatchRequest):
+        """Run one stacked inference and scatter results to the waiting requests"""
+        started = time.perf_counter()
+        for enqueued in batch.enqueued_at:
+            self.queue_delay_histogram.record((started - enqueued) * 1000)
+        self.batch_size_histogram.record(len(batch.requests))
+        
+        try:
+            results = await batch.callback(batch.requests)
+            if len(results) != len(batch.requests):
+                raise ValueError(f"Batch predictor returned {len(results)} results for {len(batch.requests)} inputs")
+            
+            for future, result in zip(batch.futures, results):
+                if not future.done():
+                    future.set_result(result)
+            
+            self.stats['batch_processed'] += 1
+            self.stats['batched_requests'] += len(batch.requests)
+            logger.debug(f"Batched {len(batch.requests)} {batch.model_type} requests in "
+                         f"{(time.perf_counter() - started) * 1000:.1f}ms")
+            
+        except Exception as e:
+            logger.warning(f"Batch inference failed for {batch.model_type}: {e}")
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            # Requests that queued behind this batch need not wait out their window
+            with self.batch_lock:
+                self.batches_in_flight[key] -= 1
+                waiting = self.batch_queue.get(key)
+            if waiting is not None:
+                self._dispatch_batch(key, waiting)
+    
+    async def _cache_result(self, cache_key: str, model_type: str, result: Dict[str, Any],
+                            features: Optional[np.ndarray] = None):
+        """Cache a prediction result and index its input features"""
         try:
             # Clean result for caching (remove non-serializable data)
             cacheable_result = {k: v for k, v in result.items() 
@@ -335,6 +414,12 @@ class MLInferenceCache:
                     self._evict_cache_entries()
                 
                 self.cache[cache_key] = entry
+                
+                if features is not None:
+                    index_key = (model_type, features.size)
+                    if index_key not in self.vector_indexes:
+                        self.vector_indexes[index_key] = VectorIndex(features.size)
+                    self.vector_indexes[index_key].add(cache_key, features, entry.timestamp.timestamp())
             
             logger.debug(f"Cached result for {model_type} (cache size: {len(self.cache)})")
             
@@ -354,7 +439,7 @@ class MLInferenceCache:
                     expired_keys.append(key)
             
             for key in expired_keys:
-                del self.cache[key]
+                self._remove_cache_entry(key)
             
             # If still over limit, remove least recently used
             if len(self.cache) >= self.max_cache_size:
@@ -369,7 +454,7 @@ class MLInferenceCache:
                 for i in range(remove_count):
                     if i < len(sorted_entries):
                         key = sorted_entries[i][0]
-                        del self.cache[key]
+                        self._remove_cache_entry(key)
             
             logger.debug(f"Cache eviction completed (size: {len(self.cache)})")
             
@@ -391,13 +476,17 @@ class MLInferenceCache:
                 logger.error(f"Error in cache cleanup loop: {e}")
     
     async def _batch_processor_loop(self):
-        """Background task for processing batched requests"""
+        """Background task dispatching batches left open past their wait window"""
         while self.running:
             try:
                 await asyncio.sleep(0.05)  # Check every 50ms
                 
-                # Process any pending batches
-                # This would be implemented for specific model types that support batching
+                max_age = timedelta(milliseconds=self.config['max_batch_wait_ms'] * 2)
+                with self.batch_lock:
+                    overdue = [(key, batch) for key, batch in self.batch_queue.items()
+                               if datetime.now() - batch.timestamp > max_age]
+                for key, batch in overdue:
+                    self._dispatch_batch(key, batch)
                 
             except asyncio.CancelledError:
                 break
@@ -414,7 +503,7 @@ class MLInferenceCache:
             
             # Update average latency
             if self.latency_history:
-                self.stats['avg_latency'] = sum(self.latency_history) / len(self.latency_history)
+                self.stats['avg_latency'] = self.latency_history.mean('latency_ms')
             
         except Exception as e:
             logger.warning(f"Error updating performance stats: {e}")
@@ -426,15 +515,28 @@ class MLInferenceCache:
             'cache_size': len(self.cache),
             'max_cache_size': self.max_cache_size,
             'config': self.config,
-            'recent_latencies': list(self.latency_history)[-10:],
+            'recent_latencies': self.latency_history.column('latency_ms', last=10).tolist(),
+            'latency_percentiles': self.latency_history.percentiles('latency_ms'),
+            'batch_size_histogram': self.batch_size_histogram.to_dict(),
+            'queue_delay_ms_histogram': self.queue_delay_histogram.to_dict(),
+            'similarity_indexes': {
+                f"{model_type}/{dim}": index.get_stats()
+                for (model_type, dim), index in self.vector_indexes.items()
+            },
             'performance_target_met': self.stats['avg_latency'] < self.config['performance_target_ms']
         }
     
-    def clear_cache(self):
-        """Clear all cache entries"""
+    def clear_cache(self, model_type: Optional[str] = None):
+        """Clear all cache entries, or only those of one model (e.g. after a model swap)"""
         with self.cache_lock:
-            self.cache.clear()
-        logger.info("Cache cleared")
+            if model_type is None:
+                self.cache.clear()
+                for index in self.vector_indexes.values():
+                    index.clear()
+            else:
+                for key in [key for key, entry in self.cache.items() if entry.model_type == model_type]:
+                    self._remove_cache_entry(key)
+        logger.info(f"Cache cleared{f' for {model_type}' if model_type else ''}")
     
     def set_config(self, **kwargs):
         """Update cache configuration"""
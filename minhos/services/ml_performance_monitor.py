@@ -23,10 +23,13 @@ from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 from collections import defaultdict, deque
 from enum import Enum
-import statistics
 import sqlite3
 from pathlib import Path
 
+import numpy as np
+
+from ..core.telemetry import TelemetryBuffer
+
 logger = logging.getLogger(__name__)
 
 class MetricType(Enum):
@@ -80,7 +83,13 @@ class MLPerformanceMonitor:
         self.running = False
         
         # Metrics storage
-        self.metrics_buffer = deque(maxlen=10000)  # In-memory buffer
+        self.metrics_buffer = TelemetryBuffer(10000, {  # In-memory buffer
+            'timestamp': 'f8',
+            'model_type': 'U16',
+            'metric_type': 'U20',
+            'value': 'f8',
+            'symbol': 'U24'
+        })
         self.health_snapshots = deque(maxlen=1000)
         
         # Performance baselines (rolling averages)
@@ -246,7 +255,13 @@ class MLPerformanceMonitor:
             )
             
             # Add to buffer
-            self.metrics_buffer.append(metric)
+            self.metrics_buffer.append(
+                timestamp=metric.timestamp.timestamp(),
+                model_type=model_type,
+                metric_type=metric_type.value,
+                value=value,
+                symbol=symbol
+            )
             
             # Store in database (async)
             await self._store_metric(metric)
@@ -553,28 +568,25 @@ class MLPerformanceMonitor:
                 alerts=[f"Health check error: {str(e)}"]
             )
     
+    def _recent_mask(self, model_type: str, seconds: float) -> np.ndarray:
+        """Mask over the metrics buffer for a model's rows in the last ``seconds``"""
+        buffer = self.metrics_buffer
+        return buffer.since(time.time() - seconds) & (buffer.column('model_type', ordered=False) == model_type)
+    
     def _get_recent_avg(self, model_type: str, metric_type: MetricType, minutes: int = 60) -> Optional[float]:
         """Get recent average for a metric"""
         try:
-            cutoff = datetime.now() - timedelta(minutes=minutes)
-            values = [
-                m.value for m in self.metrics_buffer 
-                if (m.model_type == model_type and 
-                    m.metric_type == metric_type and 
-                    m.timestamp >= cutoff)
-            ]
-            return statistics.mean(values) if values else None
+            mask = self._recent_mask(model_type, minutes * 60)
+            mask &= self.metrics_buffer.column('metric_type', ordered=False) == metric_type.value
+            values = self.metrics_buffer.column('value', ordered=False)[mask]
+            return float(values.mean()) if len(values) else None
         except:
             return None
     
     def _get_count_24h(self, model_type: str) -> int:
         """Get prediction count in last 24 hours"""
         try:
-            cutoff = datetime.now() - timedelta(hours=24)
-            return len([
-                m for m in self.metrics_buffer
-                if (m.model_type == model_type and m.timestamp >= cutoff)
-            ])
+            return int(self._recent_mask(model_type, 86400).sum())
         except:
             return 0
     
@@ -697,6 +709,7 @@ class MLPerformanceMonitor:
             return {
                 'monitoring_status': 'running' if self.running else 'stopped',
                 'metrics_collected': len(self.metrics_buffer),
+                'metrics_buffer': self.metrics_buffer.get_stats(),
                 'health_snapshots': len(self.health_snapshots),
                 'prediction_statistics': self.prediction_stats,
                 'latest_health_score': latest_snapshot.overall_score if latest_snapshot else 0.0,
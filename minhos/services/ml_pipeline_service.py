@@ -8,6 +8,7 @@ Provides centralized ML orchestration with performance monitoring and health che
 import asyncio
 import logging
 import json
+import time
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -23,6 +24,12 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
 from capabilities.prediction.lstm.lstm_predictor import LSTMPredictor
 from capabilities.ensemble.ensemble_manager import EnsembleManager
 from capabilities.position_sizing.kelly.kelly_manager import KellyManager
+from capabilities.prediction.lstm.numpy_kernel import LSTMKernel
+from capabilities.ensemble.tree_kernel import TreeEnsembleKernel
+from minhos.core.inference import get_inference_executor
+from minhos.core.model_registry import get_model_deployer, load_arrays
+from minhos.core.persistence import get_sqlite_writer
+from minhos.core.telemetry import TelemetryBuffer
 
 
 @dataclass
@@ -77,6 +84,21 @@ class MLPipelineService:
         self.ensemble_manager = EnsembleManager()
         self.kelly_manager = KellyManager()
         
+        # Blocking model inference runs on the shared inference pool, not the event loop
+        self.inference_executor = get_inference_executor()
+        self.lstm_predictor.inference_executor = self.inference_executor
+        self.ensemble_manager.inference_executor = self.inference_executor
+        
+        # Registry versions swap in without a restart
+        self.model_deployer = get_model_deployer()
+        self._register_hot_swap()
+        
+        # Per-model deadlines; fusion proceeds with whatever arrived in time
+        self.deadlines_ms = {
+            'lstm': self.config.get('lstm_deadline_ms', 250),
+            'ensemble': self.config.get('ensemble_deadline_ms', 250)
+        }
+        
         # State
         self.is_enabled = True
         self.last_prediction_time = None
@@ -86,10 +108,15 @@ class MLPipelineService:
         # Monitoring
         self.prediction_count = 0
         self.accuracy_tracker = []
-        self.confidence_tracker = []
-        self.agreement_tracker = []
+        self.confidence_tracker = TelemetryBuffer(1000, {'timestamp': 'f8', 'confidence': 'f8'})
+        self.agreement_tracker = TelemetryBuffer(1000, {'timestamp': 'f8', 'agreement': 'f8'})
+        self.component_latency = {
+            name: TelemetryBuffer(1000, {'timestamp': 'f8', 'latency_ms': 'f8', 'status': 'U8'})
+            for name in self.deadlines_ms
+        }
         
         # Initialize database
+        self.db = None
         self._init_database()
         
         logging.info("ML Pipeline Service initialized")
@@ -148,9 +175,47 @@ class MLPipelineService:
             conn.commit()
             conn.close()
             
+            self.db = get_sqlite_writer(self.db_path)
+            
         except Exception as e:
             logging.error(f"Failed to initialize ML pipeline database: {e}")
     
+    def _register_hot_swap(self):
+        """Serve the LSTM and ensemble kernels through the model deployer"""
+        def applier(name, swap):
+            def apply(kernel, version):
+                swap(kernel, version)
+                from minhos.services.ml_inference_cache import get_ml_inference_cache
+                get_ml_inference_cache().clear_cache(name)  # No answers from the replaced version
+            return apply
+        
+        try:
+            self.model_deployer.register(
+                'lstm',
+                load=lambda path: LSTMKernel.from_arrays(*load_arrays(path)),
+                apply=applier('lstm', self.lstm_predictor.swap_kernel),
+                infer=lambda kernel, inputs: kernel.predict(inputs),
+                recent_inputs=self.lstm_predictor.recent_sequences,
+                current=self.lstm_predictor.kernel
+            )
+            self.model_deployer.register(
+                'ensemble',
+                load=lambda path: TreeEnsembleKernel.from_arrays(*load_arrays(path)),
+                apply=applier('ensemble', self.ensemble_manager.swap_kernel),
+                infer=lambda kernel, inputs: kernel.predict_base(inputs),
+                recent_inputs=self.ensemble_manager.recent_inputs,
+                current=self.ensemble_manager.kernel
+            )
+        except Exception as e:
+            logging.error(f"Model hot swap unavailable: {e}")
+    
+    def warm_up(self) -> Dict[str, bool]:
+        """Dummy inference on each trained model; blocking, meant for the background warm-up"""
+        return {
+            'lstm': self.lstm_predictor.warm_up(),
+            'ensemble': self.ensemble_manager.warm_up()
+        }
+    
     async def get_ml_prediction(self, market_data: Dict[str, Any]) -> MLPrediction:
         """
         Generate unified ML prediction combining LSTM, Ensemble, and Kelly sizing
@@ -166,23 +231,19 @@ class MLPipelineService:
             timestamp = datetime.now()
             
             # Get predictions from all ML components
-            lstm_result = None
-            ensemble_result = None
             kelly_result = None
             
-            # LSTM Prediction
-            try:
-                if self.lstm_predictor.is_enabled and self.lstm_predictor.is_trained:
-                    lstm_result = await self._get_lstm_prediction(market_data)
-            except Exception as e:
-                logging.warning(f"LSTM prediction failed: {e}")
-            
-            # Ensemble Prediction  
-            try:
-                if self.ensemble_manager.is_enabled and self.ensemble_manager.is_trained:
-                    ensemble_result = await self._get_ensemble_prediction(market_data)
-            except Exception as e:
-                logging.warning(f"Ensemble prediction failed: {e}")
+            # LSTM and Ensemble run concurrently, each under its own deadline
+            lstm_result, ensemble_result = await asyncio.gather(
+                self._run_component(
+                    'lstm', self._get_lstm_prediction, market_data,
+                    enabled=self.lstm_predictor.is_enabled and self.lstm_predictor.is_trained
+                ),
+                self._run_component(
+                    'ensemble', self._get_ensemble_prediction, market_data,
+                    enabled=self.ensemble_manager.is_enabled and self.ensemble_manager.is_trained
+                )
+            )
             
             # Fusion and agreement scoring
             direction, confidence, agreement = self._fuse_predictions(
@@ -216,9 +277,9 @@ class MLPipelineService:
             
             # Update tracking
             self.prediction_count += 1
-            self.confidence_tracker.append(confidence)
+            self.confidence_tracker.append(timestamp=timestamp.timestamp(), confidence=confidence)
             if agreement:
-                self.agreement_tracker.append(agreement)
+                self.agreement_tracker.append(timestamp=timestamp.timestamp(), agreement=agreement)
             
             self.last_prediction_time = timestamp
             
@@ -228,6 +289,44 @@ class MLPipelineService:
             logging.error(f"ML prediction generation failed: {e}")
             return self._get_fallback_prediction(market_data)
     
+    async def _run_component(self, name: str, predict, market_data: Dict[str, Any],
+                             enabled: bool) -> Optional[Dict[str, Any]]:
+        """Run one model under its deadline; None if disabled, failed or late"""
+        if not enabled:
+            return None
+        
+        started = time.perf_counter()
+        status = 'ok'
+        result = None
+        try:
+            result = await asyncio.wait_for(predict(market_data), self.deadlines_ms[name] / 1000)
+        except asyncio.TimeoutError:
+            status = 'timeout'
+            logging.warning(f"{name} prediction missed its {self.deadlines_ms[name]}ms deadline")
+        except Exception as e:
+            status = 'error'
+            logging.warning(f"{name} prediction failed: {e}")
+        
+        self.component_latency[name].append(
+            timestamp=time.time(), latency_ms=(time.perf_counter() - started) * 1000, status=status
+        )
+        return result
+    
+    def get_latency_stats(self) -> Dict[str, Any]:
+        """Per-component inference latency percentiles and deadline misses"""
+        stats = {}
+        for name, buffer in self.component_latency.items():
+            statuses = buffer.column('status', ordered=False)
+            stats[name] = {
+                'deadline_ms': self.deadlines_ms[name],
+                'samples': len(buffer),
+                'timeouts': int((statuses == 'timeout').sum()),
+                'errors': int((statuses == 'error').sum()),
+                **buffer.percentiles('latency_ms')
+            }
+        stats['executor'] = self.inference_executor.get_stats()
+        return stats
+    
     async def _get_lstm_prediction(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
         """Get prediction from LSTM component"""
         # Get prediction directly (LSTM predictor handles data buffering internally)
@@ -338,10 +437,10 @@ class MLPipelineService:
     async def _store_prediction(self, prediction: MLPrediction):
         """Store prediction in database"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            if self.db is None:
+                return
             
-            cursor.execute("""
+            await self.db.submit("""
                 INSERT INTO ml_predictions 
                 (timestamp, symbol, direction, confidence, lstm_prediction, 
                  ensemble_prediction, kelly_fraction, position_size, models_agreement)
@@ -358,9 +457,6 @@ class MLPipelineService:
                 prediction.models_agreement
             ))
             
-            conn.commit()
-            conn.close()
-            
         except Exception as e:
             logging.error(f"Failed to store ML prediction: {e}")
     
@@ -386,10 +482,10 @@ class MLPipelineService:
             accuracy_24h = self._calculate_24h_accuracy()
             
             # Average confidence
-            avg_confidence = np.mean(self.confidence_tracker[-100:]) if self.confidence_tracker else 0.5
+            avg_confidence = self.confidence_tracker.mean('confidence', last=100) if self.confidence_tracker else 0.5
             
             # Models agreement rate
-            agreement_rate = np.mean(self.agreement_tracker[-100:]) if self.agreement_tracker else 0.0
+            agreement_rate = self.agreement_tracker.mean('agreement', last=100) if self.agreement_tracker else 0.0
             
             metrics = MLHealthMetrics(
                 timestamp=datetime.now(),
@@ -491,7 +587,7 @@ class MLPipelineService:
             
             # Check confidence degradation
             if len(self.confidence_tracker) > 20:
-                recent_confidence = np.mean(self.confidence_tracker[-10:])
+                recent_confidence = self.confidence_tracker.mean('confidence', last=10)
                 if recent_confidence < 0.6:
                     alerts.append({
                         'component': 'pipeline',
@@ -502,7 +598,7 @@ class MLPipelineService:
             
             # Check agreement rate
             if len(self.agreement_tracker) > 10:
-                recent_agreement = np.mean(self.agreement_tracker[-10:])
+                recent_agreement = self.agreement_tracker.mean('agreement', last=10)
                 if recent_agreement < 0.5:
                     alerts.append({
                         'component': 'pipeline',
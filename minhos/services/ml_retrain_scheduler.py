@@ -17,6 +17,16 @@ import os
 import shutil
 from pathlib import Path
 
+from minhos.core.model_registry import get_model_deployer, get_model_registry
+from minhos.core.training import TrainingExecutor, TrainingLimits
+
+
+# Training-process entry points per model type (see minhos.core.training)
+TRAINING_TARGETS = {
+    "lstm": "capabilities.prediction.lstm.lstm_predictor:run_training_job",
+    "ensemble": "capabilities.ensemble.ensemble_manager:run_training_job"
+}
+
 
 class RetrainTrigger(Enum):
     """Types of retraining triggers"""
@@ -54,6 +64,8 @@ class RetrainJob:
     backup_path: Optional[str] = None
     new_model_path: Optional[str] = None
     validation_metrics: Optional[Dict[str, Any]] = None
+    model_version: Optional[str] = None  # Registry version published from new_model_path
+    progress: Optional[Dict[str, Any]] = None  # Latest progress reported by the training process
 
 
 @dataclass
@@ -136,6 +148,22 @@ class MLRetrainScheduler:
         # Trigger callbacks
         self.trigger_callbacks = {}
         
+        # Versioned models: immutable registry versions, hot-swapped into the serving predictors
+        self.model_registry = get_model_registry()
+        self.model_deployer = get_model_deployer()
+        
+        # Training runs in a limited child process, never on the trading event loop
+        self.training_configs = {
+            "lstm": {"symbol": "NQ", "days_back": 30, "epochs": 50},
+            "ensemble": {"symbol": "NQ", "days_back": 30, "validation_split": 0.2}
+        }
+        self.training_executor = TrainingExecutor(
+            self.models_path / "training_jobs",
+            limits=TrainingLimits(cpu_cores=max(1, (os.cpu_count() or 2) // 2), memory_mb=4096,
+                                  niceness=10, time_budget_s=2 * 3600),
+            max_concurrent=self.max_concurrent_jobs
+        )
+        
         # Create directories
         self.backup_path.mkdir(exist_ok=True)
         
@@ -222,6 +250,7 @@ class MLRetrainScheduler:
     async def stop_scheduler(self):
         """Stop the retraining scheduler"""
         self.is_running = False
+        self.training_executor.cancel_all()  # Checkpoints stay; the jobs resume on next start
         logging.info("🔄 ML retrain scheduler stopped")
     
     async def _scheduler_loop(self):
@@ -399,8 +428,8 @@ class MLRetrainScheduler:
         try:
             logging.info(f"🔄 Executing retrain for {job.model_type}")
             
-            # Simulate retraining (in production, this would call actual training scripts)
-            await self._simulate_model_training(job)
+            # Train in a separate process; progress streams back into job.progress
+            await self._train_model(job)
             
             # Validate new model
             validation_metrics = await self._validate_new_model(job)
@@ -424,6 +453,9 @@ class MLRetrainScheduler:
             # Log to history
             await self._log_retrain_history(job)
             
+            # Published to the registry (or rejected): the checkpoint is no longer needed
+            self.training_executor.cleanup(job.id)
+            
         except Exception as e:
             logging.error(f"Retrain job {job.id} failed: {e}")
             job.status = RetrainStatus.FAILED
@@ -442,38 +474,42 @@ class MLRetrainScheduler:
             if job in self.job_queue:
                 self.job_queue.remove(job)
     
-    async def _simulate_model_training(self, job: RetrainJob):
-        """Simulate model training (placeholder)"""
-        # In production, this would:
-        # 1. Prepare training data
-        # 2. Train the specific model type
-        # 3. Save the new model
+    async def _train_model(self, job: RetrainJob):
+        """Run the model's training job out of process; resumes from the job's checkpoint if any"""
+        target = TRAINING_TARGETS.get(job.model_type)
+        if target is None:
+            raise ValueError(f"No training job for model type {job.model_type}")
         
         logging.info(f"🔄 Training {job.model_type} model...")
-        await asyncio.sleep(2)  # Simulate training time
+        outcome = await self.training_executor.run(
+            job.id, target, self.training_configs.get(job.model_type, {}),
+            on_progress=lambda message: self._on_training_progress(job, message)
+        )
+        result = outcome["result"] or {}
+        if not result.get("success"):
+            raise RuntimeError(f"Training did not complete: {result.get('message', 'no result')}")
         
-        # Create dummy new model path
-        job.new_model_path = str(self.models_path / f"{job.model_type}_retrained_{job.id}")
-        
-        logging.info(f"🔄 Training completed for {job.model_type}")
+        job.new_model_path = result["model_path"]
+        job.validation_metrics = result.get("validation_metrics")
+        logging.info(f"🔄 Training completed for {job.model_type} in {outcome['elapsed_s']}s")
+    
+    def _on_training_progress(self, job: RetrainJob, message: Dict[str, Any]):
+        """Progress from the training process, on the event loop"""
+        job.progress = {
+            "step": message["step"],
+            "total": message["total"],
+            "metrics": message["metrics"],
+            "updated": datetime.fromtimestamp(message["time"]).isoformat()
+        }
+        logging.info(f"🔄 {job.model_type} training {message['step']}/{message['total']} {message['metrics']}")
     
     async def _validate_new_model(self, job: RetrainJob) -> Dict[str, Any]:
         """Validate the newly trained model"""
         try:
-            # In production, this would run validation tests
-            # For now, simulate validation metrics
-            
-            base_accuracy = 0.75
-            improvement = 0.02  # Simulate 2% improvement
-            
-            validation_metrics = {
-                "accuracy": base_accuracy + improvement,
-                "precision": 0.78,
-                "recall": 0.76,
-                "f1_score": 0.77,
-                "validation_loss": 0.25,
-                "improvement_over_previous": improvement
-            }
+            # Held-out metrics computed by the training process
+            validation_metrics = job.validation_metrics
+            if not validation_metrics:
+                raise ValueError("training reported no validation metrics")
             
             logging.info(f"🔄 Validation completed for {job.model_type}: {validation_metrics['accuracy']:.2%} accuracy")
             
@@ -509,17 +545,21 @@ class MLRetrainScheduler:
             return False
     
     async def _deploy_new_model(self, job: RetrainJob):
-        """Deploy the new model"""
+        """Publish the new model to the registry and hot-swap it in; the old version serves until then"""
         try:
-            # In production, this would:
-            # 1. Stop the current model
-            # 2. Replace model files
-            # 3. Restart the model service
-            # 4. Verify deployment
+            new_model_path = Path(job.new_model_path) if job.new_model_path else None
+            if new_model_path is None or not new_model_path.exists():
+                logging.warning(f"🔄 No {job.model_type} artifacts at {job.new_model_path}, nothing to deploy")
+                return
             
             logging.info(f"🔄 Deploying new {job.model_type} model")
-            # Simulate deployment
-            await asyncio.sleep(1)
+            job.model_version = await asyncio.to_thread(
+                self.model_registry.publish, job.model_type, new_model_path,
+                {"job_id": job.id, "trigger": job.trigger.value, "validation_metrics": job.validation_metrics}
+            )
+            result = await self.model_deployer.deploy(job.model_type, job.model_version)
+            if not result["deployed"]:
+                raise RuntimeError(f"version {job.model_version} rejected: {result.get('reason')}")
             
         except Exception as e:
             logging.error(f"Deployment failed for job {job.id}: {e}")
@@ -528,25 +568,34 @@ class MLRetrainScheduler:
     async def _rollback_model(self, job: RetrainJob):
         """Rollback to previous model"""
         try:
-            if job.backup_path:
-                logging.info(f"🔄 Rolling back {job.model_type} model from backup")
-                # In production, this would restore from backup
-                await asyncio.sleep(0.5)
+            if job.model_version and self.model_registry.active_version(job.model_type) == job.model_version:
+                await self.rollback_model(job.model_type)
+            elif job.backup_path:
+                logging.info(f"🔄 {job.model_type} still serving {job.backup_path}, nothing to roll back")
             
         except Exception as e:
             logging.error(f"Rollback failed for job {job.id}: {e}")
             raise
     
-    async def _create_model_backup(self, model_type: str) -> str:
-        """Create backup of current model"""
+    async def rollback_model(self, model_type: str) -> Optional[str]:
+        """Serve the previously active version again; a reference swap when it is still loaded"""
+        version = self.model_deployer.rollback(model_type)
+        if version is None:
+            logging.warning(f"🔄 No previous {model_type} version to roll back to")
+        else:
+            logging.info(f"⏪ Rolled back {model_type} to version {version}")
+        return version
+    
+    async def _create_model_backup(self, model_type: str) -> Optional[str]:
+        """Record the version serving now; registry versions are immutable, so it is the backup"""
         try:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            backup_path = self.backup_path / f"{model_type}_backup_{timestamp}"
-            
-            # In production, this would copy model files
-            backup_path.mkdir(exist_ok=True)
+            version = self.model_registry.active_version(model_type)
+            if version is None:
+                logging.info(f"🔄 No registry version of {model_type} yet, nothing to back up")
+                return None
             
-            logging.info(f"🔄 Created backup for {model_type} at {backup_path}")
+            backup_path = self.model_registry.path(model_type, version)
+            logging.info(f"🔄 Backup for {model_type} is version {version} at {backup_path}")
             return str(backup_path)
             
         except Exception as e:
@@ -767,9 +816,12 @@ class MLRetrainScheduler:
                     validation_metrics=json.loads(row[13]) if row[13] else None
                 )
                 
+                # Interrupted jobs run again and resume from their training checkpoint
+                if job.status == RetrainStatus.RUNNING:
+                    job.status = RetrainStatus.PENDING
+                
                 self.active_jobs[job.id] = job
-                if job.status == RetrainStatus.PENDING:
-                    self.job_queue.append(job)
+                self.job_queue.append(job)
             
             logging.info(f"🔄 Loaded {len(self.active_jobs)} pending retrain jobs")
             
@@ -790,11 +842,15 @@ class MLRetrainScheduler:
                         "model_type": job.model_type,
                         "status": job.status.value,
                         "trigger": job.trigger.value,
+                        "model_version": job.model_version,
+                        "progress": job.progress,
                         "created": job.created_time.isoformat(),
                         "completed": job.completed_time.isoformat() if job.completed_time else None
                     }
                     for job in list(self.active_jobs.values())[-5:]
                 ],
+                "models": self.model_deployer.get_status(),
+                "training": self.training_executor.get_status(),
                 "timestamp": datetime.now().isoformat()
             }
         except Exception as e:
@@ -22,12 +22,13 @@ import json
 from pathlib import Path
 
 from minhos.core.base_service import BaseService
+from minhos.core.persistence import close_all_writers
+from minhos.core.startup import get_model_warmup, get_startup_report
 from minhos.services import (
     get_sierra_client, get_market_data_service, get_web_api_service,
     get_state_manager, get_ai_brain_service, get_trading_engine,
     get_pattern_analyzer, get_risk_manager
 )
-from minhos.dashboard import DashboardServer
 
 logger = logging.getLogger(__name__)
 
@@ -141,6 +142,8 @@ class ServiceOrchestrator:
     
     def _get_dashboard_service(self):
         """Create dashboard service instance"""
+        # FastAPI/uvicorn are only imported when the dashboard is started
+        DashboardServer = get_startup_report().import_module('minhos.dashboard').DashboardServer
         return DashboardServer(host="0.0.0.0", port=8888)
     
     def _get_startup_order(self) -> List[str]:
@@ -190,6 +193,7 @@ class ServiceOrchestrator:
         if self.running:
             self._health_monitor_task = asyncio.create_task(self._health_monitor())
             logger.info("All services started successfully")
+            logger.info(get_startup_report().format_report())
     
     async def _start_service(self, name: str):
         """Start a single service"""
@@ -209,11 +213,10 @@ class ServiceOrchestrator:
                 if not dep_info or dep_info.status != ServiceStatus.RUNNING:
                     raise RuntimeError(f"Dependency {dep} not running")
             
-            # Create service instance
-            service_info.instance = service_info.factory()
-            
-            # Start the service
-            await service_info.instance.start()
+            # Create and start the service (timed for the startup report)
+            with get_startup_report().timed("service", name):
+                service_info.instance = service_info.factory()
+                await service_info.instance.start()
             
             service_info.status = ServiceStatus.RUNNING
             service_info.start_time = datetime.now()
@@ -249,6 +252,9 @@ class ServiceOrchestrator:
         for service_name in shutdown_order:
             await self._stop_service(service_name)
         
+        # Commit writes the services queued on their way down
+        await asyncio.to_thread(close_all_writers)
+        
         logger.info("All services stopped")
     
     async def _stop_service(self, name: str):
@@ -364,6 +370,12 @@ class ServiceOrchestrator:
         
         return status
     
+    def get_startup_report(self) -> Dict[str, Any]:
+        """Import, service start and model warm-up timings, plus model readiness"""
+        report = get_startup_report().get_report()
+        report['models'] = get_model_warmup().get_status()
+        return report
+    
     async def restart_service(self, name: str):
         """Manually restart a service"""
         if name not in self.services:
@@ -20,7 +20,6 @@ from pathlib import Path
 from dataclasses import dataclass, asdict
 from collections import defaultdict, Counter, deque
 from enum import Enum
-import statistics
 import numpy as np
 
 # Import other services
@@ -31,6 +30,9 @@ from ..core.symbol_integration import SymbolIntegration
 
 # Import unified market data store
 from ..core.market_data_adapter import get_market_data_adapter
+from ..core.persistence import get_sqlite_writer
+from ..core.pattern_engine import PatternEngine, PatternHit, PriceWindows
+from ..core.price_levels import PriceLevelBook
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -149,9 +151,18 @@ class PatternAnalyzer:
             'confidence_threshold': 0.6,
             'lookback_period': 100,
             'correlation_threshold': 0.7,
-            'time_window_minutes': 60
+            'time_window_minutes': 60,
+            'pattern_window_bars': 50,  # Bars per symbol for the full detection cycle
+            'realtime_window_bars': 20,  # Bars per symbol for real-time checks
+            'level_warm_start_bars': 20000  # History replayed into the level index on start
         }
         
+        # Vectorized multi-symbol detection
+        self.pattern_engine = PatternEngine()
+        
+        # Persistent per-symbol support/resistance levels
+        self.price_levels = PriceLevelBook()
+        
         # Statistics
         self.stats = {
             "patterns_detected": 0,
@@ -168,6 +179,7 @@ class PatternAnalyzer:
         
         # Initialize database
         self._init_database()
+        self.db = get_sqlite_writer(self.db_path)
         
         logger.info("🧠 Pattern Analyzer initialized")
     
@@ -267,6 +279,9 @@ class PatternAnalyzer:
         
         # MIGRATED: Subscribe to unified market data store
         await self.market_data_adapter.start()
+        
+        # Seed level index from stored history before live updates arrive
+        await self._warm_start_levels()
         await self.market_data_adapter.subscribe(self._on_market_data_update)
         
         # Load existing patterns
@@ -308,37 +323,44 @@ class PatternAnalyzer:
         except Exception as e:
             logger.error(f"❌ Market data processing error: {e}")
     
+    async def _warm_start_levels(self):
+        """Replay each symbol's stored history into the price level index"""
+        limit = self.analysis_params['level_warm_start_bars']
+        
+        def load():
+            applied = 0
+            for symbol in self.market_data_adapter.get_symbols():
+                history = self.market_data_adapter.get_historical_data(symbol, limit=limit)
+                applied += self.price_levels.warm_start(symbol, reversed(history))  # Oldest first
+            return applied
+        
+        try:
+            applied = await asyncio.to_thread(load)
+            logger.info(f"📐 Price level index warmed with {applied} updates "
+                        f"for {len(self.price_levels.symbols)} symbols")
+        except Exception as e:
+            logger.error(f"❌ Price level warm start error: {e}")
+    
+    def _collect_windows(self, bars: int) -> PriceWindows:
+        """MIGRATED: Pack each symbol's latest bars from the unified store"""
+        records = {}
+        for symbol in self.market_data_adapter.get_symbols():
+            history = self.market_data_adapter.get_historical_data(symbol, limit=bars)
+            if history:
+                records[symbol] = list(reversed(history))  # Store returns newest first
+                self.price_levels.warm_start(symbol, records[symbol])  # Indexed bars are skipped, the latest revised
+        return PriceWindows.from_records(records, bars)
+    
     async def _pattern_detection_loop(self):
         """Main pattern detection loop"""
         while self.running:
             try:
-                # MIGRATED: Get data from unified store for pattern detection
-                symbols = self.market_data_adapter.get_symbols()
-                if symbols:
-                    # Get historical data for analysis
-                    all_data_points = []
-                    for symbol in symbols:
-                        history = self.market_data_adapter.get_historical_data(symbol, limit=50)
-                        # Convert to format expected by existing pattern detection
-                        for md in history:
-                            data_point = {
-                                'timestamp': md.timestamp,
-                                'symbol': md.symbol,
-                                'close': md.close,
-                                'bid': md.bid,
-                                'ask': md.ask,
-                                'volume': md.volume,
-                                'high': getattr(md, 'high', md.close),
-                                'low': getattr(md, 'low', md.close),
-                                'source': md.source
-                            }
-                            all_data_points.append(data_point)
+                windows = self._collect_windows(self.analysis_params['pattern_window_bars'])
+                if len(windows):
+                    patterns = await self._detect_patterns_in_windows(windows, self.price_levels)
                     
-                    if len(all_data_points) >= 50:
-                        patterns = await self._detect_all_patterns_with_data(all_data_points)
-                        
-                        for pattern in patterns:
-                            await self._process_detected_pattern(pattern)
+                    for pattern in patterns:
+                        await self._process_detected_pattern(pattern)
                 
                 await asyncio.sleep(60)  # Analyze every minute
                 
@@ -349,66 +371,37 @@ class PatternAnalyzer:
     async def _detect_realtime_patterns(self):
         """MIGRATED: Detect patterns in real-time using unified store"""
         try:
-            # Get recent data from unified store
-            symbols = self.market_data_adapter.get_symbols()
-            if not symbols:
+            windows = self._collect_windows(self.analysis_params['realtime_window_bars'])
+            if not len(windows):
                 return
             
-            all_recent_data = []
-            for symbol in symbols:
-                history = self.market_data_adapter.get_historical_data(symbol, limit=20)
-                # Convert to format expected by existing pattern detection
-                for md in history:
-                    data_point = {
-                        'timestamp': md.timestamp,
-                        'symbol': md.symbol,
-                        'close': md.close,
-                        'bid': md.bid,
-                        'ask': md.ask,
-                        'volume': md.volume,
-                        'high': getattr(md, 'high', md.close),
-                        'low': getattr(md, 'low', md.close),
-                        'source': md.source
-                    }
-                    all_recent_data.append(data_point)
+            # Quick breakout and volume spike checks per symbol
+            hits = self.pattern_engine.detect_realtime(windows)
             
-            if len(all_recent_data) < 20:
-                return
-            
-            # Quick pattern detection
-            patterns = []
-            
-            # Price breakout detection
-            breakout_pattern = await self._detect_price_breakout(all_recent_data)
-            if breakout_pattern:
-                patterns.append(breakout_pattern)
-            
-            # Volume spike detection
-            volume_pattern = await self._detect_volume_spike(all_recent_data)
-            if volume_pattern:
-                patterns.append(volume_pattern)
-            
-            # Process detected patterns
-            for pattern in patterns:
+            for pattern in self._to_detected_patterns(hits, windows):
                 await self._process_detected_pattern(pattern)
                 
         except Exception as e:
             logger.error(f"❌ Real-time pattern detection error: {e}")
     
     async def _detect_all_patterns_with_data(self, data: List[Dict]) -> List[DetectedPattern]:
-        """MIGRATED: Detect all types of patterns in provided market data"""
+        """Detect all types of patterns in provided chronological market data, per symbol"""
+        by_symbol = defaultdict(list)
+        for point in data:
+            by_symbol[point.get('symbol') or 'UNKNOWN'].append(point)
+        
+        windows = PriceWindows.from_records(by_symbol, self.analysis_params['pattern_window_bars'])
+        return await self._detect_patterns_in_windows(windows)
+    
+    async def _detect_patterns_in_windows(self, windows: PriceWindows,
+                                          levels: Optional[PriceLevelBook] = None) -> List[DetectedPattern]:
+        """Run every market pattern kind over all symbols, plus system patterns"""
         patterns = []
         
         try:
-            if len(data) < 50:
-                return patterns
-            
-            # Market patterns
-            patterns.extend(await self._detect_price_patterns(data))
-            patterns.extend(await self._detect_volume_patterns(data))
-            patterns.extend(await self._detect_volatility_patterns(data))
-            patterns.extend(await self._detect_trend_patterns(data))
-            patterns.extend(await self._detect_support_resistance(data))
+            # Market patterns; support/resistance from the level index when given
+            hits = self.pattern_engine.detect(windows, levels)
+            patterns.extend(self._to_detected_patterns(hits, windows))
             
             # System patterns (if we have system events)
             patterns.extend(await self._detect_system_patterns())
@@ -418,220 +411,26 @@ class PatternAnalyzer:
         
         return patterns
     
-    async def _detect_price_patterns(self, data: List[Dict[str, Any]]) -> List[DetectedPattern]:
-        """Detect price-based patterns"""
-        patterns = []
-        
-        try:
-            if len(data) < 20:
-                return patterns
-            
-            prices = [d['close'] for d in data[-50:]]
-            
-            # Breakout pattern
-            recent_high = max(prices[-20:-1])
-            current_price = prices[-1]
-            
-            if current_price > recent_high * 1.005:  # 0.5% breakout
-                pattern = DetectedPattern(
-                    pattern_type=PatternType.PRICE_BREAKOUT,
-                    confidence=0.8,
-                    description=f"Price breakout above {recent_high:.2f}",
-                    context={
-                        'breakout_level': recent_high,
-                        'current_price': current_price,
-                        'strength': (current_price - recent_high) / recent_high
-                    },
-                    timestamp=datetime.now(),
-                    market_conditions=await self._get_current_market_conditions(),
-                    suggestions=["Consider long entry", "Monitor for continuation", "Set tight stops"]
-                )
-                patterns.append(pattern)
-            
-            # Breakdown pattern
-            recent_low = min(prices[-20:-1])
-            if current_price < recent_low * 0.995:  # 0.5% breakdown
-                pattern = DetectedPattern(
-                    pattern_type=PatternType.PRICE_BREAKDOWN,
-                    confidence=0.8,
-                    description=f"Price breakdown below {recent_low:.2f}",
-                    context={
-                        'breakdown_level': recent_low,
-                        'current_price': current_price,
-                        'strength': (recent_low - current_price) / recent_low
-                    },
-                    timestamp=datetime.now(),
-                    market_conditions=await self._get_current_market_conditions(),
-                    suggestions=["Consider short entry", "Monitor for continuation", "Set tight stops"]
-                )
-                patterns.append(pattern)
-            
-        except Exception as e:
-            logger.error(f"❌ Price pattern detection error: {e}")
-        
-        return patterns
-    
-    async def _detect_volume_patterns(self, data: List[Dict[str, Any]]) -> List[DetectedPattern]:
-        """Detect volume-based patterns"""
-        patterns = []
-        
-        try:
-            volumes = [d.get('volume', 0) for d in data[-50:] if d.get('volume', 0) > 0]
-            
-            if len(volumes) < 20:
-                return patterns
-            
-            avg_volume = statistics.mean(volumes[:-1])
-            current_volume = volumes[-1]
-            
-            # Volume spike detection
-            if current_volume > avg_volume * 2.0:  # 2x average volume
-                pattern = DetectedPattern(
-                    pattern_type=PatternType.VOLUME_SPIKE,
-                    confidence=0.7,
-                    description=f"Volume spike: {current_volume:.0f} vs {avg_volume:.0f} average",
-                    context={
-                        'current_volume': current_volume,
-                        'average_volume': avg_volume,
-                        'spike_ratio': current_volume / avg_volume
-                    },
-                    timestamp=datetime.now(),
-                    market_conditions=await self._get_current_market_conditions(),
-                    suggestions=["Expect increased volatility", "Monitor price action", "Potential trend change"]
-                )
-                patterns.append(pattern)
-            
-        except Exception as e:
-            logger.error(f"❌ Volume pattern detection error: {e}")
-        
-        return patterns
-    
-    async def _detect_volatility_patterns(self, data: List[Dict[str, Any]]) -> List[DetectedPattern]:
-        """Detect volatility-based patterns"""
-        patterns = []
-        
-        try:
-            if len(data) < 30:
-                return patterns
-            
-            prices = [d['close'] for d in data[-30:]]
-            returns = [(prices[i] - prices[i-1]) / prices[i-1] for i in range(1, len(prices))]
-            
-            current_vol = statistics.stdev(returns[-10:]) if len(returns) >= 10 else 0
-            historical_vol = statistics.stdev(returns) if len(returns) > 1 else 0
-            
-            # Volatility expansion
-            if current_vol > historical_vol * 1.5:  # 50% increase in volatility
-                pattern = DetectedPattern(
-                    pattern_type=PatternType.VOLATILITY_EXPANSION,
-                    confidence=0.75,
-                    description=f"Volatility expansion: {current_vol:.4f} vs {historical_vol:.4f}",
-                    context={
-                        'current_volatility': current_vol,
-                        'historical_volatility': historical_vol,
-                        'expansion_ratio': current_vol / historical_vol if historical_vol > 0 else 0
-                    },
-                    timestamp=datetime.now(),
-                    market_conditions=await self._get_current_market_conditions(),
-                    suggestions=["Reduce position sizes", "Widen stops", "Expect larger moves"]
-                )
-                patterns.append(pattern)
-            
-        except Exception as e:
-            logger.error(f"❌ Volatility pattern detection error: {e}")
-        
-        return patterns
-    
-    async def _detect_trend_patterns(self, data: List[Dict[str, Any]]) -> List[DetectedPattern]:
-        """Detect trend-based patterns"""
-        patterns = []
-        
-        try:
-            if len(data) < 30:
-                return patterns
-            
-            prices = [d['close'] for d in data[-30:]]
-            
-            # Simple trend analysis
-            sma_short = statistics.mean(prices[-10:])
-            sma_long = statistics.mean(prices[-20:])
-            
-            # Trend reversal detection
-            recent_trend = (prices[-1] - prices[-10]) / prices[-10] if prices[-10] != 0 else 0
-            longer_trend = (prices[-10] - prices[-20]) / prices[-20] if prices[-20] != 0 else 0
-            
-            if abs(recent_trend) > 0.02 and recent_trend * longer_trend < 0:  # Trend reversal
-                pattern = DetectedPattern(
-                    pattern_type=PatternType.TREND_REVERSAL,
-                    confidence=0.65,
-                    description=f"Potential trend reversal detected",
-                    context={
-                        'recent_trend': recent_trend,
-                        'longer_trend': longer_trend,
-                        'sma_short': sma_short,
-                        'sma_long': sma_long
-                    },
-                    timestamp=datetime.now(),
-                    market_conditions=await self._get_current_market_conditions(),
-                    suggestions=["Wait for confirmation", "Consider counter-trend", "Monitor closely"]
-                )
-                patterns.append(pattern)
-            
-        except Exception as e:
-            logger.error(f"❌ Trend pattern detection error: {e}")
-        
-        return patterns
-    
-    async def _detect_support_resistance(self, data: List[Dict[str, Any]]) -> List[DetectedPattern]:
-        """Detect support and resistance levels"""
-        patterns = []
-        
-        try:
-            if len(data) < 50:
-                return patterns
-            
-            prices = [d['close'] for d in data[-50:]]
-            highs = [d.get('high', d['close']) for d in data[-50:]]
-            lows = [d.get('low', d['close']) for d in data[-50:]]
-            
-            # Simple support/resistance detection
-            # Find price levels that have been tested multiple times
-            current_price = prices[-1]
-            
-            # Look for levels within 1% that have been touched multiple times
-            level_tests = defaultdict(int)
-            
-            for price in prices[:-5]:  # Exclude very recent prices
-                price_level = round(price, 0)  # Round to nearest dollar
-                if abs(price_level - current_price) / current_price < 0.05:  # Within 5%
-                    level_tests[price_level] += 1
-            
-            # Find levels tested 3+ times
-            for level, tests in level_tests.items():
-                if tests >= 3:
-                    level_type = "resistance" if level > current_price else "support"
-                    
-                    pattern = DetectedPattern(
-                        pattern_type=PatternType.SUPPORT_RESISTANCE,
-                        confidence=min(0.9, 0.5 + tests * 0.1),
-                        description=f"{level_type.title()} level at {level:.0f} (tested {tests} times)",
-                        context={
-                            'level': level,
-                            'type': level_type,
-                            'tests': tests,
-                            'current_price': current_price,
-                            'distance_pct': abs(level - current_price) / current_price
-                        },
-                        timestamp=datetime.now(),
-                        market_conditions=await self._get_current_market_conditions(),
-                        suggestions=[f"Watch for {level_type} at {level:.0f}", "Plan entry/exit around level"]
-                    )
-                    patterns.append(pattern)
-            
-        except Exception as e:
-            logger.error(f"❌ Support/resistance detection error: {e}")
-        
-        return patterns
+    def _to_detected_patterns(self, hits: List[PatternHit], windows: PriceWindows) -> List[DetectedPattern]:
+        """Attach each symbol's market conditions, computed once per cycle"""
+        if not hits:
+            return []
+        
+        timestamp = datetime.now()
+        conditions = self.pattern_engine.market_conditions(windows, timestamp.isoformat())
+        
+        return [
+            DetectedPattern(
+                pattern_type=PatternType(hit.kind),
+                confidence=hit.confidence,
+                description=hit.description,
+                context={'symbol': hit.symbol, **hit.context},
+                timestamp=timestamp,
+                market_conditions=conditions.get(hit.symbol, {}),
+                suggestions=hit.suggestions
+            )
+            for hit in hits
+        ]
     
     async def _detect_system_patterns(self) -> List[DetectedPattern]:
         """Detect system-related patterns"""
@@ -647,63 +446,6 @@ class PatternAnalyzer:
         
         return patterns
     
-    async def _detect_price_breakout(self, data: List[Dict[str, Any]]) -> Optional[DetectedPattern]:
-        """Quick breakout detection for real-time processing"""
-        try:
-            if len(data) < 10:
-                return None
-            
-            prices = [d['close'] for d in data]
-            recent_high = max(prices[:-1])
-            current_price = prices[-1]
-            
-            if current_price > recent_high * 1.003:  # 0.3% breakout
-                return DetectedPattern(
-                    pattern_type=PatternType.PRICE_BREAKOUT,
-                    confidence=0.7,
-                    description=f"Real-time breakout above {recent_high:.2f}",
-                    context={
-                        'breakout_level': recent_high,
-                        'current_price': current_price
-                    },
-                    timestamp=datetime.now(),
-                    market_conditions=await self._get_current_market_conditions()
-                )
-            
-        except Exception:
-            pass
-        
-        return None
-    
-    async def _detect_volume_spike(self, data: List[Dict[str, Any]]) -> Optional[DetectedPattern]:
-        """Quick volume spike detection for real-time processing"""
-        try:
-            volumes = [d.get('volume', 0) for d in data if d.get('volume', 0) > 0]
-            
-            if len(volumes) < 10:
-                return None
-            
-            avg_volume = statistics.mean(volumes[:-1])
-            current_volume = volumes[-1]
-            
-            if current_volume > avg_volume * 1.8:  # 80% above average
-                return DetectedPattern(
-                    pattern_type=PatternType.VOLUME_SPIKE,
-                    confidence=0.6,
-                    description=f"Real-time volume spike: {current_volume:.0f}",
-                    context={
-                        'current_volume': current_volume,
-                        'average_volume': avg_volume
-                    },
-                    timestamp=datetime.now(),
-                    market_conditions=await self._get_current_market_conditions()
-                )
-            
-        except Exception:
-            pass
-        
-        return None
-    
     async def _process_detected_pattern(self, pattern: DetectedPattern):
         """Process and store a detected pattern"""
         try:
@@ -719,7 +461,8 @@ class PatternAnalyzer:
             # Update correlations
             await self._update_pattern_correlations(pattern)
             
-            logger.info(f"🔍 Pattern detected: {pattern.pattern_type.value} (confidence: {pattern.confidence:.1%})")
+            symbol = pattern.context.get('symbol', '')
+            logger.info(f"🔍 Pattern detected: {pattern.pattern_type.value} {symbol} (confidence: {pattern.confidence:.1%})")
             logger.debug(f"   Description: {pattern.description}")
             
         except Exception as e:
@@ -774,68 +517,26 @@ class PatternAnalyzer:
                 logger.error(f"❌ Cleanup error: {e}")
                 await asyncio.sleep(3600)
     
-    async def _get_current_market_conditions(self) -> Dict[str, Any]:
-        """MIGRATED: Get current market conditions from unified store"""
-        try:
-            symbols = self.market_data_adapter.get_symbols()
-            if not symbols:
-                return {}
-            
-            all_recent_data = []
-            for symbol in symbols:
-                history = self.market_data_adapter.get_historical_data(symbol, limit=20)
-                all_recent_data.extend(history)
-            
-            if not all_recent_data:
-                return {}
-            
-            prices = [md.close for md in all_recent_data]
-            
-            if len(prices) < 10:
-                return {}
-            
-            # Calculate basic market conditions
-            returns = [(prices[i] - prices[i-1]) / prices[i-1] for i in range(1, len(prices))]
-            volatility = statistics.stdev(returns) if len(returns) > 1 else 0
-            trend = (prices[-1] - prices[0]) / prices[0] if prices[0] != 0 else 0
-            
-            return {
-                'volatility': volatility,
-                'trend': trend,
-                'current_price': prices[-1],
-                'price_range': max(prices) - min(prices),
-                'timestamp': datetime.now().isoformat()
-            }
-            
-        except Exception as e:
-            logger.error(f"❌ Market conditions error: {e}")
-            return {}
-    
     async def _save_pattern_to_db(self, pattern: DetectedPattern):
         """Save detected pattern to database"""
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    INSERT INTO patterns 
-                    (pattern_type, description, confidence, context, market_conditions, 
-                     suggestions, first_seen, last_seen, occurrences, success_rate)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    pattern.pattern_type.value,
-                    pattern.description,
-                    pattern.confidence,
-                    json.dumps(pattern.context),
-                    json.dumps(pattern.market_conditions),
-                    json.dumps(pattern.suggestions),
-                    pattern.timestamp.isoformat(),
-                    pattern.timestamp.isoformat(),
-                    1,
-                    0.0  # Initial success rate
-                ))
-                
-                conn.commit()
+            await self.db.submit('''
+                INSERT INTO patterns 
+                (pattern_type, description, confidence, context, market_conditions, 
+                 suggestions, first_seen, last_seen, occurrences, success_rate)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                pattern.pattern_type.value,
+                pattern.description,
+                pattern.confidence,
+                json.dumps(pattern.context),
+                json.dumps(pattern.market_conditions),
+                json.dumps(pattern.suggestions),
+                pattern.timestamp.isoformat(),
+                pattern.timestamp.isoformat(),
+                1,
+                0.0  # Initial success rate
+            ))
                 
         except Exception as e:
             logger.error(f"❌ Pattern save error: {e}")
@@ -932,19 +633,16 @@ class PatternAnalyzer:
         try:
             cutoff_date = (datetime.now() - timedelta(days=30)).isoformat()
             
-            with sqlite3.connect(str(self.db_path)) as conn:
-                cursor = conn.cursor()
-                
+            await self.db.submit_many([
                 # Clean old events
-                cursor.execute("DELETE FROM learning_events WHERE timestamp < ?", (cutoff_date,))
+                ("DELETE FROM learning_events WHERE timestamp < ?", (cutoff_date,)),
                 
                 # Clean old market conditions
-                cursor.execute("DELETE FROM market_conditions WHERE timestamp < ?", (cutoff_date,))
+                ("DELETE FROM market_conditions WHERE timestamp < ?", (cutoff_date,)),
                 
                 # Clean old predictions
-                cursor.execute("DELETE FROM predictions WHERE timestamp < ?", (cutoff_date,))
-                
-                conn.commit()
+                ("DELETE FROM predictions WHERE timestamp < ?", (cutoff_date,))
+            ])
                 
             logger.debug("🧹 Pattern database cleanup completed")
             
@@ -954,25 +652,22 @@ class PatternAnalyzer:
     async def _load_patterns(self):
         """Load existing patterns from database"""
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute("SELECT * FROM patterns WHERE confidence > ?", (0.5,))
-                
-                for row in cursor.fetchall():
-                    # Load pattern data
-                    pattern_key = f"{row[1]}_{row[2]}"  # pattern_type_description
-                    
-                    self.known_patterns[pattern_key] = {
-                        'count': row[9] or 0,  # occurrences
-                        'total_confidence': 0,
-                        'outcomes': [],
-                        'contexts': [json.loads(row[4])] if row[4] else [],
-                        'success_rate': row[10] or 0.0
-                    }
-                
-                logger.info(f"✅ Loaded {len(self.known_patterns)} known patterns")
+            rows = await self.db.query("SELECT * FROM patterns WHERE confidence > ?", (0.5,))
+            
+            for row in rows:
+                # Load pattern data
+                pattern_key = f"{row[1]}_{row[2]}"  # pattern_type_description
                 
+                self.known_patterns[pattern_key] = {
+                    'count': row[9] or 0,  # occurrences
+                    'total_confidence': 0,
+                    'outcomes': [],
+                    'contexts': [json.loads(row[4])] if row[4] else [],
+                    'success_rate': row[10] or 0.0
+                }
+            
+            logger.info(f"✅ Loaded {len(self.known_patterns)} known patterns")
+            
         except Exception as e:
             logger.error(f"❌ Pattern loading error: {e}")
     
@@ -998,7 +693,8 @@ class PatternAnalyzer:
             "recent_patterns": len(self.pattern_history),
             "correlations_tracked": len(self.pattern_correlations),
             "stats": self.stats.copy(),
-            "analysis_params": self.analysis_params.copy()
+            "analysis_params": self.analysis_params.copy(),
+            "price_levels": self.price_levels.get_stats()
         }
     
     def get_pattern_insights(self) -> Dict[str, Any]:
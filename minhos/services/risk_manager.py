@@ -12,17 +12,26 @@ and clean Linux architecture.
 import asyncio
 import logging
 import time
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List, Tuple, Union
+from typing import Dict, Any, Optional, List, Tuple, Union, FrozenSet, Mapping, Deque
 from dataclasses import dataclass, asdict
 from enum import Enum
 from pathlib import Path
 import json
+import math
 import sqlite3
+from types import MappingProxyType
+
+import numpy as np
 
 # Import other services
 from minhos.core.base_service import BaseService
-from .state_manager import get_state_manager, TradingState, SystemState, Position, RiskParameters
+from minhos.core.persistence import get_sqlite_writer
+from minhos.core.correlation import CorrelationEngine, CorrelationSnapshot
+from minhos.core.sliding_window import EventRateTracker, SlidingWindowCounter
+from minhos.core.var_engine import MonteCarloVaREngine
+from .state_manager import get_state_manager, TradingState, SystemState, Position, RiskParameters, StateSnapshot
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -32,6 +41,8 @@ def json_serializer(obj):
     """JSON serializer for objects not serializable by default json code"""
     if isinstance(obj, datetime):
         return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
     raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
 
 class RiskLevel(Enum):
@@ -74,9 +85,15 @@ class RiskViolation:
     rule_type: str
     recommendation: str = ""
 
-@dataclass
+@dataclass(frozen=True)
 class RiskLimits:
-    """Current risk limits and thresholds"""
+    """
+    Precomputed, immutable risk limit table.
+    
+    Rebuilt only when risk parameters or system config change, so the
+    pre-trade fast path reads plain attributes instead of re-deriving
+    thresholds and re-validating configuration on every request.
+    """
     max_position_size: int
     max_daily_loss: float
     max_drawdown_percent: float
@@ -85,6 +102,37 @@ class RiskLimits:
     take_profit_points: float
     max_orders_per_minute: int
     volatility_multiplier: float = 1.0
+    max_positions: int = 3
+    account_value: float = 100000.0  # Assumed account value
+    max_exposure: float = 0.0
+    max_correlated_exposure: float = 0.0
+    daily_loss_warning: float = 0.0
+    daily_loss_breaker: float = 0.0
+    drawdown_warning_percent: float = 0.0
+    trading_enabled: bool = False
+    config_valid: bool = False
+    config_errors: Tuple[str, ...] = ()
+    tradeable_symbols: FrozenSet[str] = frozenset()
+    rollover_symbols: FrozenSet[str] = frozenset()
+    built_at: float = 0.0
+
+@dataclass(frozen=True)
+class CorrelatedExposure:
+    """
+    Correlation-adjusted exposure of the current book.
+    
+    Built once per (state version, correlation version) so a trade's effect
+    on portfolio exposure is an O(1) update during validation.
+    """
+    state_version: int
+    correlation_version: int
+    index: Mapping[str, int]
+    exposure: Tuple[float, ...]  # Signed notional per symbol
+    weighted: Tuple[float, ...]  # Correlation matrix times exposure
+    net_exposure: float  # Sum of signed notional, for symbols outside the matrix
+    default_correlation: float
+    total: float  # sqrt(e' R e)
+    by_position: Mapping[str, float]  # Per-position contributions summing to total
 
 class RiskManager(BaseService):
     """
@@ -122,11 +170,14 @@ class RiskManager(BaseService):
         self.emergency_mode = False
         
         # Violation tracking
-        self.violations: List[RiskViolation] = []
+        self.violations: Deque[RiskViolation] = deque(maxlen=1000)
         self.violation_counts = {"LOW": 0, "MEDIUM": 0, "HIGH": 0, "CRITICAL": 0, "EMERGENCY": 0}
         
         # Order rate limiting
-        self.order_timestamps: List[datetime] = []
+        self.order_rate = EventRateTracker()
+        self.reject_rate = EventRateTracker()
+        self.violation_rate = EventRateTracker()
+        self.critical_violations = SlidingWindowCounter(300, 1)  # Last 5 minutes
         self.order_history: List[TradeRequest] = []
         
         # Risk calculations
@@ -134,6 +185,8 @@ class RiskManager(BaseService):
         self.daily_pnl = 0.0
         self.max_drawdown = 0.0
         self.risk_budget_used = 0.0
+        self.correlated_exposure = 0.0
+        self.margin_used = 0.0
         
         # Performance tracking
         self.risk_metrics = {
@@ -153,15 +206,41 @@ class RiskManager(BaseService):
             "position_monitoring": True,
             "drawdown_protection": True,
             "volatility_adjustment": True,
-            "correlation_limits": True
+            "correlation_limits": True,
+            "max_correlated_exposure_multiple": 1.5,  # x per-position exposure limit
+            "correlation_alert_threshold": 0.8,
+            "initial_margin_rate": 0.1  # Margin as a fraction of notional (simplified)
         }
         
         # Real-time monitoring
         self.position_alerts = []
         self.risk_warnings = []
         
+        # Pre-trade fast path: limit table is rebuilt only on config changes
+        self._risk_limits: Optional[RiskLimits] = None
+        self._limits_sources: Tuple[Any, Any] = (None, None)
+        self._symbol_tables: Optional[Tuple[FrozenSet[str], FrozenSet[str]]] = None
+        self._decision_latencies_us: deque = deque(maxlen=1000)
+        self._background_tasks = set()
+        self._off_hours_warned = None
+        
+        # Cross-asset correlation fed by bar closes
+        self.correlation_engine = CorrelationEngine()
+        self._correlated_exposure: Optional[CorrelatedExposure] = None
+        self._correlation_feed_attached = False
+        
+        # Monte Carlo tail risk, cached until the book or correlations change
+        self.var_engine = MonteCarloVaREngine()
+        self.var_report: Dict[str, Any] = {}
+        self._var_cache_key = None
+        
+        # Audit rows are buffered and handed to the background writer in batches
+        self._audit_buffer: List[Tuple[str, Tuple]] = []
+        self._audit_flush_handle = None
+        
         # Initialize database
         self._init_database()
+        self.db = get_sqlite_writer(self.db_path)
         
         logger.info("🛡️ Risk Manager initialized (Linux-native)")
     
@@ -239,6 +318,7 @@ class RiskManager(BaseService):
         
         # Initialize service references
         self.state_manager = get_state_manager()
+        await self._attach_correlation_feed()
         
         # Start monitoring loops
         asyncio.create_task(self._position_monitoring_loop())
@@ -254,6 +334,7 @@ class RiskManager(BaseService):
         self.running = False
         
         # Save current state
+        self._flush_audit_buffer()
         await self._save_daily_summary()
         
         logger.info("Risk Manager stopped")
@@ -262,82 +343,58 @@ class RiskManager(BaseService):
         """
         CRITICAL: Validate trade request against all risk parameters
         Returns: (is_allowed, list_of_reasons_if_blocked)
+        
+        Runs entirely from in-memory state: one state snapshot, the
+        precomputed limit table and local counters. Audit records and
+        violation rows are queued to the background writer, so nothing on
+        this path waits on SQLite.
         """
+        started = time.perf_counter()
+        
+        allowed, violations = self._evaluate_trade_request(trade_request)
+        if not allowed:
+            self.reject_rate.record()
+        
+        self._decision_latencies_us.append((time.perf_counter() - started) * 1e6)
+        return allowed, violations
+    
+    def _evaluate_trade_request(self, trade_request: TradeRequest) -> Tuple[bool, List[str]]:
+        """Run every pre-trade check synchronously and record the outcome"""
+        violations = []
+        
         try:
             self.risk_metrics["orders_validated"] += 1
-            violations = []
             risk_score = 0.0
+            now = datetime.now()
+            
+            snapshot = self.state_manager.get_snapshot() if self.state_manager else None
+            limits = self._get_risk_limits(snapshot)
             
             # Validate symbol against centralized management
-            symbol_violations = await self._validate_symbol(trade_request.symbol)
+            symbol_violations = self._validate_symbol(trade_request.symbol, limits)
             violations.extend(symbol_violations)
             
             # CRITICAL: Check if risk management is properly configured
-            if not await self._validate_risk_configuration():
+            if not limits.config_valid:
                 violations.append("CRITICAL: Risk parameters not configured or invalid")
-                await self._record_violation(RiskLevel.CRITICAL, "Risk configuration invalid", {
-                    "request": asdict(trade_request)
+                self._record_violation_nowait(RiskLevel.CRITICAL, "Risk configuration invalid", {
+                    "request": asdict(trade_request),
+                    "errors": list(limits.config_errors)
                 }, "risk_config")
                 return False, violations
             
-            # Check emergency states
-            if self.emergency_mode:
-                violations.append("EMERGENCY: System in emergency mode - all trading blocked")
+            blocked = self._check_trading_gates(snapshot, limits)
+            if blocked:
+                violations.append(blocked)
                 return False, violations
             
-            if self.circuit_breaker_active:
-                violations.append(f"BLOCKED: Circuit breaker active - {self.circuit_breaker_reason}")
-                return False, violations
+            check_violations, risk_score = self._run_trade_checks(
+                trade_request, snapshot, snapshot.positions, self._get_correlated_exposure(snapshot), limits, now
+            )
+            violations.extend(check_violations)
             
-            # System state validation
-            if self.state_manager:
-                system_state = self.state_manager.system_state
-                if system_state != SystemState.ONLINE:
-                    violations.append(f"BLOCKED: System state is {system_state.value}")
-                    return False, violations
-                
-                system_config = self.state_manager.system_config
-                if not system_config.trading_enabled:
-                    violations.append("BLOCKED: Trading not enabled in system config")
-                    return False, violations
-            
-            # Rate limiting validation
-            rate_violations = await self._validate_order_rate()
-            violations.extend(rate_violations)
-            risk_score += len(rate_violations) * 0.1
-            
-            # Position size validation
-            size_violations, size_risk = await self._validate_position_size(trade_request)
-            violations.extend(size_violations)
-            risk_score += size_risk
-            
-            # Daily loss limit validation
-            loss_violations, loss_risk = await self._validate_daily_loss()
-            violations.extend(loss_violations)
-            risk_score += loss_risk
-            
-            # Market conditions validation
-            market_violations, market_risk = await self._validate_market_conditions(trade_request)
-            violations.extend(market_violations)
-            risk_score += market_risk
-            
-            # Drawdown validation
-            drawdown_violations, drawdown_risk = await self._validate_drawdown()
-            violations.extend(drawdown_violations)
-            risk_score += drawdown_risk
-            
-            # Volatility-adjusted limits
-            volatility_violations, vol_risk = await self._validate_volatility_adjustments(trade_request)
-            violations.extend(volatility_violations)
-            risk_score += vol_risk
-            
-            # Correlation limits (if multiple positions)
-            correlation_violations, corr_risk = await self._validate_correlation_limits(trade_request)
-            violations.extend(correlation_violations)
-            risk_score += corr_risk
-            
-            # Record validation in database
-            await self._record_trade_validation(trade_request, len(violations) == 0, violations, risk_score)
+            # Queue validation audit record
+            self._record_trade_validation(trade_request, len(violations) == 0, violations, risk_score)
             
             # Determine final result
             if violations:
@@ -345,7 +402,7 @@ class RiskManager(BaseService):
                 self.risk_metrics["risk_checks_failed"] += 1
                 
                 # Create violation record
-                await self._record_violation(
+                self._record_violation_nowait(
                     RiskLevel.HIGH,
                     f"Trade request blocked: {trade_request.symbol} {trade_request.order_type.value}",
                     {
@@ -373,6 +430,220 @@ class RiskManager(BaseService):
             self.risk_metrics["orders_blocked"] += 1
             return False, violations
     
+    def _check_trading_gates(self, snapshot: StateSnapshot, limits: RiskLimits) -> Optional[str]:
+        """Get the reason all trading is blocked, if any"""
+        if self.emergency_mode:
+            return "EMERGENCY: System in emergency mode - all trading blocked"
+        
+        if self.circuit_breaker_active:
+            return f"BLOCKED: Circuit breaker active - {self.circuit_breaker_reason}"
+        
+        if snapshot.system_state != SystemState.ONLINE:
+            return f"BLOCKED: System state is {snapshot.system_state.value}"
+        
+        if not limits.trading_enabled:
+            return "BLOCKED: Trading not enabled in system config"
+        
+        return None
+    
+    def _run_trade_checks(self, trade_request: TradeRequest, snapshot: StateSnapshot,
+                          positions: Mapping[str, Position], book: CorrelatedExposure, limits: RiskLimits,
+                          now: datetime, pending_orders: int = 0, record: bool = True) -> Tuple[List[str], float]:
+        """
+        Run the per-order checks against a book of positions.
+        
+        With ``record`` off nothing is persisted and the circuit breaker is
+        never tripped, so the checks can be run on hypothetical books.
+        """
+        violations = []
+        risk_score = 0.0
+        
+        # Rate limiting validation
+        rate_violations = self._validate_order_rate(limits, pending_orders, record)
+        violations.extend(rate_violations)
+        risk_score += len(rate_violations) * 0.1
+        
+        # Position size validation
+        size_violations, size_risk = self._validate_position_size(trade_request, positions, limits)
+        violations.extend(size_violations)
+        risk_score += size_risk
+        
+        # Daily loss limit validation
+        loss_violations, loss_risk = self._validate_daily_loss(snapshot, limits, record)
+        violations.extend(loss_violations)
+        risk_score += loss_risk
+        
+        # Market conditions validation
+        market_violations, market_risk = self._validate_market_conditions(trade_request, now)
+        violations.extend(market_violations)
+        risk_score += market_risk
+        
+        # Drawdown validation
+        drawdown_violations, drawdown_risk = self._validate_drawdown(positions, limits, record)
+        violations.extend(drawdown_violations)
+        risk_score += drawdown_risk
+        
+        # Volatility-adjusted limits
+        volatility_violations, vol_risk = self._validate_volatility_adjustments(trade_request)
+        violations.extend(volatility_violations)
+        risk_score += vol_risk
+        
+        # Correlation limits (if multiple positions)
+        correlation_violations, corr_risk = self._validate_correlation_limits(trade_request, book, limits)
+        violations.extend(correlation_violations)
+        risk_score += corr_risk
+        
+        return violations, risk_score
+    
+    def simulate_trade_requests(self, trade_requests: List[TradeRequest],
+                                cumulative: bool = False) -> Dict[str, Any]:
+        """
+        What-if evaluation of hypothetical orders against one state snapshot.
+        
+        Nothing is recorded: no audit rows, violations, rate counts or
+        circuit breaker trips. Independently, every order is checked against
+        the current book. Cumulatively, each order sees the book left by the
+        approved orders before it (bracket legs, scale-ins) and counts
+        against the order rate limit. Either way the projection applies all
+        approved orders in sequence.
+        """
+        started = time.perf_counter()
+        now = datetime.now()
+        
+        snapshot = self.state_manager.get_snapshot() if self.state_manager else None
+        limits = self._get_risk_limits(snapshot)
+        correlations = self.correlation_engine.get_snapshot()
+        current_book = self._get_correlated_exposure(snapshot)
+        
+        if not limits.config_valid:
+            blocked = "CRITICAL: Risk parameters not configured or invalid"
+        else:
+            blocked = self._check_trading_gates(snapshot, limits)
+        
+        positions = dict(snapshot.positions) if snapshot else {}
+        projected = dict(positions)
+        book = current_book
+        decisions = []
+        approved = 0
+        
+        for i, trade_request in enumerate(trade_requests):
+            violations = self._validate_symbol(trade_request.symbol, limits, record=False)
+            risk_score = 0.0
+            
+            if blocked:
+                violations.append(blocked)
+            else:
+                check_violations, risk_score = self._run_trade_checks(
+                    trade_request, snapshot, projected if cumulative else positions, book, limits, now,
+                    pending_orders=approved if cumulative else 0, record=False
+                )
+                violations.extend(check_violations)
+            
+            allowed = not violations
+            if allowed:
+                approved += 1
+                position = self._project_position(projected.get(trade_request.symbol), trade_request, now)
+                if position is None:
+                    projected.pop(trade_request.symbol, None)
+                else:
+                    projected[trade_request.symbol] = position
+                if cumulative:
+                    book = self._build_correlated_exposure(projected, book.state_version, correlations)
+            
+            decisions.append({
+                "index": i,
+                "symbol": trade_request.symbol,
+                "order_type": trade_request.order_type.value,
+                "quantity": trade_request.quantity,
+                "price": trade_request.price,
+                "allowed": allowed,
+                "violations": violations,
+                "risk_score": round(risk_score, 3),
+                "position_after": self._signed_quantity(projected.get(trade_request.symbol))
+            })
+        
+        return {
+            "cumulative": cumulative,
+            "decisions": decisions,
+            "approved": approved,
+            "rejected": len(decisions) - approved,
+            "current": self._summarize_book(positions, current_book, limits),
+            "projected": self._summarize_book(
+                projected, self._build_correlated_exposure(projected, current_book.state_version, correlations), limits
+            ),
+            "state_version": snapshot.version if snapshot else 0,
+            "correlation_version": correlations.version,
+            "compute_us": round((time.perf_counter() - started) * 1e6, 1),
+            "timestamp": now.isoformat()
+        }
+    
+    @staticmethod
+    def _signed_quantity(position: Optional[Position]) -> int:
+        """Position quantity, negative when short"""
+        if position is None:
+            return 0
+        return -abs(position.quantity) if position.side == "SHORT" else abs(position.quantity)
+    
+    def _project_position(self, position: Optional[Position], trade_request: TradeRequest,
+                          now: datetime) -> Optional[Position]:
+        """Position after a hypothetical fill at the request price (None when flat)"""
+        current = self._signed_quantity(position)
+        
+        if trade_request.order_type == OrderType.BUY:
+            quantity = current + trade_request.quantity
+        elif trade_request.order_type == OrderType.SELL:
+            quantity = current - trade_request.quantity
+        elif trade_request.order_type == OrderType.CLOSE:
+            quantity = 0
+        else:
+            return position  # Stop/limit orders do not change the position
+        
+        if quantity == 0:
+            return None
+        
+        mark = position.current_price if position else trade_request.price
+        if current == 0 or (current > 0) != (quantity > 0):
+            # New or reversed position
+            entry_price = trade_request.price
+            entry_time = now
+        elif abs(quantity) > abs(current):
+            # Adding: average in at the request price
+            added = abs(quantity) - abs(current)
+            entry_price = (position.entry_price * abs(current) + trade_request.price * added) / abs(quantity)
+            entry_time = position.entry_time
+        else:
+            entry_price = position.entry_price
+            entry_time = position.entry_time
+        
+        return Position(
+            symbol=trade_request.symbol,
+            quantity=abs(quantity),
+            side="LONG" if quantity > 0 else "SHORT",
+            entry_price=entry_price,
+            current_price=mark,
+            unrealized_pnl=(mark - entry_price) * quantity,
+            entry_time=entry_time,
+            last_update=now
+        )
+    
+    def _summarize_book(self, positions: Mapping[str, Position], book: CorrelatedExposure,
+                        limits: RiskLimits) -> Dict[str, Any]:
+        """Exposure, drawdown and margin of a book of positions"""
+        gross = sum((abs(position.quantity) * position.current_price for position in positions.values()), 0.0)
+        unrealized = sum((position.unrealized_pnl for position in positions.values()), 0.0)
+        margin_used = gross * self.risk_config.get("initial_margin_rate", 0.1)
+        
+        return {
+            "positions": {symbol: self._signed_quantity(position) for symbol, position in positions.items()},
+            "gross_exposure": round(gross, 2),
+            "net_exposure": round(book.net_exposure, 2),
+            "correlated_exposure": round(book.total, 2),
+            "unrealized_pnl": round(unrealized, 2),
+            "drawdown_percent": round(max(-unrealized, 0.0) / limits.account_value * 100, 3),
+            "margin_used": round(margin_used, 2),
+            "margin_available": round(limits.account_value - margin_used, 2)
+        }
+    
     async def validate_trade(self, order, signal=None) -> bool:
         """
         Validate trade order (compatibility method for TradingService)
@@ -408,63 +679,153 @@ class RiskManager(BaseService):
             logger.error(f"Trade validation error: {e}")
             return False
     
+    def get_risk_limits(self) -> RiskLimits:
+        """Get the current precomputed risk limit table"""
+        snapshot = self.state_manager.get_snapshot() if self.state_manager else None
+        return self._get_risk_limits(snapshot)
+    
+    def _get_risk_limits(self, snapshot: Optional[StateSnapshot]) -> RiskLimits:
+        """Get the limit table for a snapshot, rebuilding only when config changed"""
+        limits = self._risk_limits
+        risk_params = snapshot.risk_params if snapshot else None
+        system_config = snapshot.system_config if snapshot else None
+        
+        # Snapshots reuse config objects until config changes, so identity is enough
+        if (limits is not None and self._symbol_tables is not None and
+                risk_params is self._limits_sources[0] and
+                system_config is self._limits_sources[1]):
+            return limits
+        
+        limits = self._build_risk_limits(risk_params, system_config)
+        self._risk_limits = limits
+        self._limits_sources = (risk_params, system_config)
+        return limits
+    
+    def _build_risk_limits(self, risk_params: Optional[RiskParameters], system_config) -> RiskLimits:
+        """Validate configuration once and precompute all thresholds"""
+        if self._symbol_tables is None:
+            self._symbol_tables = self._load_symbol_tables()
+        tradeable_symbols, rollover_symbols = self._symbol_tables or (frozenset(), frozenset())
+        
+        errors = []
+        if risk_params is None:
+            errors.append("State manager not available for risk validation")
+            risk_params = RiskParameters()
+        elif not risk_params.enabled:
+            errors.append("Risk parameters not enabled")
+        elif (risk_params.max_position_size <= 0 or
+              risk_params.max_daily_loss <= 0 or
+              risk_params.position_size_percent <= 0):
+            errors.append(f"Invalid risk parameters: pos_size={risk_params.max_position_size}, "
+                          f"daily_loss={risk_params.max_daily_loss}, "
+                          f"size_pct={risk_params.position_size_percent}")
+        
+        for error in errors:
+            logger.error(error)
+        
+        if not errors and risk_params.stop_loss_points <= 0:
+            logger.warning("Stop loss not configured - trading allowed but risky")
+        
+        account_value = 100000.0  # Assumed account value
+        max_daily_loss = abs(risk_params.max_daily_loss)
+        
+        limits = RiskLimits(
+            max_position_size=risk_params.max_position_size,
+            max_daily_loss=max_daily_loss,
+            max_drawdown_percent=risk_params.max_drawdown_percent,
+            position_size_percent=risk_params.position_size_percent,
+            stop_loss_points=risk_params.stop_loss_points,
+            take_profit_points=risk_params.take_profit_points,
+            max_orders_per_minute=system_config.max_orders_per_minute if system_config else 0,
+            max_positions=risk_params.max_positions,
+            account_value=account_value,
+            max_exposure=account_value * (risk_params.position_size_percent / 100),
+            max_correlated_exposure=(account_value * (risk_params.position_size_percent / 100) *
+                                     self.risk_config.get("max_correlated_exposure_multiple", 1.5)),
+            daily_loss_warning=max_daily_loss * 0.8,
+            daily_loss_breaker=max_daily_loss * 1.2,
+            drawdown_warning_percent=risk_params.max_drawdown_percent * 0.8,
+            trading_enabled=bool(system_config and system_config.trading_enabled),
+            config_valid=not errors,
+            config_errors=tuple(errors),
+            tradeable_symbols=tradeable_symbols,
+            rollover_symbols=rollover_symbols,
+            built_at=time.time()
+        )
+        
+        try:
+            self.db.enqueue('''
+                INSERT INTO risk_limits_history (timestamp, limits, reason)
+                VALUES (?, ?, ?)
+            ''', (
+                datetime.now().isoformat(),
+                json.dumps({k: v for k, v in asdict(limits).items() if not isinstance(v, frozenset)}),
+                "configuration change"
+            ))
+        except Exception as e:
+            logger.error(f"Risk limits history recording error: {e}")
+        
+        logger.info(f"🛡️ Risk limits rebuilt (valid={limits.config_valid}, "
+                    f"max_size={limits.max_position_size}, max_daily_loss={limits.max_daily_loss})")
+        return limits
+    
+    def _load_symbol_tables(self) -> Optional[Tuple[FrozenSet[str], FrozenSet[str]]]:
+        """Load tradeable and rollover-pending symbols from centralized management"""
+        try:
+            tradeable_symbols = frozenset(self.symbol_integration.get_trading_engine_symbols())
+        except Exception as e:
+            logger.error(f"Symbol table load error: {e}")
+            return None
+        
+        # Rollover alerts are advisory; a failed check must not empty the tradeable set
+        try:
+            rollover_status = self.symbol_integration.check_rollover_status()
+            rollover_symbols = frozenset(
+                alert['current_contract'] for alert in rollover_status.get('alerts', [])
+                if alert.get('action_required')
+            )
+        except Exception as e:
+            logger.warning(f"Rollover status unavailable: {e}")
+            rollover_symbols = frozenset()
+        
+        return tradeable_symbols, rollover_symbols
+    
+    def _refresh_symbol_tables(self):
+        """Reload symbol tables and force the limit table to rebuild"""
+        symbol_tables = self._load_symbol_tables()
+        if symbol_tables is not None and symbol_tables != self._symbol_tables:
+            self._symbol_tables = symbol_tables
+            self._limits_sources = (None, None)
+    
     async def _validate_risk_configuration(self) -> bool:
         """Validate that risk parameters are properly configured"""
         try:
-            if not self.state_manager:
-                logger.error("State manager not available for risk validation")
-                return False
-            
-            risk_params = self.state_manager.risk_params
-            
-            # Check if risk management is enabled
-            if not risk_params.enabled:
-                logger.error("Risk parameters not enabled")
-                return False
-            
-            # Validate critical parameters
-            if (risk_params.max_position_size <= 0 or
-                risk_params.max_daily_loss <= 0 or
-                risk_params.position_size_percent <= 0):
-                
-                logger.error(f"Invalid risk parameters: pos_size={risk_params.max_position_size}, "
-                           f"daily_loss={risk_params.max_daily_loss}, "
-                           f"size_pct={risk_params.position_size_percent}")
-                return False
-            
-            # Validate stop loss configuration
-            if risk_params.stop_loss_points <= 0:
-                logger.warning("Stop loss not configured - trading allowed but risky")
-            
-            return True
+            return self.get_risk_limits().config_valid
             
         except Exception as e:
             logger.error(f"Risk configuration validation error: {e}")
             return False
     
-    async def _validate_order_rate(self) -> List[str]:
-        """Validate order rate limits"""
+    def _validate_order_rate(self, limits: RiskLimits, pending_orders: int = 0,
+                             record: bool = True) -> List[str]:
+        """Validate order rate limits, counting ``pending_orders`` not yet sent"""
         violations = []
         
         try:
-            if not self.state_manager:
-                return violations
+            max_orders = limits.max_orders_per_minute
             
-            max_orders = self.state_manager.system_config.max_orders_per_minute
+            recent_orders = self.order_rate.last_minute.count() + pending_orders
             
-            # Count orders in the last minute
-            one_minute_ago = datetime.now() - timedelta(minutes=1)
-            recent_orders = [ts for ts in self.order_timestamps if ts > one_minute_ago]
-            
-            if len(recent_orders) >= max_orders:
-                violations.append(f"Order rate limit exceeded: {len(recent_orders)}/{max_orders} orders per minute")
+            if recent_orders >= max_orders:
+                violations.append(f"Order rate limit exceeded: {recent_orders}/{max_orders} orders per minute")
                 
-                await self._record_violation(
-                    RiskLevel.MEDIUM,
-                    "Order rate limit exceeded",
-                    {"recent_orders": len(recent_orders), "limit": max_orders},
-                    "rate_limit"
-                )
+                if record:
+                    self._record_violation_nowait(
+                        RiskLevel.MEDIUM,
+                        "Order rate limit exceeded",
+                        {"recent_orders": recent_orders, "limit": max_orders},
+                        "rate_limit"
+                    )
             
         except Exception as e:
             logger.error(f"Order rate validation error: {e}")
@@ -472,21 +833,15 @@ class RiskManager(BaseService):
         
         return violations
     
-    async def _validate_position_size(self, trade_request: TradeRequest) -> Tuple[List[str], float]:
+    def _validate_position_size(self, trade_request: TradeRequest, current_positions: Mapping[str, Position],
+                                limits: RiskLimits) -> Tuple[List[str], float]:
         """Validate position size against limits"""
         violations = []
         risk_score = 0.0
         
         try:
-            if not self.state_manager:
-                return violations, risk_score
-            
-            risk_params = self.state_manager.risk_params
-            current_positions = self.state_manager.get_positions()
-            
-            # Get current position for this symbol
-            current_position = current_positions.get(trade_request.symbol)
-            current_quantity = current_position.quantity if current_position else 0
+            # Get current position for this symbol (negative when short)
+            current_quantity = self._signed_quantity(current_positions.get(trade_request.symbol))
             
             # Calculate new position size
             if trade_request.order_type == OrderType.BUY:
@@ -499,21 +854,20 @@ class RiskManager(BaseService):
                 new_quantity = current_quantity  # For stop/limit orders
             
             # Check maximum position size
-            if abs(new_quantity) > risk_params.max_position_size:
-                violations.append(f"Position size {abs(new_quantity)} exceeds maximum {risk_params.max_position_size}")
+            if abs(new_quantity) > limits.max_position_size:
+                violations.append(f"Position size {abs(new_quantity)} exceeds maximum {limits.max_position_size}")
                 risk_score += 0.3
             
             # Check position as percentage of account (simplified calculation)
             estimated_exposure = abs(new_quantity) * trade_request.price
-            max_exposure = 100000 * (risk_params.position_size_percent / 100)  # Assuming $100k account
             
-            if estimated_exposure > max_exposure:
-                violations.append(f"Position exposure ${estimated_exposure:,.0f} exceeds limit ${max_exposure:,.0f}")
+            if estimated_exposure > limits.max_exposure:
+                violations.append(f"Position exposure ${estimated_exposure:,.0f} exceeds limit ${limits.max_exposure:,.0f}")
                 risk_score += 0.4
             
             # Check total number of positions
-            if len(current_positions) >= risk_params.max_positions and trade_request.symbol not in current_positions:
-                violations.append(f"Maximum number of positions ({risk_params.max_positions}) already held")
+            if len(current_positions) >= limits.max_positions and trade_request.symbol not in current_positions:
+                violations.append(f"Maximum number of positions ({limits.max_positions}) already held")
                 risk_score += 0.2
             
         except Exception as e:
@@ -523,18 +877,15 @@ class RiskManager(BaseService):
         
         return violations, risk_score
     
-    async def _validate_daily_loss(self) -> Tuple[List[str], float]:
+    def _validate_daily_loss(self, snapshot: StateSnapshot, limits: RiskLimits,
+                             record: bool = True) -> Tuple[List[str], float]:
         """Validate against daily loss limits"""
         violations = []
         risk_score = 0.0
         
         try:
-            if not self.state_manager:
-                return violations, risk_score
-            
-            risk_params = self.state_manager.risk_params
-            current_pnl = self.state_manager.pnl.get("today", 0.0)
-            max_daily_loss = abs(risk_params.max_daily_loss)
+            current_pnl = snapshot.pnl.get("today", 0.0)
+            max_daily_loss = limits.max_daily_loss
             
             # Check current daily P&L
             if current_pnl < -max_daily_loss:
@@ -542,18 +893,19 @@ class RiskManager(BaseService):
                 risk_score += 0.5
                 
                 # Trigger circuit breaker for severe losses
-                if current_pnl < -max_daily_loss * 1.2:
-                    await self._trigger_circuit_breaker("Daily loss limit severely exceeded")
+                if record and current_pnl < -limits.daily_loss_breaker:
+                    self._trip_circuit_breaker("Daily loss limit severely exceeded")
             
             # Warning for approaching limit
-            elif current_pnl < -max_daily_loss * 0.8:
+            elif current_pnl < -limits.daily_loss_warning:
                 risk_score += 0.2
-                await self._record_violation(
-                    RiskLevel.MEDIUM,
-                    f"Approaching daily loss limit: ${abs(current_pnl):,.2f} / ${max_daily_loss:,.2f}",
-                    {"current_pnl": current_pnl, "limit": max_daily_loss},
-                    "daily_loss_warning"
-                )
+                if record:
+                    self._record_violation_nowait(
+                        RiskLevel.MEDIUM,
+                        f"Approaching daily loss limit: ${abs(current_pnl):,.2f} / ${max_daily_loss:,.2f}",
+                        {"current_pnl": current_pnl, "limit": max_daily_loss},
+                        "daily_loss_warning"
+                    )
             
         except Exception as e:
             logger.error(f"Daily loss validation error: {e}")
@@ -562,18 +914,16 @@ class RiskManager(BaseService):
         
         return violations, risk_score
     
-    async def _validate_market_conditions(self, trade_request: TradeRequest) -> Tuple[List[str], float]:
+    def _validate_market_conditions(self, trade_request: TradeRequest, now: datetime) -> Tuple[List[str], float]:
         """Validate market conditions for trading"""
         violations = []
         risk_score = 0.0
         
         try:
-            if not self.state_manager:
-                return violations, risk_score
-            
             # Check market data freshness
-            if self.state_manager.last_market_update:
-                data_age = (datetime.now() - self.state_manager.last_market_update).total_seconds()
+            last_market_update = self.state_manager.last_market_update
+            if last_market_update:
+                data_age = (now - last_market_update).total_seconds()
                 
                 if data_age > 60:  # 1 minute threshold
                     violations.append(f"Market data is stale: {data_age:.0f} seconds old")
@@ -590,10 +940,14 @@ class RiskManager(BaseService):
                 risk_score += 0.3
             
             # Check trading hours (simplified - could be enhanced)
-            current_hour = datetime.now().hour
-            if current_hour < 6 or current_hour > 17:  # Outside typical futures hours
+            if now.hour < 6 or now.hour > 17:  # Outside typical futures hours
                 risk_score += 0.1
-                logger.warning("Trading outside typical market hours")
+                
+                # Warn once per hour rather than on every request
+                hour_key = (now.date(), now.hour)
+                if hour_key != self._off_hours_warned:
+                    self._off_hours_warned = hour_key
+                    logger.warning("Trading outside typical market hours")
             
         except Exception as e:
             logger.error(f"Market conditions validation error: {e}")
@@ -602,41 +956,37 @@ class RiskManager(BaseService):
         
         return violations, risk_score
     
-    async def _validate_drawdown(self) -> Tuple[List[str], float]:
+    def _validate_drawdown(self, positions: Mapping[str, Position], limits: RiskLimits,
+                           record: bool = True) -> Tuple[List[str], float]:
         """Validate against maximum drawdown limits"""
         violations = []
         risk_score = 0.0
         
         try:
-            if not self.state_manager:
-                return violations, risk_score
-            
-            risk_params = self.state_manager.risk_params
-            positions = self.state_manager.get_positions()
-            
             # Calculate total unrealized P&L
             total_unrealized_pnl = sum(pos.unrealized_pnl for pos in positions.values())
             
             if total_unrealized_pnl < 0:
                 # Simplified drawdown calculation (would be more sophisticated in production)
-                account_value = 100000  # Assumed account value
-                drawdown_pct = abs(total_unrealized_pnl) / account_value * 100
-                max_drawdown = risk_params.max_drawdown_percent
+                drawdown_pct = abs(total_unrealized_pnl) / limits.account_value * 100
+                max_drawdown = limits.max_drawdown_percent
                 
                 if drawdown_pct > max_drawdown:
                     violations.append(f"Drawdown {drawdown_pct:.1f}% exceeds limit {max_drawdown:.1f}%")
                     risk_score += 0.5
                     
-                    await self._trigger_circuit_breaker(f"Maximum drawdown exceeded: {drawdown_pct:.1f}%")
+                    if record:
+                        self._trip_circuit_breaker(f"Maximum drawdown exceeded: {drawdown_pct:.1f}%")
                 
-                elif drawdown_pct > max_drawdown * 0.8:
+                elif drawdown_pct > limits.drawdown_warning_percent:
                     risk_score += 0.2
-                    await self._record_violation(
-                        RiskLevel.MEDIUM,
-                        f"Approaching drawdown limit: {drawdown_pct:.1f}% / {max_drawdown:.1f}%",
-                        {"current_drawdown": drawdown_pct, "limit": max_drawdown},
-                        "drawdown_warning"
-                    )
+                    if record:
+                        self._record_violation_nowait(
+                            RiskLevel.MEDIUM,
+                            f"Approaching drawdown limit: {drawdown_pct:.1f}% / {max_drawdown:.1f}%",
+                            {"current_drawdown": drawdown_pct, "limit": max_drawdown},
+                            "drawdown_warning"
+                        )
             
         except Exception as e:
             logger.error(f"Drawdown validation error: {e}")
@@ -645,7 +995,7 @@ class RiskManager(BaseService):
         
         return violations, risk_score
     
-    async def _validate_volatility_adjustments(self, trade_request: TradeRequest) -> Tuple[List[str], float]:
+    def _validate_volatility_adjustments(self, trade_request: TradeRequest) -> Tuple[List[str], float]:
         """Validate trades against volatility-adjusted limits"""
         violations = []
         risk_score = 0.0
@@ -665,35 +1015,33 @@ class RiskManager(BaseService):
         
         return violations, risk_score
     
-    async def _validate_symbol(self, symbol: str) -> List[str]:
+    def _validate_symbol(self, symbol: str, limits: RiskLimits, record: bool = True) -> List[str]:
         """Validate symbol against centralized management"""
         violations = []
         
         try:
             # Check if symbol is in tradeable symbols list
-            tradeable_symbols = self.symbol_integration.get_trading_engine_symbols()
-            if symbol not in tradeable_symbols:
+            if symbol not in limits.tradeable_symbols:
                 violations.append(f"Symbol {symbol} not in approved tradeable symbols list")
                 
-                await self._record_violation(
-                    RiskLevel.HIGH,
-                    f"Invalid symbol for trading: {symbol}",
-                    {"symbol": symbol, "tradeable_symbols": tradeable_symbols},
-                    "symbol_validation",
-                    "Use only symbols from centralized management system"
-                )
+                if record:
+                    self._record_violation_nowait(
+                        RiskLevel.HIGH,
+                        f"Invalid symbol for trading: {symbol}",
+                        {"symbol": symbol, "tradeable_symbols": sorted(limits.tradeable_symbols)},
+                        "symbol_validation",
+                        "Use only symbols from centralized management system"
+                    )
             
             # Check if symbol requires rollover attention
-            rollover_status = self.symbol_integration.check_rollover_status()
-            if rollover_status.get('needs_attention', False):
-                urgent_rollovers = rollover_status.get('urgent_rollovers', [])
-                if symbol in [alert['current_symbol'] for alert in urgent_rollovers]:
-                    violations.append(f"Symbol {symbol} requires rollover attention - trading may be risky")
-                    
-                    await self._record_violation(
+            if symbol in limits.rollover_symbols:
+                violations.append(f"Symbol {symbol} requires rollover attention - trading may be risky")
+                
+                if record:
+                    self._record_violation_nowait(
                         RiskLevel.MEDIUM,
                         f"Symbol rollover warning: {symbol}",
-                        {"symbol": symbol, "rollover_status": rollover_status},
+                        {"symbol": symbol, "rollover_symbols": sorted(limits.rollover_symbols)},
                         "rollover_warning",
                         "Consider rolling to next contract before trading"
                     )
@@ -704,18 +1052,45 @@ class RiskManager(BaseService):
         
         return violations
     
-    async def _validate_correlation_limits(self, trade_request: TradeRequest) -> Tuple[List[str], float]:
-        """Validate correlation limits between positions"""
+    def _validate_correlation_limits(self, trade_request: TradeRequest, book: CorrelatedExposure,
+                                     limits: RiskLimits) -> Tuple[List[str], float]:
+        """Validate correlation-adjusted exposure after the trade"""
         violations = []
         risk_score = 0.0
         
         try:
-            # This would implement correlation analysis between positions
-            # Prevent over-concentration in correlated instruments
+            if not self.risk_config.get("correlation_limits", True):
+                return violations, risk_score
             
-            if self.risk_config.get("correlation_limits", True):
-                # Would analyze correlations between symbols
-                pass
+            index = book.index.get(trade_request.symbol)
+            
+            # Signed notional change from this trade
+            if trade_request.order_type == OrderType.BUY:
+                delta = trade_request.quantity * trade_request.price
+            elif trade_request.order_type == OrderType.SELL:
+                delta = -trade_request.quantity * trade_request.price
+            elif trade_request.order_type == OrderType.CLOSE and index is not None:
+                delta = -book.exposure[index]
+            else:
+                delta = 0.0
+            
+            if delta == 0.0:
+                return violations, risk_score
+            
+            # e'Re after adding delta to one symbol: O(1) from the precomputed R·e
+            if index is not None:
+                weighted = book.weighted[index]
+            else:
+                weighted = book.default_correlation * book.net_exposure
+            new_total = math.sqrt(max(book.total * book.total + 2 * delta * weighted + delta * delta, 0.0))
+            
+            # Risk-reducing trades are always allowed
+            if new_total > limits.max_correlated_exposure and new_total > book.total:
+                violations.append(f"Correlation-adjusted exposure ${new_total:,.0f} exceeds limit "
+                                  f"${limits.max_correlated_exposure:,.0f}")
+                risk_score += 0.3
+            elif new_total > limits.max_correlated_exposure * 0.8:
+                risk_score += 0.1
             
         except Exception as e:
             logger.error(f"Correlation validation error: {e}")
@@ -723,22 +1098,154 @@ class RiskManager(BaseService):
         
         return violations, risk_score
     
+    def _get_correlated_exposure(self, snapshot: Optional[StateSnapshot]) -> CorrelatedExposure:
+        """Get correlation-adjusted exposure, rebuilt only when positions or correlations change"""
+        correlations = self.correlation_engine.get_snapshot()
+        state_version = snapshot.version if snapshot else 0
+        
+        book = self._correlated_exposure
+        if (book is not None and book.state_version == state_version and
+                book.correlation_version == correlations.version):
+            return book
+        
+        book = self._build_correlated_exposure(snapshot.positions if snapshot else {}, state_version, correlations)
+        self._correlated_exposure = book
+        return book
+    
+    def _build_correlated_exposure(self, positions: Mapping[str, Position], state_version: int,
+                                   correlations: CorrelationSnapshot) -> CorrelatedExposure:
+        """Compute R·e and per-position contributions for a book of positions"""
+
+        symbols = list(correlations.symbols)
+        symbols.extend(symbol for symbol in positions if symbol not in correlations.index)
+        index = {symbol: i for i, symbol in enumerate(symbols)}
+        
+        exposure = np.zeros(len(symbols))
+        for symbol, position in positions.items():
+            direction = -1.0 if position.side == "SHORT" else 1.0
+            exposure[index[symbol]] = direction * abs(position.quantity) * position.current_price
+        
+        # Symbols outside the matrix use the engine's default correlation
+        k = len(correlations.symbols)
+        matrix = np.full((len(symbols), len(symbols)), correlations.default_correlation)
+        matrix[:k, :k] = correlations.correlation
+        np.fill_diagonal(matrix, 1.0)
+        
+        weighted = matrix @ exposure
+        total_sq = float(exposure @ weighted)
+        total = math.sqrt(max(total_sq, 0.0))
+        
+        by_position = {}
+        if total > 0:
+            for symbol in positions:
+                i = index[symbol]
+                by_position[symbol] = float(exposure[i] * weighted[i] / total)
+        
+        return CorrelatedExposure(
+            state_version=state_version,
+            correlation_version=correlations.version,
+            index=MappingProxyType(index),
+            exposure=tuple(exposure.tolist()),
+            weighted=tuple(weighted.tolist()),
+            net_exposure=float(exposure.sum()),
+            default_correlation=correlations.default_correlation,
+            total=total,
+            by_position=MappingProxyType(by_position)
+        )
+    
+    async def _attach_correlation_feed(self):
+        """Warm the correlation engine from stored ticks and subscribe to market data"""
+        if self._correlation_feed_attached or not self.state_manager:
+            return
+        self._correlation_feed_attached = True
+        
+        try:
+            adapter = self.state_manager.market_data_adapter
+            
+            def load_history():
+                ticks = []
+                for symbol in adapter.get_symbols():
+                    for data in adapter.get_historical_data(symbol, limit=5000):
+                        ticks.append((data.symbol, data.close, data.timestamp))
+                return ticks
+            
+            ticks = await asyncio.to_thread(load_history)
+            self.correlation_engine.warm_start(ticks)
+            
+        except Exception as e:
+            logger.warning(f"Correlation warm start skipped: {e}")
+        
+        self.state_manager.subscribe("market_data_updated", self._on_market_data)
+    
+    def _on_market_data(self, event: Dict[str, Any]):
+        """Feed market data ticks into the correlation engine"""
+        try:
+            data = event.get("data", {})
+            timestamp = data.get("timestamp")
+            timestamp = datetime.fromisoformat(timestamp).timestamp() if timestamp else None
+            self.correlation_engine.on_price(event["symbol"], data.get("close"), timestamp)
+            
+        except Exception as e:
+            logger.error(f"Correlation feed error: {e}")
+    
+    def get_correlation_matrix(self) -> Dict[str, Any]:
+        """Get the current correlation matrix snapshot"""
+        correlations = self.correlation_engine.get_snapshot()
+        return {
+            "symbols": list(correlations.symbols),
+            "matrix": correlations.correlation.round(4).tolist(),
+            "volatility": correlations.volatility.tolist(),
+            "observations": dict(zip(correlations.symbols, correlations.observations)),
+            "ready": correlations.ready,
+            "version": correlations.version,
+            "updated_at": datetime.fromtimestamp(correlations.updated_at).isoformat()
+        }
+    
+    def _get_correlation_status(self) -> Dict[str, Any]:
+        """Get correlation engine state and highly correlated position pairs"""
+        correlations = self.correlation_engine.get_snapshot()
+        book = self._correlated_exposure
+        threshold = self.risk_config.get("correlation_alert_threshold", 0.8)
+        
+        held = list(book.by_position) if book else []
+        correlated_pairs = []
+        for i, symbol_a in enumerate(held):
+            for symbol_b in held[i + 1:]:
+                rho = correlations.get(symbol_a, symbol_b)
+                if abs(rho) >= threshold:
+                    correlated_pairs.append({"symbols": [symbol_a, symbol_b], "correlation": round(rho, 4)})
+        
+        return {
+            "ready": correlations.ready,
+            "version": correlations.version,
+            "symbols": list(correlations.symbols),
+            "exposure_by_position": dict(book.by_position) if book else {},
+            "correlated_pairs": correlated_pairs,
+            "engine": self.correlation_engine.stats.copy()
+        }
+    
     def _update_order_rate_tracking(self):
         """Update order rate tracking"""
         try:
-            now = datetime.now()
-            self.order_timestamps.append(now)
-            
-            # Keep only last hour of timestamps
-            one_hour_ago = now - timedelta(hours=1)
-            self.order_timestamps = [ts for ts in self.order_timestamps if ts > one_hour_ago]
+            self.order_rate.record()
             
         except Exception as e:
             logger.error(f"Order rate tracking update error: {e}")
     
+    def _run_in_background(self, coro):
+        """Schedule follow-up work without blocking the caller"""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+    
     async def _record_violation(self, level: RiskLevel, message: str, details: Dict[str, Any], 
                                rule_type: str, recommendation: str = ""):
         """Record a risk violation"""
+        self._record_violation_nowait(level, message, details, rule_type, recommendation)
+    
+    def _record_violation_nowait(self, level: RiskLevel, message: str, details: Dict[str, Any],
+                                 rule_type: str, recommendation: str = ""):
+        """Record a risk violation; the database row is written by the background writer"""
         try:
             violation = RiskViolation(
                 level=level,
@@ -752,23 +1259,23 @@ class RiskManager(BaseService):
             self.violations.append(violation)
             self.violation_counts[level.value] += 1
             self.risk_metrics["violations_recorded"] += 1
-            
-            # Save to database
-            with sqlite3.connect(str(self.db_path)) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO risk_violations 
-                    (timestamp, level, message, details, rule_type, recommendation)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
-                    violation.timestamp.isoformat(),
-                    level.value,
-                    message,
-                    json.dumps(details, default=json_serializer),
-                    rule_type,
-                    recommendation
-                ))
-                conn.commit()
+            self.violation_rate.record()
+            if level == RiskLevel.CRITICAL or level == RiskLevel.EMERGENCY:
+                self.critical_violations.add()
+            
+            # Queue for the database
+            self._queue_audit('''
+                INSERT INTO risk_violations 
+                (timestamp, level, message, details, rule_type, recommendation)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (
+                violation.timestamp.isoformat(),
+                level.value,
+                message,
+                json.dumps(details, default=json_serializer),
+                rule_type,
+                recommendation
+            ))
             
             # Log based on severity
             if level == RiskLevel.CRITICAL or level == RiskLevel.EMERGENCY:
@@ -777,67 +1284,119 @@ class RiskManager(BaseService):
                 logger.warning(f"⚠️ {level.value} RISK: {message}")
             else:
                 logger.info(f"📊 {level.value} Note: {message}")
-            
-            # Keep only recent violations in memory
-            if len(self.violations) > 1000:
-                self.violations = self.violations[-1000:]
                 
         except Exception as e:
             logger.error(f"Violation recording error: {e}")
     
-    async def _record_trade_validation(self, trade_request: TradeRequest, approved: bool, 
-                                     rejection_reasons: List[str], risk_score: float):
-        """Record trade validation in database"""
+    def _record_trade_validation(self, trade_request: TradeRequest, approved: bool, 
+                                 rejection_reasons: List[str], risk_score: float):
+        """Queue trade validation audit record for the background writer"""
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO trade_validations 
-                    (timestamp, symbol, order_type, quantity, price, approved, rejection_reasons, risk_score)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    trade_request.timestamp.isoformat(),
-                    trade_request.symbol,
-                    trade_request.order_type.value,
-                    trade_request.quantity,
-                    trade_request.price,
-                    approved,
-                    json.dumps(rejection_reasons),
-                    risk_score
-                ))
-                conn.commit()
+            self._queue_audit('''
+                INSERT INTO trade_validations 
+                (timestamp, symbol, order_type, quantity, price, approved, rejection_reasons, risk_score)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                trade_request.timestamp.isoformat(),
+                trade_request.symbol,
+                trade_request.order_type.value,
+                trade_request.quantity,
+                trade_request.price,
+                approved,
+                json.dumps(rejection_reasons),
+                risk_score
+            ))
                 
         except Exception as e:
             logger.error(f"Trade validation recording error: {e}")
     
+    def _queue_audit(self, sql: str, params: Tuple):
+        """Buffer an audit row; it is handed to the writer shortly after"""
+        self._audit_buffer.append((sql, params))
+        
+        if len(self._audit_buffer) >= 500:
+            self._flush_audit_buffer()
+        elif self._audit_flush_handle is None:
+            try:
+                loop = asyncio.get_running_loop()
+                self._audit_flush_handle = loop.call_later(0.1, self._flush_audit_buffer)
+            except RuntimeError:
+                self._flush_audit_buffer()  # No event loop - hand over immediately
+    
+    def _flush_audit_buffer(self):
+        """Hand buffered audit rows to the background writer, one job per row"""
+        if self._audit_flush_handle is not None:
+            self._audit_flush_handle.cancel()
+            self._audit_flush_handle = None
+        
+        if not self._audit_buffer:
+            return []
+        
+        # The writer still commits queued rows in one transaction; as separate jobs
+        # a bad row is retried and failed on its own instead of rolling back the rest
+        statements, self._audit_buffer = self._audit_buffer, []
+        futures = []
+        try:
+            for sql, params in statements:
+                futures.append(self.db.enqueue(sql, params))
+        except Exception as e:
+            logger.error(f"Audit flush error ({len(statements) - len(futures)} rows dropped): {e}")
+        return futures
+    
     async def _trigger_circuit_breaker(self, reason: str):
         """Trigger emergency circuit breaker"""
         try:
-            if not self.circuit_breaker_active:
-                self.circuit_breaker_active = True
-                self.circuit_breaker_reason = reason
-                self.circuit_breaker_time = datetime.now()
-                self.risk_metrics["circuit_breaker_triggers"] += 1
-                
-                logger.error(f"🛑 CIRCUIT BREAKER TRIGGERED: {reason}")
-                
-                # Disable auto-trading
-                if self.state_manager:
-                    await self.state_manager.update_system_config(auto_trade_enabled=False)
-                    await self.state_manager.emergency_stop(f"Risk circuit breaker: {reason}")
-                
-                # Record critical violation
-                await self._record_violation(
-                    RiskLevel.EMERGENCY,
-                    f"Circuit breaker triggered: {reason}",
-                    {"reason": reason, "time": self.circuit_breaker_time.isoformat()},
-                    "circuit_breaker",
-                    "Immediate manual intervention required"
-                )
+            if self._trip_circuit_breaker(reason, escalate=False):
+                await self._escalate_circuit_breaker(reason)
                 
         except Exception as e:
             logger.critical(f"CRITICAL: Circuit breaker trigger failed: {e}")
     
+    def _trip_circuit_breaker(self, reason: str, escalate: bool = True) -> bool:
+        """
+        Activate the circuit breaker immediately so the next request is blocked.
+        Disabling trading in the state manager is scheduled in the background
+        unless ``escalate`` is False. Returns False if it was already active.
+        """
+        try:
+            if self.circuit_breaker_active:
+                return False
+            
+            self.circuit_breaker_active = True
+            self.circuit_breaker_reason = reason
+            self.circuit_breaker_time = datetime.now()
+            self.risk_metrics["circuit_breaker_triggers"] += 1
+            
+            logger.error(f"🛑 CIRCUIT BREAKER TRIGGERED: {reason}")
+            
+            # Record critical violation
+            self._record_violation_nowait(
+                RiskLevel.EMERGENCY,
+                f"Circuit breaker triggered: {reason}",
+                {"reason": reason, "time": self.circuit_breaker_time.isoformat()},
+                "circuit_breaker",
+                "Immediate manual intervention required"
+            )
+            
+            if escalate:
+                self._run_in_background(self._escalate_circuit_breaker(reason))
+            
+            return True
+            
+        except Exception as e:
+            logger.critical(f"CRITICAL: Circuit breaker trigger failed: {e}")
+            return False
+    
+    async def _escalate_circuit_breaker(self, reason: str):
+        """Disable auto-trading and stop the system after a circuit breaker trip"""
+        try:
+            if self.state_manager:
+                await self.state_manager.update_system_config(auto_trade_enabled=False)
+                await self.state_manager.emergency_stop(f"Risk circuit breaker: {reason}")
+                
+        except Exception as e:
+            logger.critical(f"CRITICAL: Circuit breaker escalation failed: {e}")
+    
     async def reset_circuit_breaker(self, admin_override: bool = False, reason: str = "") -> bool:
         """Reset circuit breaker (requires admin action)"""
         try:
@@ -960,6 +1519,7 @@ class RiskManager(BaseService):
         while self.running:
             try:
                 await self._update_risk_metrics()
+                self._refresh_symbol_tables()
                 await asyncio.sleep(60)  # Update every minute
                 
             except Exception as e:
@@ -977,6 +1537,11 @@ class RiskManager(BaseService):
             # Calculate total exposure
             total_exposure = sum(abs(pos.quantity * pos.current_price) for pos in positions.values())
             self.current_exposure = total_exposure
+            self.margin_used = total_exposure * self.risk_config.get("initial_margin_rate", 0.1)
+            self.correlated_exposure = self._get_correlated_exposure(self.state_manager.get_snapshot()).total
+            
+            # Tail risk (recomputed only when positions or correlations changed)
+            await self.calculate_var()
             
             # Calculate current P&L
             total_unrealized = sum(pos.unrealized_pnl for pos in positions.values())
@@ -989,13 +1554,54 @@ class RiskManager(BaseService):
         except Exception as e:
             logger.error(f"Risk metrics update error: {e}")
     
+    async def calculate_var(self, force: bool = False) -> Dict[str, Any]:
+        """Compute Monte Carlo VaR/ES for the current book off the event loop"""
+        try:
+            if not self.state_manager:
+                return self.var_report
+            
+            positions = self.state_manager.get_snapshot().positions
+            correlations = self.correlation_engine.get_snapshot()
+            
+            book = tuple(sorted(
+                (symbol, -abs(pos.quantity) if pos.side == "SHORT" else abs(pos.quantity))
+                for symbol, pos in positions.items() if pos.quantity
+            ))
+            cache_key = (book, correlations.version)
+            if not force and cache_key == self._var_cache_key:
+                return self.var_report
+            
+            exposures = {symbol: quantity * positions[symbol].current_price for symbol, quantity in book}
+            history = self.correlation_engine.get_return_history(list(exposures))
+            
+            report = await asyncio.to_thread(
+                self.var_engine.compute, exposures, correlations, history,
+                self.correlation_engine.min_observations
+            )
+            report["timestamp"] = datetime.now().isoformat()
+            
+            self.var_report = report
+            self._var_cache_key = cache_key
+            
+            if report["horizons"]:
+                one_day = report["horizons"].get("1d", {}).get("levels", {}).get("99", {})
+                logger.info(f"📉 VaR updated: 1d 99% VaR ${one_day.get('var', 0):,.0f}, "
+                            f"ES ${one_day.get('es', 0):,.0f} ({report['compute_ms']}ms, {report['method']})")
+            
+            return report
+            
+        except Exception as e:
+            logger.error(f"VaR calculation error: {e}")
+            return self.var_report
+    
     async def _violation_cleanup_loop(self):
         """Clean up old violations"""
         while self.running:
             try:
-                # Remove old violations from memory
+                # Remove old violations from memory (oldest first, so pop from the left)
                 cutoff_time = datetime.now() - timedelta(hours=24)
-                self.violations = [v for v in self.violations if v.timestamp > cutoff_time]
+                while self.violations and self.violations[0].timestamp <= cutoff_time:
+                    self.violations.popleft()
                 
                 await asyncio.sleep(3600)  # Clean every hour
                 
@@ -1033,22 +1639,19 @@ class RiskManager(BaseService):
                 "risk_metrics": self.risk_metrics.copy()
             }
             
-            with sqlite3.connect(str(self.db_path)) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT OR REPLACE INTO daily_risk_summary 
-                    (date, max_exposure, max_drawdown, total_violations, trades_blocked, risk_score, summary)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    today,
-                    self.current_exposure,
-                    self.max_drawdown,
-                    sum(self.violation_counts.values()),
-                    self.risk_metrics["orders_blocked"],
-                    self.risk_budget_used,
-                    json.dumps(summary)
-                ))
-                conn.commit()
+            await self.db.submit('''
+                INSERT OR REPLACE INTO daily_risk_summary 
+                (date, max_exposure, max_drawdown, total_violations, trades_blocked, risk_score, summary)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                today,
+                self.current_exposure,
+                self.max_drawdown,
+                sum(self.violation_counts.values()),
+                self.risk_metrics["orders_blocked"],
+                self.risk_budget_used,
+                json.dumps(summary)
+            ))
             
             logger.info(f"📊 Daily risk summary saved for {today}")
             
@@ -1064,13 +1667,19 @@ class RiskManager(BaseService):
                 "circuit_breaker_reason": self.circuit_breaker_reason,
                 "emergency_mode": self.emergency_mode,
                 "current_exposure": self.current_exposure,
+                "margin_used": self.margin_used,
                 "daily_pnl": self.daily_pnl,
                 "risk_budget_used": self.risk_budget_used,
-                "violations_last_24h": len([v for v in self.violations 
-                                          if (datetime.now() - v.timestamp).total_seconds() < 86400]),
+                "violations_last_24h": self.violation_rate.last_day.count(),
+                "rate_metrics": self._get_rate_metrics(),
                 "violation_counts": self.violation_counts.copy(),
                 "risk_metrics": self.risk_metrics.copy(),
                 "risk_config": self.risk_config.copy(),
+                "correlated_exposure": self.correlated_exposure,
+                "correlation": self._get_correlation_status(),
+                "var": self.var_report,
+                "fast_path": self._get_fast_path_stats(),
+                "persistence": self.db.get_stats(),
                 "timestamp": datetime.now().isoformat()
             }
             
@@ -1082,6 +1691,40 @@ class RiskManager(BaseService):
                 "timestamp": datetime.now().isoformat()
             }
     
+    def _get_rate_metrics(self) -> Dict[str, Any]:
+        """Get sliding-window order, reject and violation rates"""
+        return {
+            "orders_per_minute": self.order_rate.last_minute.count(),
+            "rejects_per_minute": self.reject_rate.last_minute.count(),
+            "violations_per_hour": self.violation_rate.last_hour.count(),
+            "critical_violations_5m": self.critical_violations.count(),
+            "orders": self.order_rate.get_stats(),
+            "rejects": self.reject_rate.get_stats(),
+            "violations": self.violation_rate.get_stats()
+        }
+    
+    def _get_fast_path_stats(self) -> Dict[str, Any]:
+        """Get pre-trade decision latency and limit table info"""
+        latencies = sorted(self._decision_latencies_us)
+        limits = self._risk_limits
+        
+        if latencies:
+            p50 = latencies[len(latencies) // 2]
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        else:
+            p50 = p99 = 0.0
+        
+        return {
+            "decisions_sampled": len(latencies),
+            "p50_latency_us": round(p50, 1),
+            "p99_latency_us": round(p99, 1),
+            "max_latency_us": round(latencies[-1], 1) if latencies else 0.0,
+            "limits_valid": limits.config_valid if limits else False,
+            "limits_built_at": datetime.fromtimestamp(limits.built_at).isoformat() if limits else None,
+            "background_tasks": len(self._background_tasks),
+            "audit_buffered": len(self._audit_buffer)
+        }
+    
     def get_recent_violations(self, hours: int = 24) -> List[Dict[str, Any]]:
         """Get recent risk violations"""
         try:
@@ -1108,13 +1751,11 @@ class RiskManager(BaseService):
                 issues.append("System in emergency mode")
             
             # Check risk configuration
-            if not self._validate_risk_configuration():
+            if not self.get_risk_limits().config_valid:
                 issues.append("Risk parameters not properly configured")
             
             # Check for critical violations
-            recent_critical = len([v for v in self.violations 
-                                 if v.level in [RiskLevel.CRITICAL, RiskLevel.EMERGENCY] and
-                                 (datetime.now() - v.timestamp).total_seconds() < 300])
+            recent_critical = self.critical_violations.count()
             
             if recent_critical > 0:
                 issues.append(f"{recent_critical} critical violations in last 5 minutes")
@@ -1155,9 +1796,7 @@ class RiskManager(BaseService):
                 return False
             
             # Check for excessive recent violations
-            recent_critical = len([v for v in self.violations 
-                                 if v.level in [RiskLevel.CRITICAL, RiskLevel.EMERGENCY] and
-                                 (datetime.now() - v.timestamp).total_seconds() < 300])
+            recent_critical = self.critical_violations.count()
             
             if recent_critical > 5:  # More than 5 critical violations in 5 minutes
                 return False
@@ -1182,6 +1821,8 @@ class RiskManager(BaseService):
     
     async def _start_service(self):
         """Start service-specific functionality"""
+        await self._attach_correlation_feed()
+        
         # Start monitoring loops
         if self.running:
             asyncio.create_task(self._position_monitoring_loop())
@@ -1201,7 +1842,11 @@ class RiskManager(BaseService):
         # Clear violations and reset state
         self.violations.clear()
         self.order_history.clear()
-        self.order_timestamps.clear()
+        self.order_rate.clear()
+        self.reject_rate.clear()
+        self.violation_rate.clear()
+        self.critical_violations.clear()
+        self._decision_latencies_us.clear()
         
         logger.info("Risk Manager cleanup completed")
 
@@ -15,15 +15,18 @@ risk management system to ensure safe and profitable trading operations.
 
 import asyncio
 import logging
+import multiprocessing
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import json
 
 from ..core.base_service import BaseService
+from ..core.kelly_calibration import KellyCalibrationEngine, KellyCalibrationConfig
 from .state_manager import get_state_manager
 from .risk_manager import get_risk_manager
 from ..ml.kelly_criterion import get_kelly_criterion, KellyPosition
@@ -43,6 +46,9 @@ class KellyCalibrationResult:
     total_trades: int
     recommendation: str
     risk_score: float
+    probability_of_ruin: float = 0.0
+    max_drawdown_p95: float = 0.0
+    terminal_wealth: Dict[str, float] = field(default_factory=dict)
 
 @dataclass
 class BacktestResult:
@@ -86,13 +92,16 @@ class RiskValidationService(BaseService):
         self.symbol_integration = get_symbol_integration()
         
         # Calibration parameters
-        self.kelly_multipliers = [0.25, 0.5, 0.75, 1.0]  # Test fractional Kelly
+        self.kelly_multipliers = list(KellyCalibrationConfig().multipliers)  # 0.02x to 1.0x Kelly
         self.risk_scenarios = self._define_risk_scenarios()
         
         # Results storage
         self.calibration_results = []
+        self.calibration_report = {}
+        self.optimal_multiplier = 0.5
         self.backtest_results = []
         self.validation_history = []
+        self._calibration_pool: Optional[ProcessPoolExecutor] = None
         
         # Configuration
         self.config = {
@@ -100,7 +109,10 @@ class RiskValidationService(BaseService):
             'backtest_days': 90,
             'min_trades_for_validation': 10,
             'confidence_threshold': 0.6,
-            'max_position_risk': 0.02  # 2% of capital per position
+            'max_position_risk': 0.02,  # 2% of capital per position
+            'calibration_paths': 10000,  # Bootstrap resamples of the trade history
+            'calibration_workers': 0,  # Process pool size, 0 runs in a thread
+            'ruin_level': 0.5  # Equity fraction treated as ruin
         }
         
         logger.info("Risk Validation Service initialized for Phase 3")
@@ -131,6 +143,7 @@ class RiskValidationService(BaseService):
         """Stop the Risk Validation Service"""
         logger.info("🛑 Stopping Risk Validation Service...")
         self.validation_history.clear()
+        self._shutdown_calibration_pool()
         logger.info("✅ Risk Validation Service stopped")
     
     async def _cleanup(self):
@@ -139,13 +152,15 @@ class RiskValidationService(BaseService):
         self.calibration_results.clear()
         self.backtest_results.clear()
         self.validation_history.clear()
+        self._shutdown_calibration_pool()
     
     async def run_kelly_fraction_calibration(self) -> List[KellyCalibrationResult]:
         """
         Phase 3.1: Kelly Fraction Calibration
         
-        Tests different Kelly multipliers (0.25x to 1.0x) to find optimal balance
-        between returns and risk management.
+        Tests a grid of Kelly multipliers (0.02x to 1.0x) over bootstrap resamples
+        of the trade history to find the optimal balance between returns and risk
+        of ruin.
         """
         logger.info("🎯 Starting Kelly Fraction Calibration...")
         
@@ -159,25 +174,15 @@ class RiskValidationService(BaseService):
                 logger.warning(f"Insufficient trade history ({len(historical_trades)} trades)")
                 return await self._generate_synthetic_calibration()
             
-            results = []
+            pnls = [trade.get('pnl', 0.0) for trade in historical_trades]
+            report = await self._run_calibration_engine(pnls)
+            results = [self._to_calibration_result(r, report) for r in report['results']]
             
-            for multiplier in self.kelly_multipliers:
-                logger.info(f"Testing Kelly multiplier: {multiplier}")
-                
-                # Simulate trading with this Kelly multiplier
-                result = await self._simulate_kelly_strategy(
-                    historical_trades, 
-                    kelly_multiplier=multiplier
-                )
-                
-                results.append(result)
-                
-                logger.info(f"Kelly {multiplier}: Return={result.annual_return:.1f}%, "
-                          f"Drawdown={result.max_drawdown:.1f}%, "
-                          f"Sharpe={result.sharpe_ratio:.2f}")
+            logger.info(f"Simulated {len(results)} Kelly multipliers x {report['paths']} paths "
+                       f"in {report['compute_ms']:.0f}ms (full Kelly fraction {report['full_kelly_fraction']:.3f})")
             
-            # Find optimal multiplier
-            optimal_result = self._select_optimal_kelly(results)
+            # Highest median growth within the ruin and drawdown constraints
+            optimal_result = next(r for r in results if r.kelly_multiplier == report['optimal_multiplier'])
             
             logger.info(f"🏆 Optimal Kelly Multiplier: {optimal_result.kelly_multiplier} "
                        f"(Return: {optimal_result.annual_return:.1f}%, "
@@ -187,85 +192,54 @@ class RiskValidationService(BaseService):
             await self._update_kelly_configuration(optimal_result.kelly_multiplier)
             
             self.calibration_results = results
+            self.calibration_report = report
+            self.optimal_multiplier = optimal_result.kelly_multiplier
             return results
             
         except Exception as e:
             logger.error(f"Kelly calibration failed: {e}")
             return []
     
-    async def _simulate_kelly_strategy(self, 
-                                     historical_trades: List[Dict], 
-                                     kelly_multiplier: float) -> KellyCalibrationResult:
-        """Simulate Kelly strategy with given multiplier"""
-        
-        capital = self.config['base_capital']
-        trades = []
-        equity_curve = [capital]
-        
-        for trade in historical_trades:
-            try:
-                # Simulate Kelly position sizing
-                trade_pnl = trade.get('pnl', 0.0)
-                trade_return = trade_pnl / capital if capital > 0 else 0.0
-                
-                # Apply Kelly multiplier to position size
-                # In real implementation, this would use actual Kelly calculation
-                position_fraction = min(0.1 * kelly_multiplier, 0.2)  # Simplified
-                
-                # Calculate trade impact
-                trade_impact = trade_return * position_fraction * capital
-                capital += trade_impact
-                
-                trades.append({
-                    'pnl': trade_impact,
-                    'return': trade_impact / equity_curve[-1] if equity_curve[-1] > 0 else 0,
-                    'capital': capital
-                })
-                
-                equity_curve.append(capital)
-                
-            except Exception as e:
-                logger.debug(f"Trade simulation error: {e}")
-                continue
-        
-        # Calculate performance metrics
-        if len(trades) == 0:
-            return self._create_empty_calibration_result(kelly_multiplier)
-        
-        returns = [t['return'] for t in trades]
-        
-        total_return = (capital - self.config['base_capital']) / self.config['base_capital']
-        annual_return = total_return * (365 / self.config['backtest_days'])
-        
-        # Calculate max drawdown
-        peak = self.config['base_capital']
-        max_dd = 0.0
-        for equity in equity_curve:
-            if equity > peak:
-                peak = equity
-            drawdown = (peak - equity) / peak
-            max_dd = max(max_dd, drawdown)
-        
-        # Calculate Sharpe ratio
-        if len(returns) > 1:
-            sharpe = np.mean(returns) / np.std(returns) * np.sqrt(252) if np.std(returns) > 0 else 0
-        else:
-            sharpe = 0.0
-        
-        # Win rate
-        winning_trades = len([t for t in trades if t['pnl'] > 0])
-        win_rate = winning_trades / len(trades) if trades else 0.0
-        
-        # Average win/loss ratio
-        wins = [t['pnl'] for t in trades if t['pnl'] > 0]
-        losses = [abs(t['pnl']) for t in trades if t['pnl'] < 0]
-        avg_win_loss = (np.mean(wins) / np.mean(losses)) if wins and losses else 1.0
+    async def _run_calibration_engine(self, pnls: List[float]) -> Dict[str, Any]:
+        """Run the vectorized calibration off the event loop"""
+        trades_per_year = len(pnls) * 365 / self.config['backtest_days']
+        engine = KellyCalibrationEngine(KellyCalibrationConfig(
+            multipliers=tuple(self.kelly_multipliers),
+            paths=self.config['calibration_paths'],
+            trades_per_year=trades_per_year,
+            ruin_level=self.config['ruin_level']
+        ))
+        return await asyncio.to_thread(engine.calibrate, pnls, self._get_calibration_pool())
+    
+    def _get_calibration_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Get the calibration process pool, if configured"""
+        workers = self.config['calibration_workers']
+        if workers and self._calibration_pool is None:
+            # Spawn rather than fork the process running the event loop and its threads
+            self._calibration_pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._calibration_pool
+    
+    def _shutdown_calibration_pool(self):
+        """Stop calibration worker processes"""
+        if self._calibration_pool is not None:
+            self._calibration_pool.shutdown(wait=False, cancel_futures=True)
+            self._calibration_pool = None
+    
+    def _to_calibration_result(self, result: Dict[str, Any], report: Dict[str, Any]) -> KellyCalibrationResult:
+        """Convert one multiplier's simulated distribution into a calibration result"""
+        max_dd = result['max_drawdown']['p50']
+        sharpe = result['sharpe']['p50']
+        ruin = result['probability_of_ruin']
         
         # Risk score (lower is better)
-        risk_score = max_dd * 100 + (1 - win_rate) * 50
+        risk_score = max_dd * 100 + ruin * 100
         
         # Recommendation
-        if max_dd < 0.1 and sharpe > 1.0:
+        if ruin > 0.01:
+            recommendation = f"HIGH RISK - {ruin:.1%} probability of ruin"
+        elif max_dd < 0.1 and sharpe > 1.0:
             recommendation = "EXCELLENT - Low risk, high returns"
         elif max_dd < 0.15 and sharpe > 0.5:
             recommendation = "GOOD - Balanced risk/return"
@@ -275,30 +249,20 @@ class RiskValidationService(BaseService):
             recommendation = "HIGH RISK - Consider lower multiplier"
         
         return KellyCalibrationResult(
-            kelly_multiplier=kelly_multiplier,
-            annual_return=annual_return * 100,
+            kelly_multiplier=result['multiplier'],
+            annual_return=result['annual_return'] * 100,
             max_drawdown=max_dd * 100,
             sharpe_ratio=sharpe,
-            win_rate=win_rate,
-            avg_win_loss_ratio=avg_win_loss,
-            total_trades=len(trades),
+            win_rate=report['win_rate'],
+            avg_win_loss_ratio=report['win_loss_ratio'],
+            total_trades=report['trades'],
             recommendation=recommendation,
-            risk_score=risk_score
+            risk_score=risk_score,
+            probability_of_ruin=ruin,
+            max_drawdown_p95=result['max_drawdown']['p95'] * 100,
+            terminal_wealth=result['terminal_wealth']
         )
     
-    def _select_optimal_kelly(self, results: List[KellyCalibrationResult]) -> KellyCalibrationResult:
-        """Select optimal Kelly multiplier based on risk-adjusted returns"""
-        
-        # Score each result (higher is better)
-        for result in results:
-            # Risk-adjusted score: Sharpe ratio weighted by drawdown constraint
-            drawdown_penalty = max(0, result.max_drawdown - 15) * 0.1  # Penalty for >15% drawdown
-            result.score = result.sharpe_ratio - drawdown_penalty
-        
-        # Select highest scoring result
-        optimal = max(results, key=lambda r: getattr(r, 'score', 0))
-        return optimal
-    
     async def _update_kelly_configuration(self, optimal_multiplier: float):
         """Update Kelly Criterion with optimal multiplier"""
         try:
@@ -354,6 +318,7 @@ class RiskValidationService(BaseService):
         
         # Select 0.5 (half-Kelly) as optimal for synthetic data
         optimal_result = results[1]  # 0.5 multiplier
+        self.optimal_multiplier = optimal_result.kelly_multiplier
         await self._update_kelly_configuration(optimal_result.kelly_multiplier)
         
         logger.info(f"🎯 Synthetic calibration complete - Optimal: {optimal_result.kelly_multiplier}")
@@ -415,7 +380,10 @@ class RiskValidationService(BaseService):
         """Get current Kelly calibration results"""
         return {
             'calibration_results': [asdict(r) for r in self.calibration_results],
-            'optimal_multiplier': self.calibration_results[1].kelly_multiplier if len(self.calibration_results) > 1 else 0.5,
+            'optimal_multiplier': self.optimal_multiplier,
+            'full_kelly_fraction': self.calibration_report.get('full_kelly_fraction'),
+            'paths': self.calibration_report.get('paths', 0),
+            'compute_ms': self.calibration_report.get('compute_ms', 0.0),
             'last_calibration': datetime.now().isoformat(),
             'status': 'completed' if self.calibration_results else 'pending'
         }
@@ -17,14 +17,17 @@ import threading
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Callable, Union
-from dataclasses import dataclass, asdict
+from types import MappingProxyType
+from typing import Dict, Any, Optional, List, Callable, Union, Mapping
+from dataclasses import dataclass, asdict, replace
 from enum import Enum
 import aiohttp
 from contextlib import asynccontextmanager
 
 # Import unified market data store
 from ..core.market_data_adapter import get_market_data_adapter
+from ..core.trade_ledger import TradeLedger
+from ..core.persistence import get_sqlite_writer
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -102,6 +105,25 @@ class MarketDataPoint:
         if not self.received_at:
             self.received_at = datetime.now().isoformat()
 
+@dataclass(frozen=True)
+class StateSnapshot:
+    """
+    Immutable, versioned view of trading state.
+    
+    Writers publish a new snapshot after every change; readers take the
+    current reference without locking and compare versions to detect changes.
+    Positions and config objects held here are never mutated after publication.
+    """
+    version: int
+    trading_state: TradingState
+    system_state: SystemState
+    ai_state: AIState
+    positions: Mapping[str, Position]
+    risk_params: RiskParameters
+    system_config: SystemConfig
+    pnl: Mapping[str, float]
+    published_at: float
+
 class StateManager:
     """
     Centralized state manager for MinhOS v3
@@ -147,7 +169,12 @@ class StateManager:
         
         # Event system
         self.event_subscribers: Dict[str, List[Callable]] = {}
-        self.state_lock = asyncio.Lock()
+        self.state_lock = asyncio.Lock()  # Serializes writers only
+        
+        # Copy-on-write snapshot read by everyone else
+        self._snapshot: Optional[StateSnapshot] = None
+        self._state_dict_cache = None
+        self._publish_snapshot(config_changed=True)
         
         # WebSocket notifications
         self.websocket_notify_url = "http://localhost:9002/api/notify"
@@ -167,7 +194,12 @@ class StateManager:
         
         # Initialize database
         self._init_database()
-        asyncio.create_task(self._load_state())
+        self.db = get_sqlite_writer(self.db_path)
+        
+        # Fill-time trades ledger (shares the state database file)
+        self.trade_ledger = TradeLedger(self.db_path)
+        
+        self._load_task = asyncio.create_task(self._load_state())
         
         logger.info("🏛️ State Manager initialized (Linux-native)")
     
@@ -274,68 +306,67 @@ class StateManager:
     async def _load_state(self):
         """Load state from database"""
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
-                cursor = conn.cursor()
+            # Load positions
+            for row in await self.db.query("SELECT * FROM positions"):
+                symbol, quantity, side, entry_price, current_price, unrealized_pnl, entry_time_str, last_update_str = row
                 
-                # Load positions
-                cursor.execute("SELECT * FROM positions")
-                for row in cursor.fetchall():
-                    symbol, quantity, side, entry_price, current_price, unrealized_pnl, entry_time_str, last_update_str = row
+                try:
+                    entry_time = datetime.fromisoformat(entry_time_str)
+                    last_update = datetime.fromisoformat(last_update_str)
                     
-                    try:
-                        entry_time = datetime.fromisoformat(entry_time_str)
-                        last_update = datetime.fromisoformat(last_update_str)
-                        
-                        self.positions[symbol] = Position(
-                            symbol=symbol,
-                            quantity=quantity,
-                            side=side,
-                            entry_price=entry_price,
-                            current_price=current_price,
-                            unrealized_pnl=unrealized_pnl,
-                            entry_time=entry_time,
-                            last_update=last_update
-                        )
-                    except Exception as e:
-                        logger.warning(f"Failed to load position {symbol}: {e}")
-                
-                # Load risk parameters (latest)
-                cursor.execute("SELECT * FROM risk_parameters ORDER BY id DESC LIMIT 1")
-                risk_row = cursor.fetchone()
-                if risk_row:
-                    try:
-                        self.risk_params = RiskParameters(
-                            max_position_size=risk_row[1],
-                            max_daily_loss=risk_row[2],
-                            max_drawdown_percent=risk_row[3],
-                            position_size_percent=risk_row[4],
-                            stop_loss_points=risk_row[5],
-                            take_profit_points=risk_row[6],
-                            enabled=bool(risk_row[7]),
-                            max_positions=risk_row[8] if risk_row[8] is not None else 3,
-                            stop_loss_ticks=risk_row[9] if risk_row[9] is not None else 4
-                        )
-                    except Exception as e:
-                        logger.warning(f"Failed to load risk parameters: {e}")
-                
-                # Load system config (latest)
-                cursor.execute("SELECT * FROM system_config ORDER BY id DESC LIMIT 1")
-                config_row = cursor.fetchone()
-                if config_row:
-                    try:
-                        self.system_config = SystemConfig(
-                            auto_trade_enabled=bool(config_row[1]),
-                            trading_enabled=bool(config_row[2]),
-                            debug_mode=bool(config_row[3]),
-                            max_orders_per_minute=config_row[4],
-                            data_validation_enabled=bool(config_row[5]),
-                            emergency_stop_triggered=bool(config_row[6])
-                        )
-                    except Exception as e:
-                        logger.warning(f"Failed to load system config: {e}")
-                
-                logger.info("✅ State loaded from database")
-                
+                    self.positions[symbol] = Position(
+                        symbol=symbol,
+                        quantity=quantity,
+                        side=side,
+                        entry_price=entry_price,
+                        current_price=current_price,
+                        unrealized_pnl=unrealized_pnl,
+                        entry_time=entry_time,
+                        last_update=last_update
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to load position {symbol}: {e}")
+            
+            # Load risk parameters (latest)
+            rows = await self.db.query("SELECT * FROM risk_parameters ORDER BY id DESC LIMIT 1")
+            risk_row = rows[0] if rows else None
+            if risk_row:
+                try:
+                    self.risk_params = RiskParameters(
+                        max_position_size=risk_row[1],
+                        max_daily_loss=risk_row[2],
+                        max_drawdown_percent=risk_row[3],
+                        position_size_percent=risk_row[4],
+                        stop_loss_points=risk_row[5],
+                        take_profit_points=risk_row[6],
+                        enabled=bool(risk_row[7]),
+                        max_positions=risk_row[8] if risk_row[8] is not None else 3,
+                        stop_loss_ticks=risk_row[9] if risk_row[9] is not None else 4
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to load risk parameters: {e}")
+            
+            # Load system config (latest)
+            rows = await self.db.query("SELECT * FROM system_config ORDER BY id DESC LIMIT 1")
+            config_row = rows[0] if rows else None
+            if config_row:
+                try:
+                    self.system_config = SystemConfig(
+                        auto_trade_enabled=bool(config_row[1]),
+                        trading_enabled=bool(config_row[2]),
+                        debug_mode=bool(config_row[3]),
+                        max_orders_per_minute=config_row[4],
+                        data_validation_enabled=bool(config_row[5]),
+                        emergency_stop_triggered=bool(config_row[6])
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to load system config: {e}")
+            
+            await self._update_trading_state()
+            self._publish_snapshot(config_changed=True)
+            
+            logger.info("✅ State loaded from database")
+            
         except Exception as e:
             logger.error(f"❌ Error loading state from database: {e}")
     
@@ -480,13 +511,19 @@ class StateManager:
                 old_state = self.trading_state
                 
                 if symbol in self.positions:
-                    position = self.positions[symbol]
-                    position.quantity = quantity
-                    position.side = side
+                    # Never mutate a published position: build a new one
+                    position = replace(
+                        self.positions[symbol],
+                        quantity=quantity,
+                        side=side,
+                        last_update=datetime.now()
+                    )
+                    if entry_price is not None:
+                        position.entry_price = entry_price
                     if current_price is not None:
                         position.current_price = current_price
                         position.unrealized_pnl = self._calculate_position_pnl(position)
-                    position.last_update = datetime.now()
+                    self.positions[symbol] = position
                 else:
                     # New position
                     self.positions[symbol] = Position(
@@ -502,6 +539,7 @@ class StateManager:
                 
                 # Update trading state based on positions
                 await self._update_trading_state()
+                self._publish_snapshot()
                 
                 self.stats["position_updates"] += 1
                 await self._save_position(self.positions[symbol])
@@ -545,6 +583,7 @@ class StateManager:
                         self.system_config.auto_trade_enabled = False
                 
                 self.stats["risk_updates"] += 1
+                self._publish_snapshot(config_changed=True)
                 await self._save_risk_parameters()
                 
                 await self._publish_event("risk_parameters_updated", {
@@ -578,6 +617,7 @@ class StateManager:
                         logger.error("❌ Cannot enable auto-trade when system not online")
                         self.system_config.auto_trade_enabled = False
                 
+                self._publish_snapshot(config_changed=True)
                 await self._save_system_config()
                 
                 await self._publish_event("system_config_updated", {
@@ -602,6 +642,8 @@ class StateManager:
                     self.system_config.auto_trade_enabled = False
                     logger.warning("⚠️ Auto-trade disabled due to system state change")
                 
+                self._publish_snapshot(config_changed=True)
+                
                 await self._save_state_history("system_state_changed", old_state.value, new_state.value)
                 
                 await self._publish_event("system_state_changed", {
@@ -622,6 +664,7 @@ class StateManager:
                 
                 self.system_config.emergency_stop_triggered = True
                 self.system_config.auto_trade_enabled = False
+                self._publish_snapshot(config_changed=True)
                 await self.set_system_state(SystemState.EMERGENCY_STOP)
                 
                 await self._save_state()
@@ -669,9 +712,44 @@ class StateManager:
         except Exception as e:
             logger.error(f"❌ Event publishing error: {e}")
     
+    # Snapshot publication
+    def _publish_snapshot(self, config_changed: bool = False):
+        """Build a new immutable snapshot and swap it in with one assignment"""
+        previous = self._snapshot
+        
+        if config_changed or previous is None:
+            risk_params = replace(self.risk_params)
+            system_config = replace(self.system_config)
+        else:
+            risk_params = previous.risk_params
+            system_config = previous.system_config
+        
+        self._snapshot = StateSnapshot(
+            version=previous.version + 1 if previous else 1,
+            trading_state=self.trading_state,
+            system_state=self.system_state,
+            ai_state=self.ai_state,
+            positions=MappingProxyType(dict(self.positions)),
+            risk_params=risk_params,
+            system_config=system_config,
+            pnl=MappingProxyType(dict(self.pnl)),
+            published_at=time.time()
+        )
+    
+    def get_snapshot(self) -> StateSnapshot:
+        """Get the current immutable state snapshot (lock-free)"""
+        return self._snapshot
+    
+    @property
+    def state_version(self) -> int:
+        """Version of the current snapshot; changes on every state write"""
+        return self._snapshot.version
+    
     # State retrieval methods
     def get_current_state(self) -> Dict[str, Any]:
         """Get complete current state"""
+        snapshot = self._snapshot
+        
         # Add symbol management information to stats
         try:
             tradeable_symbols = self.symbol_integration.get_trading_engine_symbols()
@@ -686,24 +764,37 @@ class StateManager:
             logger.debug(f"Could not get symbol management info: {e}")
             symbol_info = {"error": "Symbol management unavailable"}
         
+        # Serialized state only changes when the snapshot version does
+        cached = self._state_dict_cache
+        if cached is None or cached[0] != snapshot.version:
+            cached = (snapshot.version, {
+                "positions": {k: asdict(v) for k, v in snapshot.positions.items()},
+                "risk_parameters": asdict(snapshot.risk_params),
+                "system_config": asdict(snapshot.system_config)
+            })
+            self._state_dict_cache = cached
+        serialized = cached[1]
+        
         return {
-            "trading_state": self.trading_state.value,
-            "system_state": self.system_state.value,
-            "ai_state": self.ai_state.value,
-            "positions": {k: asdict(v) for k, v in self.positions.items()},
-            "risk_parameters": asdict(self.risk_params),
-            "system_config": asdict(self.system_config),
-            "pnl": self.pnl.copy(),
+            "version": snapshot.version,
+            "trading_state": snapshot.trading_state.value,
+            "system_state": snapshot.system_state.value,
+            "ai_state": snapshot.ai_state.value,
+            "positions": {k: dict(v) for k, v in serialized["positions"].items()},
+            "risk_parameters": dict(serialized["risk_parameters"]),
+            "system_config": dict(serialized["system_config"]),
+            "pnl": dict(snapshot.pnl),
             "market_data": {k: asdict(v) for k, v in self.get_market_data().items()},  # MIGRATED: Get from unified store
             "last_market_update": self.last_market_update.isoformat() if self.last_market_update else None,
             "stats": self.stats.copy(),
+            "persistence": self.db.get_stats(),
             "symbol_management": symbol_info,
             "timestamp": datetime.now().isoformat()
         }
     
-    def get_positions(self) -> Dict[str, Position]:
-        """Get all current positions"""
-        return self.positions.copy()
+    def get_positions(self) -> Mapping[str, Position]:
+        """Get all current positions (read-only view of the current snapshot)"""
+        return self._snapshot.positions
     
     def get_tradeable_symbols(self) -> List[str]:
         """Get list of tradeable symbols from centralized management"""
@@ -721,13 +812,13 @@ class StateManager:
             logger.error(f"Error getting rollover status: {e}")
             return {'needs_attention': False, 'urgent_rollovers': 0, 'total_upcoming': 0, 'alerts': []}
     
-    def get_all_positions(self) -> Dict[str, Position]:
+    def get_all_positions(self) -> Mapping[str, Position]:
         """Get all current positions (alias for get_positions)"""
         return self.get_positions()
     
     def get_position(self, symbol: str) -> Optional[Position]:
         """Get position for specific symbol"""
-        return self.positions.get(symbol)
+        return self._snapshot.positions.get(symbol)
     
     def get_market_data(self, symbol: str = None) -> Union[Dict[str, MarketDataPoint], Optional[MarketDataPoint]]:
         """MIGRATED: Get market data from unified store"""
@@ -796,98 +887,104 @@ class StateManager:
         """Get current system configuration"""
         return self.system_config
     
+    async def record_fill(self, symbol: str, side: str, quantity: int, price: float,
+                          order_id: Optional[str] = None, timestamp: Optional[float] = None):
+        """Record an execution in the trades ledger and update the position"""
+        fill = self.trade_ledger.record_fill(
+            symbol=symbol,
+            side=side,
+            quantity=quantity,
+            price=price,
+            timestamp=timestamp,
+            order_id=order_id
+        )
+        
+        if fill.realized_pnl:
+            self.pnl["realized"] += fill.realized_pnl
+            self.pnl["today"] += fill.realized_pnl
+            self._publish_snapshot()
+        
+        if fill.position_after > 0:
+            position_side = "LONG"
+        elif fill.position_after < 0:
+            position_side = "SHORT"
+        else:
+            position_side = "FLAT"
+        
+        await self.update_position(
+            symbol,
+            abs(fill.position_after),
+            position_side,
+            entry_price=fill.avg_price_after,
+            current_price=price
+        )
+        
+        await self._publish_event("fill_recorded", {
+            "symbol": symbol,
+            "fill": asdict(fill)
+        })
+        
+        return fill
+    
+    def get_trade_pnl_arrays(self, days: int = 30, symbol: str = None) -> Dict[str, Any]:
+        """Get cached columnar realized P&L arrays for Kelly and risk calculations"""
+        return self.trade_ledger.get_pnl_arrays(days=days, symbol=symbol)
+    
     async def get_recent_trades(self, days: int = 30, symbol: str = None) -> List[Dict[str, Any]]:
         """Get recent trading history for Kelly Criterion calculations"""
         try:
-            cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
+            # Indexed range scan on the trades ledger
+            trades = []
+            for ledger_trade in self.trade_ledger.get_trades(days=days, symbol=symbol):
+                pnl = ledger_trade.realized_pnl
+                trades.append({
+                    'timestamp': datetime.fromtimestamp(ledger_trade.exit_time).isoformat(),
+                    'symbol': ledger_trade.symbol,
+                    'pnl': pnl,
+                    'profit_loss': pnl,
+                    'outcome': 'win' if pnl > 0 else 'loss',
+                    'side': ledger_trade.side,
+                    'quantity': ledger_trade.quantity,
+                    'entry_price': ledger_trade.entry_price,
+                    'current_price': ledger_trade.exit_price,
+                    'exit_price': ledger_trade.exit_price
+                })
             
-            with sqlite3.connect(str(self.db_path)) as conn:
-                cursor = conn.cursor()
-                
-                # Query trade history from state_history table
-                # Look for position_updated events with realized P&L
-                query = '''
-                    SELECT timestamp, data, old_state, new_state 
-                    FROM state_history 
-                    WHERE event_type = 'position_updated' 
-                    AND timestamp >= ?
-                '''
-                params = [cutoff_date]
-                
-                if symbol:
-                    query += ' AND data LIKE ?'
-                    params.append(f'%"{symbol}"%')
+            # If no real trades found, create some synthetic trade history for testing
+            if not trades and not symbol:
+                logger.info("No trade history found, generating sample data for Kelly calculations")
                 
-                query += ' ORDER BY timestamp DESC'
+                # Generate realistic sample trades for the primary symbol
+                primary_symbol = self.symbol_integration.get_ai_brain_primary_symbol()
+                base_price = 23500.0  # Approximate NQU25 price
                 
-                cursor.execute(query, params)
-                rows = cursor.fetchall()
+                import random
+                random.seed(42)  # Consistent results
                 
-                trades = []
-                for timestamp_str, data_str, old_state, new_state in rows:
-                    try:
-                        data = json.loads(data_str) if data_str else {}
-                        
-                        # Extract trade information
-                        if 'position' in data:
-                            position_data = data['position']
-                            
-                            # Calculate P&L from position data
-                            unrealized_pnl = position_data.get('unrealized_pnl', 0.0)
-                            
-                            trade = {
-                                'timestamp': timestamp_str,
-                                'symbol': position_data.get('symbol', 'UNKNOWN'),
-                                'pnl': unrealized_pnl,
-                                'profit_loss': unrealized_pnl,
-                                'outcome': 'win' if unrealized_pnl > 0 else 'loss',
-                                'side': position_data.get('side', 'UNKNOWN'),
-                                'quantity': position_data.get('quantity', 0),
-                                'entry_price': position_data.get('entry_price', 0.0),
-                                'current_price': position_data.get('current_price', 0.0)
-                            }
-                            
-                            trades.append(trade)
-                            
-                    except Exception as e:
-                        logger.debug(f"Error parsing trade data: {e}")
-                        continue
-                
-                # If no real trades found, create some synthetic trade history for testing
-                if not trades and not symbol:
-                    logger.info("No trade history found, generating sample data for Kelly calculations")
-                    
-                    # Generate realistic sample trades for the primary symbol
-                    primary_symbol = self.symbol_integration.get_ai_brain_primary_symbol()
-                    base_price = 23500.0  # Approximate NQU25 price
+                for i in range(min(20, days)):  # Generate up to 20 sample trades
+                    trade_date = datetime.now() - timedelta(days=i)
                     
-                    import random
-                    random.seed(42)  # Consistent results
+                    # Simulate realistic futures trading P&L
+                    # Futures have tick values around $5 per tick, typical move 1-20 ticks
+                    ticks = random.randint(-20, 25)  # Slightly positive bias
+                    pnl = ticks * 5.0  # $5 per tick
                     
-                    for i in range(min(20, days)):  # Generate up to 20 sample trades
-                        trade_date = datetime.now() - timedelta(days=i)
-                        
-                        # Simulate realistic futures trading P&L
-                        # Futures have tick values around $5 per tick, typical move 1-20 ticks
-                        ticks = random.randint(-20, 25)  # Slightly positive bias
-                        pnl = ticks * 5.0  # $5 per tick
-                        
-                        trade = {
-                            'timestamp': trade_date.isoformat(),
-                            'symbol': primary_symbol,
-                            'pnl': pnl,
-                            'profit_loss': pnl,
-                            'outcome': 'win' if pnl > 0 else 'loss',
-                            'side': 'LONG' if random.random() > 0.5 else 'SHORT',
-                            'quantity': random.randint(1, 3),
-                            'entry_price': base_price + random.uniform(-50, 50),
-                            'current_price': base_price + random.uniform(-50, 50)
-                        }
-                        trades.append(trade)
-                
-                logger.info(f"Retrieved {len(trades)} recent trades for Kelly calculations")
-                return trades
-                
+                    trade = {
+                        'timestamp': trade_date.isoformat(),
+                        'symbol': primary_symbol,
+                        'pnl': pnl,
+                        'profit_loss': pnl,
+                        'outcome': 'win' if pnl > 0 else 'loss',
+                        'side': 'LONG' if random.random() > 0.5 else 'SHORT',
+                        'quantity': random.randint(1, 3),
+                        'entry_price': base_price + random.uniform(-50, 50),
+                        'current_price': base_price + random.uniform(-50, 50)
+                    }
+                    trades.append(trade)
+            
+            logger.info(f"Retrieved {len(trades)} recent trades for Kelly calculations")
+            return trades
+            
         except Exception as e:
             logger.error(f"Error retrieving recent trades: {e}")
             return []
@@ -915,10 +1012,14 @@ class StateManager:
         """Update P&L for a specific position"""
         try:
             if symbol in self.positions:
-                position = self.positions[symbol]
-                position.current_price = current_price
+                position = replace(
+                    self.positions[symbol],
+                    current_price=current_price,
+                    last_update=datetime.now()
+                )
                 position.unrealized_pnl = self._calculate_position_pnl(position)
-                position.last_update = datetime.now()
+                self.positions[symbol] = position
+                self._publish_snapshot()
                 
         except Exception as e:
             logger.error(f"❌ Position P&L update error: {e}")
@@ -959,24 +1060,21 @@ class StateManager:
     async def _save_position(self, position: Position):
         """Save position to database"""
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT OR REPLACE INTO positions 
-                    (symbol, quantity, side, entry_price, current_price, unrealized_pnl, entry_time, last_update)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    position.symbol,
-                    position.quantity,
-                    position.side,
-                    position.entry_price,
-                    position.current_price,
-                    position.unrealized_pnl,
-                    position.entry_time.isoformat(),
-                    position.last_update.isoformat()
-                ))
-                conn.commit()
-                
+            await self.db.submit('''
+                INSERT OR REPLACE INTO positions 
+                (symbol, quantity, side, entry_price, current_price, unrealized_pnl, entry_time, last_update)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                position.symbol,
+                position.quantity,
+                position.side,
+                position.entry_price,
+                position.current_price,
+                position.unrealized_pnl,
+                position.entry_time.isoformat(),
+                position.last_update.isoformat()
+            ))
+            
         except Exception as e:
             logger.error(f"❌ Position save error: {e}")
     
@@ -985,71 +1083,62 @@ class StateManager:
     async def _save_risk_parameters(self):
         """Save risk parameters to database"""
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO risk_parameters 
-                    (max_position_size, max_daily_loss, max_drawdown_percent, position_size_percent,
-                     stop_loss_points, take_profit_points, enabled, max_positions, stop_loss_ticks, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    self.risk_params.max_position_size,
-                    self.risk_params.max_daily_loss,
-                    self.risk_params.max_drawdown_percent,
-                    self.risk_params.position_size_percent,
-                    self.risk_params.stop_loss_points,
-                    self.risk_params.take_profit_points,
-                    self.risk_params.enabled,
-                    self.risk_params.max_positions,
-                    self.risk_params.stop_loss_ticks,
-                    datetime.now().isoformat()
-                ))
-                conn.commit()
-                
+            await self.db.submit('''
+                INSERT INTO risk_parameters 
+                (max_position_size, max_daily_loss, max_drawdown_percent, position_size_percent,
+                 stop_loss_points, take_profit_points, enabled, max_positions, stop_loss_ticks, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                self.risk_params.max_position_size,
+                self.risk_params.max_daily_loss,
+                self.risk_params.max_drawdown_percent,
+                self.risk_params.position_size_percent,
+                self.risk_params.stop_loss_points,
+                self.risk_params.take_profit_points,
+                self.risk_params.enabled,
+                self.risk_params.max_positions,
+                self.risk_params.stop_loss_ticks,
+                datetime.now().isoformat()
+            ))
+            
         except Exception as e:
             logger.error(f"❌ Risk parameters save error: {e}")
     
     async def _save_system_config(self):
         """Save system configuration to database"""
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO system_config 
-                    (auto_trade_enabled, trading_enabled, debug_mode, max_orders_per_minute,
-                     data_validation_enabled, emergency_stop_triggered, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    self.system_config.auto_trade_enabled,
-                    self.system_config.trading_enabled,
-                    self.system_config.debug_mode,
-                    self.system_config.max_orders_per_minute,
-                    self.system_config.data_validation_enabled,
-                    self.system_config.emergency_stop_triggered,
-                    datetime.now().isoformat()
-                ))
-                conn.commit()
-                
+            await self.db.submit('''
+                INSERT INTO system_config 
+                (auto_trade_enabled, trading_enabled, debug_mode, max_orders_per_minute,
+                 data_validation_enabled, emergency_stop_triggered, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                self.system_config.auto_trade_enabled,
+                self.system_config.trading_enabled,
+                self.system_config.debug_mode,
+                self.system_config.max_orders_per_minute,
+                self.system_config.data_validation_enabled,
+                self.system_config.emergency_stop_triggered,
+                datetime.now().isoformat()
+            ))
+            
         except Exception as e:
             logger.error(f"❌ System config save error: {e}")
     
     async def _save_state_history(self, event_type: str, old_state: str, new_state: str, data: str = None):
         """Save state change history"""
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO state_history (timestamp, event_type, old_state, new_state, data)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (
-                    datetime.now().isoformat(),
-                    event_type,
-                    old_state,
-                    new_state,
-                    data or json.dumps({})
-                ))
-                conn.commit()
-                
+            await self.db.submit('''
+                INSERT INTO state_history (timestamp, event_type, old_state, new_state, data)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (
+                datetime.now().isoformat(),
+                event_type,
+                old_state,
+                new_state,
+                data or json.dumps({})
+            ))
+            
         except Exception as e:
             logger.error(f"❌ State history save error: {e}")
     
@@ -1074,6 +1163,7 @@ class StateManager:
                 unrealized_pnl = sum(pos.unrealized_pnl for pos in self.positions.values())
                 self.pnl["unrealized"] = unrealized_pnl
                 self.pnl["total"] = self.pnl["today"] + unrealized_pnl
+                self._publish_snapshot()
                 
             except Exception as e:
                 logger.error(f"❌ P&L calculation error: {e}")
@@ -1088,11 +1178,10 @@ class StateManager:
                 # Clean old market data
                 cutoff_time = (datetime.now() - timedelta(days=7)).isoformat()
                 
-                with sqlite3.connect(str(self.db_path)) as conn:
-                    cursor = conn.cursor()
-                    cursor.execute("DELETE FROM market_data WHERE timestamp < ?", (cutoff_time,))
-                    cursor.execute("DELETE FROM state_history WHERE timestamp < ?", (cutoff_time,))
-                    conn.commit()
+                await self.db.submit_many([
+                    ("DELETE FROM market_data WHERE timestamp < ?", (cutoff_time,)),
+                    ("DELETE FROM state_history WHERE timestamp < ?", (cutoff_time,))
+                ])
                 
                 logger.debug("🧹 Database cleanup completed")
                 
@@ -32,6 +32,7 @@ import numpy as np
 # Core MinhOS imports
 from minhos.core.base_service import BaseService, ServiceStatus
 from minhos.core.config import config
+from minhos.core.startup import get_model_warmup
 
 # Service imports
 from .sierra_client import SierraClient, TradeCommand, get_sierra_client
@@ -173,6 +174,10 @@ class TradingService(BaseService):
         self.analysis_interval = config.get("timing.market_analysis", 5000) / 1000
         self.decision_check_interval = config.get("timing.decision_check", 30000) / 1000
         
+        # ML models the engine trades on; analysis waits for these only
+        self.required_models = config.get("trading.required_models", ["pipeline", "lstm", "ensemble"])
+        self.model_wait_timeout = config.get("trading.model_wait_timeout", 120.0)
+        
         # Task tracking
         self._analysis_task = None
         self._decision_task = None
@@ -327,8 +332,19 @@ class TradingService(BaseService):
         # Update status
         self.status.last_update = datetime.now()
 
+    async def _wait_for_required_models(self):
+        """Hold market analysis until the models it needs are warmed up"""
+        warmup = get_model_warmup()
+        if await warmup.wait_for(self.required_models, timeout=self.model_wait_timeout):
+            logger.info(f"Required models ready: {self.required_models}")
+        else:
+            status = {name: state['state'] for name, state in warmup.get_status().items()}
+            logger.warning(f"Required models not ready after {self.model_wait_timeout}s, "
+                           f"trading on available signals: {status}")
+
     async def _market_analysis_loop(self):
         """Main market analysis loop"""
+        await self._wait_for_required_models()
         while self._running:
             try:
                 if self.current_market_data:
@@ -18,6 +18,7 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from capabilities.ensemble import EnsembleManager
+from capabilities.ensemble.walk_forward import WalkForwardSearch
 from capabilities.prediction.lstm.trainer import LSTMTrainer
 
 # Configure logging
@@ -33,7 +34,11 @@ logger = logging.getLogger(__name__)
 
 async def train_ensemble_models(symbol: str = 'NQ', 
                                days_back: int = 30, 
-                               verbose: bool = True) -> bool:
+                               verbose: bool = True,
+                               search: bool = False,
+                               search_samples: int = None,
+                               workers: int = None,
+                               threads_per_job: int = 1) -> bool:
     """
     Train ensemble models with historical data
     
@@ -41,6 +46,10 @@ async def train_ensemble_models(symbol: str = 'NQ',
         symbol: Trading symbol (e.g., 'NQ')
         days_back: Days of historical data to use
         verbose: Enable verbose output
+        search: Walk-forward hyperparameter search before training
+        search_samples: Parameter sets sampled per model (default: full grid)
+        workers: Search worker processes (default: cores / threads_per_job)
+        threads_per_job: Threads each search job may use
         
     Returns:
         Success status
@@ -79,6 +88,33 @@ async def train_ensemble_models(symbol: str = 'NQ',
         print(f"   📈 Price range: ${training_data[0]['price']:.2f} - ${training_data[-1]['price']:.2f}")
         print()
         
+        # Optional: pick base-model hyperparameters out of sample first
+        if search:
+            print("2b. Walk-Forward Hyperparameter Search...")
+            test_size = max(50, len(training_data) // 10)
+            searcher = WalkForwardSearch(
+                n_samples=search_samples,
+                train_size=min(3000, test_size * 4),
+                test_size=test_size,
+                workers=workers,
+                threads_per_job=threads_per_job
+            )
+            try:
+                search_results = await searcher.run(training_data)
+                saved = searcher.save(search_results, model_path)
+            finally:
+                searcher.cleanup()
+            
+            print(f"   ✅ {search_results['jobs']} jobs over {len(search_results['windows'])} windows "
+                  f"in {search_results['elapsed_s']:.1f}s")
+            for model_name, params in search_results['best'].items():
+                accuracy = search_results['best_metrics'][model_name]['direction_accuracy']
+                print(f"      - {model_name.upper()}: {params} ({accuracy:.1%} out-of-sample accuracy)")
+            print(f"   💾 Saved to {saved}")
+            print()
+            
+            ensemble_manager.apply_hyperparameters(search_results['best'])
+        
         # Step 3: Train Ensemble Models
         print("3. Training Ensemble Models...")
         print("   🏗️ Base Models: XGBoost, LightGBM, Random Forest, CatBoost")
@@ -191,6 +227,11 @@ async def main():
     parser.add_argument('--days', type=int, default=30, help='Days of historical data (default: 30)')
     parser.add_argument('--quick', action='store_true', help='Quick training (7 days)')
     parser.add_argument('--verbose', action='store_true', help='Verbose output')
+    parser.add_argument('--search', action='store_true', help='Walk-forward hyperparameter search first')
+    parser.add_argument('--search-samples', type=int, default=None,
+                        help='Parameter sets sampled per model (default: full grid)')
+    parser.add_argument('--workers', type=int, default=None, help='Search worker processes (default: cores)')
+    parser.add_argument('--threads-per-job', type=int, default=1, help='Threads per search job (default: 1)')
     
     args = parser.parse_args()
     
@@ -206,7 +247,11 @@ async def main():
     success = await train_ensemble_models(
         symbol=args.symbol,
         days_back=args.days,
-        verbose=args.verbose
+        verbose=args.verbose,
+        search=args.search,
+        search_samples=args.search_samples,
+        workers=args.workers,
+        threads_per_job=args.threads_per_job
     )
     
     return 0 if success else 1
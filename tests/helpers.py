@@ -0,0 +1,14 @@
+"""
+Shared test helpers
+===================
+
+Plain functions used by several test modules, including code that runs in
+spawned worker processes (so they cannot be fixtures).
+"""
+
+
+def startup_env(name: str) -> str:
+    """The variable as this process was started with, before any import could read it"""
+    with open('/proc/self/environ', 'rb') as f:
+        env = dict(item.split(b'=', 1) for item in f.read().split(b'\0') if b'=' in item)
+    return env.get(name.encode(), b'0').decode()
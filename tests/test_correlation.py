@@ -0,0 +1,66 @@
+"""
+Correlation engine tests
+========================
+
+Validates the exponentially weighted correlation estimate, tick-to-bar
+bucketing and snapshot caching.
+"""
+
+import numpy as np
+import pytest
+
+from minhos.core.correlation import CorrelationEngine
+
+
+def feed_correlated_bars(engine, rho=0.9, bars=3000, seed=7):
+    """Feed geometric random walks where A and B share a common factor and C is independent"""
+    rng = np.random.default_rng(seed)
+    prices = {"A": 100.0, "B": 200.0, "C": 50.0}
+    for _ in range(bars):
+        common, noise_a, noise_b, noise_c = rng.standard_normal(4) * 0.001
+        prices["A"] *= np.exp(common)
+        prices["B"] *= np.exp(rho * common + np.sqrt(1 - rho ** 2) * noise_b)
+        prices["C"] *= np.exp(noise_c)
+        engine.on_bar_close(dict(prices))
+
+
+def test_ew_correlation_converges():
+    """Estimated correlations match the generating process"""
+    engine = CorrelationEngine(halflife_bars=500)
+    feed_correlated_bars(engine)
+
+    snapshot = engine.get_snapshot()
+    assert snapshot.ready
+    assert snapshot.get("A", "B") == pytest.approx(0.9, abs=0.05)
+    assert snapshot.get("A", "C") == pytest.approx(0.0, abs=0.1)
+    assert snapshot.get("A", "UNKNOWN") == engine.default_correlation
+
+
+def test_snapshot_cached_until_next_bar():
+    """Snapshots are reused within a bar and are read-only"""
+    engine = CorrelationEngine(min_observations=1)
+    engine.on_bar_close({"A": 100.0, "B": 50.0})
+    engine.on_bar_close({"A": 101.0, "B": 50.5})
+
+    first = engine.get_snapshot()
+    assert engine.get_snapshot() is first
+    with pytest.raises(ValueError):
+        first.correlation[0, 1] = 0.0
+
+    engine.on_bar_close({"A": 100.5, "B": 50.1})
+    assert engine.get_snapshot().version == first.version + 1
+
+
+def test_ticks_bucketed_into_bars():
+    """Only the first tick of a new bar closes the previous one"""
+    engine = CorrelationEngine(bar_seconds=60)
+
+    assert not engine.on_price("A", 100.0, timestamp=0)
+    assert not engine.on_price("B", 50.0, timestamp=30)
+    assert not engine.on_price("A", 100.5, timestamp=59)
+    assert engine.on_price("A", 101.0, timestamp=61)
+    assert not engine.on_price("A", 99.0, timestamp=10)  # Late tick is dropped
+
+    assert engine.stats["bars"] == 1
+    assert engine.stats["late_ticks"] == 1
+    assert engine.get_snapshot().symbols == ("A", "B")
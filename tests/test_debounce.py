@@ -0,0 +1,96 @@
+"""
+Debounced scheduler tests
+=========================
+
+Validates the minimum interval, trailing-edge runs, single in-flight run
+per key and priority requests of DebouncedScheduler.
+"""
+
+import asyncio
+
+from minhos.core.debounce import DebouncedScheduler
+
+
+class Recorder:
+    """Async run callback that records calls and concurrency per key"""
+
+    def __init__(self, duration=0.0):
+        self.duration = duration
+        self.calls = []
+        self.active = {}
+        self.max_active = 0
+
+    async def __call__(self, key):
+        self.active[key] = self.active.get(key, 0) + 1
+        self.max_active = max(self.max_active, self.active[key])
+        self.calls.append(key)
+        await asyncio.sleep(self.duration)
+        self.active[key] -= 1
+
+
+async def test_burst_runs_once_plus_trailing_edge():
+    """A burst inside the interval gives one leading and one trailing run"""
+    recorder = Recorder()
+    scheduler = DebouncedScheduler(recorder, min_interval=0.05)
+
+    started = [scheduler.request("NQ") for _ in range(100)]
+    assert started[0] and not any(started[1:])
+
+    await asyncio.sleep(0.01)
+    assert recorder.calls == ["NQ"]
+
+    await scheduler.drain()
+    stats = scheduler.get_stats()
+    assert recorder.calls == ["NQ", "NQ"]
+    assert stats["runs"] == 2 and stats["trailing_runs"] == 1
+    assert stats["skipped"] == 99
+    assert stats["coalesced"] == 98
+    assert stats["pending"] == 0
+
+
+async def test_one_in_flight_run_per_key():
+    """Requests during a slow run wait for it; other keys are independent"""
+    recorder = Recorder(duration=0.05)
+    scheduler = DebouncedScheduler(recorder, min_interval=0.0)
+
+    scheduler.request("NQ")
+    await asyncio.sleep(0)
+    assert scheduler.in_flight("NQ")
+    for _ in range(10):
+        assert not scheduler.request("NQ", priority=True)
+    assert scheduler.request("ES")
+
+    await scheduler.drain()
+    assert recorder.max_active == 1
+    assert recorder.calls.count("NQ") == 2
+    assert recorder.calls.count("ES") == 1
+    assert scheduler.get_stats()["runs_by_key"] == {"NQ": 2, "ES": 1}
+
+
+async def test_priority_bypasses_interval():
+    """Priority requests start at once when nothing is in flight"""
+    recorder = Recorder()
+    scheduler = DebouncedScheduler(recorder, min_interval=60.0)
+
+    assert scheduler.request("NQ")
+    await asyncio.sleep(0.01)
+    assert not scheduler.request("NQ")
+    assert scheduler.request("NQ", priority=True)
+
+    await asyncio.sleep(0.01)
+    assert recorder.calls == ["NQ", "NQ"]
+    assert scheduler.get_stats()["priority_requests"] == 1
+    scheduler.cancel()
+    assert scheduler.get_stats()["pending"] == 0
+
+
+async def test_failed_run_is_counted():
+    """Errors in the run are logged and counted, not raised"""
+    async def failing(key):
+        raise RuntimeError("boom")
+
+    scheduler = DebouncedScheduler(failing, min_interval=0.0)
+    scheduler.request("NQ")
+    await scheduler.drain()
+    assert scheduler.get_stats()["errors"] == 1
+    assert not scheduler.in_flight("NQ")
@@ -0,0 +1,182 @@
+"""
+Feature store tests
+===================
+
+Validates that single-bar updates and batch computation give identical
+feature values, that the definitions match the pandas formulas the models
+used before, per-symbol bar caching, and that the LSTM predictor and its
+training pipeline read the same features.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from capabilities.prediction.lstm.data_pipeline import LSTMDataPipeline
+from capabilities.prediction.lstm.lstm_predictor import LSTMPredictor
+from minhos.core.feature_store import LSTM_FEATURES, FeatureStore
+
+
+def random_bars(count=600, seed=5, start=1_700_000_000.0):
+    """One-minute bars: random walk with flat stretches and zero volumes"""
+    rng = np.random.default_rng(seed)
+    price = 21000.0
+    bars = []
+    for i in range(count):
+        if not 200 <= i < 230:
+            price *= float(np.exp(rng.normal(0, 0.001)))
+        spread = float(abs(rng.normal(0, 3)))
+        bars.append({
+            'symbol': 'NQ',
+            'price': price,
+            'open': price + float(rng.normal(0, 1)),
+            'high': price + spread,
+            'low': price - spread,
+            'volume': float(rng.integers(0, 40)),
+            'timestamp': start + 60.0 * i
+        })
+    return bars
+
+
+def rolling_std(series, window):
+    """Two-pass sample std; pandas' online rolling variance is not exactly zero on flat windows"""
+    def std(values):
+        values = values[~np.isnan(values)]
+        return np.std(values, ddof=1) if len(values) > 1 else np.nan
+    return series.rolling(window, min_periods=1).apply(std, raw=True)
+
+
+def test_single_bar_updates_match_batch():
+    """Tick by tick, in random chunks and in one batch: bit-identical rows"""
+    bars = random_bars()
+    batch = FeatureStore().features(bars, symbol='NQ').values
+
+    store = FeatureStore()
+    incremental = np.vstack([store.features([bar], symbol='NQ').values for bar in bars])
+    assert np.array_equal(incremental, batch)
+
+    store = FeatureStore()
+    rng = np.random.default_rng(0)
+    cuts = np.sort(rng.choice(np.arange(1, len(bars)), 25, replace=False))
+    chunked = np.vstack([store.features(chunk, symbol='NQ').values for chunk in np.split(np.array(bars), cuts)])
+    assert np.array_equal(chunked, batch)
+
+    assert np.array_equal(FeatureStore().compute(bars).values, batch)
+    assert np.isfinite(batch).all()
+
+
+def test_matches_pandas_definitions():
+    """Shared definitions reproduce the pandas formulas the models were trained on"""
+    bars = random_bars()
+    frame = FeatureStore().compute(bars)
+    df = pd.DataFrame(bars)
+    price, volume = df['price'], df['volume']
+    mean_20, std_20 = price.rolling(20, min_periods=1).mean(), rolling_std(price, 20)
+    hours = pd.to_datetime(df['timestamp'], unit='s')
+
+    expected = {
+        'return_1': price.pct_change().fillna(0),
+        'return_5': price.pct_change(5).fillna(0),
+        'price_std_10': rolling_std(price, 10).fillna(0),
+        'price_ma_ratio_10': price / price.rolling(10, min_periods=1).mean(),
+        'return_std_20': rolling_std(price.pct_change(), 20).fillna(0),
+        'macd_12_26': (price.ewm(span=12).mean() - price.ewm(span=26).mean()) / price,
+        'bollinger_20': ((price - (mean_20 - 2 * std_20)) / (4 * std_20)).where(std_20 > 1e-6, 0.5).clip(0, 1),
+        'volume_ratio_5': (volume / volume.rolling(5, min_periods=1).mean()).fillna(1.0),
+        'close_position': (price - df['low']) / (df['high'] - df['low']),
+        'gap': ((df['open'] - price.shift(1)) / price.shift(1)).fillna(0),
+        'price_lag_3': (price.shift(3) / price).fillna(1.0),
+        'hour_of_day': hours.dt.hour / 24.0,
+        'day_of_week': hours.dt.dayofweek / 6.0,
+    }
+    for name, values in expected.items():
+        assert frame.column(name) == pytest.approx(values.to_numpy(), rel=1e-9, abs=1e-9), name
+
+    # Flat stretch: zero std, neutral RSI and Bollinger position
+    flat = frame.values[225]
+    assert flat[frame.names.index('price_std_10')] == 0.0
+    assert flat[frame.names.index('rsi_14')] == 0.5
+    assert flat[frame.names.index('bollinger_20')] == 0.5
+
+
+def test_cache_per_symbol_and_bar():
+    bars = random_bars(300)
+    store = FeatureStore(cache_bars=200)
+    first = store.features(bars[:250], symbol='NQ')
+    assert first.cached == 0
+
+    # A sliding window only computes its new bar
+    window = store.features(bars[151:251], symbol='NQ')
+    assert window.cached == 99 and len(window) == 100
+    assert np.array_equal(window.values[:99], first.values[151:])
+
+    # Same bars under another symbol are a separate stream
+    assert store.features(bars[:10], symbol='ES').cached == 0
+
+    # Evicted, timestamp-less and unsymbolled requests are computed without touching the stream
+    stats = store.get_stats()
+    store.features(bars[:100], symbol='NQ')
+    store.features([{k: v for k, v in bar.items() if k != 'timestamp'} for bar in bars[:50]], symbol='NQ')
+    store.features(bars[:50])
+    assert store.get_stats()['transient_requests'] == stats['transient_requests'] + 3
+    assert store.get_stats()['streams'] == {'NQ': 251, 'ES': 10}
+
+    # ISO timestamps key the same bars as epoch seconds
+    iso = [dict(bar, timestamp=pd.Timestamp(bar['timestamp'], unit='s', tz='UTC').isoformat())
+           for bar in bars[240:251]]
+    assert store.features(iso, symbol='NQ').cached == 11
+
+    store.clear('NQ')
+    assert store.features(bars[240:251], symbol='NQ').cached == 0
+
+
+def test_lstm_predictor_and_pipeline_share_features(temp_dir):
+    """The predictor's per-tick inputs equal the training pipeline's batch rows"""
+    bars = random_bars(120)
+    pipeline = LSTMDataPipeline()
+    pipeline.feature_store = FeatureStore()
+    training = pipeline.create_features_from_market_data(bars)
+    assert list(training.columns[:8]) == list(LSTM_FEATURES)
+
+    predictor = LSTMPredictor(model_path=str(temp_dir / "lstm_model"))
+    predictor.feature_store = FeatureStore()
+    served = np.array([predictor.engineer_features(bar) for bar in bars])
+    assert np.array_equal(served, training[list(LSTM_FEATURES)].to_numpy(dtype=np.float32))
+
+    X, y = predictor._prepare_training_data(bars)
+    assert X.shape == (len(bars) - predictor.sequence_length - 1, predictor.sequence_length, 8)
+    assert np.array_equal(X[0], served[:predictor.sequence_length])
+
+
+def feature_timings():
+    """Milliseconds for a 9.5k-bar history, then microseconds per streamed bar"""
+    bars = random_bars(10_000)
+    store = FeatureStore()
+
+    started = time.perf_counter()
+    store.features(bars[:-500], symbol='NQ')
+    batch_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    for bar in bars[-500:]:
+        store.features([bar], symbol='NQ')
+    return batch_ms, (time.perf_counter() - started) / 500 * 1e6
+
+
+def test_feature_latency():
+    """A new bar and a 10k-bar history, with headroom for a loaded machine"""
+    batch_ms, tick_us = feature_timings()
+    assert tick_us < 10_000
+    assert batch_ms < 2500
+
+
+@pytest.mark.benchmark
+def test_feature_latency_benchmark():
+    """Benchmark: one new bar and a 10k-bar history"""
+    batch_ms, tick_us = feature_timings()
+    print(f"\nFeature store: {batch_ms:.1f}ms for 9.5k bars, {tick_us:.0f}us per new bar")
+
+    assert tick_us < 2000
+    assert batch_ms < 500
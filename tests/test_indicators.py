@@ -0,0 +1,142 @@
+"""
+Streaming indicator tests
+=========================
+
+Checks the O(1) indicators against the list-based calculations AIBrainService
+used before (re-implemented here as reference oracles) on every window of a
+random tick stream.
+"""
+
+import statistics
+
+import numpy as np
+import pytest
+
+from minhos.core.indicators import EMA, IndicatorEngine, RollingVariance, WilderRSI
+
+
+def reference_indicators(window):
+    """The former per-analysis calculations over a 20-point window"""
+    prices = [d['close'] for d in window if d['close'] is not None]
+    result = {}
+
+    if len(window) >= 10 and prices:
+        result["sma_short"] = statistics.mean(prices[-10:])
+        result["sma_long"] = statistics.mean(prices[-20:]) if len(prices) >= 20 else statistics.mean(prices)
+        result["price_change"] = (prices[-1] - prices[0]) / prices[0]
+
+    changes = [prices[i] - prices[i - 1] for i in range(1, len(prices))]
+    gains = [c if c > 0 else 0 for c in changes]
+    losses = [-c if c < 0 else 0 for c in changes]
+    if len(gains) >= 14:
+        avg_gain = statistics.mean(gains[-14:])
+        avg_loss = statistics.mean(losses[-14:])
+        result["rsi"] = 100.0 if avg_loss == 0 else 100 - 100 / (1 + avg_gain / avg_loss)
+
+    returns = [(prices[i] - prices[i - 1]) / prices[i - 1] for i in range(1, len(prices))]
+    if len(window) >= 20 and returns:
+        result["return_std"] = statistics.stdev(returns) if len(returns) > 1 else 0.0
+        result["return_mean"] = statistics.mean(returns)
+
+    volumes = [d.get('volume', 0) for d in window if d.get('volume') is not None]
+    if len(volumes) >= 10:
+        volumes = [v for v in volumes if v > 0]
+        if volumes:
+            result["avg_volume"] = statistics.mean(volumes)
+            result["recent_volume"] = statistics.mean(volumes[-5:]) if len(volumes) >= 5 else volumes[-1]
+
+    return result
+
+
+def random_ticks(count=600, seed=3):
+    """Random walk with flat stretches, zero volumes and missing volume reports"""
+    rng = np.random.default_rng(seed)
+    price = 21000.0
+    ticks = []
+    for i in range(count):
+        if rng.random() > 0.15:
+            price *= float(np.exp(rng.normal(0, 0.002)))
+        roll = rng.random()
+        volume = None if roll < 0.1 else 0 if roll < 0.35 else int(rng.integers(1, 500))
+        ticks.append({'symbol': 'NQU25-CME', 'close': round(price, 2), 'volume': volume})
+    return ticks
+
+
+def test_parity_with_list_based_calculations():
+    """Every snapshot matches the former calculations on its trailing window"""
+    engine = IndicatorEngine()
+    ticks = random_ticks()
+
+    for t, tick in enumerate(ticks):
+        engine.update(tick['symbol'], tick['close'], tick['volume'])
+        snapshot = engine.snapshot('NQU25-CME')
+        expected = reference_indicators(ticks[max(0, t - 19):t + 1])
+
+        actual = {
+            "sma_short": snapshot.sma_short,
+            "sma_long": snapshot.sma_long,
+            "price_change": (snapshot.last_price - snapshot.window_open) / snapshot.window_open,
+            "rsi": snapshot.rsi,
+            "return_std": snapshot.return_std,
+            "return_mean": snapshot.return_mean,
+            "avg_volume": snapshot.avg_volume,
+            "recent_volume": snapshot.recent_volume
+        }
+        for key, value in expected.items():
+            assert actual[key] == pytest.approx(value, rel=1e-9, abs=1e-12), (t, key)
+
+        assert (snapshot.rsi is not None) == ("rsi" in expected)
+        assert (snapshot.positive_volumes > 0 and snapshot.volumes >= 10) == ("avg_volume" in expected)
+
+
+def test_symbols_are_isolated():
+    """Interleaved symbols keep separate state"""
+    engine = IndicatorEngine()
+    for i in range(30):
+        engine.update("NQU25-CME", 21000.0 + i, 100)
+        engine.update("ESU25-CME", 5800.0 - i, 50)
+
+    nq = engine.snapshot("NQU25-CME")
+    es = engine.snapshot("ESU25-CME")
+    assert nq.sma_long == pytest.approx(statistics.mean(21000.0 + i for i in range(10, 30)))
+    assert nq.rsi == 100.0 and es.rsi == 0.0
+    assert engine.snapshot("YMU25-CBOT") is None
+
+
+def test_wilder_rsi_and_ema_match_recursive_definitions():
+    """Wilder's RSI and the EMA follow their textbook recursions"""
+    rng = np.random.default_rng(8)
+    prices = 100 + np.cumsum(rng.normal(0, 1, 200))
+    changes = np.diff(prices)
+
+    rsi = WilderRSI(14)
+    ema = EMA(10)
+    for change in changes:
+        rsi.add(float(change))
+    for price in prices:
+        ema.add(float(price))
+
+    gains = np.clip(changes, 0, None)
+    losses = np.clip(-changes, 0, None)
+    avg_gain, avg_loss = gains[:14].mean(), losses[:14].mean()
+    for gain, loss in zip(gains[14:], losses[14:]):
+        avg_gain = (avg_gain * 13 + gain) / 14
+        avg_loss = (avg_loss * 13 + loss) / 14
+    assert rsi.value == pytest.approx(100 - 100 / (1 + avg_gain / avg_loss))
+
+    expected = prices[0]
+    for price in prices[1:]:
+        expected = price * (2 / 11) + expected * (9 / 11)
+    assert ema.value == pytest.approx(expected)
+
+
+def test_rolling_variance_stays_accurate():
+    """Welford add/remove tracks numpy over a long stream near a large level"""
+    rng = np.random.default_rng(4)
+    values = 21000 + rng.normal(0, 0.5, 50_000)
+    rolling = RollingVariance(19)
+    for value in values:
+        rolling.add(float(value))
+
+    assert rolling.mean == pytest.approx(values[-19:].mean(), rel=1e-12)
+    assert rolling.variance == pytest.approx(values[-19:].var(ddof=1), rel=1e-6)
@@ -0,0 +1,84 @@
+"""
+Inference executor tests
+========================
+
+Validates that blocking model calls leave the event loop responsive,
+run concurrently up to the pool size and are counted per component.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from minhos.core.inference import InferenceExecutor
+
+
+def blocking_predict(seconds, value):
+    time.sleep(seconds)  # Stands in for model.predict
+    return value
+
+
+async def test_loop_stays_responsive():
+    """Ticks keep flowing on the loop while two models predict concurrently"""
+    executor = InferenceExecutor(max_workers=2)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.005)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    try:
+        lstm, ensemble = await asyncio.gather(
+            executor.run("lstm", blocking_predict, 0.1, "up"),
+            executor.run("ensemble", blocking_predict, 0.1, "down")
+        )
+    finally:
+        task.cancel()
+        executor.shutdown()
+    elapsed = time.perf_counter() - started
+
+    assert (lstm, ensemble) == ("up", "down")
+    assert elapsed < 0.18  # Concurrent, not 0.2s back to back
+    assert ticks >= 10
+
+
+async def test_errors_and_stats_per_component():
+    executor = InferenceExecutor(max_workers=1)
+
+    def fail():
+        raise ValueError("bad input shape")
+
+    try:
+        with pytest.raises(ValueError):
+            await executor.run("ensemble", fail)
+        assert await executor.run("lstm", blocking_predict, 0.0, 1) == 1
+    finally:
+        executor.shutdown()
+
+    stats = executor.get_stats()
+    assert stats["in_flight"] == 0
+    assert stats["components"]["ensemble"]["errors"] == 1
+    assert stats["components"]["lstm"]["calls"] == 1
+
+
+async def test_deadline_cancels_queued_work():
+    """A call still queued behind a slow one is dropped when its caller times out"""
+    executor = InferenceExecutor(max_workers=1)
+    ran = []
+
+    def record():
+        ran.append(True)
+
+    try:
+        slow = asyncio.ensure_future(executor.run("lstm", blocking_predict, 0.1, None))
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(executor.run("ensemble", record), 0.02)
+        await slow
+    finally:
+        executor.shutdown()
+    assert not ran
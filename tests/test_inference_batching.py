@@ -0,0 +1,72 @@
+"""
+Inference batching tests
+========================
+
+Validates that MLInferenceCache runs a lone miss at once, coalesces misses
+that arrive while a batch is running, and dispatches them when that batch
+finishes or the configured wait runs out.
+"""
+
+import asyncio
+import time
+
+from minhos.services.ml_inference_cache import MLInferenceCache
+
+
+class SlowModel:
+    """Batch predictor that takes a fixed time per call and records batch sizes"""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.batches = []
+
+    async def predict(self, input_data):
+        return (await self.predict_batch([input_data]))[0]
+
+    async def predict_batch(self, inputs):
+        self.batches.append(len(inputs))
+        await asyncio.sleep(self.seconds)
+        return [{'value': input_data['x'] * 2} for input_data in inputs]
+
+
+def make_cache(wait_ms):
+    cache = MLInferenceCache()
+    cache.set_config(max_batch_wait_ms=wait_ms)
+    return cache
+
+
+async def test_lone_request_is_not_held_for_the_window():
+    cache, model = make_cache(wait_ms=500), SlowModel(0.0)
+    started = time.perf_counter()
+    result = await cache.get_prediction('lstm', {'x': 1}, model.predict, model.predict_batch)
+
+    assert result['value'] == 2 and not result['cache_hit']
+    assert time.perf_counter() - started < 0.25
+    assert model.batches == [1] and cache.batch_timeout == 0.5
+
+
+async def test_requests_behind_a_running_batch_coalesce():
+    """The first miss runs at once; the rest queue behind it and go out as one batch when it ends"""
+    cache, model = make_cache(wait_ms=500), SlowModel(0.02)
+    started = time.perf_counter()
+    results = await asyncio.gather(*[
+        cache.get_prediction('lstm', {'x': i}, model.predict, model.predict_batch) for i in range(10)
+    ])
+
+    assert [result['value'] for result in results] == [2 * i for i in range(10)]
+    assert model.batches == [1, 9]
+    assert time.perf_counter() - started < 0.25  # Not the 500ms window
+    assert cache.batches_in_flight[('lstm', model.predict_batch)] == 0
+
+
+async def test_wait_is_capped_by_the_configured_timeout():
+    """Requests behind a long batch go out after max_batch_wait_ms, not when it finishes"""
+    cache, model = make_cache(wait_ms=20), SlowModel(0.3)
+    first = asyncio.ensure_future(cache.get_prediction('lstm', {'x': 0}, model.predict, model.predict_batch))
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    second = await cache.get_prediction('lstm', {'x': 1}, model.predict, model.predict_batch)
+
+    assert second['value'] == 2 and (await first)['value'] == 0
+    assert time.perf_counter() - started < 0.5  # Ran alongside the first batch
+    assert model.batches == [1, 1]
@@ -0,0 +1,95 @@
+"""
+Kelly calibration engine tests
+==============================
+
+Validates the growth-optimal fraction, the shape of the calibrated
+multiplier grid, process pool parity and calibration time.
+"""
+
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from minhos.core.kelly_calibration import (
+    KellyCalibrationConfig, KellyCalibrationEngine, full_kelly_fraction, normalize_outcomes
+)
+
+
+def binary_pnls(p=0.55, b=1.5, trades=400):
+    """Wins of b units and losses of one unit, with win rate exactly p"""
+    wins = int(trades * p)
+    return [100.0 * b] * wins + [-100.0] * (trades - wins)
+
+
+def test_full_kelly_matches_closed_form():
+    """For +b/-1 outcomes the growth-optimal fraction is p - q/b"""
+    outcomes = normalize_outcomes(binary_pnls(p=0.55, b=1.5))
+    assert full_kelly_fraction(outcomes) == pytest.approx(0.55 - 0.45 / 1.5, abs=1e-6)
+    assert full_kelly_fraction(normalize_outcomes(binary_pnls(p=0.3, b=1.0))) == 0.0
+
+
+def test_calibration_grid_tradeoffs():
+    """Growth peaks near full Kelly while ruin and drawdown rise with the multiplier"""
+    config = KellyCalibrationConfig(multipliers=(0.25, 0.5, 1.0, 1.5, 2.0), paths=4000,
+                                    trades_per_path=200, seed=5)
+    report = KellyCalibrationEngine(config).calibrate(binary_pnls())
+
+    results = report["results"]
+    growth = [r["median_growth_per_trade"] for r in results]
+    assert max(range(len(growth)), key=growth.__getitem__) == 2  # Full Kelly
+
+    ruin = [r["probability_of_ruin"] for r in results]
+    drawdown = [r["max_drawdown"]["p50"] for r in results]
+    assert ruin == sorted(ruin) and ruin[-1] > ruin[0]
+    assert drawdown == sorted(drawdown)
+
+    # Overbetting at 2x Kelly gives no growth
+    assert growth[-1] == pytest.approx(0.0, abs=growth[2] * 0.25)
+    assert report["optimal_multiplier"] in config.multipliers
+    assert results[0]["terminal_wealth"]["p5"] <= results[0]["terminal_wealth"]["p50"]
+
+
+def test_process_pool_matches_serial():
+    """Chunks are seeded independently, so a process pool gives identical results"""
+    config = KellyCalibrationConfig(multipliers=(0.5, 1.0), paths=600, trades_per_path=50,
+                                    chunk_elements=20_000, seed=9)
+    engine = KellyCalibrationEngine(config)
+    serial = engine.calibrate(binary_pnls())
+    assert serial["chunks"] > 1
+
+    with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn")) as executor:
+        pooled = engine.calibrate(binary_pnls(), executor)
+
+    assert pooled["results"] == serial["results"]
+
+
+def timed_calibration():
+    """A 50-multiplier x 10k-path calibration and its wall time in seconds"""
+    rng = np.random.default_rng(1)
+    pnls = np.where(rng.random(250) < 0.55, rng.normal(150, 30, 250), -rng.normal(100, 20, 250))
+    engine = KellyCalibrationEngine(KellyCalibrationConfig(paths=10_000, trades_per_path=100, seed=1))
+
+    started = time.perf_counter()
+    report = engine.calibrate(pnls)
+    return report, time.perf_counter() - started
+
+
+@pytest.mark.slow
+def test_calibration_50_multipliers_10k_paths():
+    """A 50 x 10k calibration finishes well inside a calibration cycle"""
+    report, elapsed = timed_calibration()
+    assert len(report["results"]) == 50
+    assert elapsed < 30
+
+
+@pytest.mark.benchmark
+def test_calibration_benchmark():
+    """Benchmark: a 50 x 10k calibration completes in seconds"""
+    report, elapsed = timed_calibration()
+    print(f"\nKelly calibration: {len(report['results'])} multipliers x {report['paths']} paths in {elapsed:.2f}s")
+
+    assert len(report["results"]) == 50
+    assert elapsed < 10
@@ -0,0 +1,177 @@
+"""
+LSTM NumPy kernel tests
+=======================
+
+Validates the exported kernel against a step-by-step float64 reference of
+the Keras LSTM equations, batched and incremental inference, and that the
+predictor serves from the kernel without TensorFlow.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from capabilities.prediction.lstm.lstm_predictor import LSTMPredictor
+from capabilities.prediction.lstm.numpy_kernel import LSTMKernel, export_keras_model
+
+
+class FakeLayer:
+    """Stands in for a Keras layer: class name, get_config and get_weights"""
+
+    def __init__(self, name, config, weights=()):
+        self.name = name
+        self._config = config
+        self._weights = list(weights)
+
+    def get_config(self):
+        return dict(self._config)
+
+    def get_weights(self):
+        return list(self._weights)
+
+
+LSTM = type('LSTM', (FakeLayer,), {})
+Dense = type('Dense', (FakeLayer,), {})
+Dropout = type('Dropout', (FakeLayer,), {})
+
+
+class FakeModel:
+    def __init__(self, layers):
+        self.layers = layers
+
+
+def trained_like_model(rng, features=8, units=(200, 100), dense=50):
+    """The predictor's architecture with random weights"""
+    def lstm(name, inputs, n, return_sequences):
+        weights = [rng.normal(0, 0.3, (inputs, 4 * n)), rng.normal(0, 0.3, (n, 4 * n)), rng.normal(0, 0.1, 4 * n)]
+        return LSTM(name, {'units': n, 'activation': 'tanh', 'recurrent_activation': 'sigmoid',
+                           'return_sequences': return_sequences}, weights)
+
+    return FakeModel([
+        lstm('lstm', features, units[0], True),
+        lstm('lstm_1', units[0], units[1], False),
+        Dense('dense', {'units': dense, 'activation': 'relu'},
+              [rng.normal(0, 0.2, (units[1], dense)), rng.normal(0, 0.1, dense)]),
+        Dropout('dropout', {'rate': 0.3}),
+        Dense('dense_1', {'units': 1, 'activation': 'tanh'}, [rng.normal(0, 0.2, (dense, 1)), np.zeros(1)])
+    ])
+
+
+def reference_predict(model, sequence):
+    """Keras LSTM equations written out per timestep in float64"""
+    sigmoid = lambda x: 1 / (1 + np.exp(-x))
+    x = np.asarray(sequence, dtype=np.float64)
+    for layer in model.layers:
+        if isinstance(layer, LSTM):
+            kernel, recurrent, bias = layer.get_weights()
+            n = layer.get_config()['units']
+            h, c, outputs = np.zeros(n), np.zeros(n), []
+            for x_t in x:
+                z = x_t @ kernel + h @ recurrent + bias
+                i, f, g, o = sigmoid(z[:n]), sigmoid(z[n:2 * n]), np.tanh(z[2 * n:3 * n]), sigmoid(z[3 * n:])
+                c = f * c + i * g
+                h = o * np.tanh(c)
+                outputs.append(h)
+            x = np.array(outputs) if layer.get_config()['return_sequences'] else h
+        elif isinstance(layer, Dense):
+            kernel, bias = layer.get_weights()
+            x = x @ kernel + bias
+            x = np.maximum(x, 0) if layer.get_config()['activation'] == 'relu' else np.tanh(x)
+    return x
+
+
+@pytest.fixture
+def exported(temp_dir):
+    rng = np.random.default_rng(7)
+    model = trained_like_model(rng)
+    path = export_keras_model(model, str(temp_dir / "lstm_model.npz"))
+    return model, LSTMKernel.load(path), rng
+
+
+def test_matches_reference_single_and_batched(exported):
+    """Single and batched outputs match the float64 reference within float32 tolerance"""
+    model, kernel, rng = exported
+    sequences = rng.normal(0, 1, (16, 20, 8)).astype(np.float32)
+
+    batched = kernel.predict(sequences)
+    assert batched.shape == (16, 1) and batched.dtype == np.float32
+    for i, sequence in enumerate(sequences):
+        expected = reference_predict(model, sequence)
+        assert kernel.predict(sequence)[0] == pytest.approx(expected, abs=1e-5)
+        assert batched[i] == pytest.approx(expected, abs=1e-5)
+
+
+def test_incremental_steps_match_full_sequence(exported):
+    """Stepping a fresh state tick by tick ends at the full-sequence output"""
+    _, kernel, rng = exported
+    sequence = rng.normal(0, 1, (20, 8)).astype(np.float32)
+
+    state = kernel.initial_state()
+    for t, features in enumerate(sequence):
+        output, state = kernel.step(features, state)
+        assert output == pytest.approx(kernel.predict(sequence[:t + 1]), abs=1e-6)
+    assert output == pytest.approx(kernel.predict(sequence), abs=1e-6)
+
+
+def test_rejects_layers_it_cannot_reproduce(temp_dir):
+    conv = type('Conv1D', (FakeLayer,), {})('conv', {})
+    with pytest.raises(ValueError):
+        export_keras_model(FakeModel([conv]), str(temp_dir / "bad.npz"))
+    with pytest.raises(ValueError):
+        lstm = LSTM('lstm', {'units': 2, 'activation': 'elu'}, [np.zeros((1, 8)), np.zeros((2, 8)), np.zeros(8)])
+        export_keras_model(FakeModel([lstm]), str(temp_dir / "bad.npz"))
+
+
+async def test_predictor_serves_from_kernel(temp_dir):
+    """An exported kernel makes the predictor ready without a Keras model"""
+    rng = np.random.default_rng(3)
+    model_path = temp_dir / "lstm_model"
+    export_keras_model(trained_like_model(rng), f"{model_path}.npz")
+
+    predictor = LSTMPredictor(model_path=str(model_path))
+    assert predictor.is_enabled and predictor.is_trained and predictor.model is None
+    assert predictor.get_performance_stats()['inference_backend'] == 'numpy'
+    assert predictor.warm_up()
+
+    for i in range(25):
+        result = await predictor.predict_direction({'price': 21000.0 + i, 'volume': 100 + i}, use_cache=False)
+    assert result['source'] == 'lstm_neural_network'
+    assert -1.0 <= result['raw_prediction'] <= 1.0
+
+
+def kernel_timings_ms(kernel, rng):
+    """Mean milliseconds for a full 20x8 sequence and for one incremental tick"""
+    sequence = rng.normal(0, 1, (20, 8)).astype(np.float32)
+    kernel.predict(sequence)
+
+    started = time.perf_counter()
+    for _ in range(200):
+        kernel.predict(sequence)
+    predict_ms = (time.perf_counter() - started) / 200 * 1000
+
+    state = kernel.initial_state()
+    started = time.perf_counter()
+    for features in np.tile(sequence, (10, 1)):
+        _, state = kernel.step(features, state)
+    step_ms = (time.perf_counter() - started) / 200 * 1000
+    return predict_ms, step_ms
+
+
+def test_kernel_latency(exported):
+    """The NumPy kernel serves a sequence within a tick and a step costs less than a sequence"""
+    _, kernel, rng = exported
+    predict_ms, step_ms = kernel_timings_ms(kernel, rng)
+    assert predict_ms < 25
+    assert step_ms < predict_ms
+
+
+@pytest.mark.benchmark
+def test_kernel_latency_benchmark(exported):
+    """Benchmark: one 20x8 sequence and one incremental tick on the NumPy kernel"""
+    _, kernel, rng = exported
+    predict_ms, step_ms = kernel_timings_ms(kernel, rng)
+    print(f"\nLSTM kernel: sequence {predict_ms:.3f}ms, incremental tick {step_ms:.3f}ms")
+
+    assert predict_ms < 5
+    assert step_ms < predict_ms
@@ -0,0 +1,221 @@
+"""
+Model registry tests
+====================
+
+Validates immutable, checksummed model versions, the atomic active pointer
+and rollback history, memory-mapped kernel loading, and hot swaps: in-flight
+predictions finish on the old version, shadow inference gates the swap and
+rollback is a reference swap.
+"""
+
+import asyncio
+import threading
+from collections import deque
+
+import numpy as np
+import pytest
+
+from capabilities.ensemble.tree_kernel import TreeEnsembleKernel, compile_ensemble
+from capabilities.prediction.lstm.lstm_predictor import LSTMPredictor
+from capabilities.prediction.lstm.numpy_kernel import LSTMKernel, export_keras_model
+from minhos.core.model_registry import ModelDeployer, ModelRegistry, load_arrays
+from tests.test_lstm_kernel import trained_like_model
+from tests.test_tree_kernel import fitted_ensemble
+
+
+class ScaleModel:
+    """Multiplies inputs by a factor; ``gate`` holds predictions until set"""
+
+    def __init__(self, factor, gate=None):
+        self.factor = factor
+        self.gate = gate
+
+    def predict(self, inputs):
+        if self.gate is not None:
+            self.gate.wait(5)
+        return np.asarray(inputs, dtype=np.float64) * self.factor
+
+
+class Server:
+    """A predictor serving one model reference"""
+
+    def __init__(self, model=None):
+        self.model, self.version, self.loads = model, None, 0
+
+    def apply(self, model, version):
+        self.model, self.version = model, version
+
+    def predict(self, inputs):
+        return self.model.predict(inputs)
+
+
+def publish_factor(registry, factor, temp_dir):
+    source = temp_dir / f"factor_{factor}"
+    source.mkdir()
+    (source / "factor.txt").write_text(str(factor))
+    return registry.publish("scale", source, metadata={"factor": factor})
+
+
+def deployer_for(registry, server, recent=None, **kwargs):
+    def load(path):
+        server.loads += 1
+        return ScaleModel(float((path / "factor.txt").read_text()))
+
+    deployer = ModelDeployer(registry)
+    deployer.register("scale", load=load, apply=server.apply, infer=lambda model, x: model.predict(x),
+                      recent_inputs=(lambda: recent), current=server.model, **kwargs)
+    return deployer
+
+
+def test_versions_are_immutable_and_checksummed(temp_dir):
+    registry = ModelRegistry(temp_dir / "registry")
+    version = publish_factor(registry, 1.0, temp_dir)
+
+    manifest = registry.manifest("scale", version)
+    assert registry.versions("scale") == [version]
+    assert manifest["metadata"] == {"factor": 1.0} and set(manifest["files"]) == {"factor.txt"}
+    assert registry.verify("scale", version)
+
+    artifact = registry.path("scale", version) / "factor.txt"
+    assert not artifact.stat().st_mode & 0o222
+    artifact.chmod(0o644)  # Tampering past the read-only bit is caught by the checksum
+    artifact.write_text("2.0")
+    assert not registry.verify("scale", version)
+
+
+def test_active_pointer_and_rollback_history(temp_dir):
+    registry = ModelRegistry(temp_dir / "registry")
+    first, second = publish_factor(registry, 1.0, temp_dir), publish_factor(registry, 2.0, temp_dir)
+    assert registry.active_version("scale") is None and registry.rollback("scale") is None
+
+    registry.activate("scale", first)
+    registry.activate("scale", second)
+    assert registry.active_version("scale") == second
+    assert registry.rollback("scale") == first
+    assert registry.active_version("scale") == first
+    assert registry.rollback("scale") is None
+    with pytest.raises(ValueError):
+        registry.activate("scale", "missing")
+    assert sorted(p.name for p in (temp_dir / "registry" / "scale").iterdir()) == sorted([first, second, "ACTIVE"])
+
+
+def test_kernels_load_memory_mapped(temp_dir):
+    """Published kernel arrays are served straight from the memory map, with identical outputs"""
+    registry = ModelRegistry(temp_dir / "registry")
+    rng = np.random.default_rng(3)
+    lstm = LSTMKernel.load(export_keras_model(trained_like_model(rng), str(temp_dir / "lstm.npz")))
+    trees = compile_ensemble(*fitted_ensemble(rng))
+
+    lstm_version = registry.publish_arrays("lstm", *lstm.to_arrays())
+    trees_version = registry.publish_arrays("ensemble", *trees.to_arrays())
+    mapped_lstm = LSTMKernel.from_arrays(*load_arrays(registry.path("lstm", lstm_version)))
+    mapped_trees = TreeEnsembleKernel.from_arrays(*load_arrays(registry.path("ensemble", trees_version)))
+
+    assert isinstance(mapped_lstm.layers[0]["kernel"].base, np.memmap)  # A view, not a copy
+    assert isinstance(mapped_trees.threshold, np.memmap) and isinstance(mapped_trees.left, np.memmap)
+    sequences = rng.normal(0, 1, (4, 20, 8)).astype(np.float32)
+    rows = rng.normal(0, 1, (16, 20))
+    assert np.array_equal(mapped_lstm.predict(sequences), lstm.predict(sequences))
+    base = trees.predict_base(rows)
+    assert np.array_equal(mapped_trees.predict_base(rows), base)
+    assert np.array_equal(mapped_trees.predict_meta(base), trees.predict_meta(base))
+
+
+async def test_in_flight_predictions_finish_on_old_version(temp_dir):
+    registry = ModelRegistry(temp_dir / "registry")
+    gate = threading.Event()
+    server = Server(ScaleModel(1.0, gate))
+    deployer = deployer_for(registry, server, recent=np.ones(4))
+
+    in_flight = asyncio.create_task(asyncio.to_thread(server.predict, np.ones(1)))
+    await asyncio.sleep(0.05)  # Prediction started on the old model, waiting on the gate
+
+    gate.set()  # Shadow inference also runs the old model
+    result = await deployer.deploy("scale", publish_factor(registry, 2.0, temp_dir))
+    assert result["deployed"] and result["shadow"] == {"rows": 4, "mean_abs_diff": 1.0, "max_abs_diff": 1.0}
+
+    assert (await in_flight)[0] == 1.0
+    assert server.predict(np.ones(1))[0] == 2.0
+    assert registry.active_version("scale") == result["version"] == server.version
+
+
+async def test_shadow_gates_swap_and_rollback_is_instant(temp_dir):
+    registry = ModelRegistry(temp_dir / "registry")
+    server = Server()
+    deployer = deployer_for(registry, server, recent=np.ones(4), max_divergence=0.5)
+
+    first = await deployer.deploy("scale", publish_factor(registry, 1.0, temp_dir))
+    assert first["deployed"] and first["shadow"] == {"rows": 4}  # Nothing served yet to compare with
+
+    for factor in (5.0, float("nan")):
+        rejected = await deployer.deploy("scale", publish_factor(registry, factor, temp_dir))
+        assert not rejected["deployed"]
+        assert server.version == registry.active_version("scale") == first["version"]
+
+    second = await deployer.deploy("scale", publish_factor(registry, 1.25, temp_dir))
+    assert second["deployed"] and server.model.factor == 1.25
+
+    loads = server.loads
+    assert deployer.rollback("scale") == first["version"]
+    assert server.model.factor == 1.0 and server.loads == loads  # Swapped back, not reloaded
+    assert registry.active_version("scale") == first["version"]
+
+    # A new process picks up the active version on registration
+    restarted = Server()
+    deployer_for(registry, restarted)
+    assert restarted.version == first["version"] and restarted.model.factor == 1.0
+
+
+async def test_shadow_inputs_snapshotted_on_loop_thread(temp_dir):
+    """Predictor buffers are read where they are appended to, not on the shadow worker thread"""
+    registry = ModelRegistry(temp_dir / "registry")
+    server = Server(ScaleModel(1.0))
+    buffer = deque(np.ones(4))
+    readers = []
+
+    def recent():
+        readers.append(threading.current_thread())
+        return np.array(list(buffer))
+
+    def infer(model, inputs):
+        buffer.append(2.0)  # The live path keeps appending while the shadow runs
+        return model.predict(inputs)
+
+    deployer = ModelDeployer(registry)
+    deployer.register("scale", load=lambda path: ScaleModel(float((path / "factor.txt").read_text())),
+                      apply=server.apply, infer=infer, recent_inputs=recent, current=server.model)
+    result = await deployer.deploy("scale", publish_factor(registry, 1.5, temp_dir))
+
+    assert result["deployed"] and result["shadow"]["rows"] == 4
+    assert readers == [threading.main_thread()]
+
+
+async def test_lstm_predictor_hot_swap(temp_dir):
+    """The predictor serves a published kernel after deploy and the old one after rollback"""
+    rng = np.random.default_rng(5)
+    model_path = temp_dir / "lstm_model"
+    export_keras_model(trained_like_model(rng), f"{model_path}.npz")
+    predictor = LSTMPredictor(model_path=str(model_path))
+    original = predictor.kernel
+    for i in range(25):
+        await predictor.predict_direction({'price': 21000.0 + i, 'volume': 100 + i}, use_cache=False)
+
+    registry = ModelRegistry(temp_dir / "registry")
+    deployer = ModelDeployer(registry)
+    deployer.register("lstm", load=lambda path: LSTMKernel.from_arrays(*load_arrays(path)),
+                      apply=predictor.swap_kernel, infer=lambda kernel, x: kernel.predict(x),
+                      recent_inputs=predictor.recent_sequences, current=original)
+    retrained = LSTMKernel.load(export_keras_model(trained_like_model(rng), str(temp_dir / "retrained.npz")))
+
+    result = await deployer.deploy("lstm", registry.publish_arrays("lstm", *retrained.to_arrays()))
+    assert result["deployed"] and result["shadow"]["rows"] == 6
+    assert predictor.get_performance_stats()['model_version'] == result["version"]
+    sequence = predictor.create_sequence()
+    assert np.array_equal(predictor.kernel.predict(sequence), retrained.predict(sequence))
+
+    first = registry.publish_arrays("lstm", *original.to_arrays())
+    served = predictor.kernel
+    await deployer.deploy("lstm", first)
+    assert predictor.kernel is not served
+    deployer.rollback("lstm")
+    assert predictor.kernel is served and predictor.model_version == result["version"]
@@ -0,0 +1,160 @@
+"""
+Pattern engine tests
+====================
+
+Checks the vectorized multi-symbol detectors against the original
+list-based detectors applied to each symbol separately, and benchmarks
+a detection cycle over many symbols.
+"""
+
+import statistics
+import time
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+from minhos.core.pattern_engine import PatternEngine, PriceWindows
+
+
+def reference_patterns(data):
+    """Original per-series detectors (chronological list of dicts)"""
+    hits = []
+    prices = [d['close'] for d in data[-50:]]
+    if len(data) >= 20:
+        recent_high, recent_low, current = max(prices[-20:-1]), min(prices[-20:-1]), prices[-1]
+        if current > recent_high * 1.005:
+            hits.append(("price_breakout", recent_high))
+        if current < recent_low * 0.995:
+            hits.append(("price_breakdown", recent_low))
+
+    volumes = [d.get('volume', 0) for d in data[-50:] if d.get('volume', 0) > 0]
+    if len(volumes) >= 20 and volumes[-1] > statistics.mean(volumes[:-1]) * 2.0:
+        hits.append(("volume_spike", volumes[-1]))
+
+    if len(data) >= 30:
+        p = [d['close'] for d in data[-30:]]
+        returns = [(p[i] - p[i - 1]) / p[i - 1] for i in range(1, len(p))]
+        current_vol, historical_vol = statistics.stdev(returns[-10:]), statistics.stdev(returns)
+        if current_vol > historical_vol * 1.5:
+            hits.append(("volatility_expansion", current_vol))
+
+        recent = (p[-1] - p[-10]) / p[-10]
+        longer = (p[-10] - p[-20]) / p[-20]
+        if abs(recent) > 0.02 and recent * longer < 0:
+            hits.append(("trend_reversal", recent))
+
+    if len(data) >= 50:
+        current = prices[-1]
+        tests = defaultdict(int)
+        for price in prices[:-5]:
+            level = round(price, 0)
+            if abs(level - current) / current < 0.05:
+                tests[level] += 1
+        hits.extend(("support_resistance", level) for level, n in tests.items() if n >= 3)
+    return hits
+
+
+def reference_realtime(data):
+    hits = []
+    prices = [d['close'] for d in data]
+    if len(prices) >= 10 and prices[-1] > max(prices[:-1]) * 1.003:
+        hits.append(("price_breakout", max(prices[:-1])))
+    volumes = [d.get('volume', 0) for d in data if d.get('volume', 0) > 0]
+    if len(volumes) >= 10 and volumes[-1] > statistics.mean(volumes[:-1]) * 1.8:
+        hits.append(("volume_spike", volumes[-1]))
+    return hits
+
+
+def make_series(rng, symbols, bars):
+    """Random walks with occasional jumps, volume bursts and short histories"""
+    series = {}
+    for i in range(symbols):
+        n = bars if i % 5 else int(rng.integers(5, bars))
+        base = rng.uniform(50, 5000)
+        scale = rng.choice([0.002, 0.01, 0.03])
+        steps = rng.normal(0, scale, n)
+        steps[-1] += rng.choice([0.0, 0.02, -0.02])
+        prices = base * np.exp(np.cumsum(steps))
+        volumes = rng.integers(0, 400, n).astype(float)
+        volumes[-1] *= rng.choice([1.0, 4.0])
+        series[f"SYM{i}"] = [{'symbol': f"SYM{i}", 'close': float(p), 'volume': float(v)}
+                             for p, v in zip(prices, volumes)]
+    return series
+
+
+def key_value(hit):
+    context = hit.context
+    for key in ('breakout_level', 'breakdown_level', 'current_volume', 'current_volatility',
+                'recent_trend', 'level'):
+        if key in context:
+            return round(context[key], 6)
+
+
+def test_matches_reference_per_symbol():
+    """Every pattern kind matches the list detectors run on each symbol alone"""
+    rng = np.random.default_rng(11)
+    series = make_series(rng, symbols=60, bars=50)
+    engine = PatternEngine()
+
+    hits = engine.detect(PriceWindows.from_records(series, 50))
+    got = sorted((h.symbol, h.kind, key_value(h)) for h in hits)
+    expected = sorted((symbol, kind, round(value, 6))
+                      for symbol, data in series.items() for kind, value in reference_patterns(data))
+    assert got == expected
+    assert {kind for _, kind, _ in got} >= {"price_breakout", "volume_spike", "support_resistance"}
+
+    realtime = {symbol: data[-20:] for symbol, data in series.items()}
+    hits = engine.detect_realtime(PriceWindows.from_records(realtime, 20))
+    got = sorted((h.symbol, h.kind, key_value(h)) for h in hits)
+    expected = sorted((symbol, kind, round(value, 6))
+                      for symbol, data in realtime.items() for kind, value in reference_realtime(data))
+    assert got == expected
+
+
+def test_market_conditions_per_symbol():
+    """Conditions use each symbol's own bars, not a mixed series"""
+    series = {
+        "NQU25-CME": [{'close': 21000.0 + i * 10} for i in range(30)],
+        "ESU25-CME": [{'close': 6000.0 - i} for i in range(30)],
+        "NEW": [{'close': 100.0}] * 5,
+    }
+    conditions = PatternEngine().market_conditions(PriceWindows.from_records(series, 50))
+
+    assert set(conditions) == {"NQU25-CME", "ESU25-CME"}
+    assert conditions["NQU25-CME"]["trend"] == pytest.approx(190 / 21100)
+    assert conditions["NQU25-CME"]["current_price"] == 21290.0
+    assert conditions["ESU25-CME"]["trend"] < 0
+    assert conditions["ESU25-CME"]["price_range"] == pytest.approx(19.0)
+    prices = [6000.0 - i for i in range(10, 30)]
+    returns = [(prices[i] - prices[i - 1]) / prices[i - 1] for i in range(1, len(prices))]
+    assert conditions["ESU25-CME"]["volatility"] == pytest.approx(statistics.stdev(returns))
+
+
+def detection_cycle_ms():
+    """Mean detect + market_conditions time for 50 symbols x 200 bars"""
+    rng = np.random.default_rng(4)
+    windows = PriceWindows.from_records(make_series(rng, symbols=50, bars=200), 200)
+    engine = PatternEngine()
+    engine.detect(windows)
+
+    started = time.perf_counter()
+    for _ in range(20):
+        hits = engine.detect(windows)
+        engine.market_conditions(windows)
+    return (time.perf_counter() - started) * 1000 / 20, hits
+
+
+def test_detection_cycle_latency():
+    """50 symbols x 200 bars per cycle, with headroom for a loaded machine"""
+    elapsed_ms, hits = detection_cycle_ms()
+    assert hits and elapsed_ms < 50
+
+
+@pytest.mark.benchmark
+def test_detection_cycle_benchmark():
+    """Benchmark: 50 symbols x 200 bars per cycle in a few milliseconds"""
+    elapsed_ms, hits = detection_cycle_ms()
+    print(f"\nPattern cycle: 50 symbols x 200 bars, {len(hits)} hits in {elapsed_ms:.2f}ms")
+
+    assert elapsed_ms < 10
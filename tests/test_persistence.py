@@ -0,0 +1,124 @@
+"""
+Persistence layer tests
+=======================
+
+Validates the single-writer SQLite layer: batched commits, error isolation,
+reported statistics, that queued writes survive shutdown and exit, and
+that closing releases every read connection.
+"""
+
+import asyncio
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from minhos.core.persistence import SQLiteWriter, close_all_writers, get_sqlite_writer
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def writer(temp_dir):
+    db_path = temp_dir / "writer.db"
+    with sqlite3.connect(str(db_path)) as conn:
+        conn.execute("CREATE TABLE events (id INTEGER PRIMARY KEY, value TEXT UNIQUE)")
+    writer = SQLiteWriter(db_path)
+    yield writer
+    writer.close()
+
+
+async def test_submit_and_query(writer):
+    """Concurrent submits are committed and visible to queries"""
+    await asyncio.gather(*(
+        writer.submit("INSERT INTO events (value) VALUES (?)", (f"event-{i}",))
+        for i in range(200)
+    ))
+
+    rows = await writer.query("SELECT COUNT(*) FROM events")
+    assert rows[0][0] == 200
+
+    stats = writer.get_stats()
+    assert stats["writes"] == 200
+    assert stats["batches"] <= 200
+    assert stats["queue_depth"] == 0
+    assert stats["p99_write_latency_ms"] > 0
+
+
+async def test_failed_statement_only_fails_its_caller(writer):
+    """A constraint violation in a batch does not drop the other writes"""
+    results = await asyncio.gather(
+        writer.submit("INSERT INTO events (value) VALUES (?)", ("dup",)),
+        writer.submit("INSERT INTO events (value) VALUES (?)", ("dup",)),
+        writer.submit("INSERT INTO events (value) VALUES (?)", ("other",)),
+        return_exceptions=True
+    )
+
+    assert sum(isinstance(r, sqlite3.IntegrityError) for r in results) == 1
+    assert writer.query_sync("SELECT COUNT(*) FROM events")[0][0] == 2
+    assert writer.get_stats()["errors"] == 1
+
+
+def test_enqueue_from_sync_code(writer):
+    """Sync callers can queue writes and flush before reading"""
+    writer.enqueue_many([
+        ("INSERT INTO events (value) VALUES (?)", ("a",)),
+        ("INSERT INTO events (value) VALUES (?)", ("b",)),
+    ])
+    writer.flush(timeout=5)
+
+    assert writer.query_sync("SELECT value FROM events ORDER BY value") == [("a",), ("b",)]
+
+
+async def test_close_closes_every_read_connection(writer):
+    """Read connections opened on the reader pool and on callers' threads are closed with the writer"""
+    await writer.query("SELECT COUNT(*) FROM events")
+    pooled = writer._reader.submit(writer._read_connection).result()
+    own = writer._read_connection()
+    assert pooled is not own
+
+    writer.close()
+    for conn in (pooled, own):
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+
+def create_events(db_path):
+    with sqlite3.connect(str(db_path)) as conn:
+        conn.execute("CREATE TABLE events (id INTEGER PRIMARY KEY, value TEXT UNIQUE)")
+
+
+def count_events(db_path):
+    with sqlite3.connect(str(db_path)) as conn:
+        return conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+
+def test_queued_writes_survive_close_all_writers(temp_dir):
+    db_path = temp_dir / "shutdown.db"
+    create_events(db_path)
+    writer = get_sqlite_writer(db_path)
+    futures = [writer.enqueue("INSERT INTO events (value) VALUES (?)", (f"fill-{i}",)) for i in range(1000)]
+
+    close_all_writers()
+    assert all(future.done() for future in futures)
+    assert count_events(db_path) == 1000
+    assert get_sqlite_writer(db_path) is not writer  # Registry was cleared
+
+
+def test_queued_writes_committed_at_exit(temp_dir):
+    """A process that exits with writes still queued commits them"""
+    db_path = temp_dir / "exit.db"
+    create_events(db_path)
+    code = (
+        "import sys\n"
+        "from minhos.core.persistence import get_sqlite_writer\n"
+        "writer = get_sqlite_writer(sys.argv[1])\n"
+        "for i in range(1000):\n"
+        "    writer.enqueue('INSERT INTO events (value) VALUES (?)', (f'fill-{i}',))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code, str(db_path)], cwd=ROOT,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert count_events(db_path) == 1000
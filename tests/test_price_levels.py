@@ -0,0 +1,174 @@
+"""
+Price level index tests
+=======================
+
+Validates tick-grid bucketing, decayed touch and pivot counts against a
+brute-force recount, pivots from bar highs/lows, same-timestamp updates
+folding into their bar, array growth and renormalization, and the pattern
+engine's indexed support/resistance.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from minhos.core.pattern_engine import PatternEngine, PriceWindows
+from minhos.core.price_levels import (
+    PriceLevelBook, PriceLevelConfig, PriceLevelIndex, tick_size_for
+)
+
+
+def brute_force_touches(timestamps, prices, bucket_size, half_life, now):
+    """Decayed count of entries into each bucket, recomputed from scratch"""
+    touches = {}
+    previous = None
+    for t, p in zip(timestamps, prices):
+        bucket = int(round(p / bucket_size))
+        if bucket != previous:
+            touches[bucket] = touches.get(bucket, 0.0) + 0.5 ** ((now - t) / half_life)
+            previous = bucket
+    return touches
+
+
+def test_tick_sizes_from_contract_root():
+    assert tick_size_for("NQU25-CME") == 0.25
+    assert tick_size_for("RTYU25-CME") == 0.1
+    assert tick_size_for("YMU25-CBOT") == 1.0
+    assert tick_size_for("VIX_CGI") == 0.01
+
+
+def test_decayed_touches_match_recount():
+    """Indexed counts equal a full recount of decayed bucket entries"""
+    rng = np.random.default_rng(5)
+    config = PriceLevelConfig(half_life_seconds=3600.0)
+    index = PriceLevelIndex(0.25, config)
+    timestamps = np.cumsum(rng.uniform(1, 60, 5000)) + 1_700_000_000
+    prices = np.round((21000 + np.cumsum(rng.normal(0, 2, 5000))) / 0.25) * 0.25
+    for t, p in zip(timestamps, prices):
+        assert index.update(t, float(p))
+
+    now = timestamps[-1]
+    expected = brute_force_touches(timestamps, prices, 1.0, 3600.0, now)
+    found = index.levels(band=0.05, min_touches=0.5)
+    assert found
+    for level in found:
+        assert level.touches == pytest.approx(expected[int(round(level.price))], rel=1e-9)
+    assert {round(l.price) for l in found} == {b for b, v in expected.items()
+                                               if v >= 0.5 and abs(b - prices[-1]) <= prices[-1] * 0.05 + 0.5}
+    strengths = [level.strength for level in found]
+    assert strengths == sorted(strengths, reverse=True)
+
+
+def test_sees_levels_older_than_window_and_decays():
+    """A level tested long ago is still indexed, at half weight per half-life"""
+    index = PriceLevelIndex(0.25, PriceLevelConfig(half_life_seconds=1000.0, pivot_span=2))
+    t = 0.0
+    for _ in range(4):  # Four separate tests of 100 with rejections
+        for price in (102.0, 101.0, 100.0, 101.0, 102.0):
+            t += 1
+            index.update(t, price)
+    for i in range(500):  # Long drift above the level
+        t += 1
+        index.update(t, 103.0 + (i % 3))
+
+    level = next(l for l in index.levels(min_touches=1) if l.price == 100.0)
+    assert level.touches == pytest.approx(sum(0.5 ** ((t - s) / 1000.0) for s in (3, 8, 13, 18)))
+    assert level.pivot_lows > 0 and level.pivot_highs == 0
+
+    later = index.levels(min_touches=0, now=t + 1000.0)
+    assert next(l for l in later if l.price == 100.0).touches == pytest.approx(level.touches / 2)
+
+
+def test_pivots_from_bar_highs_and_lows():
+    """Swing highs/lows come from the bars' wicks, not from their closes"""
+    index = PriceLevelIndex(1.0, PriceLevelConfig(bucket_ticks=1, half_life_seconds=1e9, pivot_span=2))
+    wicks = [(101.0, 99.0), (102.0, 98.0), (105.0, 95.0), (102.0, 98.0), (101.0, 99.0), (101.0, 99.0)]
+    for t, (high, low) in enumerate(wicks):
+        index.update(float(t), 100.0, high, low)  # Flat closes: no close-based pivots
+
+    levels = {level.price: level for level in index.levels(band=0.1, min_touches=0)}
+    assert levels[105.0].pivot_highs == pytest.approx(1.0)
+    assert levels[95.0].pivot_lows == pytest.approx(1.0)
+    assert levels[100.0].pivot_highs == levels[100.0].pivot_lows == 0
+
+
+def test_same_timestamp_updates_fold_into_the_bar():
+    """Ticks sharing the last timestamp revise that bar instead of being dropped"""
+    index = PriceLevelIndex(1.0, PriceLevelConfig(bucket_ticks=1, half_life_seconds=1e9, pivot_span=1))
+    index.update(0.0, 100.0)
+    index.update(1.0, 100.0)
+    for price in (101.0, 103.0, 102.0):  # The bar at t=1 trades up to 103 and closes at 102
+        assert index.update(1.0, price)
+    index.update(2.0, 100.0)
+    index.update(3.0, 100.0)  # Closes the window around t=1
+
+    assert index.last_price == 100.0 and index.updates == 7
+    levels = {level.price: level for level in index.levels(band=0.1, min_touches=0)}
+    assert levels[103.0].pivot_highs == pytest.approx(1.0)
+    assert levels[103.0].touches == levels[101.0].touches == pytest.approx(1.0)
+    assert levels[100.0].touches == pytest.approx(2.0)
+
+
+def test_growth_stale_updates_and_renormalization():
+    """Far prices grow the grid; old or invalid updates are ignored; decay stays finite"""
+    index = PriceLevelIndex(1.0, PriceLevelConfig(bucket_ticks=1, half_life_seconds=1.0, max_buckets=10_000))
+    assert index.update(1.0, 500.0)
+    assert index.update(2.0, 5000.0)
+    assert index.update(3.0, 100.0)
+    assert not index.update(2.5, 101.0)  # Older than the last bar
+    assert not index.update(4.0, 0.0)
+    assert not index.update(5.0, 1e9)  # Would exceed max_buckets
+    assert index.get_stats()["buckets"] <= 10_000
+
+    for i in range(2000):  # 2000 half-lives: forces renormalization
+        index.update(10.0 + i, 100.0 + (i % 2))
+    found = {l.price: l.touches for l in index.levels(min_touches=0.5)}
+    assert found == pytest.approx({101.0: 4 / 3, 100.0: 2 / 3})  # Geometric sums at 1/4 per 2s
+
+
+def test_engine_reports_indexed_levels():
+    """With a level book the engine reports the strongest indexed levels"""
+    book = PriceLevelBook(PriceLevelConfig(half_life_seconds=1e9))
+    records = [{'timestamp': float(i), 'close': 21000.0 + (i % 8) * 2.5} for i in range(400)]
+    assert book.warm_start("NQU25-CME", records) == 400
+
+    windows = PriceWindows.from_records({"NQU25-CME": records[-50:], "ESU25-CME": records[-50:]}, 50)
+    hits = [h for h in PatternEngine().detect(windows, book) if h.kind == "support_resistance"]
+
+    assert hits and len(hits) <= 5
+    assert {h.symbol for h in hits} == {"NQU25-CME"}  # ESU25 has no index yet
+    assert all(h.context['tests'] >= 3 and h.context['distance_pct'] < 0.05 for h in hits)
+
+
+def index_over_months():
+    """Three months of minute bars indexed, with per-update and per-query microseconds"""
+    rng = np.random.default_rng(9)
+    n = 90 * 24 * 60
+    prices = np.round((20000 + np.cumsum(rng.normal(0, 3, n))) / 0.25) * 0.25
+    index = PriceLevelIndex(0.25)
+    started = time.perf_counter()
+    for t, p in enumerate(prices.tolist()):
+        index.update(60.0 * t, p)
+    per_update_us = (time.perf_counter() - started) / n * 1e6
+
+    started = time.perf_counter()
+    for _ in range(1000):
+        index.levels(band=0.05, min_touches=3, limit=5)
+    return index, per_update_us, (time.perf_counter() - started) / 1000 * 1e6
+
+
+def test_query_latency_over_months():
+    """Queries over three months of minute bars stay far below a rescan"""
+    index, per_update_us, per_query_us = index_over_months()
+    assert per_query_us < 2500
+
+
+@pytest.mark.benchmark
+def test_query_latency_over_months_benchmark():
+    """Benchmark: queries stay in microseconds over three months of minute bars"""
+    index, per_update_us, per_query_us = index_over_months()
+    print(f"\nPrice levels: {index.get_stats()['updates']} updates at {per_update_us:.1f}us, "
+          f"{index.get_stats()['buckets']} buckets, query {per_query_us:.1f}us")
+
+    assert per_query_us < 500
@@ -0,0 +1,244 @@
+"""
+Risk fast path tests
+====================
+
+Validates the precomputed risk limit table and benchmarks pre-trade
+decision latency in RiskManager.validate_trade_request.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+
+import pytest
+
+from minhos.services.risk_manager import RiskManager, TradeRequest, OrderType
+from minhos.services.state_manager import StateManager, SystemState
+
+
+@pytest.fixture
+async def risk_manager(temp_dir):
+    state_manager = StateManager(db_path=temp_dir / "state.db")
+    state_manager.websocket_enabled = False
+    await state_manager._load_task
+    await state_manager.update_risk_parameters(enabled=True, position_size_percent=50.0)
+    await state_manager.update_system_config(trading_enabled=True, max_orders_per_minute=1_000_000)
+    await state_manager.set_system_state(SystemState.ONLINE)
+    state_manager.last_market_update = datetime.now()
+
+    manager = RiskManager(db_path=temp_dir / "risk.db")
+    manager.state_manager = state_manager
+    yield manager
+    manager._flush_audit_buffer()
+    manager.db.flush(timeout=5)
+
+
+def make_request(manager, quantity=1):
+    symbol = sorted(manager.get_risk_limits().tradeable_symbols)[0]
+    return TradeRequest(
+        symbol=symbol,
+        order_type=OrderType.BUY,
+        quantity=quantity,
+        price=21000.0,
+        timestamp=datetime.now()
+    )
+
+
+async def test_limits_rebuilt_only_on_config_change(risk_manager):
+    """The limit table is reused across P&L updates and rebuilt on config changes"""
+    limits = risk_manager.get_risk_limits()
+    assert limits.config_valid
+    assert limits.max_exposure == pytest.approx(50000.0)
+
+    await risk_manager.state_manager.update_position("NQU25-CME", 1, "LONG", 21000.0, 21000.0)
+    assert risk_manager.get_risk_limits() is limits
+
+    await risk_manager.state_manager.update_risk_parameters(max_position_size=1)
+    rebuilt = risk_manager.get_risk_limits()
+    assert rebuilt is not limits
+    assert rebuilt.max_position_size == 1
+
+    allowed, reasons = await risk_manager.validate_trade_request(make_request(risk_manager, quantity=2))
+    assert not allowed
+    assert any("exceeds maximum 1" in reason for reason in reasons)
+
+
+async def test_audit_records_written_in_background(risk_manager):
+    """Validation and violation records reach SQLite without being awaited"""
+    await risk_manager.validate_trade_request(make_request(risk_manager))
+    await risk_manager.validate_trade_request(make_request(risk_manager, quantity=50))
+    assert risk_manager.get_risk_status()["fast_path"]["audit_buffered"] >= 3
+
+    await asyncio.sleep(0.2)  # Buffered rows are handed to the writer shortly after
+    risk_manager.db.flush(timeout=5)
+
+    rows = risk_manager.db.query_sync("SELECT approved FROM trade_validations ORDER BY id")
+    assert [bool(row[0]) for row in rows] == [True, False]
+    assert risk_manager.db.query_sync("SELECT COUNT(*) FROM risk_violations")[0][0] >= 1
+
+
+async def test_bad_audit_row_fails_alone(risk_manager):
+    """One row the database rejects does not roll back the rows flushed with it"""
+    await risk_manager.validate_trade_request(make_request(risk_manager))
+    risk_manager._queue_audit("INSERT INTO missing_table (value) VALUES (?)", (1,))
+    await risk_manager.validate_trade_request(make_request(risk_manager))
+
+    futures = risk_manager._flush_audit_buffer()
+    risk_manager.db.flush(timeout=5)
+
+    assert sum(future.exception() is not None for future in futures) == 1
+    assert risk_manager.db.query_sync("SELECT COUNT(*) FROM trade_validations")[0][0] == 2
+
+
+async def test_invalid_configuration_blocks_trading(risk_manager):
+    """Disabled risk parameters fail closed"""
+    await risk_manager.state_manager.update_risk_parameters(enabled=False)
+
+    allowed, reasons = await risk_manager.validate_trade_request(make_request(risk_manager))
+    assert not allowed
+    assert reasons[-1].startswith("CRITICAL")
+
+
+async def decision_latencies_us(risk_manager):
+    """Sorted pre-trade decision latencies over a 90/10 approve/reject mix"""
+    approve = make_request(risk_manager)
+    reject = make_request(risk_manager, quantity=50)
+
+    # Warm up the limit table and code paths
+    for _ in range(50):
+        await risk_manager.validate_trade_request(approve)
+
+    latencies_us = []
+    for i in range(2000):
+        request = reject if i % 10 == 0 else approve
+        started = time.perf_counter()
+        await risk_manager.validate_trade_request(request)
+        latencies_us.append((time.perf_counter() - started) * 1e6)
+    return sorted(latencies_us)
+
+
+async def test_decision_latency_p99_under_5ms(risk_manager):
+    """Pre-trade decisions stay in the low milliseconds even on a loaded machine"""
+    latencies_us = await decision_latencies_us(risk_manager)
+    assert latencies_us[int(len(latencies_us) * 0.99)] < 5000
+
+
+@pytest.mark.benchmark
+async def test_decision_latency_p99_under_1ms(risk_manager):
+    """Benchmark: pre-trade decisions complete in under 1 ms at p99"""
+    latencies_us = await decision_latencies_us(risk_manager)
+    p50 = latencies_us[len(latencies_us) // 2]
+    p99 = latencies_us[int(len(latencies_us) * 0.99)]
+    print(f"\nPre-trade decision latency: p50={p50:.1f}us p99={p99:.1f}us")
+
+    assert p99 < 1000
+    assert risk_manager.get_risk_status()["fast_path"]["p99_latency_us"] < 1000
+
+
+async def test_correlated_exposure_limit(risk_manager):
+    """Adding to a correlated book is blocked; hedging it is allowed"""
+    state_manager = risk_manager.state_manager
+    symbol = make_request(risk_manager).symbol
+    await state_manager.update_position("ESU25-CME", 2, "LONG", 25000.0, 25000.0)
+
+    # NQ and ES moving together bar after bar
+    engine = risk_manager.correlation_engine
+    for i in range(200):
+        move = 1.0 + (0.001 if i % 2 else -0.0009)
+        engine.on_bar_close({symbol: 21000.0 * move ** i, "ESU25-CME": 25000.0 * move ** i})
+    assert engine.get_snapshot().get(symbol, "ESU25-CME") > 0.9
+
+    buy = make_request(risk_manager, quantity=2)
+    allowed, reasons = await risk_manager.validate_trade_request(buy)
+    assert not allowed
+    assert any("Correlation-adjusted exposure" in reason for reason in reasons)
+
+    sell = TradeRequest(symbol=symbol, order_type=OrderType.SELL, quantity=2,
+                        price=21000.0, timestamp=datetime.now())
+    allowed, reasons = await risk_manager.validate_trade_request(sell)
+    assert allowed, reasons
+
+    status = risk_manager.get_risk_status()["correlation"]
+    assert "ESU25-CME" in status["exposure_by_position"]
+
+
+async def test_order_rate_limit_uses_sliding_window(risk_manager):
+    """Approved orders count against the per-minute limit and rejects are tracked"""
+    await risk_manager.state_manager.update_system_config(max_orders_per_minute=3)
+
+    results = [(await risk_manager.validate_trade_request(make_request(risk_manager)))[0] for _ in range(4)]
+    assert results == [True, True, True, False]
+
+    rates = risk_manager.get_risk_status()["rate_metrics"]
+    assert rates["orders_per_minute"] == 3
+    assert rates["rejects_per_minute"] == 1
+    assert rates["violations_per_hour"] >= 1
+
+
+async def test_var_report_cached_between_position_changes(risk_manager):
+    """VaR is recomputed only when the book changes"""
+    state_manager = risk_manager.state_manager
+    await state_manager.update_position("NQU25-CME", 1, "LONG", 21000.0, 21000.0)
+
+    first = await risk_manager.calculate_var()
+    assert first["symbols"] == ["NQU25-CME"]
+    assert await risk_manager.calculate_var() is first
+
+    await state_manager._update_position_pnl("NQU25-CME", 21010.0)  # Price only
+    assert await risk_manager.calculate_var() is first
+
+    await state_manager.update_position("NQU25-CME", 2, "LONG", 21000.0, 21010.0)
+    second = await risk_manager.calculate_var()
+    assert second is not first
+    assert risk_manager.get_risk_status()["var"] is second
+
+
+async def test_what_if_batch_is_side_effect_free(risk_manager):
+    """Independent what-if orders see the current book and leave no trace"""
+    buy = make_request(risk_manager, quantity=2)
+    add = make_request(risk_manager, quantity=1)
+    oversized = make_request(risk_manager, quantity=50)
+
+    result = risk_manager.simulate_trade_requests([buy, add, oversized])
+    assert [d["allowed"] for d in result["decisions"]] == [True, True, False]
+    assert result["approved"] == 2
+
+    # Projection applies every approved order
+    projected = result["projected"]
+    assert projected["positions"] == {buy.symbol: 3}
+    assert projected["gross_exposure"] == pytest.approx(63000.0)
+    assert projected["margin_used"] == pytest.approx(6300.0)
+    assert result["current"]["positions"] == {}
+
+    assert risk_manager.risk_metrics["orders_validated"] == 0
+    assert risk_manager.order_rate.last_minute.count() == 0
+    assert not risk_manager._audit_buffer
+    assert not risk_manager.violations
+
+
+async def test_what_if_cumulative_sequence(risk_manager):
+    """Cumulative orders see earlier fills and count against the order rate"""
+    symbol = make_request(risk_manager).symbol
+    await risk_manager.state_manager.update_position(symbol, 1, "SHORT", 21100.0, 21000.0)
+    await risk_manager.state_manager.update_system_config(max_orders_per_minute=2)
+    now = datetime.now()
+
+    def order(order_type, quantity):
+        return TradeRequest(symbol=symbol, order_type=order_type, quantity=quantity, price=21000.0, timestamp=now)
+
+    orders = [order(OrderType.BUY, 3), order(OrderType.BUY, 1), order(OrderType.SELL, 2), order(OrderType.SELL, 1)]
+    result = risk_manager.simulate_trade_requests(orders, cumulative=True)
+    decisions = result["decisions"]
+
+    # Short 1 -> long 2 fits; long 3 breaches the $50k exposure limit
+    assert decisions[0]["allowed"] and decisions[0]["position_after"] == 2
+    assert not decisions[1]["allowed"]
+    assert any("exposure" in reason for reason in decisions[1]["violations"])
+    assert decisions[2]["allowed"] and decisions[2]["position_after"] == 0
+    assert any("Order rate limit" in reason for reason in decisions[3]["violations"])
+
+    assert result["current"]["positions"] == {symbol: -1}
+    assert result["current"]["net_exposure"] == pytest.approx(-21000.0)
+    assert result["projected"]["positions"] == {}
+    assert result["projected"]["margin_used"] == 0
+    assert risk_manager.order_rate.last_minute.count() == 0
@@ -0,0 +1,184 @@
+"""
+Ordered shard tests
+===================
+
+Validates stable key-to-shard assignment, in-order execution per key,
+per-symbol state isolation during analysis and per-shard worker processes.
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import replace
+
+import pytest
+
+from minhos.core.indicators import compute_indicators
+from minhos.core.sharding import OrderedShards, shard_for
+from minhos.services.ai_brain_service import SymbolState
+
+
+SYMBOLS = ["NQU25-CME", "ESU25-CME", "YMU25-CBOT", "RTYU25-CME", "CLV25-NYMEX", "GCZ25-COMEX"]
+
+
+def test_shard_assignment_is_stable():
+    """The same symbol maps to the same shard on every call and process"""
+    assert shard_for("NQU25-CME", 4) == shard_for("NQU25-CME", 4)
+    assert shard_for("NQU25-CME", 4) == 2  # CRC32, not the salted built-in hash
+    assert len({shard_for(symbol, 4) for symbol in SYMBOLS}) > 1
+
+
+async def test_in_order_per_key_and_inline_before_start():
+    """Work for one key runs in submission order on its shard worker"""
+    workers = OrderedShards(shards=3)
+    seen = []
+
+    async def record(symbol, i):
+        await asyncio.sleep(0.001 * (5 - i % 5))  # Later items finish faster
+        seen.append((symbol, i))
+        return i
+
+    assert await workers.run("NQU25-CME", record, "NQU25-CME", -1) == -1
+    assert workers.get_stats()["inline"] == 1
+
+    await workers.start()
+    try:
+        results = await asyncio.gather(*[
+            workers.run(symbol, record, symbol, i) for i in range(10) for symbol in SYMBOLS[:3]
+        ])
+    finally:
+        await workers.stop()
+
+    assert sorted(results) == sorted(list(range(10)) * 3)
+    expected = {symbol: list(range(10)) for symbol in SYMBOLS[:3]}
+    expected["NQU25-CME"].insert(0, -1)
+    for symbol in SYMBOLS[:3]:
+        assert [i for s, i in seen if s == symbol] == expected[symbol]
+
+
+async def test_errors_reach_the_caller():
+    """A failing item raises for its caller and the shard keeps going"""
+    workers = OrderedShards(shards=2)
+
+    async def fail():
+        raise ValueError("bad tick")
+
+    async def ok():
+        return "ok"
+
+    await workers.start()
+    try:
+        with pytest.raises(ValueError):
+            await workers.run("NQU25-CME", fail)
+        assert await workers.run("NQU25-CME", ok) == "ok"
+    finally:
+        await workers.stop()
+    assert workers.get_stats()["errors"] == 1
+
+
+async def test_shard_process_matches_inline():
+    """CPU steps in a shard process give the same result as inline"""
+    points = [{"close": 21000.0 + i * (1 if i % 3 else -2), "volume": 100 + i} for i in range(40)]
+    inline = await OrderedShards(shards=2).run_cpu("NQU25-CME", compute_indicators, points, "NQU25-CME")
+
+    workers = OrderedShards(shards=2, processes=True)
+    try:
+        pooled = await workers.run_cpu("NQU25-CME", compute_indicators, points, "NQU25-CME")
+    finally:
+        await workers.stop()
+
+    assert replace(pooled, updated_at=inline.updated_at) == inline
+    assert workers.get_stats()["process_calls"] == 1
+
+
+def market_ticks(symbol, n, seed):
+    base = 21000.0 if symbol.startswith("NQ") else 5000.0
+    return [{"symbol": symbol, "close": base + ((i * seed) % 17 - 8) * 0.25, "volume": 100 + i % 50}
+            for i in range(n)]
+
+
+async def analyze(shards, state, tick):
+    """AIBrainService's per-symbol step: buffer the tick, replay the window, record on the state"""
+    state.buffer.append(tick)
+    await asyncio.sleep(0)  # Yields like the brain's data fetch
+    window = list(state.buffer)[-200:]
+    snapshot = await shards.run_cpu(state.symbol, compute_indicators, window, state.symbol)
+    state.current_analysis = snapshot
+    state.analyses += 1
+    return snapshot
+
+
+async def analyze_all(shards, states, ticks):
+    """Submit every symbol's ticks interleaved, each through its shard"""
+    return await asyncio.gather(*[
+        shards.run(symbol, analyze, shards, states[symbol], tick)
+        for step in zip(*ticks.values()) for symbol, tick in zip(ticks, step)
+    ])
+
+
+async def test_symbol_state_analysis_is_ordered_and_isolated():
+    """Interleaved analyses see each symbol's ticks in order and only its own state"""
+    symbols = SYMBOLS[:4]
+    ticks = {symbol: market_ticks(symbol, 60, seed) for seed, symbol in enumerate(symbols, 3)}
+    states = {symbol: SymbolState(symbol) for symbol in symbols}
+
+    shards = OrderedShards(shards=3)
+    await shards.start()
+    try:
+        snapshots = await analyze_all(shards, states, ticks)
+    finally:
+        await shards.stop()
+
+    for symbol in symbols:
+        # Each analysis saw exactly its own tick as the latest one, in submission order
+        seen = [snapshot.last_price for snapshot in snapshots if snapshot.symbol == symbol]
+        assert seen == [tick["close"] for tick in ticks[symbol]]
+        assert list(states[symbol].buffer) == ticks[symbol]
+        assert states[symbol].analyses == 60
+        assert states[symbol].current_analysis.last_price == ticks[symbol][-1]["close"]
+
+
+async def timed_analyses(shards, symbols, per_symbol=100):
+    ticks = {symbol: market_ticks(symbol, per_symbol, seed) for seed, symbol in enumerate(symbols, 3)}
+    states = {symbol: SymbolState(symbol) for symbol in symbols}
+    started = time.perf_counter()
+    await analyze_all(shards, states, ticks)
+    return time.perf_counter() - started
+
+
+@pytest.mark.benchmark
+async def test_sharded_analysis_overhead():
+    """Benchmark: ordering through the shard queues costs little over direct analysis"""
+    symbols = SYMBOLS[:4]
+    direct = await timed_analyses(OrderedShards(shards=4), symbols)  # Not started: inline
+
+    shards = OrderedShards(shards=4)
+    await shards.start()
+    try:
+        sharded = await timed_analyses(shards, symbols)
+    finally:
+        await shards.stop()
+
+    print(f"\nSymbolState analysis, 4 symbols x 100 ticks: direct {direct * 1000:.0f}ms, "
+          f"sharded {sharded * 1000:.0f}ms")
+    assert sharded < direct * 1.5
+
+
+@pytest.mark.benchmark
+@pytest.mark.skipif((os.cpu_count() or 1) < 4, reason="needs 4 cores")
+async def test_shard_processes_scale_with_symbols():
+    """Benchmark: with shard processes, four symbols' analyses use four cores"""
+    symbols = ["NQU25-CME", "YMU25-CBOT", "RTYU25-CME", "CLV25-NYMEX"]
+    shards = OrderedShards(shards=8, processes=True)
+    assert len({shards.shard_for(symbol) for symbol in symbols}) == len(symbols)
+
+    await shards.start()
+    try:
+        await timed_analyses(shards, symbols, per_symbol=5)  # Spawn the shard processes
+        one = await timed_analyses(shards, symbols[:1], per_symbol=400)
+        four = await timed_analyses(shards, symbols, per_symbol=400)
+    finally:
+        await shards.stop()
+
+    print(f"\nSharded analysis in processes: 1 symbol {one * 1000:.0f}ms, 4 symbols {four * 1000:.0f}ms")
+    assert four < one * 2  # 4x the work in well under 4x the time
@@ -0,0 +1,55 @@
+"""
+Sliding window counter tests
+============================
+
+Validates bucketed expiry and windowed rates.
+"""
+
+import pytest
+
+from minhos.core.sliding_window import SlidingWindowCounter, EventRateTracker
+
+
+def test_events_expire_by_bucket():
+    """Events leave the window once their whole bucket has aged out"""
+    counter = SlidingWindowCounter(60, 1)
+    counter.add(now=0.2)
+    counter.add(now=0.9)
+    counter.add(3, now=30.0)
+
+    assert counter.count(now=59.9) == 5
+    assert counter.count(now=60.0) == 5  # 0.9 is only 59.1s old: bucket 0 still counted
+    assert counter.count(now=61.0) == 3  # Bucket 0 expired
+    assert counter.count(now=90.0) == 3
+    assert counter.count(now=91.0) == 0
+    assert counter.total == 5
+
+
+def test_rate_and_late_events():
+    """Late events fold into the newest bucket and rates scale to the window"""
+    counter = SlidingWindowCounter(3600, 60)
+    for minute in range(30):
+        counter.add(2, now=minute * 60.0)
+    counter.add(now=100.0)  # Older than the newest bucket
+
+    assert counter.count(now=1799.0) == 61
+    assert counter.rate(per_seconds=60, now=1799.0) == pytest.approx(61 / 60)
+
+
+def test_invalid_window_rejected():
+    with pytest.raises(ValueError):
+        SlidingWindowCounter(1, 5)
+
+
+def test_event_rate_tracker_windows():
+    """The tracker reports minute, hour and day counts from one stream"""
+    clock = [0.0]
+    tracker = EventRateTracker(clock=lambda: clock[0])
+    tracker.record()
+    clock[0] = 120.0
+    tracker.record(2)
+
+    assert tracker.get_stats() == {"last_minute": 2, "last_hour": 3, "last_24h": 3, "total": 3}
+    clock[0] = 4000.0
+    assert tracker.get_stats()["last_hour"] == 0
+    assert tracker.get_stats()["last_24h"] == 3
@@ -0,0 +1,130 @@
+"""
+Startup tests
+=============
+
+Validates lazy service imports, the startup timing report, and background
+model warm-up with per-model readiness flags.
+"""
+
+import asyncio
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from minhos.core.startup import ModelWarmup, StartupReport
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class FakeModel:
+    def __init__(self, load_seconds=0.0):
+        time.sleep(load_seconds)  # Stands in for loading artifacts
+        self.warmed = False
+
+    def warm_up(self):
+        self.warmed = True
+
+
+def test_services_package_imports_lazily():
+    """Importing the package or one service leaves the other service modules unloaded"""
+    code = (
+        "import json, sys\n"
+        "import minhos.services as services\n"
+        "before = sorted(m for m in sys.modules if m.startswith('minhos.services.'))\n"
+        "services.StateManager\n"
+        "from minhos.core.startup import get_startup_report\n"
+        "print(json.dumps({'before': before, 'loaded': sorted(sys.modules),\n"
+        "                  'imports': get_startup_report().get_report()['import']}))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert report['before'] == []
+    assert 'minhos.services.state_manager' in report['loaded']
+    for heavy in ('minhos.services.web_api', 'minhos.services.ai_brain_service', 'pandas'):
+        assert heavy not in report['loaded']
+    assert 'minhos.services.state_manager' in report['imports']
+
+
+def test_report_records_imports_once_and_formats():
+    report = StartupReport()
+    report.import_module('json')  # Already imported: not a startup cost
+    with report.timed('service', 'state_manager'):
+        time.sleep(0.01)
+
+    timings = report.get_report()
+    assert timings['import'] == {}
+    assert timings['service']['state_manager'] >= 10
+    assert 'state_manager' in report.format_report()
+
+
+async def test_wait_only_for_needed_models():
+    """Each wait ends when its own models are done, off the event loop; failures end the wait"""
+    warmup = ModelWarmup(StartupReport())
+    ready = {}
+    warmup.register('slow', lambda: FakeModel(0.5), warm=FakeModel.warm_up)  # Loads first
+    warmup.register('fast', lambda: FakeModel(0.0), warm=FakeModel.warm_up,
+                    on_ready=lambda model: ready.__setitem__('fast', model))
+    warmup.register('broken', lambda: 1 / 0)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    warmup.start()
+    try:
+        assert not await warmup.wait_for(['slow'], timeout=0.05)
+        assert await warmup.wait_for(['fast', 'not_registered'], timeout=5)
+        fast_seconds = time.perf_counter() - started
+        assert not await warmup.wait_for(['broken'], timeout=5)
+        assert await warmup.wait_for(['slow'], timeout=5)
+    finally:
+        task.cancel()
+
+    assert ticks >= 20  # Loading ran off the event loop
+    assert fast_seconds >= 0.5  # Fast waited only for the slow load ahead of it
+    assert ready['fast'].warmed and warmup.get('slow').warmed
+    status = warmup.get_status()
+    assert status['broken']['state'] == 'failed' and 'division' in status['broken']['error']
+    assert status['slow']['state'] == 'ready' and status['slow']['load_ms'] >= 500
+    assert set(warmup.report.get_report()['warmup']) == {'slow', 'fast', 'broken'}
+    assert warmup.pending() == []
+
+
+async def test_models_registered_later_start_on_next_start():
+    warmup = ModelWarmup(StartupReport())
+    warmup.register('lstm', FakeModel)
+    warmup.start().join(5)
+    warmup.register('ensemble', FakeModel)
+    assert warmup.pending() == ['ensemble']
+    warmup.start()
+    assert await warmup.wait_for(['lstm', 'ensemble'], timeout=5)
+
+
+async def test_failure_hook_registers_fallbacks():
+    """A model that fails to load can register stand-ins, warmed up by the same run"""
+    warmup = ModelWarmup(StartupReport())
+    ready = {}
+
+    def fall_back(error):
+        assert isinstance(error, ImportError)
+        for name in ('lstm', 'kelly'):
+            warmup.register(name, FakeModel, on_ready=lambda model, name=name: ready.__setitem__(name, model))
+        warmup.start()
+
+    def broken_pipeline():
+        raise ImportError("no module named sklearn")
+
+    warmup.register('pipeline', broken_pipeline, on_failed=fall_back)
+    warmup.start()
+    assert not await warmup.wait_for(['pipeline'], timeout=5)
+    assert await warmup.wait_for(['lstm', 'kelly'], timeout=5)
+    assert set(ready) == {'lstm', 'kelly'} and warmup.get_status()['pipeline']['state'] == 'failed'
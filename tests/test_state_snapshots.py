@@ -0,0 +1,108 @@
+"""
+State snapshot tests
+====================
+
+Validates copy-on-write state snapshots in StateManager and benchmarks
+lock-free read throughput under concurrent P&L updates.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from minhos.services.state_manager import StateManager
+
+SYMBOL = "NQU25-CME"
+
+
+@pytest.fixture
+async def state_manager(temp_dir):
+    manager = StateManager(db_path=temp_dir / "state.db")
+    manager.websocket_enabled = False
+    await manager._load_task
+    await manager.update_position(SYMBOL, 2, "LONG", 21000.0, 21000.0)
+    return manager
+
+
+async def test_snapshots_are_immutable(state_manager):
+    """A published snapshot never changes after later writes"""
+    before = state_manager.get_snapshot()
+    await state_manager._update_position_pnl(SYMBOL, 21010.0)
+    after = state_manager.get_snapshot()
+
+    assert after.version > before.version
+    assert before.positions[SYMBOL].current_price == 21000.0
+    assert after.positions[SYMBOL].unrealized_pnl == pytest.approx(20.0)
+    with pytest.raises(TypeError):
+        after.positions["ESU25-CME"] = None
+
+
+async def test_config_changes_bump_version(state_manager):
+    """Risk parameter updates publish a new snapshot with copied config"""
+    version = state_manager.state_version
+    await state_manager.update_risk_parameters(max_position_size=3)
+
+    snapshot = state_manager.get_snapshot()
+    assert snapshot.version > version
+    assert snapshot.risk_params.max_position_size == 3
+    assert snapshot.risk_params is not state_manager.risk_params
+
+
+async def read_under_pnl_updates(state_manager, seconds):
+    """Read snapshots on a thread while P&L updates stream in on the loop"""
+    stop = threading.Event()
+    results = {"reads": 0, "inconsistent": 0, "version_regressions": 0}
+
+    def reader():
+        last_version = 0
+        while not stop.is_set():
+            snapshot = state_manager.get_snapshot()
+            position = snapshot.positions[SYMBOL]
+            expected = (position.current_price - position.entry_price) * position.quantity
+            if abs(position.unrealized_pnl - expected) > 1e-9:
+                results["inconsistent"] += 1
+            if snapshot.version < last_version:
+                results["version_regressions"] += 1
+            last_version = snapshot.version
+            results["reads"] += 1
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+
+    updates = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        await state_manager._update_position_pnl(SYMBOL, 21000.0 + (updates % 40) * 0.25)
+        updates += 1
+        if updates % 100 == 0:
+            await asyncio.sleep(0)
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    thread.join()
+    results.update(updates=updates, elapsed=elapsed)
+    return results
+
+
+async def test_reads_consistent_under_pnl_updates(state_manager):
+    """Lock-free readers see consistent snapshots and are never starved by writers"""
+    results = await read_under_pnl_updates(state_manager, 0.3)
+
+    assert results["inconsistent"] == 0
+    assert results["version_regressions"] == 0
+    assert results["reads"] >= 2 * results["updates"]
+
+
+@pytest.mark.benchmark
+async def test_read_throughput_under_pnl_updates(state_manager):
+    """Benchmark: lock-free readers stay consistent while P&L updates stream in"""
+    results = await read_under_pnl_updates(state_manager, 1.0)
+    elapsed = results["elapsed"]
+    print(f"\nSnapshot reads: {results['reads'] / elapsed:,.0f}/s "
+          f"with {results['updates'] / elapsed:,.0f} P&L updates/s")
+
+    assert results["inconsistent"] == 0
+    assert results["version_regressions"] == 0
+    assert results["reads"] > 10_000
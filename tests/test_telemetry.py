@@ -0,0 +1,89 @@
+"""
+Telemetry buffer tests
+======================
+
+Validates ring-buffer ordering, windowed views and aggregates, missing
+values and constant memory of TelemetryBuffer.
+"""
+
+import numpy as np
+import pytest
+
+from minhos.core.telemetry import Histogram, TelemetryBuffer
+
+
+def make_buffer(capacity=8):
+    return TelemetryBuffer(capacity, {"timestamp": "f8", "latency_ms": "f8", "signal": "U8", "hit": "b1"})
+
+
+def test_ring_keeps_latest_rows_in_order():
+    """Once full the oldest rows are overwritten and reads stay oldest-first"""
+    buffer = make_buffer(capacity=5)
+    for i in range(12):
+        buffer.append(timestamp=float(i), latency_ms=i * 10.0, signal="BUY" if i % 2 else "SELL")
+
+    assert len(buffer) == 5 and buffer.total == 12
+    assert buffer.column("timestamp").tolist() == [7.0, 8.0, 9.0, 10.0, 11.0]
+    assert buffer.column("latency_ms", last=3).tolist() == [90.0, 100.0, 110.0]
+    assert [r["signal"] for r in buffer.records(2)] == ["SELL", "BUY"]
+    assert buffer.latest()["timestamp"] == 11.0
+
+
+def test_windows_are_views_when_contiguous():
+    """Full-history and non-wrapping windows do not copy"""
+    buffer = make_buffer(capacity=6)
+    for i in range(4):
+        buffer.append(latency_ms=float(i))
+    assert np.shares_memory(buffer.column("latency_ms"), buffer._columns["latency_ms"])
+
+    for i in range(4, 9):
+        buffer.append(latency_ms=float(i))  # Head is now mid-ring
+    assert np.shares_memory(buffer.column("latency_ms", last=3), buffer._columns["latency_ms"])
+    assert np.shares_memory(buffer.column("latency_ms", ordered=False), buffer._columns["latency_ms"])
+    assert buffer.column("latency_ms").tolist() == [3.0, 4.0, 5.0, 6.0, 7.0, 8.0]
+
+
+def test_aggregates_ignore_missing_values():
+    """Missing floats are NaN in storage, None in records and skipped by aggregates"""
+    buffer = make_buffer()
+    assert buffer.mean("latency_ms") is None
+    assert buffer.percentiles("latency_ms") == {"p50": None, "p95": None, "p99": None}
+
+    for value in [10.0, None, 20.0, 30.0, None, 40.0]:
+        buffer.append(timestamp=1.0, latency_ms=value, signal="HOLD")
+
+    assert buffer.mean("latency_ms") == pytest.approx(25.0)
+    assert buffer.mean("latency_ms", last=2) == pytest.approx(40.0)
+    assert buffer.percentile("latency_ms", 50) == pytest.approx(25.0)
+    assert buffer.summary("latency_ms")["count"] == 4
+    assert buffer.records()[1]["latency_ms"] is None
+    assert buffer.records()[0]["hit"] is False
+
+
+def test_memory_is_constant():
+    """Appending far beyond capacity does not grow the buffer"""
+    buffer = make_buffer(capacity=1000)
+    nbytes = buffer.nbytes
+    rng = np.random.default_rng(3)
+    for i, value in enumerate(rng.exponential(20.0, 50_000)):
+        buffer.append(timestamp=float(i), latency_ms=float(value), signal="BUY")
+
+    assert buffer.nbytes == nbytes
+    assert len(buffer) == 1000 and buffer.total == 50_000
+    assert buffer.since(49_900.0).sum() == 100
+    stats = buffer.percentiles("latency_ms")
+    assert stats["p50"] < stats["p95"] < stats["p99"]
+
+
+def test_histogram_buckets_are_upper_bounds():
+    """Values land in the first bucket whose edge is at least the value"""
+    histogram = Histogram([1, 2, 4, 8])
+    for value in [0.5, 1, 1.5, 2, 3, 8, 9, 100]:
+        histogram.record(value)
+
+    result = histogram.to_dict()
+    assert result["buckets"] == {"<=1": 2, "<=2": 2, "<=4": 1, "<=8": 1, ">8": 2}
+    assert result["count"] == 8 and result["mean"] == pytest.approx(125 / 8)
+    histogram.clear()
+    assert histogram.to_dict()["mean"] is None
+
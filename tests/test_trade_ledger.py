@@ -0,0 +1,67 @@
+"""
+Trade ledger tests
+==================
+
+Validates fill matching, realized P&L and the indexed lookback queries.
+"""
+
+import time
+
+import pytest
+
+from minhos.core.trade_ledger import TradeLedger
+
+
+@pytest.fixture
+def ledger(temp_dir):
+    return TradeLedger(temp_dir / "ledger.db")
+
+
+def test_round_trip_realizes_pnl(ledger):
+    """Opening and closing a long produces one trade with realized P&L"""
+    ledger.record_fill("NQU25-CME", "BUY", 2, 100.0)
+    ledger.record_fill("NQU25-CME", "BUY", 2, 110.0)
+    fill = ledger.record_fill("NQU25-CME", "SELL", 4, 120.0)
+
+    assert fill.position_after == 0
+    assert fill.realized_pnl == pytest.approx((120.0 - 105.0) * 4)
+
+    trades = ledger.get_trades(days=1, symbol="NQU25-CME")
+    assert len(trades) == 1
+    assert trades[0].side == "LONG"
+    assert trades[0].entry_price == pytest.approx(105.0)
+
+
+def test_reversal_opens_new_position(ledger):
+    """A fill larger than the open position reverses it at the fill price"""
+    ledger.record_fill("ESU25-CME", "SELL", 1, 50.0)
+    fill = ledger.record_fill("ESU25-CME", "BUY", 3, 45.0)
+
+    assert fill.realized_pnl == pytest.approx(5.0)
+    assert ledger.get_open_position("ESU25-CME") == (2, 45.0)
+
+
+def test_open_positions_restored(temp_dir):
+    """Open positions survive a ledger restart"""
+    TradeLedger(temp_dir / "ledger.db").record_fill("YMU25-CBOT", "BUY", 3, 42000.0)
+
+    restored = TradeLedger(temp_dir / "ledger.db")
+    assert restored.get_open_position("YMU25-CBOT") == (3, 42000.0)
+
+
+def test_pnl_arrays_are_cached_until_next_fill(ledger):
+    """Columnar P&L arrays are reused until a new fill bumps the version"""
+    now = time.time()
+    ledger.record_fill("NQU25-CME", "BUY", 1, 100.0, timestamp=now - 10)
+    ledger.record_fill("NQU25-CME", "SELL", 1, 90.0, timestamp=now - 5)
+
+    first = ledger.get_pnl_arrays(days=1, symbol="NQU25-CME")
+    assert first is ledger.get_pnl_arrays(days=1, symbol="NQU25-CME")
+    assert list(first['realized_pnl']) == [-10.0]
+
+    ledger.record_fill("NQU25-CME", "BUY", 1, 95.0, timestamp=now - 2)
+    ledger.record_fill("NQU25-CME", "SELL", 1, 97.0, timestamp=now - 1)
+
+    second = ledger.get_pnl_arrays(days=1, symbol="NQU25-CME")
+    assert list(second['realized_pnl']) == [-10.0, 2.0]
+    assert ledger.get_pnl_arrays(days=1, symbol="ESU25-CME")['realized_pnl'].size == 0
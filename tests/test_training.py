@@ -0,0 +1,148 @@
+"""
+Training executor tests
+=======================
+
+Validates out-of-process training: resource limits in the child, progress
+streaming, checkpoint and resume across a time-budget stop, failures, and
+that the event loop and live inference keep their latency while a job
+burns CPU.
+"""
+
+import asyncio
+import os
+import time
+
+import numpy as np
+import pytest
+
+from minhos.core.training import TrainingBudgetExceeded, TrainingExecutor, TrainingFailed, TrainingLimits
+from tests.helpers import startup_env
+
+
+def burn_steps(context):
+    """Training stand-in: CPU-bound steps, a checkpoint and a progress message after each"""
+    steps, step_seconds = context.config['steps'], context.config['step_seconds']
+    start = (context.load_checkpoint() or {'step': 0})['step']
+    a = np.random.default_rng(0).normal(size=(64, 64))
+    for step in range(start, steps):
+        if context.should_stop():
+            return {'success': False, 'step': step, 'resumed_from': start}
+        deadline = time.perf_counter() + step_seconds
+        while time.perf_counter() < deadline:
+            a = np.tanh(a @ a.T / 64)
+        context.save_checkpoint({'step': step + 1})
+        context.progress(step + 1, steps, loss=float(np.abs(a).mean()))
+    return {'success': True, 'resumed_from': start, 'nice': os.nice(0), 'threads': os.environ['OMP_NUM_THREADS'],
+            'startup_threads': startup_env('OMP_NUM_THREADS') if os.path.exists('/proc/self/environ') else '1'}
+
+
+def crash(context):
+    raise ValueError("bad training data")
+
+
+def ignore_budget(context):
+    time.sleep(60)
+
+
+def limits(**kwargs):
+    return TrainingLimits(**{'cpu_cores': 1, 'memory_mb': 2048, 'niceness': 5, 'time_budget_s': 60, **kwargs})
+
+
+async def test_limits_applied_and_progress_streamed(temp_dir):
+    executor = TrainingExecutor(temp_dir, limits())
+    progress = []
+    outcome = await executor.run('job-1', 'tests.test_training:burn_steps', {'steps': 5, 'step_seconds': 0.01},
+                                 on_progress=progress.append)
+
+    result = outcome['result']
+    assert result['success'] and result['resumed_from'] == 0
+    assert [message['step'] for message in progress] == [1, 2, 3, 4, 5]
+    assert result['nice'] >= 5 and result['threads'] == '1'
+    assert result['startup_threads'] == '1'  # Capped before the child imported numpy
+    assert len(outcome['limits']['cpu_affinity']) == 1 and outcome['limits']['memory_mb'] == 2048
+    assert result['nice'] != os.nice(0)  # Only the training process was niced
+    assert executor.get_status()['job-1']['state'] == 'completed'
+
+    executor.cleanup('job-1')
+    assert not executor.work_dir('job-1').exists()
+
+
+async def test_budget_stop_then_resume_from_checkpoint(temp_dir):
+    """A job out of budget checkpoints and returns; the next run continues where it stopped"""
+    executor = TrainingExecutor(temp_dir, limits(time_budget_s=2.0))
+    config = {'steps': 40, 'step_seconds': 0.1}
+
+    first = await executor.run('job-2', 'tests.test_training:burn_steps', config)
+    assert first['budget_exhausted'] and not first['result']['success']
+    stopped_at = first['result']['step']
+    assert 0 < stopped_at < 40
+
+    progress = []
+    second = await executor.run('job-2', 'tests.test_training:burn_steps', config,
+                                on_progress=progress.append, limits=limits())
+    assert second['result']['success'] and second['result']['resumed_from'] == stopped_at
+    assert progress[0]['step'] == stopped_at + 1 and progress[-1]['step'] == 40
+
+
+async def test_failures_reach_the_caller(temp_dir):
+    executor = TrainingExecutor(temp_dir, limits())
+    with pytest.raises(TrainingFailed, match="bad training data"):
+        await executor.run('job-3', 'tests.test_training:crash')
+
+    started = time.perf_counter()
+    with pytest.raises(TrainingBudgetExceeded):
+        await executor.run('job-4', 'tests.test_training:ignore_budget', limits=limits(time_budget_s=0.5, grace_s=0.5))
+    assert time.perf_counter() - started < 10  # Terminated, not waited out
+    assert executor.get_status()['job-4']['state'] == 'failed'
+
+
+async def serve_during_training(temp_dir):
+    """Loop lag and inference time (ms), idle and while a job burns CPU"""
+    executor = TrainingExecutor(temp_dir, limits(niceness=19))
+    weights = np.random.default_rng(1).normal(size=(32, 32))
+    samples = {'idle': [], 'training': []}
+    phase = 'idle'
+
+    async def serve():
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(0.005)
+            lag = time.perf_counter() - started - 0.005
+            started = time.perf_counter()
+            np.tanh(weights @ np.ones(32))  # Stands in for a live prediction
+            if phase is not None:
+                samples[phase].append((lag, time.perf_counter() - started))
+
+    def on_progress(message):
+        nonlocal phase
+        phase = 'training'
+
+    server = asyncio.create_task(serve())
+    try:
+        await asyncio.sleep(0.5)
+        phase = None  # Process start-up is not training
+        outcome = await executor.run('job-5', 'tests.test_training:burn_steps', {'steps': 30, 'step_seconds': 0.1},
+                                     on_progress=on_progress)
+    finally:
+        server.cancel()
+
+    assert outcome['result']['success']
+    idle, busy = (np.array(samples[name]) * 1000 for name in ('idle', 'training'))
+    assert len(busy) > 100
+    return idle, busy
+
+
+async def test_event_loop_latency_during_training(temp_dir):
+    """While a job burns CPU, loop ticks stay within a loose lag bound"""
+    idle, busy = await serve_during_training(temp_dir)
+    assert np.percentile(busy[:, 0], 99) < 50
+
+
+@pytest.mark.benchmark
+async def test_event_loop_and_inference_latency_during_training(temp_dir):
+    """While a job burns CPU, loop ticks stay on time and a small inference keeps its idle latency"""
+    idle, busy = await serve_during_training(temp_dir)
+    print(f"\nLoop lag idle/training: p99 {np.percentile(idle[:, 0], 99):.2f}/{np.percentile(busy[:, 0], 99):.2f}ms; "
+          f"inference p50 {np.median(idle[:, 1]) * 1000:.0f}/{np.median(busy[:, 1]) * 1000:.0f}us")
+    assert np.percentile(busy[:, 0], 99) < 20
+    assert np.median(busy[:, 1]) < 2 * np.median(idle[:, 1]) + 0.02
@@ -0,0 +1,340 @@
+"""
+Tree ensemble kernel tests
+==========================
+
+Validates the flat-array evaluator against node-by-node reference walks of
+each library's model format (XGBoost JSON, LightGBM dump, scikit-learn
+tree arrays, CatBoost oblivious trees), the scaler and meta-learner
+folding, save/load, and that the ensemble manager serves from the kernel
+without the model libraries.
+"""
+
+import json
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from capabilities.ensemble.ensemble_manager import EnsembleManager
+from capabilities.ensemble.tree_kernel import TreeEnsembleKernel, compile_ensemble, compile_tree_model
+from minhos.core.feature_store import ENSEMBLE_FEATURES
+
+
+def random_tree(rng, features, depth):
+    """Nested split/leaf dicts with float32-representable thresholds"""
+    if depth == 0 or rng.random() < 0.15:
+        return {'leaf': float(rng.normal(0, 0.1))}
+    return {
+        'feature': int(rng.integers(features)),
+        'threshold': float(np.float32(rng.normal(0, 1))),
+        'default_left': bool(rng.random() < 0.5),
+        'left': random_tree(rng, features, depth - 1),
+        'right': random_tree(rng, features, depth - 1)
+    }
+
+
+def flatten(tree):
+    """Breadth-first arrays; -1 children mark leaves"""
+    nodes, queue = [], [tree]
+    while queue:
+        node = queue.pop(0)
+        nodes.append(node)
+        if 'leaf' not in node:
+            node['_children'] = (len(nodes) + len(queue), len(nodes) + len(queue) + 1)
+            queue += [node['left'], node['right']]
+    leaf = ['leaf' in node for node in nodes]
+    return {
+        'feature': [0 if is_leaf else node['feature'] for node, is_leaf in zip(nodes, leaf)],
+        'threshold': [0.0 if is_leaf else node['threshold'] for node, is_leaf in zip(nodes, leaf)],
+        'value': [node['leaf'] if is_leaf else 0.0 for node, is_leaf in zip(nodes, leaf)],
+        'default_left': [not is_leaf and node['default_left'] for node, is_leaf in zip(nodes, leaf)],
+        'left': [-1 if is_leaf else node['_children'][0] for node, is_leaf in zip(nodes, leaf)],
+        'right': [-1 if is_leaf else node['_children'][1] for node, is_leaf in zip(nodes, leaf)]
+    }
+
+
+class XGBRegressor:
+    """XGBoost JSON model: leaf values live in split_conditions, split is x < condition"""
+
+    def __init__(self, rng, features, n_trees=20, depth=6):
+        self.trees = [random_tree(rng, features, depth) for _ in range(n_trees)]
+        self.base_score = 0.25
+
+    def get_booster(self):
+        return self
+
+    def save_raw(self, raw_format):
+        trees = []
+        for tree in map(flatten, self.trees):
+            trees.append({
+                'left_children': tree['left'], 'right_children': tree['right'],
+                'split_indices': tree['feature'], 'default_left': [int(d) for d in tree['default_left']],
+                'split_conditions': [v if l < 0 else t for v, t, l in zip(tree['value'], tree['threshold'], tree['left'])]
+            })
+        model = {'learner': {
+            'objective': {'name': 'reg:squarederror'},
+            'learner_model_param': {'base_score': f"[{self.base_score:E}]"},
+            'gradient_booster': {'name': 'gbtree', 'model': {'trees': trees}}
+        }}
+        return bytearray(json.dumps(model).encode())
+
+    def reference(self, row):
+        total = 0.0
+        for node in self.trees:
+            while 'leaf' not in node:
+                x = np.float32(row[node['feature']])
+                go_left = node['default_left'] if np.isnan(x) else x < np.float32(node['threshold'])
+                node = node['left'] if go_left else node['right']
+            total += node['leaf']
+        return self.base_score + total
+
+
+class LGBMRegressor:
+    """LightGBM dump_model(): nested nodes, x <= threshold in float64, NaN as 0 unless missing_type NaN"""
+
+    def __init__(self, rng, features, n_trees=20, depth=6):
+        self.trees = [random_tree(rng, features, depth) for _ in range(n_trees)]
+        for tree in self.trees:
+            self._missing(tree, rng)
+        self.booster_ = self
+
+    def _missing(self, node, rng):
+        if 'leaf' not in node:
+            node['threshold'] += float(rng.normal(0, 1e-9))  # Not float32-representable
+            node['missing_type'] = 'NaN' if rng.random() < 0.5 else 'None'
+            self._missing(node['left'], rng)
+            self._missing(node['right'], rng)
+
+    def dump_model(self):
+        def dump(node):
+            if 'leaf' in node:
+                return {'leaf_index': 0, 'leaf_value': node['leaf']}
+            return {'split_index': 0, 'split_feature': node['feature'], 'threshold': node['threshold'],
+                    'decision_type': '<=', 'default_left': node['default_left'],
+                    'missing_type': node['missing_type'],
+                    'left_child': dump(node['left']), 'right_child': dump(node['right'])}
+        return {'objective': 'regression', 'tree_info': [{'tree_structure': dump(tree)} for tree in self.trees]}
+
+    def reference(self, row):
+        total = 0.0
+        for node in self.trees:
+            while 'leaf' not in node:
+                x = float(row[node['feature']])
+                if np.isnan(x) and node['missing_type'] == 'NaN':
+                    go_left = node['default_left']
+                else:
+                    go_left = (0.0 if np.isnan(x) else x) <= node['threshold']
+                node = node['left'] if go_left else node['right']
+            total += node['leaf']
+        return total
+
+
+class RandomForestRegressor:
+    """scikit-learn forest: tree_ arrays, float32 inputs against float64 thresholds, mean of trees"""
+
+    def __init__(self, rng, features, n_trees=20, depth=6):
+        self.trees = [random_tree(rng, features, depth) for _ in range(n_trees)]
+        self.estimators_ = []
+        for tree in map(flatten, self.trees):
+            node_count = len(tree['feature'])
+            self.estimators_.append(SimpleNamespace(tree_=SimpleNamespace(
+                node_count=node_count,
+                feature=np.array(tree['feature']), threshold=np.array(tree['threshold']) + 1e-9,
+                children_left=np.array(tree['left']), children_right=np.array(tree['right']),
+                value=np.array(tree['value']).reshape(node_count, 1, 1),
+                missing_go_to_left=np.array(tree['default_left'], dtype=np.uint8))))
+
+    def reference(self, row):
+        total = 0.0
+        for estimator in self.estimators_:
+            tree, node = estimator.tree_, 0
+            while tree.children_left[node] >= 0:
+                x = np.float32(row[tree.feature[node]])
+                go_left = tree.missing_go_to_left[node] if np.isnan(x) else float(x) <= tree.threshold[node]
+                node = tree.children_left[node] if go_left else tree.children_right[node]
+            total += tree.value[node, 0, 0]
+        return total / len(self.estimators_)
+
+
+class CatBoostRegressor:
+    """CatBoost JSON: oblivious trees, split d sets bit d of the leaf index when x > border"""
+
+    def __init__(self, rng, features, n_trees=20, depth=6):
+        self.float_features = [{'feature_index': i, 'flat_feature_index': int(flat),
+                                'nan_value_treatment': str(rng.choice(['AsIs', 'AsFalse', 'AsTrue']))}
+                               for i, flat in enumerate(rng.permutation(features))]
+        self.trees = []
+        for _ in range(n_trees):
+            tree_depth = int(rng.integers(0, depth + 1))
+            self.trees.append({
+                'splits': [{'float_feature_index': int(rng.integers(features)), 'split_type': 'FloatFeature',
+                            'border': float(np.float32(rng.normal(0, 1)))} for _ in range(tree_depth)],
+                'leaf_values': rng.normal(0, 0.1, 2 ** tree_depth).tolist()
+            })
+        self.scale_and_bias = [0.5, [0.1]]
+
+    def save_model(self, path, format):
+        with open(path, 'w') as f:
+            json.dump({'features_info': {'float_features': self.float_features},
+                       'oblivious_trees': self.trees, 'scale_and_bias': self.scale_and_bias}, f)
+
+    def reference(self, row):
+        total = 0.0
+        for tree in self.trees:
+            index = 0
+            for d, split in enumerate(tree['splits']):
+                info = self.float_features[split['float_feature_index']]
+                x = np.float32(row[info['flat_feature_index']])
+                bit = info['nan_value_treatment'] == 'AsTrue' if np.isnan(x) else x > np.float32(split['border'])
+                index |= int(bit) << d
+            total += tree['leaf_values'][index]
+        return self.scale_and_bias[0] * total + self.scale_and_bias[1][0]
+
+
+MODELS = {'xgboost': XGBRegressor, 'lightgbm': LGBMRegressor,
+          'random_forest': RandomForestRegressor, 'catboost': CatBoostRegressor}
+
+
+def inputs(rng, models, rows=64, features=20):
+    """Normal rows plus rows sitting exactly on split thresholds, and NaNs"""
+    def splits(node):
+        if 'feature' in node:
+            yield node['feature'], node['threshold']
+            yield from splits(node['left'])
+            yield from splits(node['right'])
+        for split in node.get('splits', []):
+            yield models[-1].float_features[split['float_feature_index']]['flat_feature_index'], split['border']
+
+    x = rng.normal(0, 1, (rows, features))
+    thresholds = [split for model in models for tree in model.trees for split in splits(tree)]
+    for i, (feature, threshold) in enumerate(thresholds[:rows // 2]):
+        x[i, feature] = threshold
+    x[rng.random(x.shape) < 0.05] = np.nan
+    return x
+
+
+def fitted_ensemble(rng, features=20, n_trees=20):
+    models = {name: cls(rng, features, n_trees) for name, cls in MODELS.items()}
+    scaler = SimpleNamespace(mean_=rng.normal(0, 0.1, features), scale_=rng.uniform(0.5, 2, features))
+    meta = SimpleNamespace(coef_=np.array([0.4, 0.3, 0.2, 0.1]), intercept_=0.01)
+    return models, scaler, meta
+
+
+@pytest.mark.parametrize('name', list(MODELS))
+def test_each_format_matches_reference(name):
+    """Single and batched outputs match a node-by-node walk of the library format"""
+    rng = np.random.default_rng(11)
+    model = MODELS[name](rng, 20)
+    kernel = TreeEnsembleKernel.from_models({name: compile_tree_model(model)})
+    x = inputs(rng, [model])
+
+    batched = kernel.predict_base(x)
+    assert batched.shape == (len(x), 1)
+    for i, row in enumerate(x):
+        expected = model.reference(row)
+        assert kernel.predict_base(row)[0, 0] == pytest.approx(expected, abs=1e-12)
+        assert batched[i, 0] == pytest.approx(expected, abs=1e-12)
+
+
+def test_ensemble_scaler_meta_and_roundtrip(temp_dir):
+    """All four models in one pass, with the scaler and linear meta-learner folded in"""
+    rng = np.random.default_rng(5)
+    models, scaler, meta = fitted_ensemble(rng)
+    kernel = compile_ensemble(models, scaler, meta)
+    raw = rng.normal(0, 1, (32, 20))
+    scaled = (raw - scaler.mean_) / scaler.scale_
+
+    base = kernel.predict_base(raw)
+    assert kernel.model_names == tuple(MODELS)
+    expected = np.array([[model.reference(row) for model in models.values()] for row in scaled])
+    assert np.allclose(base, expected, atol=1e-12)
+    assert np.allclose(kernel.predict_base(scaled, scaled=True), base)
+    assert np.allclose(kernel.predict_meta(base), expected @ meta.coef_ + meta.intercept_)
+
+    loaded = TreeEnsembleKernel.load(kernel.save(str(temp_dir / "tree_kernel.npz")))
+    assert np.array_equal(loaded.predict_base(raw), base)
+    assert np.array_equal(loaded.predict_meta(base), kernel.predict_meta(base))
+    assert compile_ensemble(models, scaler).predict_meta(base) is None
+
+
+def test_rejects_models_it_cannot_reproduce():
+    rng = np.random.default_rng(1)
+    with pytest.raises(ValueError):
+        compile_tree_model(type('SVR', (), {})())
+
+    lgbm = LGBMRegressor(rng, 4, n_trees=1, depth=1)
+    dump = lgbm.dump_model()
+    dump['tree_info'] = [{'tree_structure': {'split_index': 0, 'split_feature': 0, 'threshold': '1||2',
+                                             'decision_type': '==', 'left_child': {'leaf_value': 0.0},
+                                             'right_child': {'leaf_value': 1.0}}}]
+    lgbm.dump_model = lambda: dump
+    with pytest.raises(ValueError):
+        compile_tree_model(lgbm)
+
+    xgb = XGBRegressor(rng, 4, n_trees=1)
+    raw = json.loads(xgb.save_raw('json'))
+    raw['learner']['objective']['name'] = 'binary:logistic'
+    xgb.save_raw = lambda raw_format: json.dumps(raw).encode()
+    with pytest.raises(ValueError):
+        compile_tree_model(xgb)
+
+    models = {'random_forest': RandomForestRegressor(rng, 4, n_trees=2)}
+    with pytest.raises(ValueError):
+        compile_ensemble(models, meta_learner=type('IsotonicRegression', (), {})())
+
+
+async def test_manager_serves_from_kernel(temp_dir):
+    """A compiled kernel makes the manager ready without the model libraries"""
+    rng = np.random.default_rng(3)
+    model_path = temp_dir / "ensemble"
+    model_path.mkdir()
+    compile_ensemble(*fitted_ensemble(rng, features=len(ENSEMBLE_FEATURES))).save(str(model_path / "tree_kernel.npz"))
+
+    manager = EnsembleManager(model_path=str(model_path))
+    assert manager.is_enabled and manager.is_trained and not manager.base_models
+    assert manager.warm_up()
+    stats = manager.get_performance_stats()
+    assert stats['inference_backend'] == 'numpy' and stats['base_models'] == list(MODELS)
+
+    bars = [{'price': 21000.0 + np.sin(i / 5) * 10, 'volume': 100 + i, 'high': 21015.0 + i,
+             'low': 20985.0 + i, 'timestamp': 1_700_000_000.0 + 60 * i} for i in range(30)]
+    result = await manager.predict_ensemble(bars)
+    assert result['source'] == 'ensemble_ml_models'
+    assert result['ensemble_method'] == 'stacking'
+    assert set(result['base_predictions']) == set(MODELS)
+
+
+def kernel_timings():
+    """Microseconds per row and milliseconds per 1k-row batch for 4 models x 100 depth-6 trees"""
+    rng = np.random.default_rng(9)
+    kernel = compile_ensemble(*fitted_ensemble(rng, n_trees=100))
+    row = rng.normal(0, 1, 20)
+    kernel.predict_base(row)
+
+    started = time.perf_counter()
+    for _ in range(200):
+        kernel.predict_base(row)
+    row_us = (time.perf_counter() - started) / 200 * 1e6
+
+    batch = rng.normal(0, 1, (1000, 20))
+    started = time.perf_counter()
+    kernel.predict_base(batch)
+    return row_us, (time.perf_counter() - started) * 1000
+
+
+def test_kernel_latency():
+    """One row and a 1k-row batch, with headroom for a loaded machine"""
+    row_us, batch_ms = kernel_timings()
+    assert row_us < 10_000
+    assert batch_ms < 2500
+
+
+@pytest.mark.benchmark
+def test_kernel_latency_benchmark():
+    """Benchmark: 4 models x 100 depth-6 trees, one row and a 1k-row batch"""
+    row_us, batch_ms = kernel_timings()
+    print(f"\nTree kernel: {row_us:.0f}us per row, {batch_ms:.1f}ms per 1k rows")
+
+    assert row_us < 2000
+    assert batch_ms < 500
@@ -0,0 +1,111 @@
+"""
+VaR engine tests
+================
+
+Validates Monte Carlo VaR/ES against closed-form values, component
+additivity, concurrent computes and compute time.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from minhos.core.correlation import CorrelationEngine
+from minhos.core.var_engine import MonteCarloVaREngine, VaRConfig
+
+SYMBOLS = ["NQU25-CME", "ESU25-CME", "RTYU25-CME", "YMU25-CBOT"]
+
+
+@pytest.fixture
+def correlations():
+    """Four index futures driven by a common fat-tailed factor"""
+    engine = CorrelationEngine(halflife_bars=500)
+    rng = np.random.default_rng(11)
+    prices = np.array([21000.0, 5800.0, 2200.0, 42000.0])
+    for _ in range(2000):
+        prices *= np.exp(rng.standard_t(4) * 0.0004 + rng.standard_normal(4) * 0.0002)
+        engine.on_bar_close(dict(zip(SYMBOLS, prices)))
+    return engine
+
+
+def test_gaussian_var_matches_closed_form():
+    """Without history, single-asset VaR/ES match the normal distribution"""
+    config = VaRConfig(seed=3, horizons_bars={"1d": 1380})
+    engine = MonteCarloVaREngine(config)
+    snapshot = CorrelationEngine().get_snapshot()
+
+    report = engine.compute({"NQU25-CME": 1_000_000.0}, snapshot)
+    level = report["horizons"]["1d"]["levels"]["99"]
+
+    assert report["method"] == "gaussian"
+    assert level["var"] == pytest.approx(1_000_000 * -np.expm1(-2.326 * 0.015), rel=0.03)
+    assert level["es"] == pytest.approx(1_000_000 * -np.expm1(-2.665 * 0.015), rel=0.03)
+
+
+def test_components_sum_and_hedging(correlations):
+    """Component VaR/ES add up, and a hedged book carries less tail risk"""
+    engine = MonteCarloVaREngine(VaRConfig(seed=5))
+    snapshot = correlations.get_snapshot()
+
+    long_book = {"NQU25-CME": 400_000.0, "ESU25-CME": 300_000.0}
+    hedged_book = {"NQU25-CME": 400_000.0, "ESU25-CME": -300_000.0}
+
+    long_report = engine.compute(long_book, snapshot, correlations.get_return_history(list(long_book)))
+    hedged_report = engine.compute(hedged_book, snapshot, correlations.get_return_history(list(hedged_book)))
+
+    level = long_report["horizons"]["1d"]["levels"]["95"]
+    assert long_report["method"] == "bootstrap"
+    assert sum(level["component_var"].values()) == pytest.approx(level["var"], rel=1e-6)
+    assert sum(level["component_es"].values()) == pytest.approx(level["es"], rel=1e-6)
+    assert level["es"] >= level["var"]
+    assert hedged_report["horizons"]["1d"]["levels"]["95"]["var"] < level["var"]
+
+
+def test_concurrent_computes_use_independent_generators(correlations):
+    """Threaded computes draw the same per-call streams as sequential ones"""
+    snapshot = correlations.get_snapshot()
+    book = {"NQU25-CME": 400_000.0, "ESU25-CME": -300_000.0}
+    history = correlations.get_return_history(list(book))
+
+    def es(report):
+        return report["horizons"]["1d"]["levels"]["99"]["es"]
+
+    sequential = MonteCarloVaREngine(VaRConfig(seed=9))
+    expected = sorted(es(sequential.compute(book, snapshot, history)) for _ in range(6))
+
+    threaded = MonteCarloVaREngine(VaRConfig(seed=9))
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        reports = list(pool.map(lambda _: threaded.compute(book, snapshot, history), range(6)))
+    assert sorted(es(report) for report in reports) == expected
+    assert len(set(expected)) == 6  # Each call drew its own scenarios
+
+
+def median_compute_ms(correlations):
+    """Median wall time of a full four-symbol 100k-scenario report"""
+    engine = MonteCarloVaREngine()
+    snapshot = correlations.get_snapshot()
+    book = {"NQU25-CME": 840_000.0, "ESU25-CME": -290_000.0, "RTYU25-CME": 330_000.0, "YMU25-CBOT": 210_000.0}
+    history = correlations.get_return_history(SYMBOLS)
+
+    engine.compute(book, snapshot, history)  # Warm up
+    timings = []
+    for _ in range(5):
+        started = time.perf_counter()
+        engine.compute(book, snapshot, history)
+        timings.append((time.perf_counter() - started) * 1000)
+    return sorted(timings)[2]
+
+
+def test_100k_scenarios_within_a_bar(correlations):
+    """A 100k-scenario report leaves ample headroom even on a loaded machine"""
+    assert median_compute_ms(correlations) < 500
+
+
+@pytest.mark.benchmark
+def test_100k_scenarios_under_100ms(correlations):
+    """Benchmark: full four-symbol report with 100k scenarios"""
+    median = median_compute_ms(correlations)
+    print(f"\nVaR/ES (100k scenarios, 2 horizons, 2 levels): median {median:.1f}ms")
+    assert median < 100
@@ -0,0 +1,173 @@
+"""
+Vector index tests
+==================
+
+Validates LSH recall against exact cosine search, row reuse on removal,
+expiry filtering and query latency of VectorIndex, and that the inference
+cache only matches real feature vectors by similarity, including the LSTM
+predictor's sequences.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from capabilities.prediction.lstm.lstm_predictor import LSTMPredictor
+from capabilities.prediction.lstm.numpy_kernel import export_keras_model
+from minhos.core.vector_index import VectorIndex
+from minhos.services import ml_inference_cache
+from minhos.services.ml_inference_cache import MLInferenceCache
+from tests.test_lstm_kernel import trained_like_model
+
+
+def clustered(rng, n, dim, centers=200, spread=0.05):
+    """Feature vectors scattered around a few hundred market states"""
+    base = rng.standard_normal((centers, dim))
+    return base[rng.integers(0, centers, n)] + rng.standard_normal((n, dim)) * spread
+
+
+def exact_best(matrix, query):
+    units = matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+    similarity = units @ (query / np.linalg.norm(query))
+    best = int(np.argmax(similarity))
+    return best, float(similarity[best])
+
+
+def test_lsh_matches_exact_search():
+    """Above the exact threshold, LSH finds the exact best match nearly always"""
+    rng = np.random.default_rng(1)
+    vectors = clustered(rng, 5000, 24)
+    index = VectorIndex(24, exact_below=100)
+    for i, vector in enumerate(vectors):
+        assert index.add(f"k{i}", vector, timestamp=0.0)
+
+    queries = vectors[rng.integers(0, len(vectors), 300)] + rng.standard_normal((300, 24)) * 0.02
+    agree = 0
+    for query in queries:
+        best, similarity = exact_best(vectors, query)
+        match = index.query(query, threshold=0.95)
+        assert match is None or match[1] <= similarity + 1e-5
+        if match and (match[0] == f"k{best}" or match[1] == pytest.approx(similarity, abs=1e-5)):
+            agree += 1
+
+    assert agree >= 0.97 * len(queries)
+    assert index.get_stats()["avg_candidates"] < len(vectors) / 4
+
+
+def test_remove_reuses_rows_and_filters_expired():
+    """Removed keys never match; expired rows are skipped; rows are reused"""
+    index = VectorIndex(3)
+    index.add("old", [1.0, 0.0, 0.0], timestamp=100.0)
+    index.add("new", [0.99, 0.1, 0.0], timestamp=200.0)
+    assert index.query([1.0, 0.0, 0.0], 0.9)[0] == "old"
+    assert index.query([1.0, 0.0, 0.0], 0.9, min_timestamp=150.0)[0] == "new"
+
+    assert index.remove("old") and not index.remove("old")
+    assert index.query([1.0, 0.0, 0.0], 0.9)[0] == "new"
+    index.add("again", [0.0, 1.0, 0.0], timestamp=300.0)
+    assert index.get_stats()["capacity"] == 1024 and len(index) == 2
+
+    index.add("new", [0.0, 0.0, 1.0], timestamp=400.0)  # Replacing moves the key
+    assert index.query([1.0, 0.0, 0.0], 0.9) is None
+    assert not index.add("zero", [0.0, 0.0, 0.0], timestamp=0.0)
+    assert not index.add("short", [1.0, 0.0], timestamp=0.0)
+
+    index.clear()
+    assert len(index) == 0 and index.query([0.0, 1.0, 0.0], 0.5) is None
+
+
+def test_grows_past_initial_capacity():
+    rng = np.random.default_rng(2)
+    index = VectorIndex(8, capacity=16, exact_below=0)
+    vectors = rng.standard_normal((100, 8))
+    for i, vector in enumerate(vectors):
+        index.add(str(i), vector, timestamp=float(i))
+    assert len(index) == 100
+    assert index.query(vectors[57], 0.999) == ("57", pytest.approx(1.0, abs=1e-5))
+
+
+def timed_queries_10k():
+    """Hits and per-query milliseconds for 500 near-duplicate lookups over 10k entries"""
+    rng = np.random.default_rng(3)
+    vectors = clustered(rng, 10_000, 32, centers=1000)
+    index = VectorIndex(32)
+    for i, vector in enumerate(vectors):
+        index.add(f"k{i}", vector, timestamp=float(i))
+
+    queries = vectors[rng.integers(0, len(vectors), 500)] + rng.standard_normal((500, 32)) * 0.02
+    started = time.perf_counter()
+    hits = sum(index.query(query, 0.95, min_timestamp=0.0) is not None for query in queries)
+    return index, hits, (time.perf_counter() - started) / len(queries) * 1000
+
+
+def test_query_latency_10k():
+    """Similarity lookups over 10k entries find their neighbours well under a brute-force scan"""
+    index, hits, per_query_ms = timed_queries_10k()
+    assert per_query_ms < 5.0
+    assert hits > 450
+
+
+@pytest.mark.benchmark
+def test_query_latency_10k_benchmark():
+    """Benchmark: similarity lookups over 10k entries stay under 1ms"""
+    index, hits, per_query_ms = timed_queries_10k()
+    print(f"\nVector index: 10k x 32, {hits}/500 hits, {per_query_ms * 1000:.0f}us per query, "
+          f"{index.get_stats()['avg_candidates']:.0f} candidates")
+
+    assert per_query_ms < 1.0
+    assert hits > 450
+
+
+async def test_cache_ignores_scalar_features():
+    """LSTM-shaped inputs carry a feature count, which must not make every tick a similarity hit"""
+    cache = MLInferenceCache()
+    calls = []
+
+    async def predict(input_data):
+        calls.append(input_data['market_data']['close'])
+        return {'direction': input_data['market_data']['close']}
+
+    results = []
+    for close in (100.0, 101.0, 250.0):
+        for metadata in ({'n_features': 8}, {'features': 8}, {'features': [1.0, 2.0]}):
+            cache_input = {'market_data': {'close': close, 'volume': 10}, 'sequence_length': 20,
+                           'is_trained': True, 'is_enabled': True, 'model_version': None, **metadata}
+            results.append(await cache.get_prediction('lstm', cache_input, predict))
+
+    assert calls == [100.0] * 3 + [101.0] * 3 + [250.0] * 3
+    assert [result['direction'] for result in results] == calls
+    assert not any(result['cache_hit'] for result in results) and not cache.vector_indexes
+
+    # Real feature vectors still hit by similarity
+    vector = {'market_data': {'close': 1.0}, 'features': [1.0, 2.0, 3.0, 4.0]}
+    await cache.get_prediction('ensemble', vector, predict)
+    similar = {'market_data': {'close': 2.0}, 'features': [1.0, 2.0, 3.0, 4.01]}
+    assert (await cache.get_prediction('ensemble', similar, predict))['cache_hit']
+
+
+async def test_lstm_predictor_hits_on_a_repeated_pattern(temp_dir, monkeypatch):
+    """The predictor looks up its model sequence, so a repeating price pattern is served by similarity"""
+    cache = MLInferenceCache()
+    monkeypatch.setattr(ml_inference_cache, '_ml_inference_cache', cache)
+    model_path = temp_dir / "lstm_model"
+    export_keras_model(trained_like_model(np.random.default_rng(3)), f"{model_path}.npz")
+    predictor = LSTMPredictor(model_path=str(model_path))
+
+    pattern = [0.0, 2.0, 5.0, 3.0, 1.0, 4.0, 6.0, 2.0, 0.5, -1.0]
+    results = []
+    for i in range(80):
+        bar = {'symbol': 'LSTM-CACHE-TEST', 'timestamp': 1_700_000_000.0 + i,
+               'price': 21000.0 + pattern[i % 10] + (0.25 if i == 65 else 0.0), 'volume': 100 + 10 * (i % 5)}
+        results.append(await predictor.predict_direction(bar))
+
+    trend = {'symbol': 'LSTM-CACHE-TEST', 'timestamp': 1_700_000_080.0, 'price': 21030.0, 'volume': 400}
+    assert not (await predictor.predict_direction(trend))['cache_hit']  # A break from the pattern
+
+    served = [r for r in results if r['source'] == 'lstm_neural_network']
+    hits = [r for r in served if r['cache_hit']]
+    assert served and not served[0]['cache_hit']
+    assert len(hits) > len(served) // 2  # The window repeats every 10 bars, nudged once
+    assert hits[-1]['raw_prediction'] == pytest.approx(served[-1]['raw_prediction'])
+    assert cache.get_performance_stats()['similarity_indexes']['lstm/160']['hits'] == len(hits)
+    assert len(predictor.data_buffer) == predictor.data_buffer.maxlen  # Hits still advance the buffer
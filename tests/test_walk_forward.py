@@ -0,0 +1,141 @@
+"""
+Walk-forward search tests
+=========================
+
+Validates window splitting and seeded parameter sampling, the per-window
+cache (scaler fitted on training rows only), identical results inline and
+on a process pool, thread limits reaching each job, and the best config
+round-tripping into EnsembleManager.
+"""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+from capabilities.ensemble.ensemble_manager import HYPERPARAMETERS_FILE, EnsembleManager
+from capabilities.ensemble.walk_forward import (WalkForwardSearch, parameter_candidates,
+                                                walk_forward_windows)
+from tests.helpers import startup_env
+from tests.test_feature_store import random_bars
+
+
+class RidgeStub:
+    """Seeded ridge regression on a random feature subset; params shape the fit"""
+
+    def __init__(self, params, threads, seed):
+        self.alpha = params['learning_rate'] if 'learning_rate' in params else 1.0
+        self.columns = params['max_depth']
+        self.rng = np.random.default_rng(seed + params['n_estimators'])
+        self.threads = threads
+
+    def fit(self, X, y):
+        self.subset = np.sort(self.rng.choice(X.shape[1], size=min(self.columns, X.shape[1]), replace=False))
+        A = X[:, self.subset]
+        self.coef = np.linalg.solve(A.T @ A + self.alpha * len(A) * np.eye(A.shape[1]), A.T @ y)
+        return self
+
+    def predict(self, X):
+        return X[:, self.subset] @ self.coef
+
+
+class ThreadProbe(RidgeStub):
+    def predict(self, X):
+        # Encodes the job's thread count and the worker's start-up BLAS cap into the score
+        threads = int(startup_env('OMP_NUM_THREADS'))
+        return np.full(len(X), self.threads * 100 + threads, dtype=np.float64)
+
+
+def ridge_builder(name, params, threads, seed):
+    return RidgeStub(params, threads, seed)
+
+
+def probe_builder(name, params, threads, seed):
+    return ThreadProbe(params, threads, seed)
+
+
+SPACE = {'max_depth': [2, 4, 8], 'learning_rate': [0.01, 0.1], 'n_estimators': [100, 200]}
+
+
+def search(temp_dir, **kwargs):
+    return WalkForwardSearch(**{
+        'model_names': ('xgboost', 'random_forest'), 'search_space': SPACE, 'n_samples': 4,
+        'train_size': 300, 'test_size': 100, 'workers': 0, 'builder': ridge_builder,
+        'cache_dir': str(temp_dir / "cache"), **kwargs
+    })
+
+
+def test_windows_and_candidates(temp_dir):
+    assert walk_forward_windows(1000, 400, 200) == [(0, 400, 400, 600), (200, 600, 600, 800), (400, 800, 800, 1000)]
+    assert walk_forward_windows(1000, 400, 200, step=300, expanding=True) == [(0, 400, 400, 600), (0, 700, 700, 900)]
+    assert walk_forward_windows(500, 400, 200) == []
+
+    grid = parameter_candidates(SPACE)
+    assert len(grid) == 12 and grid[0] == {'learning_rate': 0.01, 'max_depth': 2, 'n_estimators': 100}
+    sampled = parameter_candidates(SPACE, 5, seed=7)
+    assert sampled == parameter_candidates(SPACE, 5, seed=7) != parameter_candidates(SPACE, 5, seed=8)
+    assert len(sampled) == 5 and all(params in grid for params in sampled)
+
+    # Random forest has no learning rate: its grid collapses instead of repeating jobs
+    forest = search(temp_dir, n_samples=None).candidates('random_forest')
+    assert len(forest) == 6 and all('learning_rate' not in params for params in forest)
+
+
+def test_window_cache_scaled_on_train_rows_only(temp_dir):
+    searcher = search(temp_dir)
+    windows = searcher.prepare(random_bars(1000))
+    assert len(windows) == 6
+
+    window = temp_dir / "cache" / "window_002"
+    X_train, X_test = np.load(window / "X_train.npy"), np.load(window / "X_test.npy")
+    assert X_train.shape[0] == 300 and X_test.shape[0] == 100
+    assert np.allclose(X_train.mean(axis=0), 0, atol=1e-9)  # Fitted here...
+    assert not np.allclose(X_test.mean(axis=0), 0, atol=1e-3)  # ...and only applied here
+    assert np.all(np.abs(np.load(window / "y_train.npy")) < 1)
+
+    jobs = searcher.jobs()
+    assert len(jobs) == 6 * (4 + 4)
+    assert all(set(job) == {'cache_dir', 'window', 'model', 'params', 'threads', 'seed', 'builder'} for job in jobs)
+
+
+async def test_pool_matches_inline_and_is_repeatable(temp_dir):
+    bars = random_bars(1000)
+    inline = await search(temp_dir / "a").run(bars)
+    pooled = await search(temp_dir / "b", workers=2).run(bars)
+    again = await search(temp_dir / "c", workers=2).run(bars)
+
+    for result in (inline, pooled, again):
+        result.pop('elapsed_s')
+    assert inline == pooled == again
+    assert inline['jobs'] == 48 and len(inline['windows']) == 6
+    for model in ('xgboost', 'random_forest'):
+        board = inline['leaderboard'][model]
+        assert inline['best'][model] == board[0]['params'] and len(board) == 4
+        assert all(row['windows'] == 6 for row in board)
+        assert board[0]['direction_accuracy'] >= board[-1]['direction_accuracy']
+    assert await search(temp_dir / "d", seed=1).run(bars) != inline
+
+
+@pytest.mark.skipif(not os.path.exists('/proc/self/environ'), reason="needs /proc")
+async def test_threads_per_job_reach_builder_and_worker(temp_dir):
+    result = await search(temp_dir, workers=1, threads_per_job=3, builder=probe_builder,
+                          model_names=('lightgbm',), n_samples=1).run(random_bars(600))
+    assert result['best_metrics']['lightgbm']['mae'] > 0
+    # |prediction - y| is within 1 of threads * 100 + OMP_NUM_THREADS
+    assert abs(result['best_metrics']['lightgbm']['mae'] - 303) < 1
+    assert 'OMP_NUM_THREADS' not in os.environ or os.environ['OMP_NUM_THREADS'] != '3'  # Parent restored
+
+
+async def test_best_config_loaded_by_ensemble_manager(temp_dir):
+    searcher = search(temp_dir)
+    summary = await searcher.run(random_bars(800))
+    path = searcher.save(summary, str(temp_dir / "ensemble"))
+    searcher.cleanup()
+    assert path.name == HYPERPARAMETERS_FILE and not (temp_dir / "cache").exists()
+
+    saved = json.loads(path.read_text())
+    assert saved['best'] == summary['best'] and saved['seed'] == 42 and 'leaderboard' not in saved
+
+    manager = EnsembleManager(model_path=str(temp_dir / "ensemble"))
+    assert manager._load_hyperparameters() == summary['best']